@@ -2,14 +2,16 @@ import datetime
 import logging
 from typing import Optional
 
+from redis import WatchError
+from redis.asyncio.client import Pipeline as AsyncPipeline
 from redis.client import Pipeline
 
 from dmod.communication import FullAuthSession, Session, SessionManager
-from dmod.redis import RedisBacked
+from dmod.redis import AsyncRedisBacked
 
 
 # TODO: add something to periodically scrub sessions due to some expiring criteria
-class RedisBackendSessionManager(SessionManager, RedisBacked):
+class RedisBackendSessionManager(SessionManager, AsyncRedisBacked):
     _LOGGER = None
     _SESSION_KEY_PREFIX = 'session:'
     _SESSION_HASH_SUBKEY_SECRET = 'secret'
@@ -87,6 +89,32 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
                                                 self._session_redis_hash_subkey_created,
                                                 self._session_redis_hash_subkey_last_accessed}
 
+    def _init_session_from_record(self, session_id: int, record_hash: Optional[dict]) -> Optional[FullAuthSession]:
+        """
+        Initialize a session object from the given session id and the Redis hash of its record.
+
+        Parameters
+        ----------
+        session_id : int
+            The session id.
+        record_hash : Optional[dict]
+            The record hash, as a dictionary, which may be empty or ``None`` if no record was found.
+
+        Returns
+        -------
+        Optional[FullAuthSession]
+            The session object, or ``None`` if no record was found.
+        """
+        # Comes back from Redis as a dict, perhaps empty if nothing is found for this session id
+        if record_hash is None or len(record_hash) == 0:
+            return None
+        return FullAuthSession(session_id=session_id,
+                               session_secret=record_hash[self._session_redis_hash_subkey_secret],
+                               created=record_hash[self._session_redis_hash_subkey_created],
+                               ip_address=record_hash[self._session_redis_hash_subkey_ip_address],
+                               user=record_hash[self._session_redis_hash_subkey_user],
+                               last_accessed=record_hash[self._session_redis_hash_subkey_last_accessed])
+
     def _write_session_via_pipeline(self, session: FullAuthSession, pipeline: Optional[Pipeline] = None,
                                     write_attr_subkeys: Optional[set] = None):
         """
@@ -148,6 +176,29 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
             if did_internal_init_pipeline:
                 pipeline.reset()
 
+    async def _async_get_next_session_id_via_pipeline(self, pipeline: AsyncPipeline) -> int:
+        """
+        Async counterpart of :meth:`_get_next_session_id_via_pipeline`, for a pipeline in immediate execution mode
+        (i.e., watching the next session id key), that only reads the next available session id without bumping the
+        stored value.
+
+        Parameters
+        ----------
+        pipeline : AsyncPipeline
+            An asyncio pipeline in immediate execution mode.
+
+        Returns
+        -------
+        int
+            The next available session id.
+        """
+        session_id_str: Optional[str] = await pipeline.get(self._next_session_id_key)
+        session_id = self.get_initial_session_id_value() if session_id_str is None else int(session_id_str)
+        # Skip over any ids for which the key is already in use (via manual selection)
+        while await pipeline.hlen(self.get_key_for_session_by_id(session_id)) != 0:
+            session_id += 1
+        return session_id
+
     # TODO: test
     def _get_next_session_id_via_pipeline(self, pipeline: Pipeline) -> int:
         # Do this in a loop to account for (unlikely) possibility that someone manually used a key out of order
@@ -167,6 +218,72 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
                 session_id = None
         return session_id
 
+    async def async_create_session(self, ip_address, username) -> FullAuthSession:
+        """
+        Async counterpart of :meth:`create_session`, using the asyncio Redis client.
+
+        The next session id is read while watching its key, and then the bumped next id value and the new session's
+        records are written in a single transaction, which is retried if another session was created in between.
+
+        Parameters
+        ----------
+        ip_address
+            The IP address of the session's client.
+        username
+            The session's user.
+
+        Returns
+        -------
+        FullAuthSession
+            The newly created session.
+        """
+        async with self.async_redis.pipeline() as pipeline:
+            while True:
+                try:
+                    await pipeline.watch(self._next_session_id_key)
+                    session_id = await self._async_get_next_session_id_via_pipeline(pipeline)
+                    session = FullAuthSession(ip_address=ip_address, session_id=session_id, user=username)
+                    session_key = self.get_key_for_session(session)
+
+                    pipeline.multi()
+                    pipeline.set(self._next_session_id_key, session_id + 1)
+                    pipeline.hset(session_key, mapping={
+                        self._session_redis_hash_subkey_ip_address: session.ip_address,
+                        self._session_redis_hash_subkey_secret: session.session_secret,
+                        self._session_redis_hash_subkey_user: session.user,
+                        self._session_redis_hash_subkey_created: session.get_created_serialized(),
+                        self._session_redis_hash_subkey_last_accessed: session.get_last_accessed_serialized()
+                    })
+                    pipeline.hset(self._all_session_secrets_hash_key, session.session_secret, session.session_id)
+                    pipeline.hset(self._all_users_hash_key, session.user, session.session_id)
+                    await pipeline.execute()
+                    return session
+                except WatchError:
+                    self.get_logger().debug('Next session id changed while creating session; retrying')
+                except Exception as e:
+                    self.get_logger().error('Encountered {} instance: {}'.format(e.__class__.__name__, str(e)))
+                    raise e
+
+    async def async_lookup_session_by_id(self, session_id: int) -> Optional[FullAuthSession]:
+        record_hash = await self.async_redis.hgetall(self.get_key_for_session_by_id(session_id))
+        return self._init_session_from_record(session_id, record_hash)
+
+    async def async_lookup_session_by_secret(self, session_secret: str) -> Optional[FullAuthSession]:
+        session_id: Optional[str] = await self.async_redis.hget(self._all_session_secrets_hash_key, session_secret)
+        return None if session_id is None else await self.async_lookup_session_by_id(int(session_id))
+
+    async def async_lookup_session_by_username(self, username: str) -> Optional[FullAuthSession]:
+        session_id: Optional[str] = await self.async_redis.hget(self._all_users_hash_key, username)
+        return None if session_id is None else await self.async_lookup_session_by_id(int(session_id))
+
+    async def async_remove_session(self, session: FullAuthSession):
+        async with self.async_redis.pipeline() as pipeline:
+            pipeline.delete(self.get_key_for_session(session))
+            # Then cleanup reverse-lookup hashes
+            pipeline.hdel(self._all_session_secrets_hash_key, session.session_secret)
+            pipeline.hdel(self._all_users_hash_key, session.user)
+            await pipeline.execute()
+
     def create_session(self, ip_address, username) -> FullAuthSession:
         with self.redis.pipeline() as pipeline:
             try:
@@ -202,15 +319,7 @@ class RedisBackendSessionManager(SessionManager, RedisBacked):
 
     def lookup_session_by_id(self, session_id: int) -> Optional[FullAuthSession]:
         record_hash = self.redis.hgetall(self.get_key_for_session_by_id(session_id))
-        # Comes back from Redis as a dict, perhaps empty if nothing is found for this session id
-        if record_hash is None or len(record_hash) == 0:
-            return None
-        return FullAuthSession(session_id=session_id,
-                               session_secret=record_hash[self._session_redis_hash_subkey_secret],
-                               created=record_hash[self._session_redis_hash_subkey_created],
-                               ip_address=record_hash[self._session_redis_hash_subkey_ip_address],
-                               user=record_hash[self._session_redis_hash_subkey_user],
-                               last_accessed=record_hash[self._session_redis_hash_subkey_last_accessed])
+        return self._init_session_from_record(session_id, record_hash)
 
     def lookup_session_by_secret(self, session_secret: str) -> Optional[FullAuthSession]:
         session_id: Optional[str] = self.redis.hget(self._all_session_secrets_hash_key, session_secret)
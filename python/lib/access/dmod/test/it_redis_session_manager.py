@@ -1,3 +1,4 @@
+import asyncio
 import datetime
 import time
 import unittest
@@ -762,3 +763,56 @@ class IntegrationTestRedisBackendSessionManager(unittest.TestCase):
 
         lookup_session_2 = self._session_manager.lookup_session_by_id(session_2.session_id)
         self.assertTrue(session_2.full_equals(lookup_session_2))
+
+    def _run_async(self, coroutine):
+        async def run_and_close():
+            try:
+                return await coroutine
+            finally:
+                await self._session_manager.async_close_redis()
+        return asyncio.get_event_loop().run_until_complete(run_and_close())
+
+    def test_async_create_session_1_a(self):
+        """
+        Test that a session created with ``async_create_session()`` can be looked up with each of the async lookups.
+        """
+        user = self._redis_user_1
+        ip_addr = self._session_ip_1
+
+        async def create_and_lookup():
+            created = await self._session_manager.async_create_session(ip_address=ip_addr, username=user)
+            return created, [await self._session_manager.async_lookup_session_by_id(created.session_id),
+                             await self._session_manager.async_lookup_session_by_secret(created.session_secret),
+                             await self._session_manager.async_lookup_session_by_username(user)]
+
+        created_session, looked_up_sessions = self._run_async(create_and_lookup())
+        self.assertEqual(user, created_session.user)
+        for looked_up in looked_up_sessions:
+            self.assertTrue(created_session.full_equals(looked_up))
+        looked_up_sync = self._session_manager.lookup_session_by_id(created_session.session_id)
+        self.assertTrue(created_session.full_equals(looked_up_sync))
+
+    def test_async_create_session_1_b(self):
+        """
+        Test that sessions created concurrently with ``async_create_session()`` get different ids.
+        """
+        async def create_concurrently():
+            return await asyncio.gather(
+                self._session_manager.async_create_session(ip_address=self._session_ip_1, username=self._redis_user_1),
+                self._session_manager.async_create_session(ip_address=self._session_ip_2, username=self._redis_user_2),
+                self._session_manager.async_create_session(ip_address=self._session_ip_3, username=self._redis_user_3))
+
+        sessions = self._run_async(create_concurrently())
+        self.assertEqual(len(set([s.session_id for s in sessions])), 3)
+        for session in sessions:
+            self.assertTrue(session.full_equals(self._session_manager.lookup_session_by_id(session.session_id)))
+
+    def test_async_remove_session_1_a(self):
+        """
+        Test that ``async_remove_session()`` removes the session and its reverse lookups.
+        """
+        session = self._session_manager.create_session(ip_address=self._session_ip_1, username=self._redis_user_1)
+        self._run_async(self._session_manager.async_remove_session(session))
+        self.assertIsNone(self._session_manager.lookup_session_by_id(session.session_id))
+        self.assertIsNone(self._session_manager.lookup_session_by_secret(session.session_secret))
+        self.assertIsNone(self._session_manager.lookup_session_by_username(session.user))
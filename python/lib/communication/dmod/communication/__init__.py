@@ -5,6 +5,9 @@ from .maas_request import get_available_models, get_available_outputs, get_distr
     NGENRequestResponse
 from .message import AbstractInitRequest, MessageEventType, Message, Response, InvalidMessage, InvalidMessageResponse, \
     InitRequestResponseReason
+from .message_channel import CorrelatedMessageChannel, MessageChannel, WebSocketMessageChannel
+from .message_registry import MessageTypeRegistry, create_stream_end, get_correlation_id, is_envelope, is_stream_end, \
+    unwrap_envelope, wrap_in_envelope
 from .request_handler import AbstractRequestHandler
 from .scheduler_request import SchedulerRequestMessage, SchedulerRequestResponse
 from .session import Session, FullAuthSession, SessionInitMessage, SessionInitResponse, FailedSessionInitInfo, \
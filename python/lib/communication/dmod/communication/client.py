@@ -1,17 +1,24 @@
 import asyncio
 import datetime
 import json
+import random
 import ssl
 import traceback
+import uuid
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Optional, Union
+from collections import deque
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple, Union
 
 import websockets
+import websockets.client
 
 from .maas_request import MaaSRequest, MaaSRequestResponse, NWMRequest, NWMRequestResponse, NGENRequest, NGENRequestResponse
-from .message import Message, Response, InitRequestResponseReason
+from .message import Message, MessageEventType, Response, InitRequestResponseReason
+from .message_registry import get_correlation_id, is_stream_end, unwrap_envelope, wrap_in_envelope
 from .scheduler_request import SchedulerRequestMessage, SchedulerRequestResponse
+from .serializeable import Serializable
+from .serialization import SerialCodec, decode_message, encode_message, get_codec, get_codec_for_subprotocol
 from .validator import NWMRequestJsonValidator
 from .update_message import UpdateMessage, UpdateMessageResponse
 
@@ -37,7 +44,7 @@ class WebSocketClient(ABC):
                 path = '/' + path
         return proto + '://' + host.strip() + ':' + str(port).strip() + path
 
-    def __init__(self, endpoint_uri: str, ssl_directory: Path):
+    def __init__(self, endpoint_uri: str, ssl_directory: Path, serial_codec: Optional[str] = None):
         super().__init__()
 
         self.endpoint_uri = endpoint_uri
@@ -62,6 +69,12 @@ class WebSocketClient(ABC):
         self.active_connections = 0
         """int: The number of active utilizations of the open :attr:`connection`."""
 
+        self._requested_serial_codec: Optional[SerialCodec] = None if serial_codec is None else get_codec(serial_codec)
+        """Optional[SerialCodec]: The serialization codec to request when opening connections, if not the default."""
+
+        self.serial_codec: SerialCodec = get_codec()
+        """SerialCodec: The serialization codec negotiated for the open :attr:`connection`."""
+
     async def __aenter__(self):
         """
             When context is entered, use existing connection or create if none exists
@@ -80,8 +93,15 @@ class WebSocketClient(ABC):
         if self.connection is None:
             # If not, mark that this exec is opening a connection, before giving up control during the await
             self._opening_connection = True
-            # Then asynchronously open the connection ...
-            self.connection = await websockets.client.connect(self.endpoint_uri, ssl=self.client_ssl_context)
+            # Then asynchronously open the connection, offering a subprotocol for any requested serialization codec ...
+            if self._requested_serial_codec is None:
+                self.connection = await websockets.client.connect(self.endpoint_uri, ssl=self.client_ssl_context)
+            else:
+                self.connection = await websockets.client.connect(
+                    self.endpoint_uri, ssl=self.client_ssl_context,
+                    subprotocols=[self._requested_serial_codec.get_subprotocol()])
+            # ... using the default codec if the server did not accept the subprotocol
+            self.serial_codec = get_codec_for_subprotocol(self.connection.subprotocol)
             # And now, note that we are no longer in the middle of an attempt to open a connection
             self._opening_connection = False
 
@@ -98,15 +118,18 @@ class WebSocketClient(ABC):
             self.connection = None
             self.active_connections = 0
 
-    async def async_send(self, data: Union[str, bytearray], await_response: bool = False):
+    async def async_send(self, data: Union[str, bytearray, Serializable], await_response: bool = False):
         """
             Send data to websocket, by default returning immediately after, but optionally waiting for and returning the
             response.
 
+            ::class:`Serializable` objects are encoded with the serialization codec negotiated for the connection, with
+            ::class:`Message` objects first wrapped in an envelope tagged with their event type.
+
             Parameters
             ----------
             data
-                string or byte array
+                string, byte array, or serializable object
 
             await_response
                 whether the method should also await a response on the websocket connection and return it
@@ -118,6 +141,10 @@ class WebSocketClient(ABC):
         """
         async with self as websocket:
             #TODO ensure correct type for data???
+            if isinstance(data, Message):
+                data = encode_message(wrap_in_envelope(data), self.serial_codec, data.get_schema_version())
+            elif isinstance(data, Serializable):
+                data = encode_message(data.to_dict(), self.serial_codec, data.get_schema_version())
             await websocket.connection.send(data)
             return await websocket.connection.recv() if await_response else None
 
@@ -157,6 +184,253 @@ class WebSocketClient(ABC):
 
 
 class SchedulerClient(WebSocketClient):
+    """
+    Client for the scheduler service, multiplexing concurrent requests over a single persistent connection.
+
+    Each request message is sent in an envelope with a new correlation id (see ::mod:`message_registry`), and a single
+    reader task routes each received message to the conversation with its correlation id.  This lets many concurrent
+    requests, along with the job update messages the scheduler sends back for each requested job, share one connection,
+    rather than opening a new connection (with its TLS handshake) for every request.  The number of requests awaiting
+    their initial response is bounded by a window of ::attribute:`max_in_flight` requests, with further requests waiting
+    for a slot in the window.
+
+    The connection is opened when first needed and then kept open, including after exiting the client's context.  If
+    it is lost, it is transparently reopened for the next request, with backoff between failed attempts.  Any request
+    still awaiting a response when a connection is lost fails.
+
+    Job update messages from the scheduler are acknowledged automatically, and a bounded number are buffered for each
+    job, which can be consumed via ::method:`get_job_updates`.
+    """
+
+    _CONNECT_ATTEMPTS = 3
+    """ Number of attempts to open a connection for a request before failing. """
+    _CONNECT_BACKOFF_SECONDS = 0.5
+    """ Max delay after the first failed attempt to open a connection, doubled for each further one. """
+    _DEFAULT_MAX_IN_FLIGHT = 32
+    """ Default maximum number of concurrent requests awaiting an initial response. """
+    _MAX_BUFFERED_MESSAGES = 100
+    """ Maximum number of unconsumed messages buffered for each conversation, beyond which the oldest are dropped. """
+    _MAX_ENDED_JOB_UPDATES = 100
+    """ Maximum number of ended jobs with unconsumed updates kept, beyond which those of the oldest are dropped. """
+
+    def __init__(self, endpoint_uri: str, ssl_directory: Path, serial_codec: Optional[str] = None,
+                 max_in_flight: Optional[int] = None):
+        super().__init__(endpoint_uri=endpoint_uri, ssl_directory=ssl_directory, serial_codec=serial_codec)
+
+        self.max_in_flight = self._DEFAULT_MAX_IN_FLIGHT if max_in_flight is None else max_in_flight
+        """int: The maximum number of concurrent requests awaiting an initial response."""
+
+        self._conversations: Dict[str, Tuple[Any, asyncio.Queue]] = dict()
+        """Dict[str, Tuple[Any, asyncio.Queue]]: Connections and received message queues of conversations in progress,
+        by correlation id."""
+
+        self._conversation_jobs: Dict[str, str] = dict()
+        """Dict[str, str]: Ids of requested jobs, by the correlation ids of their conversations in progress."""
+
+        self._job_updates: Dict[str, asyncio.Queue] = dict()
+        """Dict[str, asyncio.Queue]: Queues of received update messages for requested jobs, by job id."""
+
+        self._ended_jobs: Deque[str] = deque()
+        """Deque[str]: Ids of jobs with ended conversations but still-kept update queues, oldest first."""
+
+        # Create these lazily, within the event loop that uses them
+        self._connect_lock: Optional[asyncio.Lock] = None
+        self._in_flight_window: Optional[asyncio.Semaphore] = None
+        self._reader_task: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        """
+            When context is entered, use existing connection or create if none exists
+        """
+        await self._get_connection()
+        self.active_connections += 1
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """
+            When context exits, decrement the connection count, but keep the connection open for later requests
+        """
+        self.active_connections = max(0, self.active_connections - 1)
+
+    async def _acknowledge_update(self, connection, update: UpdateMessage, correlation_id: str):
+        response = UpdateMessageResponse(digest=update.digest, object_found=True, success=True,
+                                         reason='Update Received')
+        await connection.send(encode_message(wrap_in_envelope(response, correlation_id), self.serial_codec))
+
+    def _end_conversation(self, correlation_id: str):
+        """
+        Stop tracking the conversation with the given correlation id, marking the end of its received messages.
+        """
+        connection_and_conversation = self._conversations.pop(correlation_id, None)
+        if connection_and_conversation is not None:
+            self._put_received(connection_and_conversation[1], None)
+        job_id = self._conversation_jobs.pop(correlation_id, None)
+        if job_id is not None and job_id in self._job_updates:
+            # Keep the job's updates until consumed, but only for a bounded number of ended jobs
+            self._put_received(self._job_updates[job_id], None)
+            self._ended_jobs.append(job_id)
+            while len(self._ended_jobs) > self._MAX_ENDED_JOB_UPDATES:
+                self._job_updates.pop(self._ended_jobs.popleft(), None)
+
+    async def _get_connection(self):
+        """
+        Get the open persistent connection, opening it (and starting its reader task) if necessary.
+
+        Returns
+        -------
+        websockets.client.Connect
+            The open persistent connection.
+        """
+        if self._connect_lock is None:
+            self._connect_lock = asyncio.Lock()
+        async with self._connect_lock:
+            if self.connection is not None:
+                return self.connection
+            attempt = 0
+            while True:
+                try:
+                    if self._requested_serial_codec is None:
+                        connection = await websockets.client.connect(self.endpoint_uri, ssl=self.client_ssl_context)
+                    else:
+                        connection = await websockets.client.connect(
+                            self.endpoint_uri, ssl=self.client_ssl_context,
+                            subprotocols=[self._requested_serial_codec.get_subprotocol()])
+                    break
+                except (OSError, asyncio.TimeoutError, websockets.exceptions.WebSocketException) as e:
+                    attempt += 1
+                    if attempt >= self._CONNECT_ATTEMPTS:
+                        raise
+                    logger.warning('Failed to connect to {} ({}); retrying'.format(self.endpoint_uri, str(e)))
+                    await asyncio.sleep(random.uniform(0, self._CONNECT_BACKOFF_SECONDS * 2 ** (attempt - 1)))
+            self.connection = connection
+            # Use the default codec if the server did not accept the requested subprotocol
+            self.serial_codec = get_codec_for_subprotocol(connection.subprotocol)
+            self._reader_task = asyncio.ensure_future(self._read_messages(connection))
+            return connection
+
+    def _put_received(self, conversation: asyncio.Queue, message: Optional[dict]):
+        """
+        Add a received message (or ``None`` to mark the end) to a conversation, dropping its oldest if full.
+        """
+        if conversation.full():
+            conversation.get_nowait()
+            logger.warning('Dropped oldest unconsumed message from {} conversation'.format(self.__class__.__name__))
+        conversation.put_nowait(message)
+
+    async def _read_messages(self, connection):
+        """
+        Read the messages received over the given connection, routing each to its conversation, until it closes.
+
+        Update messages are acknowledged here, so that the scheduler does not depend on them being consumed.  When the
+        connection closes, all conversations end, and the client will open a new connection for the next request.
+        """
+        try:
+            async for raw_message in connection:
+                data = decode_message(raw_message)
+                correlation_id = get_correlation_id(data)
+                conversation_connection, conversation = self._conversations.get(correlation_id, (None, None))
+                if conversation_connection is not connection:
+                    logger.debug('Discarding message for unknown conversation: {}'.format(str(raw_message)))
+                    continue
+                if is_stream_end(data):
+                    self._end_conversation(correlation_id)
+                    continue
+                event_type, message = unwrap_envelope(data) or (None, data)
+                if event_type == MessageEventType.INFORMATION_UPDATE:
+                    update = UpdateMessage.factory_init_from_deserialized_json(message)
+                    if update is not None:
+                        await self._acknowledge_update(connection, update, correlation_id)
+                        job_id = self._conversation_jobs.get(correlation_id)
+                        if job_id is not None:
+                            self._put_received(self._job_updates[job_id], message)
+                            continue
+                elif event_type == MessageEventType.SCHEDULER_REQUEST:
+                    response = SchedulerRequestResponse.factory_init_from_deserialized_json(message)
+                    if response is not None and response.success:
+                        job_id = str(response.job_id)
+                        self._conversation_jobs[correlation_id] = job_id
+                        self._job_updates[job_id] = asyncio.Queue(maxsize=self._MAX_BUFFERED_MESSAGES)
+                self._put_received(conversation, message)
+        except websockets.exceptions.ConnectionClosed as e:
+            logger.info('Connection to {} closed ({})'.format(self.endpoint_uri, str(e)))
+        finally:
+            if self.connection is connection:
+                self.connection = None
+            for correlation_id, (conversation_connection, _) in list(self._conversations.items()):
+                if conversation_connection is connection:
+                    self._end_conversation(correlation_id)
+
+    async def async_close(self):
+        """
+        Close the persistent connection, if it is open, ending any conversations in progress.
+        """
+        if self.connection is not None:
+            await self.connection.close()
+        if self._reader_task is not None:
+            await self._reader_task
+            self._reader_task = None
+
+    async def async_send(self, data: Union[str, bytearray, Serializable], await_response: bool = False):
+        """
+            Send data to the scheduler over the persistent connection, by default returning immediately after, but
+            optionally waiting for and returning the response.
+
+            ::class:`Message` objects start a new conversation, being sent in an envelope with a new correlation id,
+            and the returned response is the first message received in that conversation, in its serialized dictionary
+            form.  Requests awaiting a response are limited to the ::attribute:`max_in_flight` window.  Other data is
+            sent as is, and cannot be awaited for a response.
+
+            Parameters
+            ----------
+            data
+                message object, or other string, byte array, or serializable object
+
+            await_response
+                whether the method should also await a response to a sent message and return it
+
+            Returns
+            -------
+            response
+                the request response if one should be awaited, or None
+        """
+        if not isinstance(data, Message):
+            if await_response:
+                raise ValueError('{} can only await responses to {} objects'.format(self.__class__.__name__,
+                                                                                     Message.__name__))
+            connection = await self._get_connection()
+            if isinstance(data, Serializable):
+                data = encode_message(data.to_dict(), self.serial_codec, data.get_schema_version())
+            await connection.send(data)
+            return None
+
+        if self._in_flight_window is None:
+            self._in_flight_window = asyncio.Semaphore(self.max_in_flight)
+        correlation_id = uuid.uuid4().hex
+        conversation = asyncio.Queue(maxsize=self._MAX_BUFFERED_MESSAGES)
+        async with self._in_flight_window:
+            try:
+                for attempt in range(2):
+                    connection = await self._get_connection()
+                    # Register before sending, so the response cannot arrive before the conversation is known
+                    if await_response:
+                        self._conversations[correlation_id] = (connection, conversation)
+                    try:
+                        await connection.send(encode_message(wrap_in_envelope(data, correlation_id), self.serial_codec,
+                                                             data.get_schema_version()))
+                        break
+                    except websockets.exceptions.ConnectionClosed:
+                        # If the connection was lost before its reader noticed, retry once with a new connection
+                        if self.connection is connection:
+                            self.connection = None
+                        if attempt > 0:
+                            raise
+                response = await conversation.get() if await_response else None
+            except BaseException:
+                self._end_conversation(correlation_id)
+                raise
+        if await_response and response is None:
+            raise ConnectionError('Connection to {} closed before a response was received'.format(self.endpoint_uri))
+        return response
 
     async def async_send_update(self, message: UpdateMessage) -> UpdateMessageResponse:
         """
@@ -181,10 +455,11 @@ class SchedulerClient(WebSocketClient):
         response_json = {}
         serialized_response = None
         try:
-            serialized_response = await self.async_send(data=str(message), await_response=True)
+            serialized_response = await self.async_send(data=message, await_response=True)
             if serialized_response is None:
                 raise ValueError('Response from {} async update message was `None`'.format(self.__class__.__name__))
-            response_object = UpdateMessageResponse.factory_init_from_deserialized_json(json.loads(serialized_response))
+            response_object = UpdateMessageResponse.factory_init_from_deserialized_json(
+                serialized_response if isinstance(serialized_response, dict) else decode_message(serialized_response))
             if response_object is None:
                 raise ValueError('Could not deserialize update response to {}'.format(UpdateMessageResponse.__name__))
             else:
@@ -193,7 +468,7 @@ class SchedulerClient(WebSocketClient):
             reason = 'Update Scheduler Failure: {} ({})'.format(str(e), e.__class__.__name__)
             logger.error('Encountered {} sending update to scheduler service: {}'.format(e.__class__.__name__, str(e)))
             return UpdateMessageResponse(digest=message.digest, object_found=False, success=False, reason=reason,
-                                         response_text='None' if serialized_response is None else serialized_response)
+                                         response_text='None' if serialized_response is None else str(serialized_response))
 
     async def async_make_request(self, message: SchedulerRequestMessage) -> SchedulerRequestResponse:
         """
@@ -213,7 +488,7 @@ class SchedulerClient(WebSocketClient):
         response_json = {}
         try:
             # Send the request and get the scheduler confirmation of job submission
-            serialized_response = await self.async_send(data=str(message), await_response=True)
+            serialized_response = await self.async_send(data=message, await_response=True)
             if serialized_response is None:
                 raise ValueError('Serialized response from {} async message was `None`'.format(self.__class__.__name__))
         except Exception as e:
@@ -222,12 +497,15 @@ class SchedulerClient(WebSocketClient):
             return SchedulerRequestResponse(success=False, reason=reason, message=str(e), data=response_json)
         try:
             # Consume the response confirmation by deserializing first to JSON, then from this to a response object
-            response_json = json.loads(serialized_response)
+            if isinstance(serialized_response, dict):
+                response_json = serialized_response
+            else:
+                response_json = decode_message(serialized_response)
             try:
                 response_object = SchedulerRequestResponse.factory_init_from_deserialized_json(response_json)
                 if response_object is None:
                     logging.error('********** Client did not deserialize response content to scheduler response object')
-                    logging.error('********** Content was: ' + serialized_response)
+                    logging.error('********** Content was: ' + str(serialized_response))
                     reason = 'Could Not Deserialize Response Object'
                     response_object = SchedulerRequestResponse(success=False, reason=reason, data=response_json)
             except Exception as e2:
@@ -244,11 +522,42 @@ class SchedulerClient(WebSocketClient):
         logging.debug('************* Scheduler client returning response object {}'.format(response_object.to_json()))
         return response_object
 
-    async def get_results(self):
-        logging.debug('************* Scheduler client preparing to yield results')
-        async for message in self.connection:
-            logging.debug('************* Scheduler client yielding result: {}'.format(str(message)))
-            yield message
+    async def get_job_updates(self, job_id: str) -> AsyncIterator[UpdateMessage]:
+        """
+        Get the update messages received for the given job, requested through this client, as they are received.
+
+        Iteration ends once the scheduler ends the conversation for the job (e.g., because the job is no longer active),
+        or if the connection is lost.  Updates are kept after the conversation ends until consumed, though only for
+        the ::attribute:`_MAX_ENDED_JOB_UPDATES` most recently ended jobs.  Note also that updates received beyond the
+        buffer limit of ::attribute:`_MAX_BUFFERED_MESSAGES` before being consumed are dropped, oldest first.
+
+        Parameters
+        ----------
+        job_id : str
+            The id of the job, from the response to the request for it.
+
+        Returns
+        -------
+        AsyncIterator[UpdateMessage]
+            An async iterator of the update messages received for the given job.
+        """
+        job_id = str(job_id)
+        job_updates = self._job_updates.get(job_id)
+        if job_updates is None:
+            return
+        while True:
+            message = await job_updates.get()
+            if message is None:
+                # Once all of an ended job's updates are consumed, there is no need to keep its queue
+                if self._job_updates.get(job_id) is job_updates:
+                    self._job_updates.pop(job_id)
+                    if job_id in self._ended_jobs:
+                        self._ended_jobs.remove(job_id)
+                return
+            update = UpdateMessage.factory_init_from_deserialized_json(message)
+            if update is not None:
+                logging.debug('************* Scheduler client yielding update: {}'.format(str(message)))
+                yield update
 
 
 class MaasRequestClient(WebSocketClient, ABC):
@@ -322,7 +631,7 @@ class MaasRequestClient(WebSocketClient, ABC):
 
     async def async_make_request(self, maas_request: MaaSRequest) -> MaaSRequestResponse:
         async with websockets.connect(self.endpoint_uri, ssl=self.client_ssl_context) as websocket:
-            await websocket.send(maas_request.to_json())
+            await websocket.send(json.dumps(wrap_in_envelope(maas_request)))
             response = await websocket.recv()
             return maas_request.__class__.factory_init_correct_response_subtype(json_obj=json.loads(response))
 
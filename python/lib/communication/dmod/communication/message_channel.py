@@ -0,0 +1,141 @@
+"""
+Channels for exchanging messages over websocket connections, either as the only conversation over a connection, or as
+one of several concurrent conversations multiplexed over a connection using correlation ids (see
+::mod:`message_registry`).
+"""
+import asyncio
+from abc import ABC, abstractmethod
+from websockets import WebSocketCommonProtocol
+from websockets.exceptions import ConnectionClosed
+
+from .message import Message
+from .message_registry import create_stream_end, unwrap_envelope, wrap_in_envelope
+from .serializeable import Serializable
+from .serialization import decode_message, encode_message, get_codec_for_subprotocol
+
+
+class MessageChannel(ABC):
+    """
+    Abstract channel for one conversation of messages over a websocket connection.
+    """
+
+    def __init__(self, websocket: WebSocketCommonProtocol):
+        self._websocket = websocket
+        self._serial_codec = get_codec_for_subprotocol(getattr(websocket, 'subprotocol', None))
+
+    async def close(self):
+        """
+        Close the channel when the conversation is finished, without closing the underlying websocket connection.
+
+        The default implementation does nothing.
+        """
+        pass
+
+    @abstractmethod
+    async def recv(self) -> dict:
+        """
+        Receive the next message in the channel's conversation.
+
+        Returns
+        -------
+        dict
+            The received message, deserialized to its serialized dictionary form.
+        """
+        pass
+
+    @abstractmethod
+    async def send_serialized(self, obj: Serializable):
+        """
+        Send the given object as the next message in the channel's conversation, encoded with the connection's
+        negotiated serialization codec.
+
+        Parameters
+        ----------
+        obj : Serializable
+            The object to send.
+        """
+        pass
+
+    @property
+    def websocket(self) -> WebSocketCommonProtocol:
+        """
+        The underlying websocket connection.
+
+        Returns
+        -------
+        WebSocketCommonProtocol
+            The underlying websocket connection.
+        """
+        return self._websocket
+
+
+class WebSocketMessageChannel(MessageChannel):
+    """
+    Channel for a conversation that is the only conversation over its websocket connection.
+
+    Messages are sent and received directly over the connection, without being wrapped in envelopes, as was done before
+    conversations could be multiplexed.
+    """
+
+    async def recv(self) -> dict:
+        return decode_message(await self._websocket.recv())
+
+    async def send_serialized(self, obj: Serializable):
+        await self._websocket.send(encode_message(obj.to_dict(), self._serial_codec, obj.get_schema_version()))
+
+
+class CorrelatedMessageChannel(MessageChannel):
+    """
+    Channel for one of the conversations multiplexed over a websocket connection, identified by its correlation id.
+
+    Sent messages are wrapped in envelopes with the correlation id.  Since a single reader of the connection must route
+    received messages to the right conversation, received messages are not read from the connection by the channel, but
+    are instead given to the channel via ::method:`put_received`.
+    """
+
+    def __init__(self, websocket: WebSocketCommonProtocol, correlation_id: str):
+        super().__init__(websocket)
+        self._correlation_id = correlation_id
+        self._received = asyncio.Queue()
+
+    async def close(self):
+        """
+        Close the channel, sending a stream end marker so the other side may also release the conversation.
+
+        There is nothing to do if the connection has already closed.
+        """
+        try:
+            await self._websocket.send(encode_message(create_stream_end(self._correlation_id), self._serial_codec))
+        except ConnectionClosed:
+            pass
+
+    def put_received(self, data: dict):
+        """
+        Add a received message, in its serialized dictionary form, for this channel's conversation.
+
+        Parameters
+        ----------
+        data : dict
+            The received message, which may be wrapped in an envelope.
+        """
+        envelope = unwrap_envelope(data)
+        self._received.put_nowait(data if envelope is None else envelope[1])
+
+    async def recv(self) -> dict:
+        return await self._received.get()
+
+    async def send_serialized(self, obj: Message):
+        data = wrap_in_envelope(obj, self._correlation_id)
+        await self._websocket.send(encode_message(data, self._serial_codec, obj.get_schema_version()))
+
+    @property
+    def correlation_id(self) -> str:
+        """
+        The correlation id of the channel's conversation.
+
+        Returns
+        -------
+        str
+            The correlation id of the channel's conversation.
+        """
+        return self._correlation_id
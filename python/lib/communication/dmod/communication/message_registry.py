@@ -0,0 +1,273 @@
+"""
+Typed message envelopes, and a registry for dispatching received messages to their ::class:`Message` types.
+
+An envelope wraps a serialized message with an explicit discriminator, naming the ::class:`MessageEventType` of the
+message:
+
+    {"event_type": "SCHEDULER_REQUEST", "message": {...}}
+
+A ::class:`MessageTypeRegistry` maps each event type to its ::class:`Message` subtype and (optionally) the
+::class:`MessageJsonValidator` for it, so a received envelope needs a single lookup and a single validation, rather than
+trial parsing as each supported type in turn.  Messages not in an envelope (i.e., from senders predating envelopes) are
+still supported, falling back to trying each registered type in the order registered.
+
+Envelopes may also have a correlation id, allowing several concurrent conversations (i.e., a request, its response,
+and any further related messages in either direction) to be multiplexed over one connection.  Each message of a
+conversation carries the same correlation id, and the end of a conversation is indicated with a stream end marker:
+
+    {"correlation_id": "...", "stream_end": true}
+"""
+from typing import Any, Dict, List, Optional, Tuple, Type
+
+from .message import Message, MessageEventType
+from .validator import MessageJsonValidator
+
+ENVELOPE_CORRELATION_ID_KEY = 'correlation_id'
+ENVELOPE_EVENT_TYPE_KEY = 'event_type'
+ENVELOPE_MESSAGE_KEY = 'message'
+STREAM_END_KEY = 'stream_end'
+
+
+def create_stream_end(correlation_id: str) -> dict:
+    """
+    Get the serialized marker for the end of the multiplexed conversation with the given correlation id.
+
+    Parameters
+    ----------
+    correlation_id : str
+        The correlation id of the conversation.
+
+    Returns
+    -------
+    dict
+        The serialized stream end marker.
+    """
+    return {ENVELOPE_CORRELATION_ID_KEY: correlation_id, STREAM_END_KEY: True}
+
+
+def get_correlation_id(data: Any) -> Optional[str]:
+    """
+    Get the correlation id of the given received message envelope or stream end marker, if it has one.
+
+    Parameters
+    ----------
+    data : Any
+        The received, deserialized data.
+
+    Returns
+    -------
+    Optional[str]
+        The correlation id of the received data, or ``None`` if there is none.
+    """
+    return data.get(ENVELOPE_CORRELATION_ID_KEY) if isinstance(data, dict) else None
+
+
+def is_envelope(data: Any) -> bool:
+    """
+    Get whether the given received data is a message envelope.
+
+    Parameters
+    ----------
+    data : Any
+        The received, deserialized data.
+
+    Returns
+    -------
+    bool
+        Whether the given received data is a message envelope.
+    """
+    if not isinstance(data, dict) or not isinstance(data.get(ENVELOPE_EVENT_TYPE_KEY), str) \
+            or not isinstance(data.get(ENVELOPE_MESSAGE_KEY), dict):
+        return False
+    return len(data) == 2 or (len(data) == 3 and ENVELOPE_CORRELATION_ID_KEY in data)
+
+
+def is_stream_end(data: Any) -> bool:
+    """
+    Get whether the given received data is a stream end marker.
+
+    Parameters
+    ----------
+    data : Any
+        The received, deserialized data.
+
+    Returns
+    -------
+    bool
+        Whether the given received data is a stream end marker.
+    """
+    return isinstance(data, dict) and data.get(STREAM_END_KEY) is True and ENVELOPE_CORRELATION_ID_KEY in data
+
+
+def unwrap_envelope(data: Any) -> Optional[Tuple[MessageEventType, dict]]:
+    """
+    Get the event type and serialized message of the given message envelope.
+
+    Parameters
+    ----------
+    data : Any
+        The received, deserialized data.
+
+    Returns
+    -------
+    Optional[Tuple[MessageEventType, dict]]
+        The event type and serialized message of the envelope, with an unrecognized event type replaced by
+        ``MessageEventType.INVALID``, or ``None`` if the data is not an envelope.
+    """
+    if not is_envelope(data):
+        return None
+    try:
+        event_type = MessageEventType[data[ENVELOPE_EVENT_TYPE_KEY]]
+    except KeyError:
+        event_type = MessageEventType.INVALID
+    return event_type, data[ENVELOPE_MESSAGE_KEY]
+
+
+def wrap_in_envelope(message: Message, correlation_id: Optional[str] = None) -> dict:
+    """
+    Get the serialized envelope for the given message.
+
+    Parameters
+    ----------
+    message : Message
+        The message to wrap.
+    correlation_id : Optional[str]
+        The optional correlation id of the conversation the message is part of.
+
+    Returns
+    -------
+    dict
+        The serialized envelope for the message, tagged with the message's event type.
+    """
+    envelope = {ENVELOPE_EVENT_TYPE_KEY: message.get_message_event_type().name, ENVELOPE_MESSAGE_KEY: message.to_dict()}
+    if correlation_id is not None:
+        envelope[ENVELOPE_CORRELATION_ID_KEY] = correlation_id
+    return envelope
+
+
+class MessageTypeRegistry:
+    """
+    Registry of the supported ::class:`Message` types of a receiver, keyed by event type, along with an optional
+    validator for each.
+
+    Types without a validator are considered valid for a serialized message when their
+    ::method:`Message.factory_init_from_deserialized_json` can deserialize the message.
+    """
+
+    def __init__(self):
+        self._message_types: Dict[MessageEventType, Type[Message]] = dict()
+        self._validators: Dict[MessageEventType, MessageJsonValidator] = dict()
+
+    def deserialize(self, data: dict) -> Optional[Message]:
+        """
+        Deserialize the given received data to the appropriate registered message type, if possible.
+
+        Envelopes are dispatched directly to the type registered for their event type, and, when there is one,
+        validated with its validator.  Other data falls back to validating and deserializing as each registered type in
+        the order registered.
+
+        Parameters
+        ----------
+        data : dict
+            The received, deserialized data, either an envelope or a serialized message.
+
+        Returns
+        -------
+        Optional[Message]
+            The deserialized message, or ``None`` if the data is not valid for any registered type.
+        """
+        envelope = unwrap_envelope(data)
+        if envelope is not None:
+            event_type, serial_message = envelope
+            return self._deserialize_as(event_type, serial_message)
+        for event_type in self._message_types:
+            message = self._deserialize_as(event_type, data)
+            if message is not None:
+                return message
+        return None
+
+    def _deserialize_as(self, event_type: MessageEventType, serial_message: dict) -> Optional[Message]:
+        message_type = self._message_types.get(event_type)
+        if message_type is None:
+            return None
+        validator = self._validators.get(event_type)
+        if validator is not None and not validator.validate(serial_message)[0]:
+            return None
+        return message_type.factory_init_from_deserialized_json(serial_message)
+
+    def get_event_types(self) -> List[MessageEventType]:
+        """
+        Get the event types of the registered message types, in the order registered.
+
+        Returns
+        -------
+        List[MessageEventType]
+            The event types of the registered message types, in the order registered.
+        """
+        return list(self._message_types.keys())
+
+    def get_message_type(self, event_type: MessageEventType) -> Optional[Type[Message]]:
+        """
+        Get the message type registered for the given event type.
+
+        Parameters
+        ----------
+        event_type : MessageEventType
+            The event type.
+
+        Returns
+        -------
+        Optional[Type[Message]]
+            The message type registered for the given event type, or ``None`` if there is none.
+        """
+        return self._message_types.get(event_type)
+
+    def register(self, message_type: Type[Message], validator: Optional[MessageJsonValidator] = None):
+        """
+        Register the given message type, and optionally its validator, for its event type.
+
+        Parameters
+        ----------
+        message_type : Type[Message]
+            The message type to register.
+        validator : Optional[MessageJsonValidator]
+            An optional validator for serialized messages of the type.
+
+        Raises
+        -------
+        ValueError
+            If a different message type is already registered for the same event type.
+        """
+        event_type = message_type.get_message_event_type()
+        existing = self._message_types.get(event_type)
+        if existing is not None and existing is not message_type:
+            raise ValueError("Cannot register message type {} for event type {} already registered to {}".format(
+                message_type.__name__, event_type.name, existing.__name__))
+        self._message_types[event_type] = message_type
+        if validator is not None:
+            self._validators[event_type] = validator
+
+    def validate(self, event_type: MessageEventType, serial_message: dict) -> Tuple[bool, Optional[Any]]:
+        """
+        Validate the given serialized message as the message type registered for the given event type.
+
+        Parameters
+        ----------
+        event_type : MessageEventType
+            The event type.
+        serial_message : dict
+            The serialized message.
+
+        Returns
+        -------
+        Tuple[bool, Optional[Any]]
+            A tuple with whether the message is valid and either the error for invalid messages or ``None``, where
+            messages of event types with no registered message type are invalid.
+        """
+        validator = self._validators.get(event_type)
+        if validator is not None:
+            return validator.validate(serial_message)
+        message_type = self._message_types.get(event_type)
+        if message_type is None:
+            return False, None
+        return message_type.factory_init_from_deserialized_json(serial_message) is not None, None
@@ -0,0 +1,426 @@
+"""
+Pluggable codecs for encoding the serialized (i.e., ::method:`Serializable.to_dict`) form of objects.
+
+The default codec is JSON, which is what all components have historically used.  A compact binary codec based on
+MessagePack is also provided, though it is only available when the optional ``msgpack`` package is installed.
+
+Encoded data may be "tagged" with a small header, identifying the codec used and the schema version of the serialized
+form, so that readers can detect how data was written.  Untagged data is assumed to be JSON, so that data written
+before codecs were introduced remains readable.
+"""
+
+import json
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+class SerialCodec(ABC):
+    """
+    Abstraction for an encoding of serialized object data to and from bytes.
+
+    Codecs encode any JSON-like value (i.e., the types allowed within the result of ::method:`Serializable.to_dict`).
+    Each has a unique name and a unique single-byte numeric id, used for tagging encoded data.
+    """
+
+    _SUBPROTOCOL_PREFIX = 'dmod.'
+
+    @classmethod
+    @abstractmethod
+    def get_codec_id(cls) -> int:
+        """
+        Get the unique numeric id of this codec, used in the headers of tagged data.
+
+        Returns
+        -------
+        int
+            The unique numeric id of this codec, between ``0`` and ``255``.
+        """
+        pass
+
+    @classmethod
+    @abstractmethod
+    def get_name(cls) -> str:
+        """
+        Get the unique name of this codec.
+
+        Returns
+        -------
+        str
+            The unique name of this codec.
+        """
+        pass
+
+    @classmethod
+    def get_subprotocol(cls) -> str:
+        """
+        Get the websocket subprotocol name through which use of this codec is negotiated.
+
+        Returns
+        -------
+        str
+            The websocket subprotocol name through which use of this codec is negotiated.
+        """
+        return cls._SUBPROTOCOL_PREFIX + cls.get_name()
+
+    @classmethod
+    def is_available(cls) -> bool:
+        """
+        Get whether this codec can be used in the current environment (e.g., whether any required packages are
+        installed).
+
+        Returns
+        -------
+        bool
+            Whether this codec can be used in the current environment.
+        """
+        return True
+
+    @classmethod
+    @abstractmethod
+    def is_binary(cls) -> bool:
+        """
+        Get whether this codec's encoded data is binary, as opposed to UTF-8 text.
+
+        Returns
+        -------
+        bool
+            Whether this codec's encoded data is binary.
+        """
+        pass
+
+    @abstractmethod
+    def dumps(self, value: Any) -> bytes:
+        """
+        Encode the given JSON-like value.
+
+        Parameters
+        ----------
+        value : Any
+            The value to encode.
+
+        Returns
+        -------
+        bytes
+            The encoded value.
+        """
+        pass
+
+    @abstractmethod
+    def loads(self, data: Union[bytes, str]) -> Any:
+        """
+        Decode the given encoded value.
+
+        Parameters
+        ----------
+        data : Union[bytes, str]
+            The encoded value.
+
+        Returns
+        -------
+        Any
+            The decoded JSON-like value.
+        """
+        pass
+
+
+class JsonCodec(SerialCodec):
+    """
+    Codec encoding values as UTF-8 JSON text.
+    """
+
+    @classmethod
+    def get_codec_id(cls) -> int:
+        return 0
+
+    @classmethod
+    def get_name(cls) -> str:
+        return 'json'
+
+    @classmethod
+    def is_binary(cls) -> bool:
+        return False
+
+    def dumps(self, value: Any) -> bytes:
+        return json.dumps(value).encode()
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return json.loads(data)
+
+
+class MsgpackCodec(SerialCodec):
+    """
+    Codec encoding values in the compact MessagePack binary format, available if the ``msgpack`` package is installed.
+    """
+
+    @classmethod
+    def get_codec_id(cls) -> int:
+        return 1
+
+    @classmethod
+    def get_name(cls) -> str:
+        return 'msgpack'
+
+    @classmethod
+    def is_available(cls) -> bool:
+        return msgpack is not None
+
+    @classmethod
+    def is_binary(cls) -> bool:
+        return True
+
+    def dumps(self, value: Any) -> bytes:
+        return msgpack.packb(value, use_bin_type=True)
+
+    def loads(self, data: Union[bytes, str]) -> Any:
+        return msgpack.unpackb(data, raw=False)
+
+
+DEFAULT_CODEC_NAME = JsonCodec.get_name()
+""" The name of the default codec. """
+
+# Leading bytes of tagged data; 0xc1 is never used in MessagePack and can never appear in UTF-8 text
+_TAG_MAGIC = b'\xc1D'
+_TAG_LENGTH = len(_TAG_MAGIC) + 2
+
+_codecs_by_name: Dict[str, SerialCodec] = dict()
+_codecs_by_id: Dict[int, SerialCodec] = dict()
+
+
+def register_codec(codec: SerialCodec):
+    """
+    Register a codec, so that it can be looked up by name, id, or websocket subprotocol.
+
+    Parameters
+    ----------
+    codec : SerialCodec
+        The codec to register.
+
+    Raises
+    -------
+    ValueError
+        If a different codec with the same name or id is already registered.
+    """
+    for existing in (_codecs_by_name.get(codec.get_name()), _codecs_by_id.get(codec.get_codec_id())):
+        if existing is not None and existing is not codec:
+            raise ValueError('Cannot register codec {}: conflicts with registered codec {}'.format(
+                codec.get_name(), existing.get_name()))
+    _codecs_by_name[codec.get_name()] = codec
+    _codecs_by_id[codec.get_codec_id()] = codec
+
+
+def get_codec(name: Optional[str] = None) -> SerialCodec:
+    """
+    Get the registered codec with the given name, or the default codec if no name is given.
+
+    Parameters
+    ----------
+    name : Optional[str]
+        The name of the codec, or ``None`` for the default.
+
+    Returns
+    -------
+    SerialCodec
+        The codec with the given name.
+
+    Raises
+    -------
+    ValueError
+        If there is no registered codec with the given name, or it is not available in the current environment.
+    """
+    codec = _codecs_by_name.get(DEFAULT_CODEC_NAME if name is None else name)
+    if codec is None:
+        raise ValueError('Unrecognized serialization codec name {}'.format(name))
+    if not codec.is_available():
+        raise ValueError('Serialization codec {} is not available in this environment'.format(name))
+    return codec
+
+
+def get_available_codecs() -> List[SerialCodec]:
+    """
+    Get the registered codecs that are available in the current environment, in order of preference (i.e., binary
+    codecs first).
+
+    Returns
+    -------
+    List[SerialCodec]
+        The available registered codecs, in order of preference.
+    """
+    codecs = [c for c in _codecs_by_id.values() if c.is_available()]
+    return sorted(codecs, key=lambda c: (not c.is_binary(), c.get_codec_id()))
+
+
+def get_codec_for_subprotocol(subprotocol: Optional[str]) -> SerialCodec:
+    """
+    Get the codec for the given negotiated websocket subprotocol, with the default codec used if no subprotocol (or an
+    unrelated one) was negotiated.
+
+    Parameters
+    ----------
+    subprotocol : Optional[str]
+        The negotiated websocket subprotocol, if any.
+
+    Returns
+    -------
+    SerialCodec
+        The codec to use over the websocket connection.
+    """
+    for codec in _codecs_by_name.values():
+        if codec.get_subprotocol() == subprotocol:
+            return codec
+    return get_codec()
+
+
+def get_supported_subprotocols() -> List[str]:
+    """
+    Get the websocket subprotocols for the available codecs, in order of preference.
+
+    Returns
+    -------
+    List[str]
+        The websocket subprotocols for the available codecs, in order of preference.
+    """
+    return [c.get_subprotocol() for c in get_available_codecs()]
+
+
+def create_tag(codec: SerialCodec, schema_version: int) -> bytes:
+    """
+    Create the header tag for data encoded with the given codec, for a serialized form of the given schema version.
+
+    Parameters
+    ----------
+    codec : SerialCodec
+        The codec of the encoded data.
+    schema_version : int
+        The schema version of the serialized form, between ``0`` and ``255``.
+
+    Returns
+    -------
+    bytes
+        The header tag.
+    """
+    return _TAG_MAGIC + bytes([codec.get_codec_id(), schema_version])
+
+
+def parse_tag(data: Union[bytes, str]) -> Optional[Tuple[SerialCodec, int]]:
+    """
+    Parse the codec and schema version from the header tag at the start of the given data, if it is tagged.
+
+    Parameters
+    ----------
+    data : Union[bytes, str]
+        The encoded data, or the header tag alone.
+
+    Returns
+    -------
+    Optional[Tuple[SerialCodec, int]]
+        The codec and schema version of the data, or ``None`` if the data is not tagged.
+
+    Raises
+    -------
+    ValueError
+        If the data is tagged with the id of an unrecognized or unavailable codec.
+    """
+    if isinstance(data, str) or len(data) < _TAG_LENGTH or data[:len(_TAG_MAGIC)] != _TAG_MAGIC:
+        return None
+    codec = _codecs_by_id.get(data[len(_TAG_MAGIC)])
+    if codec is None or not codec.is_available():
+        raise ValueError('Data is tagged with unrecognized or unavailable codec id {}'.format(data[len(_TAG_MAGIC)]))
+    return codec, data[len(_TAG_MAGIC) + 1]
+
+
+def encode(value: Any, codec: Optional[SerialCodec] = None, schema_version: int = 1) -> bytes:
+    """
+    Encode the given value with the given codec, tagging the encoded data.
+
+    Parameters
+    ----------
+    value : Any
+        The JSON-like value to encode.
+    codec : Optional[SerialCodec]
+        The codec to use, with the default codec used if ``None``.
+    schema_version : int
+        The schema version of the serialized form, ``1`` by default.
+
+    Returns
+    -------
+    bytes
+        The tagged, encoded data.
+    """
+    codec = get_codec() if codec is None else codec
+    return create_tag(codec, schema_version) + codec.dumps(value)
+
+
+def decode(data: Union[bytes, str]) -> Tuple[Any, Optional[int]]:
+    """
+    Decode the given tagged or untagged data.
+
+    Untagged data is assumed to be JSON, and is decoded without a schema version.
+
+    Parameters
+    ----------
+    data : Union[bytes, str]
+        The encoded data.
+
+    Returns
+    -------
+    Tuple[Any, Optional[int]]
+        The decoded value and the schema version from the data's tag, or ``None`` if the data was untagged.
+    """
+    tag = parse_tag(data)
+    if tag is None:
+        return json.loads(data), None
+    codec, schema_version = tag
+    return codec.loads(data[_TAG_LENGTH:]), schema_version
+
+
+def encode_message(value: Any, codec: Optional[SerialCodec] = None, schema_version: int = 1) -> Union[str, bytes]:
+    """
+    Encode the given value for sending as a websocket message with the given codec.
+
+    Text codecs produce plain, untagged text messages, as has always been used over websocket connections, while binary
+    codecs produce tagged binary messages.
+
+    Parameters
+    ----------
+    value : Any
+        The JSON-like value to encode.
+    codec : Optional[SerialCodec]
+        The codec to use, with the default codec used if ``None``.
+    schema_version : int
+        The schema version of the serialized form, ``1`` by default.
+
+    Returns
+    -------
+    Union[str, bytes]
+        The encoded message.
+    """
+    codec = get_codec() if codec is None else codec
+    if codec.is_binary():
+        return encode(value, codec, schema_version)
+    return codec.dumps(value).decode()
+
+
+def decode_message(message: Union[str, bytes]) -> Any:
+    """
+    Decode a received websocket message, whether a text message or a tagged binary message.
+
+    Parameters
+    ----------
+    message : Union[str, bytes]
+        The received message.
+
+    Returns
+    -------
+    Any
+        The decoded JSON-like value.
+    """
+    return decode(message)[0]
+
+
+register_codec(JsonCodec())
+register_codec(MsgpackCodec())
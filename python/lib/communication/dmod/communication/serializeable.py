@@ -1,8 +1,10 @@
 from abc import ABC, abstractmethod
 from numbers import Number
-from typing import Callable, Dict, Type, Union
+from typing import Callable, Dict, Optional, Type, Union
 import json
 
+from . import serialization
+
 
 class Serializable(ABC):
     """
@@ -24,9 +26,16 @@ class Serializable(ABC):
     its ::attribute:`_SERIAL_DATETIME_STR_FORMAT` class attribute.  Note that the actual parsing/serialization logic is
     left entirely to the subtypes, as many will not need it (and thus should not have to worry about implement another
     method or have their superclass bloated by importing the ``datetime`` package).
+
+    Objects may also be encoded to bytes with any of the codecs from the ::mod:`serialization` module (e.g., the compact
+    binary MessagePack codec) via ::method:`to_bytes`, and decoded with ::method:`factory_init_from_bytes`.  Encoded
+    bytes are tagged with the codec and the schema version of the type's serialized dictionary form, as returned by
+    ::method:`get_schema_version`.  Subtypes should increment their ::attribute:`_SERIAL_SCHEMA_VERSION` class attribute
+    when they make incompatible changes to their serialized form.
     """
 
     _SERIAL_DATETIME_STR_FORMAT = '%Y-%m-%d %H:%M:%S'
+    _SERIAL_SCHEMA_VERSION = 1
 
     @classmethod
     def _get_invalid_type_message(cls):
@@ -49,6 +58,33 @@ class Serializable(ABC):
         """
         pass
 
+    @classmethod
+    def factory_init_from_bytes(cls, data: Union[bytes, str]):
+        """
+        Factory create a new instance of this type from encoded bytes, as produced by ::method:`to_bytes`.
+
+        The codec is determined from the data's tag, with untagged data (e.g., from ::method:`to_json`) decoded as JSON.
+
+        Parameters
+        ----------
+        data : Union[bytes, str]
+            The encoded serialized form of an instance.
+
+        Returns
+        -------
+        A new object of this type instantiated from the decoded serialized form.
+
+        Raises
+        -------
+        ValueError
+            If the data is tagged with an unavailable codec or with a schema version newer than this type supports.
+        """
+        json_obj, schema_version = serialization.decode(data)
+        if schema_version is not None and schema_version > cls.get_schema_version():
+            msg = 'Cannot deserialize {} from schema version {} (newest supported is {})'
+            raise ValueError(msg.format(cls.__name__, schema_version, cls.get_schema_version()))
+        return cls.factory_init_from_deserialized_json(json_obj)
+
     @classmethod
     def get_datetime_str_format(cls):
         """
@@ -64,6 +100,18 @@ class Serializable(ABC):
 
         return cls._SERIAL_DATETIME_STR_FORMAT
 
+    @classmethod
+    def get_schema_version(cls) -> int:
+        """
+        Get the schema version of the serialized dictionary form of this class, used to tag encoded bytes.
+
+        Returns
+        -------
+        int
+            The schema version of the serialized dictionary form of this class.
+        """
+        return cls._SERIAL_SCHEMA_VERSION
+
     @classmethod
     def parse_simple_serialized(cls, json_obj: dict, key: str, expected_type: Type, required_present: bool = True,
                                 converter: Callable = None):
@@ -185,6 +233,22 @@ class Serializable(ABC):
     def __str__(self):
         return str(self.to_json())
 
+    def to_bytes(self, codec: Optional[str] = None) -> bytes:
+        """
+        Get the representation of this instance as tagged bytes, encoded with the given codec.
+
+        Parameters
+        ----------
+        codec : Optional[str]
+            The name of the codec to use, with the default (JSON) codec used if ``None``.
+
+        Returns
+        -------
+        bytes
+            The tagged, encoded representation of this instance.
+        """
+        return serialization.encode(self.to_dict(), serialization.get_codec(codec), self.get_schema_version())
+
     def to_json(self) -> str:
         """
         Get the representation of this instance as a serialized JSON-formatted string.
@@ -1,6 +1,7 @@
 import datetime
 import hashlib
 import random
+from asyncio import get_event_loop
 from .message import AbstractInitRequest, MessageEventType, Response
 from .serializeable import Serializable
 from abc import ABC, abstractmethod
@@ -244,6 +245,11 @@ class Session(Serializable):
                 return True
         return False
 
+    @property
+    def last_accessed(self):
+        """:obj:`datetime.datetime`: The date and time this session was last accessed."""
+        return self._last_accessed
+
     @property
     def session_id(self):
         """int: The unique identifier for this session."""
@@ -558,8 +564,30 @@ class SessionManager(ABC):
     Note in particular the separation of lookup-type methods, rather than a single method with multiple optional args.
     The intent was to separate behavior to avoid ambiguity and convoluted logic among implementations to address cases
     when multiple arguments associate with different sessions.
+
+    Each method also has an async counterpart (e.g., :meth:`async_create_session`) for use from coroutines.  By default,
+    these run the synchronous method in the event loop's default executor, so that it does not block the event loop,
+    though implementations should override them with native asyncio logic where possible.
     """
 
+    async def async_create_session(self, ip_address: str, username: str) -> Session:
+        return await get_event_loop().run_in_executor(None, self.create_session, ip_address, username)
+
+    async def async_lookup_session_by_id(self, session_id: int) -> Optional[Session]:
+        return await get_event_loop().run_in_executor(None, self.lookup_session_by_id, session_id)
+
+    async def async_lookup_session_by_secret(self, session_secret: str) -> Optional[Session]:
+        return await get_event_loop().run_in_executor(None, self.lookup_session_by_secret, session_secret)
+
+    async def async_lookup_session_by_username(self, username: str) -> Optional[Session]:
+        return await get_event_loop().run_in_executor(None, self.lookup_session_by_username, username)
+
+    async def async_refresh_session(self, session: Session) -> bool:
+        return await get_event_loop().run_in_executor(None, self.refresh_session, session)
+
+    async def async_remove_session(self, session: Session):
+        await get_event_loop().run_in_executor(None, self.remove_session, session)
+
     @abstractmethod
     def create_session(self, ip_address: str, username: str) -> Session:
         pass
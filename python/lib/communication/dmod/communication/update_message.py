@@ -90,6 +90,7 @@ class UpdateMessage(AbstractInitRequest):
                 return None
             message = cls(object_id=obj_id, object_type=obj_type, updated_data=updated_data)
             message._digest = str(json_obj[cls.get_digest_key()])
+            return message
         except:
             return None
 
@@ -192,6 +193,28 @@ class UpdateMessageResponse(Response):
         """
         return cls._OBJECT_FOUND_SUBKEY
 
+    @classmethod
+    def factory_init_from_deserialized_json(cls, json_obj: dict):
+        """
+        Factory create a new instance of this type based on a JSON object dictionary deserialized from received JSON.
+
+        Parameters
+        ----------
+        json_obj
+
+        Returns
+        -------
+        response_obj : UpdateMessageResponse
+            A new object of this type instantiated from the deserialize JSON object dictionary, or none if the provided
+            parameter could not be used to instantiated a new object.
+        """
+        try:
+            return cls(digest=json_obj['data'][cls.get_digest_subkey()],
+                       object_found=json_obj['data'][cls.get_object_found_subkey()], success=json_obj['success'],
+                       reason=json_obj['reason'], response_text=json_obj['message'])
+        except Exception as e:
+            return None
+
     def __init__(self, digest: str, object_found: bool, success: bool, reason: str, response_text: str = ''):
         super().__init__(success=success, reason=reason, message=response_text,
                          data={self.get_digest_subkey(): digest, self.get_object_found_subkey(): object_found})
@@ -6,24 +6,109 @@ from .session import SessionInitMessage
 from abc import ABC
 from jsonschema.exceptions import best_match
 from pathlib import Path
-from typing import Any, Optional, Tuple, Type
+from threading import Lock, local
+from typing import Any, Dict, Optional, Tuple, Type, Union
+
+DEFAULT_SCHEMAS_DIR = Path(__file__).resolve().parent.joinpath('schemas')
+
+# Loaded schema documents, keyed by schemas directory URI, then by schema URI
+_schema_stores: Dict[str, Dict[str, dict]] = dict()
+_schema_stores_lock = Lock()
+# Compiled validators are kept per thread, since a validator's ref resolver tracks resolution scope while validating
+_thread_local = local()
+
+
+def _get_schemas_dir_uri(schemas_dir: Optional[Union[str, Path]] = None) -> str:
+    schemas_dir = DEFAULT_SCHEMAS_DIR if schemas_dir is None else Path(schemas_dir).resolve()
+    return '{}/'.format(schemas_dir.as_uri())
+
+
+def get_schema_store(schemas_dir: Optional[Union[str, Path]] = None) -> Dict[str, dict]:
+    """
+    Get the loaded JSON schema documents in the given schemas directory, loading them the first time.
+
+    Each ``*.schema.json`` file in the directory is read and parsed once per process.  The returned store maps the
+    ``file`` URI of each schema to its document, allowing ``$ref`` references across schemas of the directory to be
+    resolved without reading files again.
+
+    Parameters
+    ----------
+    schemas_dir : Optional[Union[str, Path]]
+        The schemas directory, with ::attribute:`DEFAULT_SCHEMAS_DIR` used by default.
+
+    Returns
+    -------
+    Dict[str, dict]
+        Mapping of schema URI to loaded schema document for the schemas of the directory.
+    """
+    dir_uri = _get_schemas_dir_uri(schemas_dir)
+    store = _schema_stores.get(dir_uri)
+    if store is None:
+        with _schema_stores_lock:
+            store = _schema_stores.get(dir_uri)
+            if store is None:
+                store = dict()
+                for schema_file in Path(DEFAULT_SCHEMAS_DIR if schemas_dir is None else schemas_dir).glob(
+                        '*.schema.json'):
+                    store[dir_uri + schema_file.name] = json.loads(schema_file.read_text())
+                _schema_stores[dir_uri] = store
+    return store
+
+
+def get_schema_validator(base_schema_filename: str,
+                         schemas_dir: Optional[Union[str, Path]] = None) -> jsonschema.Draft7Validator:
+    """
+    Get the compiled validator for the given base schema, creating it the first time.
+
+    Validators are created from the documents of ::function:`get_schema_store`, with a ref resolver whose store holds
+    every schema of the directory, and are then reused for all later validations.  Since resolvers track resolution
+    scope while validating, each thread gets its own validator for a schema, though all threads share the loaded
+    schema documents.
+
+    Parameters
+    ----------
+    base_schema_filename : str
+        The name of the base schema file within the schemas directory.
+    schemas_dir : Optional[Union[str, Path]]
+        The schemas directory, with ::attribute:`DEFAULT_SCHEMAS_DIR` used by default.
+
+    Returns
+    -------
+    jsonschema.Draft7Validator
+        The compiled validator for the base schema.
+    """
+    dir_uri = _get_schemas_dir_uri(schemas_dir)
+    validators = getattr(_thread_local, 'validators', None)
+    if validators is None:
+        validators = _thread_local.validators = dict()
+    validator = validators.get((dir_uri, base_schema_filename))
+    if validator is None:
+        store = get_schema_store(schemas_dir)
+        schema_uri = dir_uri + base_schema_filename
+        if schema_uri not in store:
+            schema_path = Path(DEFAULT_SCHEMAS_DIR if schemas_dir is None else schemas_dir).joinpath(
+                base_schema_filename)
+            with _schema_stores_lock:
+                store[schema_uri] = json.loads(schema_path.read_text())
+        schema = store[schema_uri]
+        resolver = jsonschema.RefResolver(dir_uri, referrer=schema, store=store)
+        validator = jsonschema.Draft7Validator(schema, resolver=resolver)
+        validators[(dir_uri, base_schema_filename)] = validator
+    return validator
 
 
 class MessageJsonValidator(ABC):
+    """
+    Validator of serialized ::class:`Message` objects against a JSON schema.
+
+    Instances are lightweight, using the process-wide loaded schemas and compiled validators from
+    ::function:`get_schema_validator`, so creating them does not read schema files.
+    """
 
     def __init__(self, base_schema_filename, message_type: Type[Message], schemas_dir=None):
-        if schemas_dir is None:
-            script_dir = Path(__file__).resolve().parent
-            self.base_schemas_dir = script_dir.joinpath('schemas')
-        else:
-            self.base_schemas_dir = schemas_dir
-        resolve_path = str(self.base_schemas_dir) + '/'
-        self.schema = None
-        self.resolver = None
+        self.base_schemas_dir = DEFAULT_SCHEMAS_DIR if schemas_dir is None else schemas_dir
+        self.base_schema_filename = base_schema_filename
         self._message_type: Type[Message] = message_type
-        with self.base_schemas_dir.joinpath(base_schema_filename).open(mode='r') as schema_file:
-            self.schema = json.loads(schema_file.read())
-            self.resolver = jsonschema.RefResolver("file://{}/".format(resolve_path), referrer=self.schema)
 
     def validate(self, request: dict) -> Tuple[bool, Optional[Any]]:
         """
@@ -36,7 +121,7 @@ class MessageJsonValidator(ABC):
         :param request:
         :return: A tuple with whether the request is valid and either the error for invalid requests or None
         """
-        results = jsonschema.Draft7Validator(self.schema, resolver=self.resolver).iter_errors(request)
+        results = self.validator.iter_errors(request)
         error = best_match(results)
         return (error is None), error
 
@@ -48,6 +133,14 @@ class MessageJsonValidator(ABC):
     def message_type(self) -> Type[Message]:
         return self._message_type
 
+    @property
+    def schema(self) -> dict:
+        return self.validator.schema
+
+    @property
+    def validator(self) -> jsonschema.Draft7Validator:
+        return get_schema_validator(self.base_schema_filename, self.base_schemas_dir)
+
 
 class NWMRequestJsonValidator(MessageJsonValidator):
     def __init__(self, schemas_dir=None):
@@ -16,12 +16,16 @@ import websockets
 import ssl
 import signal
 import logging
-from .maas_request import get_request, MaaSRequest
+from .maas_request import get_request, MaaSRequest, NWMRequest
 from .message import Message, MessageEventType, InvalidMessage
+from .message_registry import MessageTypeRegistry, unwrap_envelope
+from .serializeable import Serializable
+from .serialization import SerialCodec, decode_message, encode_message, get_codec_for_subprotocol, \
+    get_supported_subprotocols
 from .session import Session, SessionInitMessage
 from .validator import NWMRequestJsonValidator, SessionInitMessageJsonValidator
 from pathlib import Path
-from typing import Dict, Optional, Tuple
+from typing import Dict, Optional, Tuple, Union
 from websockets import WebSocketServerProtocol
 from .async_service import AsyncServiceInterface
 
@@ -41,6 +45,11 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
     after any other coroutine tasks added via ::method:`add_async_task` are scheduled via
     ::method:`AbstractEventLoop.create_task`.
 
+    The server offers a websocket subprotocol for each available serialization codec (see ::mod:`serialization`), so
+    clients may negotiate a compact binary codec for messages.  Clients that request no subprotocol use JSON text
+    messages.  Implementations should use ::method:`deserialize_received` and ::method:`send_serialized` so that
+    messages are decoded and encoded with the negotiated codec.
+
     Attributes
     ----------
     signals: list-like
@@ -53,6 +62,11 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
         websocket server
     """
 
+    _message_registry = MessageTypeRegistry()
+    """ Registry of the supported message types for ::method:`parse_request_type`, in order of legacy precedence. """
+    _message_registry.register(SessionInitMessage, SessionInitMessageJsonValidator())
+    _message_registry.register(NWMRequest, NWMRequestJsonValidator())
+
     @classmethod
     def _get_async_loop(cls):
         """
@@ -68,6 +82,55 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
         """
         return asyncio.get_event_loop()
 
+    @classmethod
+    def deserialize_received(cls, message: Union[str, bytes]) -> dict:
+        """
+        Decode a received message to its serialized dictionary form, whether a JSON text message or a tagged binary
+        message encoded with some other codec.
+
+        Parameters
+        ----------
+        message : Union[str, bytes]
+            The received message.
+
+        Returns
+        -------
+        dict
+            The decoded serialized dictionary form of the message.
+        """
+        return decode_message(message)
+
+    @classmethod
+    def get_serial_codec(cls, websocket: WebSocketServerProtocol) -> SerialCodec:
+        """
+        Get the serialization codec negotiated for the given websocket connection.
+
+        Parameters
+        ----------
+        websocket : WebSocketServerProtocol
+            The websocket connection.
+
+        Returns
+        -------
+        SerialCodec
+            The serialization codec negotiated for the connection.
+        """
+        return get_codec_for_subprotocol(getattr(websocket, 'subprotocol', None))
+
+    @classmethod
+    async def send_serialized(cls, websocket: WebSocketServerProtocol, obj: Serializable):
+        """
+        Send the given object over the given websocket connection, encoded with the connection's negotiated codec.
+
+        Parameters
+        ----------
+        websocket : WebSocketServerProtocol
+            The websocket connection.
+        obj : Serializable
+            The object to send.
+        """
+        await websocket.send(encode_message(obj.to_dict(), cls.get_serial_codec(websocket), obj.get_schema_version()))
+
     def __del__(self):
         try:
             asyncio.run(self.shutdown())
@@ -145,7 +208,8 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
         self.ssl_context.load_cert_chain(cert_pem, keyfile=priv_key_pem)
         # print(hostname)
         # Setup websocket server
-        self.server = websockets.serve(self.listener, self._listen_host, self._port, ssl=self.ssl_context, loop=self._loop)
+        self.server = websockets.serve(self.listener, self._listen_host, self._port, ssl=self.ssl_context, loop=self._loop,
+                                       subprotocols=get_supported_subprotocols())
         self._requested_tasks = []
         self._scheduled_tasks = []
 
@@ -195,6 +259,10 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
             if event_type is None:
                 event_type, errors = await self.parse_request_type(data=message_data, check_for_auth=check_for_auth)
 
+            envelope = unwrap_envelope(message_data)
+            if envelope is not None:
+                message_data = envelope[1]
+
             if event_type is None:
                 raise RuntimeError('Cannot deserialize message: could not parse request to any enumerated event type')
             elif event_type == MessageEventType.MAAS_REQUEST:
@@ -274,6 +342,9 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
         """
         Parse for request for validity, optionally for authentication type, determining which type of request this is.
 
+        For a message envelope (see ::mod:`message_registry`), only the registered type for the envelope's event type is
+        validated.  Other data falls back to validating as each registered type in turn.
+
         Parameters
         ----------
         data
@@ -291,16 +362,23 @@ class WebSocketInterface(AsyncServiceInterface, ABC):
             if t != MessageEventType.INVALID:
                 errors[t] = None
 
-        if check_for_auth:
-            is_auth_req, error = SessionInitMessageJsonValidator().validate(data)
-            errors[MessageEventType.SESSION_INIT] = error
-            if is_auth_req:
-                return MessageEventType.SESSION_INIT, errors
-
-        is_job_req, error = NWMRequestJsonValidator().validate(data)
-        errors[MessageEventType.MAAS_REQUEST] = error
-        if is_job_req:
-            return MessageEventType.MAAS_REQUEST, errors
+        # Enveloped messages only need checking for the type named by the envelope's discriminator, while others fall
+        # back to checking each registered type in turn
+        envelope = unwrap_envelope(data)
+        if envelope is None:
+            candidate_types = self._message_registry.get_event_types()
+        else:
+            candidate_types, data = [envelope[0]], envelope[1]
+
+        for event_type in candidate_types:
+            if event_type == MessageEventType.INVALID:
+                continue
+            if event_type == MessageEventType.SESSION_INIT and not check_for_auth:
+                continue
+            is_valid, error = self._message_registry.validate(event_type, data)
+            errors[event_type] = error
+            if is_valid:
+                return event_type, errors
 
         return MessageEventType.INVALID, errors
 
@@ -0,0 +1,96 @@
+"""
+Benchmark of messages per second through ::method:`WebSocketInterface.parse_request_type`.
+
+Compares the existing path, which uses the shared, compiled schema validators of ::mod:`validator`, against the
+previous behavior of building new validators for every message (reading and parsing the base schema file, and resolving
+referenced schemas from disk).  Cases parse a valid job request, a valid session init request, and an invalid job
+request, both as legacy messages and (for the existing path) in envelopes naming their event type (see
+::mod:`message_registry`), which need only one validation.  No websocket server is needed:
+
+    python -m dmod.test.bench_parse_request_type --iterations 2000
+"""
+import argparse
+import asyncio
+import json
+import jsonschema
+from jsonschema.exceptions import best_match
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from ..communication.message import MessageEventType
+from ..communication.message_registry import ENVELOPE_EVENT_TYPE_KEY, ENVELOPE_MESSAGE_KEY
+from ..communication.validator import DEFAULT_SCHEMAS_DIR
+from ..communication.websocket_interface import NoOpHandler
+
+
+def _handle_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--iterations', help='Number of messages parsed per case', dest='iterations', type=int,
+                        default=2000)
+    return parser.parse_args()
+
+
+def _validate_uncached(base_schema_filename: str, data: dict) -> bool:
+    """
+    Validate as was done before schema validators were cached, building a new validator from the schema file.
+    """
+    with DEFAULT_SCHEMAS_DIR.joinpath(base_schema_filename).open(mode='r') as schema_file:
+        schema = json.loads(schema_file.read())
+    resolver = jsonschema.RefResolver('file://{}/'.format(str(DEFAULT_SCHEMAS_DIR) + '/'), referrer=schema)
+    return best_match(jsonschema.Draft7Validator(schema, resolver=resolver).iter_errors(data)) is None
+
+
+async def _parse_uncached(data: dict, check_for_auth=False) -> MessageEventType:
+    if check_for_auth and _validate_uncached('nwm.maas.auth.schema.json', data):
+        return MessageEventType.SESSION_INIT
+    if _validate_uncached('request.schema.json', data):
+        return MessageEventType.MAAS_REQUEST
+    return MessageEventType.INVALID
+
+
+def sample_messages() -> List[Tuple[str, dict, dict, bool]]:
+    """
+    Get the sample messages, as tuples of name, legacy message data, message data for the existing path, and whether to
+    check for a session init request.
+    """
+    messages = []
+    for name, filename, event_type, check_for_auth in [
+            ('job request', 'request.json', MessageEventType.MAAS_REQUEST, False),
+            ('job request, auth', 'request.json', MessageEventType.MAAS_REQUEST, True),
+            ('session init', 'auth.json', MessageEventType.SESSION_INIT, True),
+            ('invalid job request', 'request_bad.json', MessageEventType.MAAS_REQUEST, False)]:
+        with DEFAULT_SCHEMAS_DIR.joinpath(filename).open(mode='r') as data_file:
+            data = json.load(data_file)
+        messages.append((name, data, data, check_for_auth))
+        envelope = {ENVELOPE_EVENT_TYPE_KEY: event_type.name, ENVELOPE_MESSAGE_KEY: data}
+        messages.append(('{} (env)'.format(name), data, envelope, check_for_auth))
+    return messages
+
+
+def _rate(loop: asyncio.AbstractEventLoop, parse: Callable, data: dict, check_for_auth: bool, iterations: int) -> float:
+    """
+    Get the number of messages parsed per second with the given parse coroutine function.
+    """
+    async def parse_all():
+        for _ in range(iterations):
+            await parse(data, check_for_auth=check_for_auth)
+    start = perf_counter()
+    loop.run_until_complete(parse_all())
+    return iterations / (perf_counter() - start)
+
+
+def main():
+    args = _handle_args()
+    # Parsing does not depend on any state set up on init, so skip starting a server
+    interface = object.__new__(NoOpHandler)
+    loop = asyncio.new_event_loop()
+    print('{:>26} {:>16} {:>16} {:>8}'.format('message', 'before (msg/s)', 'after (msg/s)', 'speedup'))
+    for name, legacy_data, data, check_for_auth in sample_messages():
+        before = _rate(loop, _parse_uncached, legacy_data, check_for_auth, args.iterations)
+        after = _rate(loop, interface.parse_request_type, data, check_for_auth, args.iterations)
+        print('{:>26} {:>16.0f} {:>16.0f} {:>7.1f}x'.format(name, before, after, after / before))
+    loop.close()
+
+
+if __name__ == '__main__':
+    main()
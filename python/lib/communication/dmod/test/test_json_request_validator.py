@@ -1,7 +1,9 @@
 import json
 import unittest
 from ..communication import NWMRequestJsonValidator, SessionInitMessageJsonValidator
+from ..communication.validator import get_schema_store, get_schema_validator
 from pathlib import Path
+from threading import Thread
 
 
 class TestJsonRequestValidator(unittest.TestCase):
@@ -620,3 +622,29 @@ class TestJsonRequestValidator(unittest.TestCase):
         req_property = self.valid_job_request_data['model']['nwm']['parameters']['hydraulic_conductivity']
         req_property['distribution'] = 5
         self.assertFalse(self.jobs_validator.validate(self.valid_job_request_data)[0])
+
+    def test_get_schema_validator_1_a(self):
+        """
+        Test that validator instances share the same compiled schema validator.
+        """
+        self.assertIs(self.jobs_validator.validator, NWMRequestJsonValidator().validator)
+        self.assertIs(self.jobs_validator.validator, get_schema_validator('request.schema.json'))
+
+    def test_get_schema_validator_1_b(self):
+        """
+        Test that another thread gets its own compiled schema validator, but for the same loaded schema document.
+        """
+        other_thread_validators = []
+        thread = Thread(target=lambda: other_thread_validators.append(get_schema_validator('request.schema.json')))
+        thread.start()
+        thread.join()
+        self.assertIsNot(other_thread_validators[0], self.jobs_validator.validator)
+        self.assertIs(other_thread_validators[0].schema, self.jobs_validator.schema)
+
+    def test_get_schema_store_1_a(self):
+        """
+        Test that the schema store includes the schemas referenced by the base request schema.
+        """
+        store_names = [uri.split('/')[-1] for uri in get_schema_store()]
+        for name in ['request.schema.json', 'nwm.schema.json', 'ngen.schema.json', 'nwm.model.parameter.schema.json']:
+            self.assertIn(name, store_names)
@@ -0,0 +1,91 @@
+import unittest
+from ..communication.maas_request import NWMRequest
+from ..communication.message import MessageEventType
+from ..communication.message_registry import MessageTypeRegistry, is_envelope, unwrap_envelope, wrap_in_envelope
+from ..communication.scheduler_request import SchedulerRequestMessage
+from ..communication.session import SessionInitMessage
+from ..communication.update_message import UpdateMessage
+from ..communication.validator import NWMRequestJsonValidator, SessionInitMessageJsonValidator
+
+
+class TestMessageTypeRegistry(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.request_json = {"model": {"nwm": {"version": 2.0, "output": "streamflow", "domain": "", "parameters": {}}},
+                             "session-secret": "f21f27ac3d443c0948aab924bddefc64891c455a756ca77a4d86ec2f697cd13c"}
+        self.scheduler_request = SchedulerRequestMessage(
+            model_request=NWMRequest.factory_init_from_deserialized_json(self.request_json), user_id='someone', cpus=4,
+            mem=500000, allocation_paradigm='single-node')
+        self.update_message = UpdateMessage(object_id='42', object_type=SchedulerRequestMessage,
+                                            updated_data={'status': 'RUNNING'})
+
+        self.scheduler_registry = MessageTypeRegistry()
+        self.scheduler_registry.register(SchedulerRequestMessage)
+        self.scheduler_registry.register(UpdateMessage)
+
+        self.validated_registry = MessageTypeRegistry()
+        self.validated_registry.register(SessionInitMessage, SessionInitMessageJsonValidator())
+        self.validated_registry.register(NWMRequest, NWMRequestJsonValidator())
+
+    def tearDown(self) -> None:
+        pass
+
+    # Test that an envelope unwraps to the event type and serialized form of the wrapped message
+    def test_unwrap_envelope_1_a(self):
+        envelope = wrap_in_envelope(self.scheduler_request)
+        self.assertTrue(is_envelope(envelope))
+        self.assertEqual(unwrap_envelope(envelope),
+                         (MessageEventType.SCHEDULER_REQUEST, self.scheduler_request.to_dict()))
+
+    # Test that a serialized message not in an envelope is not unwrapped
+    def test_unwrap_envelope_1_b(self):
+        self.assertFalse(is_envelope(self.scheduler_request.to_dict()))
+        self.assertIsNone(unwrap_envelope(self.scheduler_request.to_dict()))
+
+    # Test that an envelope with an unrecognized event type unwraps with the invalid event type
+    def test_unwrap_envelope_1_c(self):
+        envelope = {'event_type': 'NOT_A_TYPE', 'message': self.scheduler_request.to_dict()}
+        self.assertEqual(unwrap_envelope(envelope)[0], MessageEventType.INVALID)
+
+    # Test that enveloped messages deserialize to the type registered for their event type
+    def test_deserialize_1_a(self):
+        self.assertEqual(self.scheduler_registry.deserialize(wrap_in_envelope(self.scheduler_request)),
+                         self.scheduler_request)
+        message = self.scheduler_registry.deserialize(wrap_in_envelope(self.update_message))
+        self.assertIsInstance(message, UpdateMessage)
+        self.assertEqual(message.digest, self.update_message.digest)
+
+    # Test that legacy messages not in an envelope fall back to trying each registered type
+    def test_deserialize_1_b(self):
+        self.assertEqual(self.scheduler_registry.deserialize(self.scheduler_request.to_dict()), self.scheduler_request)
+        message = self.scheduler_registry.deserialize(self.update_message.to_dict())
+        self.assertIsInstance(message, UpdateMessage)
+
+    # Test that an enveloped message is not deserialized when its event type is not registered
+    def test_deserialize_1_c(self):
+        envelope = wrap_in_envelope(SessionInitMessage(username='someone', user_secret='something'))
+        self.assertIsNone(self.scheduler_registry.deserialize(envelope))
+
+    # Test that an enveloped message is not deserialized when it is not valid for the type of its event type
+    def test_deserialize_1_d(self):
+        envelope = {'event_type': MessageEventType.INFORMATION_UPDATE.name,
+                    'message': self.scheduler_request.to_dict()}
+        self.assertIsNone(self.scheduler_registry.deserialize(envelope))
+
+    # Test that registering a different type for an already registered event type is rejected
+    def test_register_1_a(self):
+        class OtherSchedulerRequest(SchedulerRequestMessage):
+            pass
+        self.assertRaises(ValueError, self.scheduler_registry.register, OtherSchedulerRequest)
+
+    # Test that an enveloped message is validated with the registered validator for its event type
+    def test_validate_1_a(self):
+        event_type, message = unwrap_envelope(wrap_in_envelope(NWMRequest.factory_init_from_deserialized_json(
+            self.request_json)))
+        self.assertTrue(self.validated_registry.validate(event_type, message)[0])
+        self.assertFalse(self.validated_registry.validate(MessageEventType.SESSION_INIT, message)[0])
+
+    # Test that messages of event types with no registered type are invalid
+    def test_validate_1_b(self):
+        self.assertEqual(self.validated_registry.validate(MessageEventType.SCHEDULER_REQUEST,
+                                                          self.scheduler_request.to_dict()), (False, None))
@@ -1,9 +1,14 @@
 import asyncio
 import json
 import unittest
+import websockets
 from pathlib import Path
 from typing import Union
-from ..communication import NWMRequest, SchedulerClient, SchedulerRequestMessage, SchedulerRequestResponse
+from ..communication import NWMRequest, SchedulerClient, SchedulerRequestMessage, SchedulerRequestResponse, \
+    UpdateMessage, UpdateMessageResponse
+from ..communication.message_channel import CorrelatedMessageChannel
+from ..communication.message_registry import get_correlation_id, unwrap_envelope
+from ..communication.serialization import decode_message
 
 
 class MockSendTestingSchedulerClient(SchedulerClient):
@@ -210,3 +215,142 @@ class TestSchedulerClient(unittest.TestCase):
 
         response = self.loop.run_until_complete(self.client.async_make_request(request))
         self.assertTrue(response.success)
+
+
+class LoopbackSchedulerClient(SchedulerClient):
+    """
+    Customized extension of ``SchedulerClient`` for testing purposes, connecting without SSL to a local mock scheduler.
+    """
+
+    @property
+    def client_ssl_context(self):
+        return None
+
+
+class MockMultiplexingScheduler:
+    """
+    Mock scheduler server for testing multiplexed client connections, which responds to each scheduler request with the
+    request's user id as the job id, then sends a number of job update messages, awaiting a response for each.
+    """
+
+    def __init__(self, update_count: int = 0, close_after_each_request: bool = False):
+        self.update_count = update_count
+        self.close_after_each_request = close_after_each_request
+        self.connection_count = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.update_responses = []
+
+    async def _converse(self, data: dict, channel: CorrelatedMessageChannel):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.05)
+        self.in_flight -= 1
+        request = SchedulerRequestMessage.factory_init_from_deserialized_json(unwrap_envelope(data)[1])
+        job_id = request.user_id
+        await channel.send_serialized(SchedulerRequestResponse(success=True, reason='Job Request Processed',
+                                                               data={'job_id': job_id}))
+        for i in range(self.update_count):
+            await channel.send_serialized(UpdateMessage(object_id=job_id, object_type=SchedulerRequestMessage,
+                                                        updated_data={'status': str(i)}))
+            self.update_responses.append(UpdateMessageResponse.factory_init_from_deserialized_json(
+                await channel.recv()))
+        await channel.close()
+        if self.close_after_each_request:
+            await channel.websocket.close()
+
+    async def handler(self, websocket, path=None):
+        self.connection_count += 1
+        channels = dict()
+        async for raw_message in websocket:
+            data = decode_message(raw_message)
+            correlation_id = get_correlation_id(data)
+            if correlation_id in channels:
+                channels[correlation_id].put_received(data)
+            else:
+                channels[correlation_id] = CorrelatedMessageChannel(websocket, correlation_id)
+                asyncio.ensure_future(self._converse(data, channels[correlation_id]))
+
+
+class TestMultiplexedSchedulerClient(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.test_model_request_1 = NWMRequest(version=2.0, output='streamflow', parameters={}, session_secret='')
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def _run_with_scheduler(self, scheduler: MockMultiplexingScheduler, test_coro_func, **client_kwargs):
+        """
+        Run the given test coroutine function with a client connected to a local mock scheduler.
+        """
+        async def run():
+            async with websockets.serve(scheduler.handler, 'localhost', 0) as server:
+                port = list(server.sockets)[0].getsockname()[1]
+                client = LoopbackSchedulerClient('ws://localhost:{}'.format(port), Path('.'), **client_kwargs)
+                try:
+                    return await test_coro_func(client)
+                finally:
+                    await client.async_close()
+        return self.loop.run_until_complete(run())
+
+    def _request(self, user_id: str) -> SchedulerRequestMessage:
+        return SchedulerRequestMessage(model_request=self.test_model_request_1, user_id=user_id)
+
+    def test_async_make_request_1_a(self):
+        """
+        Test that concurrent requests each get the response to their own request, over a single connection.
+        """
+        scheduler = MockMultiplexingScheduler()
+        user_ids = ['user_{}'.format(i) for i in range(10)]
+
+        async def test(client: SchedulerClient):
+            return await asyncio.gather(*[client.async_make_request(self._request(u)) for u in user_ids])
+
+        responses = self._run_with_scheduler(scheduler, test)
+        self.assertEqual([r.job_id for r in responses], user_ids)
+        self.assertEqual(scheduler.connection_count, 1)
+
+    def test_async_make_request_1_b(self):
+        """
+        Test that the number of concurrent requests awaiting responses is limited to the client's in-flight window.
+        """
+        scheduler = MockMultiplexingScheduler()
+
+        async def test(client: SchedulerClient):
+            return await asyncio.gather(*[client.async_make_request(self._request(str(i))) for i in range(8)])
+
+        responses = self._run_with_scheduler(scheduler, test, max_in_flight=2)
+        self.assertTrue(all(r.success for r in responses))
+        self.assertEqual(scheduler.max_in_flight, 2)
+
+    def test_async_make_request_1_c(self):
+        """
+        Test that the client reconnects for later requests after its connection is closed.
+        """
+        scheduler = MockMultiplexingScheduler(close_after_each_request=True)
+
+        async def test(client: SchedulerClient):
+            first = await client.async_make_request(self._request('first'))
+            await asyncio.sleep(0.1)
+            second = await client.async_make_request(self._request('second'))
+            return first, second
+
+        first, second = self._run_with_scheduler(scheduler, test)
+        self.assertEqual((first.job_id, second.job_id), ('first', 'second'))
+        self.assertEqual(scheduler.connection_count, 2)
+
+    def test_get_job_updates_1_a(self):
+        """
+        Test that job update messages are acknowledged and yielded for their job, ending with the job's conversation.
+        """
+        scheduler = MockMultiplexingScheduler(update_count=3)
+
+        async def test(client: SchedulerClient):
+            response = await client.async_make_request(self._request('job'))
+            return [update async for update in client.get_job_updates(response.job_id)]
+
+        updates = self._run_with_scheduler(scheduler, test)
+        self.assertEqual([u.updated_data['status'] for u in updates], ['0', '1', '2'])
+        self.assertEqual([r.digest for r in scheduler.update_responses], [u.digest for u in updates])
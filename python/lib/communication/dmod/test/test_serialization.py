@@ -0,0 +1,68 @@
+import unittest
+from ..communication.maas_request import NWMRequest
+from ..communication.scheduler_request import SchedulerRequestMessage
+from ..communication.serialization import MsgpackCodec, decode, decode_message, encode, encode_message, get_codec, \
+    get_codec_for_subprotocol
+
+
+class TestSerialization(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.request_json = {"model": {"nwm": {"version": 2.0, "output": "streamflow", "domain": "", "parameters": {}}},
+                             "session-secret": "f21f27ac3d443c0948aab924bddefc64891c455a756ca77a4d86ec2f697cd13c"}
+        self.request_obj = SchedulerRequestMessage(
+            model_request=NWMRequest.factory_init_from_deserialized_json(self.request_json), user_id='someone', cpus=4,
+            mem=500000, allocation_paradigm='single-node')
+
+    def tearDown(self) -> None:
+        pass
+
+    # Test that JSON tagged data decodes to the original value and schema version
+    def test_decode_1_a(self):
+        data = encode(self.request_json, get_codec('json'), schema_version=3)
+        self.assertEqual(decode(data), (self.request_json, 3))
+
+    # Test that untagged JSON data, as written before codecs, decodes with no schema version
+    def test_decode_1_b(self):
+        self.assertEqual(decode(self.request_obj.to_json()), (self.request_obj.to_dict(), None))
+
+    # Test that msgpack tagged data decodes to the original value and is smaller than JSON
+    @unittest.skipIf(not MsgpackCodec.is_available(), 'msgpack package is not installed')
+    def test_decode_1_c(self):
+        data = encode(self.request_json, get_codec('msgpack'))
+        self.assertEqual(decode(data), (self.request_json, 1))
+        self.assertLess(len(data), len(encode(self.request_json)))
+
+    # Test that the JSON codec gives text websocket messages, which decode to the original value
+    def test_encode_message_1_a(self):
+        message = encode_message(self.request_obj.to_dict())
+        self.assertIsInstance(message, str)
+        self.assertEqual(message, self.request_obj.to_json())
+        self.assertEqual(decode_message(message), self.request_obj.to_dict())
+
+    # Test that the msgpack codec gives binary websocket messages, which decode to the original value
+    @unittest.skipIf(not MsgpackCodec.is_available(), 'msgpack package is not installed')
+    def test_encode_message_1_b(self):
+        message = encode_message(self.request_obj.to_dict(), get_codec('msgpack'))
+        self.assertIsInstance(message, bytes)
+        self.assertEqual(decode_message(message), self.request_obj.to_dict())
+
+    # Test that an unrecognized codec name is rejected
+    def test_get_codec_1_a(self):
+        self.assertRaises(ValueError, get_codec, 'not_a_codec')
+
+    # Test that the default codec is used when no codec subprotocol was negotiated
+    def test_get_codec_for_subprotocol_1_a(self):
+        self.assertEqual(get_codec_for_subprotocol(None).get_name(), 'json')
+        self.assertEqual(get_codec_for_subprotocol('dmod.json').get_name(), 'json')
+
+    # Test that an object deserialized from its msgpack bytes is equal to the original
+    @unittest.skipIf(not MsgpackCodec.is_available(), 'msgpack package is not installed')
+    def test_factory_init_from_bytes_1_a(self):
+        obj = SchedulerRequestMessage.factory_init_from_bytes(self.request_obj.to_bytes('msgpack'))
+        self.assertEqual(obj, self.request_obj)
+
+    # Test that data tagged with a newer schema version than the type supports is rejected
+    def test_factory_init_from_bytes_1_b(self):
+        data = encode(self.request_obj.to_dict(), schema_version=SchedulerRequestMessage.get_schema_version() + 1)
+        self.assertRaises(ValueError, SchedulerRequestMessage.factory_init_from_bytes, data)
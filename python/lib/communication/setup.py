@@ -20,5 +20,6 @@ setup(
     include_package_data=True,
     #install_requires=['websockets', 'jsonschema'],vi
     install_requires=['websockets', 'jsonschema', 'redis'],
+    extras_require={'msgpack': ['msgpack']},
     packages=find_namespace_packages(include=['dmod.*'], exclude=('tests'))
 )
\ No newline at end of file
@@ -60,8 +60,8 @@ class InnerSessionAuthUtil:
 
         if await self.is_authenticated and await self.is_authorized and await self.is_needs_new_session:
             try:
-                self._session = self.session_manager.create_session(ip_address=self.session_ip_addr,
-                                                                    username=self.username)
+                self._session = await self.session_manager.async_create_session(ip_address=self.session_ip_addr,
+                                                                                username=self.username)
                 self._newly_created = True
             except Exception as e:
                 details = 'The session manager encountered a {} when attempting to create a new session: {}'.format(
@@ -71,7 +71,7 @@ class InnerSessionAuthUtil:
                                                            details=details)
         # Return the already-existing session when auth is good and there is already one
         elif await self.is_authenticated and await self.is_authorized:
-            self._session = self.session_manager.lookup_session_by_username(self.username)
+            self._session = await self.session_manager.async_lookup_session_by_username(self.username)
         elif await self.is_authenticated:   # implies user was not authorized
             self._failure_info = FailedSessionInitInfo(user=self.username,
                                                        reason=SessionInitFailureReason.USER_NOT_AUTHORIZED,
@@ -103,7 +103,7 @@ class InnerSessionAuthUtil:
     async def is_needs_new_session(self):
         if self._is_needs_new_session is None:
             self._is_needs_new_session = await self.is_authorized and not (
-                self.session_manager.lookup_session_by_username(self.username))
+                await self.session_manager.async_lookup_session_by_username(self.username))
         return self._is_needs_new_session
 
     @property
@@ -1,5 +1,6 @@
 import logging
 from pathlib import Path
+from typing import Optional
 from dmod.access import Authorizer
 from dmod.communication import AbstractRequestHandler, FullAuthSession, NWMRequest, NWMRequestResponse, \
     SchedulerClient, SchedulerRequestMessage, SessionManager, InitRequestResponseReason
@@ -14,7 +15,7 @@ logging.basicConfig(
 class NWMRequestHandler(AbstractRequestHandler):
 
     def __init__(self, session_manager: SessionManager, authorizer: Authorizer, scheduler_host: str,
-                 scheduler_port: int, scheduler_ssl_dir: Path):
+                 scheduler_port: int, scheduler_ssl_dir: Path, scheduler_codec: Optional[str] = None):
         self._session_manager = session_manager
         self._authorizer = authorizer
         self._scheduler_host = scheduler_host
@@ -26,7 +27,8 @@ class NWMRequestHandler(AbstractRequestHandler):
 
         self.scheduler_client_ssl_dir = scheduler_ssl_dir
 
-        self._scheduler_client = SchedulerClient(self._scheduler_url, self.scheduler_client_ssl_dir)
+        self._scheduler_client = SchedulerClient(self._scheduler_url, self.scheduler_client_ssl_dir,
+                                                 serial_codec=scheduler_codec)
         """SchedulerClient: Client for interacting with scheduler, which also is a context manager for connections."""
 
     async def _is_authorized(self, request: NWMRequest, session: FullAuthSession) -> bool:
@@ -84,7 +86,7 @@ class NWMRequestHandler(AbstractRequestHandler):
         response: NWMRequestResponse
             An appropriate ``NWMRequestResponse`` object.
         """
-        session = self._session_manager.lookup_session_by_secret(request.session_secret)
+        session = await self._session_manager.async_lookup_session_by_secret(request.session_secret)
         if session is None:
             reason = InitRequestResponseReason.UNRECOGNIZED_SESSION_SECRET
             msg = 'Request {} does not correspond to a known authenticated session'.format(request.to_json())
@@ -94,21 +96,16 @@ class NWMRequestHandler(AbstractRequestHandler):
                 session.user, str(session.session_id), request.to_json())
             logging.debug("*************" + msg)
         else:
-            # The context manager manages a SINGLE connection to the scheduler server
-            # Adhoc calls to the scheduler can be made for this connection via the scheduler_client
-            # These adhoc calls will use the SAME connection the context was initialized with
+            # The scheduler client multiplexes requests over a SINGLE persistent connection to the scheduler server, so
+            # concurrent requests from different tasks share the connection rather than each opening a new one
             logging.debug("************* Preparing scheduler request message")
             scheduler_message = SchedulerRequestMessage(model_request=request, user_id=session.user)
             logging.debug("************* Scheduler request message ready:\n{}".format(str(scheduler_message)))
-            # Should be able to do this to reuse same object/context/connection across tasks, even from other methods
-            async with self._scheduler_client as scheduler_client:
-                initial_response = await scheduler_client.async_make_request(scheduler_message)
-                logging.debug("************* Scheduler client received response:\n{}".format(str(initial_response)))
-                if initial_response.success:
-                    job_id = initial_response.job_id
-                    #async for response in scheduler_client.get_results():
-                    #    logging.debug("************* Results:\n{}".format(str(response)))
-                    #    print(response)
+            initial_response = await self._scheduler_client.async_make_request(scheduler_message)
+            logging.debug("************* Scheduler client received response:\n{}".format(str(initial_response)))
+            #if initial_response.success:
+            #    async for update in self._scheduler_client.get_job_updates(initial_response.job_id):
+            #        logging.debug("************* Update:\n{}".format(str(update)))
             # TODO: consider registering the job and relationship with session, etc.
             success = initial_response.success
             success_str = 'Success' if success else 'Failure'
@@ -1 +1,2 @@
 from .que_monitor import QueMonitor
+from .async_monitor import AsyncQueMonitor, Backoff
@@ -0,0 +1,265 @@
+"""
+Asyncio control loop for a ::class:`QueMonitor`, watching worker services concurrently rather than one at a time.
+"""
+import asyncio
+import docker
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from redis import RedisError
+from requests.exceptions import RequestException
+from typing import Dict, Optional
+
+from .que_monitor import QueMonitor, RECONCILE_INTERVAL
+
+
+class Backoff:
+    """
+    Configurable exponential backoff, for the delays between attempts of a failing operation.
+    """
+
+    _MAX_EXPONENT = 64
+
+    def __init__(self, initial: float = 1.0, maximum: float = 60.0, multiplier: float = 2.0, max_attempts: int = 5):
+        """
+        Parameters
+        ----------
+        initial : float
+            The delay in seconds after the first failed attempt.
+        maximum : float
+            The max delay in seconds.
+        multiplier : float
+            The factor by which the delay increases after each further failed attempt.
+        max_attempts : int
+            The number of attempts made of an operation before giving up, where applicable.
+        """
+        if initial <= 0 or maximum < initial or multiplier < 1 or max_attempts < 1:
+            raise ValueError("Invalid backoff of initial {}, maximum {}, multiplier {}, and max attempts {}".format(
+                initial, maximum, multiplier, max_attempts))
+        self.initial = initial
+        self.maximum = maximum
+        self.multiplier = multiplier
+        self.max_attempts = max_attempts
+
+    def get_delay(self, attempt: int) -> float:
+        """
+        Get the delay after the given failed attempt.
+
+        Parameters
+        ----------
+        attempt : int
+            The index of the failed attempt, starting from ``0``.
+
+        Returns
+        -------
+        float
+            The delay in seconds before the next attempt.
+        """
+        # Cap the exponent, since the delay is at the max long before this, and the power would eventually overflow
+        return min(self.maximum, self.initial * (self.multiplier ** min(attempt, self._MAX_EXPONENT)))
+
+
+class AsyncQueMonitor:
+    """
+    Asyncio control loop for a ::class:`QueMonitor`, keeping the monitor's stored job and task state up to date from the
+    Docker events stream.
+
+    Received events are dispatched to a watcher task for each affected worker service, so services are handled
+    concurrently, while the events for any one service are handled in order.  A burst of events for a service is
+    coalesced into a single update, since each update re-reads the service's current state anyway.  When a task of a
+    service stops, the watcher also checks the service's logs (see ::method:`QueMonitor.check_service_state`).
+
+    Docker and Redis calls of the (blocking) monitor are run in a thread pool, with the number made at once bounded by
+    ::attribute:`max_docker_calls`.  A periodic reconciliation sweep (see ::method:`QueMonitor.reconcile_job_state`),
+    done first on start, corrects any state changes missed by the events stream, including any events handled but not
+    yet persisted in the monitor's resume cursor before a restart.  Failures are retried after delays from a
+    configurable ::class:`Backoff`.
+    """
+
+    _DEFAULT_MAX_DOCKER_CALLS = 8
+    _STOPPED_TASK_ACTIONS = {'die', 'oom'}
+    """ Container event actions for a stopped task, after which the service's logs are checked. """
+
+    def __init__(self, monitor: QueMonitor, max_docker_calls: Optional[int] = None,
+                 reconcile_interval: int = RECONCILE_INTERVAL, backoff: Optional[Backoff] = None):
+        """
+        Parameters
+        ----------
+        monitor : QueMonitor
+            The wrapped monitor.
+        max_docker_calls : Optional[int]
+            The max number of calls to the Docker API made at once, not counting the events stream.
+        reconcile_interval : int
+            Seconds between reconciliation sweeps.
+        backoff : Optional[Backoff]
+            The backoff for retrying failed operations, with a default ::class:`Backoff` used if ``None``.
+        """
+        self._monitor = monitor
+        self.max_docker_calls = self._DEFAULT_MAX_DOCKER_CALLS if max_docker_calls is None else max_docker_calls
+        self.reconcile_interval = reconcile_interval
+        self.backoff = Backoff() if backoff is None else backoff
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._docker_semaphore: Optional[asyncio.Semaphore] = None
+        self._events: Optional[asyncio.Queue] = None
+        self._events_stream = None
+        # Number of consecutive attempts to read the events stream that failed (or ended) without delivering an event
+        self._events_read_attempt = 0
+        self._watchers: Dict[str, asyncio.Task] = dict()
+        self._watcher_queues: Dict[str, asyncio.Queue] = dict()
+
+    async def _call_monitor(self, func, *args):
+        """
+        Call the given blocking monitor function in the thread pool, once one of the bounded Docker calls is available.
+        """
+        async with self._docker_semaphore:
+            return await asyncio.get_running_loop().run_in_executor(self._get_executor(), func, *args)
+
+    def _check_service_logs(self, service_id: str):
+        try:
+            service = self._monitor.docker_client.services.get(service_id)
+        except docker.errors.NotFound:
+            return
+        self._monitor.check_service_state(service)
+
+    async def _dispatch_events(self):
+        """
+        Dispatch each received event for a worker service to the service's watcher, starting the watcher if needed.
+        """
+        while True:
+            event = await self._events.get()
+            # Make sure one malformed event cannot end dispatching
+            try:
+                service_id, service_name = self._monitor.get_event_service(event)
+                if service_id is None:
+                    continue
+                if service_id not in self._watcher_queues:
+                    self._watcher_queues[service_id] = asyncio.Queue()
+                    self._watchers[service_id] = asyncio.create_task(self._watch_service(service_id, service_name))
+                self._watcher_queues[service_id].put_nowait(event)
+            except Exception:
+                logging.exception("Failed to dispatch Docker event {}".format(event))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            # Include an extra thread for reading the events stream
+            self._executor = ThreadPoolExecutor(max_workers=self.max_docker_calls + 1,
+                                                thread_name_prefix='que_monitor')
+        return self._executor
+
+    async def _read_events(self):
+        """
+        Read the Docker events stream, queuing received events for dispatch, and reconnecting after failures, with the
+        backoff starting over once a reconnected stream delivers an event.
+        """
+        loop = asyncio.get_running_loop()
+        self._events_read_attempt = 0
+        try:
+            while True:
+                try:
+                    count = await loop.run_in_executor(self._get_executor(), self._stream_events, loop)
+                    logging.warning("Docker events stream ended after {} events".format(count))
+                except (docker.errors.DockerException, RequestException, RedisError) as e:
+                    logging.error("Docker events stream failed: {}".format(e))
+                await asyncio.sleep(self.backoff.get_delay(self._events_read_attempt))
+                self._events_read_attempt += 1
+        finally:
+            # Unblock the thread reading the stream
+            if self._events_stream is not None:
+                self._events_stream.close()
+
+    async def _reconcile_periodically(self):
+        """
+        Run a reconciliation sweep immediately, and then every ::attribute:`reconcile_interval` seconds.
+        """
+        while True:
+            try:
+                await self._call_monitor(self._monitor.reconcile_job_state)
+            except (docker.errors.DockerException, RequestException, RedisError) as e:
+                logging.error("Reconciliation sweep failed: {}".format(e))
+            await asyncio.sleep(self.reconcile_interval)
+
+    def _stream_events(self, loop: asyncio.AbstractEventLoop) -> int:
+        """
+        Read the Docker events stream in a pool thread, from the monitor's resume cursor, until it ends.
+
+        Returns
+        -------
+        int
+            The number of events read.
+        """
+        self._events_stream = self._monitor.docker_client.events(since=self._monitor.get_events_cursor(),
+                                                                 filters={'type': ['service', 'container']},
+                                                                 decode=True)
+        count = 0
+        for event in self._events_stream:
+            if count == 0:
+                # The stream is working again, so any later failure starts the backoff over
+                loop.call_soon_threadsafe(setattr, self, '_events_read_attempt', 0)
+            loop.call_soon_threadsafe(self._events.put_nowait, event)
+            count += 1
+        return count
+
+    async def _watch_service(self, service_id: str, service_name: str):
+        """
+        Watch a worker service, handling its events in order, until it is removed.
+        """
+        queue = self._watcher_queues[service_id]
+        try:
+            while True:
+                events = [await queue.get()]
+                while not queue.empty():
+                    events.append(queue.get_nowait())
+                # The last event is handled, which re-reads the service's current state regardless of the event
+                for attempt in range(self.backoff.max_attempts):
+                    try:
+                        await self._call_monitor(self._monitor.handle_docker_event, events[-1])
+                        break
+                    except (docker.errors.DockerException, RequestException, RedisError) as e:
+                        logging.warning("Failed to update state of {}: {}".format(service_name, e))
+                        await asyncio.sleep(self.backoff.get_delay(attempt))
+                    except Exception:
+                        # Not worth retrying (e.g., an unexpected event), so wait for the next event
+                        logging.exception("Failed to handle Docker event {} for {}".format(events[-1], service_name))
+                        break
+                else:
+                    logging.error("Giving up updating state of {} until its next event".format(service_name))
+                if any(e.get('Type') == 'service' and e.get('Action') == 'remove' for e in events):
+                    return
+                if any(e.get('Action') in self._STOPPED_TASK_ACTIONS for e in events):
+                    try:
+                        await self._call_monitor(self._check_service_logs, service_id)
+                    except (docker.errors.DockerException, RequestException) as e:
+                        logging.warning("Failed to check logs of {}: {}".format(service_name, e))
+        finally:
+            self._watchers.pop(service_id, None)
+            self._watcher_queues.pop(service_id, None)
+
+    async def run(self):
+        """
+        Run the monitor indefinitely, until cancelled.
+        """
+        self._docker_semaphore = asyncio.Semaphore(self.max_docker_calls)
+        self._events = asyncio.Queue()
+        tasks = [asyncio.create_task(self._read_events()), asyncio.create_task(self._dispatch_events()),
+                 asyncio.create_task(self._reconcile_periodically())]
+        try:
+            await asyncio.gather(*tasks)
+        finally:
+            tasks.extend(self._watchers.values())
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+                self._executor = None
+
+    @property
+    def watcher_count(self) -> int:
+        """
+        The number of worker services currently being watched.
+
+        Returns
+        -------
+        int
+            The number of worker services currently being watched.
+        """
+        return len(self._watchers)
@@ -3,12 +3,14 @@ import yaml
 import os
 from os import getenv
 from pathlib import Path
-from . import name as package_name
 #from .service import SchedulerHandler
 #from .scheduler import Launcher
 #from .redis_manager import RedisManager
 #from ..lib.job_manager import JobManagerFactory, JobManager
 
+# Not imported from the package, which itself imports this module (via que_monitor)
+package_name = 'monitor'
+
 
 def _handle_args():
     parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
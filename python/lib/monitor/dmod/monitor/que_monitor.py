@@ -1,7 +1,8 @@
 #!/usr/bin/env python3
 
+import asyncio
 import logging
-from typing import Optional
+from typing import Dict, List, Optional, Tuple
 import sys
 import os
 from os.path import join, dirname, realpath
@@ -10,9 +11,10 @@ import subprocess
 import queue
 import json, ast
 import docker
+from requests.exceptions import RequestException
 from pprint import pprint as pp
 #FIXME URGENT refactor all resource management usning redisManager
-from redis import Redis, WatchError
+from redis import Redis, RedisError, WatchError
 from pathlib import Path
 
 ## local imports
@@ -20,17 +22,18 @@ from pathlib import Path
 
 # from other dmod libs
 from dmod.redis import RedisBacked, KeyNameHelper
-from dmod.scheduler.job import RedisBackedJobManager, JobManagerFactory, JobManager
+from dmod.scheduler.job import JobManagerFactory, JobManager
 from dmod.scheduler.job import RequestedJob
 from dmod.scheduler.resources import ResourceManager, RedisManager, Resource
 from dmod.scheduler import RsaKeyPair
 from dmod.scheduler.scheduler import Launcher
 import dmod.scheduler.utils.parsing_nested as pn
-import name_parser as name_parser
+from . import name_parser
 
 MAX_JOBS = 210
 Max_Redis_Init = 5
 T_INTERVAL = 20
+RECONCILE_INTERVAL = 300
 
 logging.basicConfig(
     filename='que_monitor.log',
@@ -41,8 +44,12 @@ logging.basicConfig(
 class QueMonitor(RedisBacked):
     _jobQ = queue.deque()
     _jobQList = "redisQList"
+    _RESTORE_BATCH_SIZE = 1000
+    """ Max number of set members popped at once when restoring stored state. """
+    _TASK_CONTAINER_ACTIONS = {'create', 'start', 'die', 'oom', 'kill', 'stop', 'destroy'}
+    """ Container event actions that may indicate a state change of the task the container belongs to. """
     def __init__(self, resource_pool: str,
-                 docker_client: docker.from_env() = None, api_client: docker.APIClient() = None,
+                 docker_client: docker.DockerClient = None, api_client: docker.APIClient = None,
                  redis_host: Optional[str] = None, redis_port: Optional[int] = None,
                  redis_pass: Optional[str] = None, **kwargs):
         """
@@ -86,6 +93,8 @@ class QueMonitor(RedisBacked):
         # self.keyname_prefix = "nwm-master" #FIXME parameterize
         self.keyname_prefix = "maas" #FIXME parameterize
         self.keynamehelper = KeyNameHelper(self.keyname_prefix, ':')
+        # Time of the last processed Docker event, in memory until persisted (see get_events_cursor)
+        self._events_cursor = None
         #FIXME if resource is needed must load externally (file, redis, resourceManager)
         #self.create_resources()
 
@@ -138,7 +147,7 @@ class QueMonitor(RedisBacked):
         while len(high_priority_queue) > 0:
             hp_job = heapq.heappop(high_priority_queue)
             job_id = hp_job.job_id
-            job_req = hp_job._originating_request      # _originating_request = job_request: SchedulerRequestMessage
+            job_req = hp_job.originating_request
             user_id = job_req.user_id
             cpus = job_req.cpus
             memory = job_req.memory
@@ -152,7 +161,7 @@ class QueMonitor(RedisBacked):
         while len(med_priority_queue) > 0:
             hp_job = heapq.heappop(med_priority_queue)
             job_id = hp_job.job_id
-            job_req = hp_job._originating_request      # _originating_request = job_request: SchedulerRequestMessage
+            job_req = hp_job.originating_request
             user_id = job_req.user_id
             cpus = job_req.cpus
             memory = job_req.memory
@@ -167,7 +176,7 @@ class QueMonitor(RedisBacked):
         while len(low_priority_queue) > 0:
             hp_job = heapq.heappop(low_priority_queue)
             job_id = hp_job.job_id
-            job_req = hp_job._originating_request      # _originating_request = job_request: SchedulerRequestMessage
+            job_req = hp_job.originating_request
             user_id = job_req.user_id
             cpus = job_req.cpus
             memory = job_req.memory
@@ -179,7 +188,7 @@ class QueMonitor(RedisBacked):
         for job in active_jobs:
             if (job not in priority_queues):
                 job_id = req_job.job_id()
-                job_req = job._originating_request
+                job_req = job.originating_request
                 user_id = job_req.user_id
                 cpus = job_req.cpus
                 memory = job_req.memory
@@ -211,11 +220,10 @@ class QueMonitor(RedisBacked):
         # test out some service functions
         service_list = client.services.list()
 
-        # create a set key to store hash key names
-        service_set_key = self.keynamehelper.create_key_name("service_set")
-
         # Initialize runningJobList the first time it is called
         runningJobList = []
+        # service attrs to store in redis, all at once after iterating
+        services_attrs = dict()
 
         # iterate through entire service list
         for service in service_list:
@@ -224,12 +232,7 @@ class QueMonitor(RedisBacked):
             if srv_basename in service_name:
                 logging.info("\nIn check_runningJobs(): service_name = {}".format(service_name))
                 #print("\nIn check_runningJobs(): service_name = {}\n".format(service_name))
-                # store service_attrs in Redis as string
-                stringified_service_attrs = json.dumps(service_attrs)  # convert dict object to string
-                service_attrs_hash_key = self.keynamehelper.create_key_name("service_attrs", service_name)
-                self.redis.set(service_attrs_hash_key, stringified_service_attrs)
-                # store the service_name to a set
-                self.redis.sadd(service_set_key, service_name)
+                services_attrs[service_name] = service_attrs
 
                 (_, _, serv_name, req_id) = service_name.split('_')
                 lens = len(serv_name)
@@ -276,10 +279,12 @@ class QueMonitor(RedisBacked):
                                 "Labels": Labels, "Name": Name, "Mounts": Mounts, "Healthcheck": Healthcheck,
                                 "RestartPolicy": RestartPolicy, "HostNode": HostNode, "cpus_alloc": cpus_alloc}
                 runningJobList.append(service_dict)
+        # store service_attrs in Redis as strings, with the service names in a set
+        self.snapshot_service_attrs(services_attrs)
         logging.info("end of que_monitor.check_runningJobs")
         return runningJobList, service_dict
 
-    def resubmit(self, service_dict: dict, service_name: str) -> docker.from_env().services.create:
+    def resubmit(self, service_dict: dict, service_name: str) -> docker.models.services.Service:
         """
         Resubmit a job that failed to start/run/complete successfully using the service attributes extracted from the initial service
 
@@ -373,56 +378,70 @@ class QueMonitor(RedisBacked):
         """
         client = self.docker_client
         srv_basename = self.name
-        mpirun = "mpirun"
-        failed = "failed"
 
         # logging some common linux exit status code and signal code
         service_list = client.services.list()
         for service in service_list:
             if srv_basename in service.name:
-                for service_log in service.logs(details=True, stdout=True, stderr=True, timestamps=True):
-                    # print(service_log)   # output in byte string format
-                    service_log_str = str(service_log, 'utf-8')
-                    # output regular strings
-                    ## print(service_log_str)    # uncomment this line to output all logs in regular string format.
-                    if failed in service_log_str:
-                        logging.debug("failed info: {}".format(service_log_str))
-                    if mpirun in service_log_str:
-                        string = service_log_str
-                        word = string.split()
-                        #print("word is instance of list:", isinstance(word, list))
-                        logging.debug("exitcode = {}".format(word[-1]))
-                        exitcode = int(word[-1])
-                        #print("int exitcode = ", exitcode)
-                        if exitcode > 128 and exitcode < 256:
-                            fatal_signal_code = exitcode - 128
-                            logging.info("service name: {}, fatal signal code: {}".format(service.name, fatal_signal_code))
-                            if fatal_signal_code == 4:
-                                logging.info("service name: {}, Illegal Instruction, signal code: {}".format(service.name, fatal_signal_code))
-                            if fatal_signal_code == 6:
-                                logging.info("service name: {}, Abort Signal, signal code: {}".format(service.name, fatal_signal_code))
-                            if fatal_signal_code == 8:
-                                logging.info("service name: {}, Floating Point Exception, signal code: {}".format(service.name, fatal_signal_code))
-                            if fatal_signal_code == 9:
-                                logging.info("service name: {}, Kill Signal, signal code: {}".format(service.name, fatal_signal_code))
-                            if fatal_signal_code == 11:
-                                logging.info("service name: {}, Invalid Memory Reference, signal code: {}".format(service.name, fatal_signal_code))
-                            if fatal_signal_code == 13:
-                                logging.info("service name: {}, Broken Pipe, signal code: {}".format(service.name, fatal_signal_code))
-                        if exitcode == 0:
-                            logging.info("service name: {}, exit code: {}, Successful Completion".format(service.name, exitcode))
-                        if exitcode == 1:
-                            logging.info("service name: {}, exit code: {}, Execution failed".format(service.name, exitcode))
-                        if exitcode == 2:
-                            logging.info("service name: {}, exit code: {}, Misuse of shell builtins".format(service.name, exitcode))
-                        if exitcode == 126:
-                            logging.info("service name: {}, exit code: {}, Command invoked cannot execute".format(service.name, exitcode))
-                        if exitcode == 127:
-                            logging.info("service name: {}, exit code: {}, Command not found".format(service.name, exitcode))
-                        if exitcode == 130:
-                            logging.info("service name: {}, exit code: {}, Script terminated by Control-C".format(service.name, exitcode))
-                        if exitcode == 139:
-                            logging.info("service name: {}, exit code: {}, Segmentation Fault".format(service.name, exitcode))
+                self.check_service_state(service)
+
+    def check_service_state(self, service):
+        """
+        Check the logs of a single worker service, logging failures and the meaning of any ``mpirun`` exit code
+
+        See ::method:`check_system_state`, which checks all worker services.
+
+        Parameters
+        ----------
+        service
+            The worker service
+        """
+        mpirun = "mpirun"
+        failed = "failed"
+
+        for service_log in service.logs(details=True, stdout=True, stderr=True, timestamps=True):
+            # print(service_log)   # output in byte string format
+            service_log_str = str(service_log, 'utf-8')
+            # output regular strings
+            ## print(service_log_str)    # uncomment this line to output all logs in regular string format.
+            if failed in service_log_str:
+                logging.debug("failed info: {}".format(service_log_str))
+            if mpirun in service_log_str:
+                string = service_log_str
+                word = string.split()
+                #print("word is instance of list:", isinstance(word, list))
+                logging.debug("exitcode = {}".format(word[-1]))
+                exitcode = int(word[-1])
+                #print("int exitcode = ", exitcode)
+                if exitcode > 128 and exitcode < 256:
+                    fatal_signal_code = exitcode - 128
+                    logging.info("service name: {}, fatal signal code: {}".format(service.name, fatal_signal_code))
+                    if fatal_signal_code == 4:
+                        logging.info("service name: {}, Illegal Instruction, signal code: {}".format(service.name, fatal_signal_code))
+                    if fatal_signal_code == 6:
+                        logging.info("service name: {}, Abort Signal, signal code: {}".format(service.name, fatal_signal_code))
+                    if fatal_signal_code == 8:
+                        logging.info("service name: {}, Floating Point Exception, signal code: {}".format(service.name, fatal_signal_code))
+                    if fatal_signal_code == 9:
+                        logging.info("service name: {}, Kill Signal, signal code: {}".format(service.name, fatal_signal_code))
+                    if fatal_signal_code == 11:
+                        logging.info("service name: {}, Invalid Memory Reference, signal code: {}".format(service.name, fatal_signal_code))
+                    if fatal_signal_code == 13:
+                        logging.info("service name: {}, Broken Pipe, signal code: {}".format(service.name, fatal_signal_code))
+                if exitcode == 0:
+                    logging.info("service name: {}, exit code: {}, Successful Completion".format(service.name, exitcode))
+                if exitcode == 1:
+                    logging.info("service name: {}, exit code: {}, Execution failed".format(service.name, exitcode))
+                if exitcode == 2:
+                    logging.info("service name: {}, exit code: {}, Misuse of shell builtins".format(service.name, exitcode))
+                if exitcode == 126:
+                    logging.info("service name: {}, exit code: {}, Command invoked cannot execute".format(service.name, exitcode))
+                if exitcode == 127:
+                    logging.info("service name: {}, exit code: {}, Command not found".format(service.name, exitcode))
+                if exitcode == 130:
+                    logging.info("service name: {}, exit code: {}, Script terminated by Control-C".format(service.name, exitcode))
+                if exitcode == 139:
+                    logging.info("service name: {}, exit code: {}, Segmentation Fault".format(service.name, exitcode))
 
     def check_job_state(self) -> list:
         """
@@ -438,94 +457,317 @@ class QueMonitor(RedisBacked):
         api_client = self.api_client
         srv_basename = self.name
 
-        # create the redis key for service task id set
-        task_set_key = self.keynamehelper.create_key_name("service_tasks")
-
-        # iterate through entire service list
+        # iterate through entire service list, collecting the state of every task so they can be stored at once
         service_list = client.services.list()
-        service_state_list = []
+        task_states = []
         for service in service_list:
             service_name = service.name
             if srv_basename in service_name:
                 for task in service.tasks():
-                    # logging task state
-                    logging.info("\tState: {}".format(task['Status']['State']))
-                    logging.info("\tTimestamp: {}".format(task['Status']['Timestamp']))
-                    logging.info("\tContainerID: {}".format(task['Status']['ContainerStatus']['ContainerID']))
-                    logging.info("\tDesiredState: {}".format(task['DesiredState']))
-                    logging.info("\tServiceID: {}".format(task['ServiceID']))
-
-                    task_state = service_name + ':' + task['Status']['State']
-                    task_timestamp = service_name + ':' + task['Status']['Timestamp']
-                    task_container_id = service_name + ':' + task['Status']['ContainerStatus']['ContainerID']
-                    task_disired_state = service_name + ':' + task['DesiredState']
                     task_service_id = service_name + ':' + task['ServiceID']
-                    task_error = service_name + ':' + str(task['Status']['ContainerStatus']['ExitCode'])
-                    task_error_num = task['Status']['ContainerStatus']['ExitCode']
-                    task_host = task['Spec']['Placement']['Constraints']
-                    task_host = task_host[0]
-                    (_, task_host) = task_host.split(' == ')
-
-                    logging.info("\n\tserviceName:taskState: {}".format(task_state))
-                    (serviceName, taskState) = task_state.split(':')
-
-                    logging.info("\tserviceName: {}".format(serviceName))
-                    logging.info("\ttaskState: {}".format(taskState))
-                    logging.info("\ttaskExitCode: {}".format(task_error))
-                    logging.info("\ttaskExitCode: {}".format(task_error_num))
-                    logging.info("\ttask_host: {}".format(task_host))
-                    # pp(task)
-
-                    try:
-                        service_state_dict = {"service_name": service_name, "taskState": taskState, "task_host": task_host,
-                                              "task_container_id": task_container_id, "task_disired_state": task_disired_state}
-                        task_key = self.keynamehelper.create_key_name("running_services", task_service_id)
-                        self.redis.hmset(task_key, service_state_dict)
-
-                        # save task_service_id to redis set as key for retrieving service_stat_dict later on
-                        self.redis.sadd(task_set_key, task_service_id)
-                    except:
-                        raise RedisError("Error occurred in storing task states to redis")
-
-                    if (taskState == 'starting'):
-                        pass
-                    elif (taskState == 'running'):
-                        #FIXME This option is for testing the codes involved in resubmitting
-                        logging.info("Job {} is running: restart to test code".format(serviceName))
-                        service.remove()
-                    elif (taskState == 'complete'):
-                        logging.info("Job {} successfully finished".format(serviceName))
-                        service.remove()
-                    elif (taskState == 'failed'):
-                        logging.info("Job {} failed to complete".format(serviceName))
-                        logging.info("Please examine the task logs for cause before removing the service")
-                        # Check reasons and consider resubmit
-                        service.remove()
-                    elif (taskState == 'shutdown'):
-                        # TODO consider resubmit
-                        logging.info("Docker requested {} to shutdown".format(serviceName))
-                        service.remove()
-                    elif (taskState == 'rejected'):
-                        # TODO check node state and resubmit
-                        logging.info("The worker node rejected {}".format(serviceName))
-                        service.remove()
-                    elif (taskState == 'ophaned'):
-                        # TODO check node state and possibly resubmit to a different node
-                        logging.info("The node for {} down for too long".format(serviceName))
-                        service.remove()
-                    elif (taskState == 'remove'):
-                        # TODO check node state and resubmit
-                        logging.info("The node for {} down for too long".format(serviceName))
-                        service.remove()
-                    else:
-                        pass
-                    service_state = {"taskState": taskState, "service_name": service_name}
-                    service_state_list.append(service_state)
-                    #print("In check_job_state, service_state_list:")
-                    #pp(service_state_list)
-                    #print("-" * 30)
+                    service_state_dict = self._parse_task_state(service_name, task)
+                    logging.debug("In check_job_state: task of {} is {}".format(service_name, service_state_dict))
+                    task_states.append((service, task_service_id, service_state_dict))
+
+        try:
+            self.snapshot_task_states({task_service_id: state for _, task_service_id, state in task_states})
+        except:
+            raise RedisError("Error occurred in storing task states to redis")
+
+        service_state_list = []
+        for service, task_service_id, service_state_dict in task_states:
+            service_name = service.name
+            serviceName = service_name
+            taskState = service_state_dict['taskState']
+
+            if (taskState == 'starting'):
+                pass
+            elif (taskState == 'running'):
+                #FIXME This option is for testing the codes involved in resubmitting
+                logging.info("Job {} is running: restart to test code".format(serviceName))
+                service.remove()
+            elif (taskState == 'complete'):
+                logging.info("Job {} successfully finished".format(serviceName))
+                service.remove()
+            elif (taskState == 'failed'):
+                logging.info("Job {} failed to complete".format(serviceName))
+                logging.info("Please examine the task logs for cause before removing the service")
+                # Check reasons and consider resubmit
+                service.remove()
+            elif (taskState == 'shutdown'):
+                # TODO consider resubmit
+                logging.info("Docker requested {} to shutdown".format(serviceName))
+                service.remove()
+            elif (taskState == 'rejected'):
+                # TODO check node state and resubmit
+                logging.info("The worker node rejected {}".format(serviceName))
+                service.remove()
+            elif (taskState == 'ophaned'):
+                # TODO check node state and possibly resubmit to a different node
+                logging.info("The node for {} down for too long".format(serviceName))
+                service.remove()
+            elif (taskState == 'remove'):
+                # TODO check node state and resubmit
+                logging.info("The node for {} down for too long".format(serviceName))
+                service.remove()
+            else:
+                pass
+            service_state = {"taskState": taskState, "service_name": service_name}
+            service_state_list.append(service_state)
+            #print("In check_job_state, service_state_list:")
+            #pp(service_state_list)
+            #print("-" * 30)
         return service_state_list
 
+    @staticmethod
+    def _parse_task_state(service_name: str, task: dict) -> dict:
+        """
+        Get the state of a task of a worker service, in the form stored in Redis in its ``running_services`` hash.
+
+        Parameters
+        ----------
+        service_name
+            Name of the service of the task
+        task
+            The task, as returned by the service's ``tasks()``
+
+        Returns
+        -------
+        service_state_dict
+            Dictionary of the task state, host, container id, and desired state
+        """
+        status = task['Status']
+        container_status = status.get('ContainerStatus', {})
+        constraints = task.get('Spec', {}).get('Placement', {}).get('Constraints', [])
+        task_host = constraints[0].split(' == ')[-1] if len(constraints) > 0 else ''
+        return {"service_name": service_name, "taskState": status['State'], "task_host": task_host,
+                "task_container_id": service_name + ':' + container_status.get('ContainerID', ''),
+                "task_disired_state": service_name + ':' + task['DesiredState']}
+
+    def _get_events_cursor_key(self) -> str:
+        return self.keynamehelper.create_key_name("docker_events_cursor")
+
+    def get_events_cursor(self) -> Optional[str]:
+        """
+        Get the persisted resume cursor for the Docker events stream, i.e., the time of the last processed event.
+
+        Returns
+        -------
+        cursor
+            The time of the last processed event, as a ``<seconds>.<nanoseconds>`` string suitable for the ``since``
+            param of the Docker events API, or ``None`` if no events have yet been processed
+        """
+        return self.redis.get(self._get_events_cursor_key())
+
+    def _queue_remove_service_state(self, pipeline, service_name: str, service_id: str):
+        """
+        Queue commands on the given pipeline to remove the stored job and task state of a removed worker service.
+        """
+        task_service_id = service_name + ':' + service_id
+        pipeline.delete(self.keynamehelper.create_key_name("running_services", task_service_id))
+        pipeline.srem(self.keynamehelper.create_key_name("service_tasks"), task_service_id)
+        pipeline.delete(self.keynamehelper.create_key_name("service_attrs", service_name))
+        pipeline.srem(self.keynamehelper.create_key_name("service_set"), service_name)
+
+    def _queue_store_service_state(self, pipeline, service) -> Optional[str]:
+        """
+        Queue commands on the given pipeline to store the job and task state of a worker service.
+
+        The stored job state is the service's attributes, as stored by ::method:`check_and_store_runningJobs`.  The
+        stored task state is that of the service's most recently updated task, in the form stored by
+        ::method:`check_job_state`.
+
+        Parameters
+        ----------
+        pipeline
+            The Redis pipeline on which to queue commands
+        service
+            The worker service
+
+        Returns
+        -------
+        task_service_id
+            The ``service_tasks`` set member for the service, or ``None`` if the service has no tasks
+        """
+        service_name = service.name
+        service_attrs_hash_key = self.keynamehelper.create_key_name("service_attrs", service_name)
+        pipeline.set(service_attrs_hash_key, json.dumps(service.attrs))
+        pipeline.sadd(self.keynamehelper.create_key_name("service_set"), service_name)
+
+        tasks = service.tasks()
+        if len(tasks) == 0:
+            return None
+        task = max(tasks, key=lambda t: t['Status'].get('Timestamp', ''))
+        task_service_id = service_name + ':' + task['ServiceID']
+        task_key = self.keynamehelper.create_key_name("running_services", task_service_id)
+        pipeline.hset(task_key, mapping=self._parse_task_state(service_name, task))
+        pipeline.sadd(self.keynamehelper.create_key_name("service_tasks"), task_service_id)
+        return task_service_id
+
+    def get_event_service(self, event: dict) -> Tuple[Optional[str], str]:
+        """
+        Get the worker service affected by a Docker event, if any.
+
+        Service events, and container events for the containers of service tasks (which, unlike service events, follow
+        the state changes of tasks), may affect a worker service.
+
+        Parameters
+        ----------
+        event
+            The decoded Docker event
+
+        Returns
+        -------
+        tuple
+            The id and name of the affected worker service, or ``None`` and an empty string if the event does not
+            affect a worker service
+        """
+        action = event.get('Action', '')
+        actor = event.get('Actor', {})
+        attributes = actor.get('Attributes', {})
+        if event.get('Type') == 'service':
+            service_id = actor.get('ID')
+            service_name = attributes.get('name', '')
+        elif event.get('Type') == 'container' and action in self._TASK_CONTAINER_ACTIONS:
+            service_id = attributes.get('com.docker.swarm.service.id')
+            service_name = attributes.get('com.docker.swarm.service.name', '')
+        else:
+            service_id, service_name = None, ''
+        if service_id is None or self.name not in service_name:
+            return None, ''
+        return service_id, service_name
+
+    def handle_docker_event(self, event: dict) -> bool:
+        """
+        Incrementally update the stored job and task state of a worker service for a received Docker event.
+
+        Service events, and container events for the containers of service tasks (which, unlike service events, follow
+        the state changes of tasks), cause just the affected service to be re-read, and its state stored.  Events for
+        the removal of a service remove its stored state.  Events for anything other than worker services are ignored.
+
+        The resume cursor returned by ::method:`get_events_cursor` is advanced past the event, and persisted in the same
+        Redis transaction as any resulting state changes.
+
+        Parameters
+        ----------
+        event
+            The decoded Docker event
+
+        Returns
+        -------
+        bool
+            Whether stored state was updated for the event
+        """
+        event_type = event.get('Type')
+        action = event.get('Action', '')
+        service_id, service_name = self.get_event_service(event)
+
+        if 'timeNano' in event:
+            cursor = '{}.{:09d}'.format(*divmod(int(event['timeNano']), 1000000000))
+            # Events may be handled out of order by concurrent callers, so make sure the cursor only moves forward
+            if self._events_cursor is None or float(cursor) > float(self._events_cursor):
+                self._events_cursor = cursor
+
+        if service_id is None:
+            return False
+
+        pipeline = self.redis.pipeline()
+        service = None
+        if not (event_type == 'service' and action == 'remove'):
+            try:
+                service = self.docker_client.services.get(service_id)
+            except docker.errors.NotFound:
+                pass
+        if service is None:
+            logging.info("Worker service {} removed".format(service_name))
+            self._queue_remove_service_state(pipeline, service_name, service_id)
+        else:
+            logging.debug("Updating state of worker service {} for {} {} event".format(service_name, event_type, action))
+            self._queue_store_service_state(pipeline, service)
+        if self._events_cursor is not None:
+            pipeline.set(self._get_events_cursor_key(), self._events_cursor)
+        pipeline.execute()
+        return True
+
+    def reconcile_job_state(self) -> int:
+        """
+        Sweep all worker services, storing the job and task state of each, and removing any stored state for services
+        that no longer exist.
+
+        This is the fallback for incremental updates from Docker events (see ::method:`watch_docker_events`), correcting
+        any state changes missed; e.g., if events were dropped, or for services on other nodes, whose container events
+        are not seen.  All changes are written in a single Redis pipeline.
+
+        Returns
+        -------
+        int
+            The number of worker services swept
+        """
+        service_set_key = self.keynamehelper.create_key_name("service_set")
+        task_set_key = self.keynamehelper.create_key_name("service_tasks")
+        stored_service_names = self.redis.smembers(service_set_key)
+        stored_task_service_ids = self.redis.smembers(task_set_key)
+
+        pipeline = self.redis.pipeline()
+        service_names = set()
+        task_service_ids = set()
+        for service in self.docker_client.services.list():
+            if self.name not in service.name:
+                continue
+            service_names.add(service.name)
+            task_service_ids.add(self._queue_store_service_state(pipeline, service))
+        for service_name in stored_service_names - service_names:
+            pipeline.delete(self.keynamehelper.create_key_name("service_attrs", service_name))
+            pipeline.srem(service_set_key, service_name)
+        for task_service_id in stored_task_service_ids - task_service_ids:
+            pipeline.delete(self.keynamehelper.create_key_name("running_services", task_service_id))
+            pipeline.srem(task_set_key, task_service_id)
+        pipeline.execute()
+        logging.info("Reconciled state of {} worker services".format(len(service_names)))
+        return len(service_names)
+
+    def watch_docker_events(self, reconcile_interval: int = RECONCILE_INTERVAL, max_sweeps: Optional[int] = None):
+        """
+        Watch the Docker events stream for service and task state changes, incrementally updating stored job and task
+        state, as an alternative to repeatedly polling all services via ::method:`check_job_state`.
+
+        Events are read in windows of ``reconcile_interval`` seconds, each followed by a reconciliation sweep via
+        ::method:`reconcile_job_state`.  Each window resumes from the persisted cursor (see
+        ::method:`get_events_cursor`), so events are not missed across windows or monitor restarts.  When there is no
+        persisted cursor, an initial sweep is done first.  If the events stream fails, the remainder of the window is
+        skipped, with the next window resuming from the cursor.
+
+        Parameters
+        ----------
+        reconcile_interval
+            Seconds between reconciliation sweeps
+        max_sweeps
+            Optional limit to the number of windows (and sweeps) before returning, or ``None`` to watch indefinitely
+        """
+        self._events_cursor = self.get_events_cursor()
+        if self._events_cursor is None:
+            # Anything happening during the initial sweep will be replayed in the first window
+            self._events_cursor = '{:.9f}'.format(time.time())
+            self.reconcile_job_state()
+            self.redis.set(self._get_events_cursor_key(), self._events_cursor)
+
+        sweeps = 0
+        while max_sweeps is None or sweeps < max_sweeps:
+            window_end = int(time.time()) + reconcile_interval
+            try:
+                events = self.docker_client.events(since=self._events_cursor, until=window_end,
+                                                   filters={'type': ['service', 'container']}, decode=True)
+                for event in events:
+                    self.handle_docker_event(event)
+                # All events before the end of the window have been seen, so the cursor can go up to it
+                self._events_cursor = '{}.{:09d}'.format(window_end, 0)
+            except (docker.errors.DockerException, RequestException) as e:
+                logging.error("Docker events stream failed, falling back to reconciliation: {}".format(e))
+                time.sleep(max(0, window_end - time.time()))
+            self.reconcile_job_state()
+            self.redis.set(self._get_events_cursor_key(), self._events_cursor)
+            sweeps += 1
+
     def build_state_list_reqid_set(self, service_state_list: list) -> dict:
         """
         Enumerate through all possible jobs in the service list and classfify them into possible
@@ -663,8 +905,6 @@ class QueMonitor(RedisBacked):
                                 # print("service_dict", service_dict)
                                 service = self.resubmit(service_dict, service_name)
                                 # service = self.resubmit_using_redis_items(service_dict, service_name)
-                                # avoid calling servname_gen() function simultaneously from different jobState
-                                time.sleep(1)
                                 logging.info("In service_actions: service = {}".format(service))
                 # print("-" * 30)
 
@@ -687,8 +927,6 @@ class QueMonitor(RedisBacked):
                                 # print("service_dict", service_dict)
                                 service = self.resubmit(service_dict, service_name)
                                 # service = self.resubmit_using_redis_items(service_dict, service_name)
-                                # avoid calling servname_gen() function simultaneously from different jobState
-                                time.sleep(1)
                                 logging.info("In service_actions: service = {}".format(service))
                 # print("-" * 30)
 
@@ -776,7 +1014,7 @@ class QueMonitor(RedisBacked):
     #Since we are using a partitioning scheme with "resource_pool", should limit
     #this function to only care about the pool a given instance of monitor is
     #monitoring.
-    def get_node_info(self) -> docker.from_env().nodes.list:
+    def get_node_info(self) -> list:
         """
         Obtain service node info using Docker API
 
@@ -841,6 +1079,96 @@ class QueMonitor(RedisBacked):
             e_key = self.keynamehelper.create_key_name("resource", resource['node_id'])
             logging.info("hgetall(e_key): {}".format(self.redis.hgetall(e_key)))
 
+    def _spop_all(self, set_key: str) -> List[str]:
+        """
+        Pop all members of a Redis set, in batches of ::attribute:`_RESTORE_BATCH_SIZE` using ``SPOP`` with a count.
+        """
+        members = []
+        while True:
+            batch = self.redis.spop(set_key, self._RESTORE_BATCH_SIZE)
+            members.extend(batch)
+            if len(batch) < self._RESTORE_BATCH_SIZE:
+                return members
+
+    def snapshot_service_attrs(self, services_attrs: Dict[str, dict]):
+        """
+        Store the attributes of worker services in Redis, as JSON strings with the service names in a set, writing all of
+        them in a single pipeline.
+
+        Parameters
+        ----------
+        services_attrs
+            Dictionary of the attributes of each service, keyed by service name
+        """
+        if len(services_attrs) == 0:
+            return
+        pipeline = self.redis.pipeline()
+        for service_name, service_attrs in services_attrs.items():
+            pipeline.set(self.keynamehelper.create_key_name("service_attrs", service_name), json.dumps(service_attrs))
+        pipeline.sadd(self.keynamehelper.create_key_name("service_set"), *services_attrs.keys())
+        pipeline.execute()
+
+    def snapshot_task_states(self, task_states: Dict[str, dict]):
+        """
+        Store the states of worker service tasks in Redis, as hashes with their keys' ids in a set, writing all of them in
+        a single pipeline.
+
+        Parameters
+        ----------
+        task_states
+            Dictionary of task states, as from ::method:`_parse_task_state`, keyed by the ``service_tasks`` set member
+            id of each (i.e., ``<service_name>:<service_id>``)
+        """
+        if len(task_states) == 0:
+            return
+        pipeline = self.redis.pipeline()
+        for task_service_id, service_state_dict in task_states.items():
+            task_key = self.keynamehelper.create_key_name("running_services", task_service_id)
+            pipeline.hset(task_key, mapping=service_state_dict)
+        pipeline.sadd(self.keynamehelper.create_key_name("service_tasks"), *task_states.keys())
+        pipeline.execute()
+
+    def restore_service_attrs(self) -> Dict[str, dict]:
+        """
+        Restore the worker service attributes last stored in Redis, emptying the set of their service names.
+
+        The set is emptied in batches of ``SPOP`` with a count, and the attributes read in a single pipeline, so the
+        number of round trips does not grow with the number of services.
+
+        Returns
+        -------
+        services_attrs
+            Dictionary of the attributes of each service, keyed by service name
+        """
+        service_names = self._spop_all(self.keynamehelper.create_key_name("service_set"))
+        pipeline = self.redis.pipeline()
+        for service_name in service_names:
+            pipeline.get(self.keynamehelper.create_key_name("service_attrs", service_name))
+        services_attrs = dict()
+        for service_name, stringified_service_attrs in zip(service_names, pipeline.execute()):
+            if stringified_service_attrs is not None:
+                services_attrs[service_name] = json.loads(stringified_service_attrs)
+        return services_attrs
+
+    def restore_task_states(self) -> Dict[str, dict]:
+        """
+        Restore the worker service task states last stored in Redis, emptying the set of their ids.
+
+        The set is emptied in batches of ``SPOP`` with a count, and the states read in a single pipeline, so the number
+        of round trips does not grow with the number of tasks.
+
+        Returns
+        -------
+        task_states
+            Dictionary of task states, keyed by the ``service_tasks`` set member id of each
+        """
+        task_service_ids = self._spop_all(self.keynamehelper.create_key_name("service_tasks"))
+        pipeline = self.redis.pipeline()
+        for task_service_id in task_service_ids:
+            pipeline.hgetall(self.keynamehelper.create_key_name("running_services", task_service_id))
+        return {task_service_id: state for task_service_id, state in zip(task_service_ids, pipeline.execute())
+                if len(state) > 0}
+
     def retrieve_running_jobs_attr_from_redis(self) -> list:
         """
         Retrive services.attrs for all jobs in running job queue from redis,
@@ -862,15 +1190,8 @@ class QueMonitor(RedisBacked):
         # Initialize runningJobList the first time it is called
         runningJobList = list()
 
-        # retrieve first element of the service set from redis
-        service_set_key = self.keynamehelper.create_key_name("service_set")
-        service_name = self.redis.spop(service_set_key)
-        # iterate through the saved service set
-        while service_name != None:
-            service_attrs_hash_key = self.keynamehelper.create_key_name("service_attrs", service_name)
-            stringified_service_attrs = self.redis.get(service_attrs_hash_key)
-            service_attrs = json.loads(stringified_service_attrs)  # convert string data to object(dict/JSON)
-
+        # iterate through the saved service set, restored from redis in bulk
+        for service_name, service_attrs in self.restore_service_attrs().items():
             # extract individual attribute to be used for creating service
             Image = pn.find('Image', service_attrs)
             *Image, = Image
@@ -901,9 +1222,6 @@ class QueMonitor(RedisBacked):
                             "RestartPolicy": RestartPolicy, "HostNode": HostNode, "cpus_alloc": cpus_alloc}
             runningJobList.append(service_dict)
 
-            # retrieve service_name for next iteration
-            service_name = self.redis.spop(service_set_key)
-
         #print("\nend of que_monitor.retrieve_running_jobs_from_redis")
         #print("=" * 30)
         return runningJobList
@@ -923,32 +1241,8 @@ class QueMonitor(RedisBacked):
         # docker api
         client = self.docker_client
 
-        # initialize service_state_list
-        service_state_list = list()
-
-        # create t_set_key needed to find task_service_id, which has a one-to-one correpondence
-        # with service_state_dict
-        task_set_key = self.keynamehelper.create_key_name("service_tasks")
-        task_service_id = self.redis.spop(task_set_key)
-        while task_service_id != None:
-            task_key = self.keynamehelper.create_key_name("running_services", task_service_id)
-            service_state_dict = self.redis.hgetall(task_key)
-
-            # form service_state_list needed for job resubmission
-            service_state_list.append(service_state_dict)
-
-            # extract individual item of the dictionary if necessary such as validation
-            # otherwise comment out the next 4 lines of code
-            service_name = service_state_dict['service_name']
-            #print("service_name = {}".format(service_name))
-            taskState = service_state_dict['taskState']
-            #print("taskState = {}".format(taskState))
-            # task_host = service_state_dict['task_host']
-            # task_container_id = service_state_dict['task_container_id']
-            # task_desired_state = service_state_dict['task_desired_state']
-
-            # get next task_service_id from redis
-            task_service_id = self.redis.spop(task_set_key)
+        # restore all the task states saved in redis in bulk, forming the service_state_list needed for job resubmission
+        service_state_list = list(self.restore_task_states().values())
 
         #print("end of retrieve_job_state_from_redis()")
         return service_state_list
@@ -1016,9 +1310,9 @@ def main():
     nodeList = q.get_node_info()
     q.check_available_resources()
 
-    while True:
-        time.sleep(30)
-        q.check_system_state()
+    # keep watching the worker services, checking the logs of each as its tasks stop
+    from dmod.monitor.async_monitor import AsyncQueMonitor
+    asyncio.run(AsyncQueMonitor(q).run())
 
     print("end of que_monitor")
 
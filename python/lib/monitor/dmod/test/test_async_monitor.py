@@ -0,0 +1,254 @@
+import asyncio
+import docker
+import threading
+import time
+import unittest
+from typing import List, Optional
+from unittest.mock import MagicMock
+
+from ..monitor.async_monitor import AsyncQueMonitor, Backoff
+
+
+class MockEventsStream:
+    """
+    Mock of a Docker events stream, yielding the given events, and then either ending or failing with a given error.
+    """
+
+    def __init__(self, events: List[dict], error: Exception = None):
+        self._events = iter(events)
+        self._error = error
+        self.closed = False
+
+    def __iter__(self):
+        return self
+
+    def __next__(self):
+        try:
+            return next(self._events)
+        except StopIteration:
+            if self._error is not None:
+                raise self._error
+            raise
+
+    def close(self):
+        self.closed = True
+
+
+class RecordingBackoff(Backoff):
+    """
+    Backoff with negligible delays, recording the attempts for which delays were requested.
+    """
+
+    def __init__(self, max_attempts: int = 3):
+        super().__init__(initial=0.001, maximum=0.001, max_attempts=max_attempts)
+        self.attempts: List[int] = []
+
+    def get_delay(self, attempt: int) -> float:
+        self.attempts.append(attempt)
+        return super().get_delay(attempt)
+
+
+class MockQueMonitor:
+    """
+    Mock of the wrapped ::class:`QueMonitor`, recording the events handled, and optionally failing to handle them.
+
+    Events are simplified to dicts with the ``id`` and ``name`` of the affected service, if any, along with a
+    ``Type`` and ``Action``.
+    """
+
+    def __init__(self):
+        self.docker_client = MagicMock()
+        self.handled: List[dict] = []
+        self.handle_errors: List[Exception] = []
+        self.handle_calls = 0
+        # When set, handling events blocks until this is set
+        self.handle_release: Optional[threading.Event] = None
+        self.checked_services: List[str] = []
+        self.reconcile_count = 0
+
+    def check_service_state(self, service):
+        self.checked_services.append(service)
+
+    def get_event_service(self, event: dict):
+        if event.get('malformed'):
+            raise KeyError('Actor')
+        return event.get('id'), event.get('name', '')
+
+    def get_events_cursor(self):
+        return None
+
+    def handle_docker_event(self, event: dict) -> bool:
+        self.handle_calls += 1
+        if self.handle_release is not None:
+            self.handle_release.wait(5.0)
+        if len(self.handle_errors) > 0:
+            raise self.handle_errors.pop(0)
+        self.handled.append(event)
+        return True
+
+    def reconcile_job_state(self) -> int:
+        self.reconcile_count += 1
+        return 0
+
+
+class TestBackoff(unittest.TestCase):
+
+    def test_get_delay_1_a(self):
+        """
+            Test delays grow by the multiplier from the initial delay, up to the max delay
+        """
+        backoff = Backoff(initial=1.0, maximum=10.0, multiplier=2.0)
+        self.assertEqual([backoff.get_delay(a) for a in range(6)], [1.0, 2.0, 4.0, 8.0, 10.0, 10.0])
+
+    def test_get_delay_1_b(self):
+        """
+            Test the delay stays at the max, rather than overflowing, after very many failed attempts
+        """
+        backoff = Backoff(initial=1.0, maximum=60.0, multiplier=2.0)
+        self.assertEqual(backoff.get_delay(5000), 60.0)
+
+    def test_init_1_a(self):
+        """
+            Test invalid backoff settings are rejected
+        """
+        self.assertRaises(ValueError, Backoff, initial=0)
+        self.assertRaises(ValueError, Backoff, initial=2.0, maximum=1.0)
+        self.assertRaises(ValueError, Backoff, multiplier=0.5)
+        self.assertRaises(ValueError, Backoff, max_attempts=0)
+
+
+class TestAsyncQueMonitor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.que_monitor = MockQueMonitor()
+        self.backoff = RecordingBackoff()
+        self.monitor = AsyncQueMonitor(self.que_monitor, max_docker_calls=2, backoff=self.backoff)
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    async def _wait_for(self, condition, timeout: float = 5.0):
+        async def wait():
+            while not condition():
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait(), timeout)
+
+    def _run_until(self, condition):
+        """
+        Run the monitor until the given condition is met, and then cancel it.
+        """
+        async def exec_test():
+            task = asyncio.create_task(self.monitor.run())
+            try:
+                await self._wait_for(condition)
+            finally:
+                task.cancel()
+                await asyncio.gather(task, return_exceptions=True)
+
+        self.loop.run_until_complete(exec_test())
+
+    def _set_events_streams(self, *streams: MockEventsStream):
+        """
+        Set the events streams returned by successive reads of the Docker events stream, after which reads return empty
+        streams.
+        """
+        stream_list = list(streams)
+        self.que_monitor.docker_client.events.side_effect = \
+            lambda **kwargs: stream_list.pop(0) if len(stream_list) > 0 else MockEventsStream([])
+
+    def _event(self, service_id: str, action: str = 'update', event_type: str = 'service', **kwargs) -> dict:
+        event = {'id': service_id, 'name': 'nwm_mpi-worker_serv_' + service_id, 'Type': event_type, 'Action': action}
+        event.update(kwargs)
+        return event
+
+    def test_dispatch_events_1_a(self):
+        """
+            Test events are dispatched to a watcher for each affected service, ignoring events for no service
+        """
+        self._set_events_streams(MockEventsStream([self._event('s1'), {'id': None}, self._event('s2')]))
+        self._run_until(lambda: len(self.que_monitor.handled) == 2 and self.monitor.watcher_count == 2)
+        self.assertEqual({e['id'] for e in self.que_monitor.handled}, {'s1', 's2'})
+
+    def test_dispatch_events_1_b(self):
+        """
+            Test a malformed event is skipped, without ending dispatch of later events
+        """
+        self._set_events_streams(MockEventsStream([{'malformed': True}, self._event('s1')]))
+        self._run_until(lambda: len(self.que_monitor.handled) == 1)
+        self.assertEqual(self.que_monitor.handled[0]['id'], 's1')
+
+    def test_watch_service_1_a(self):
+        """
+            Test events received for a service while it is being updated are coalesced, handling just the last
+        """
+        self.que_monitor.handle_release = threading.Event()
+        events = [self._event('s1', n=i) for i in range(3)]
+        self._set_events_streams(MockEventsStream(events))
+
+        def release_after_all_received():
+            if self.que_monitor.handle_calls > 0 and self.monitor._events.empty():
+                self.que_monitor.handle_release.set()
+            return len(self.que_monitor.handled) > 0 and self.que_monitor.handled[-1] is events[-1]
+
+        self._run_until(release_after_all_received)
+        self.assertLess(len(self.que_monitor.handled), len(events))
+
+    def test_watch_service_1_b(self):
+        """
+            Test a watcher ends when its service is removed
+        """
+        self._set_events_streams(MockEventsStream([self._event('s1', 'create'), self._event('s1', 'remove')]))
+        self._run_until(lambda: len(self.que_monitor.handled) > 0 and self.monitor.watcher_count == 0)
+        self.assertEqual(self.que_monitor.handled[-1]['Action'], 'remove')
+
+    def test_watch_service_1_c(self):
+        """
+            Test a watcher gives up updating its service after the backoff's max attempts, until the next event
+        """
+        self.que_monitor.handle_errors = [docker.errors.APIError('Failed')] * self.backoff.max_attempts
+
+        def wait_for_retries_exhausted():
+            while len(self.que_monitor.handle_errors) > 0:
+                time.sleep(0.01)
+
+        def events(**kwargs):
+            # The first event should fail to be handled before the second is received
+            if self.que_monitor.docker_client.events.call_count == 1:
+                return MockEventsStream([self._event('s1', n=1)])
+            if self.que_monitor.docker_client.events.call_count == 2:
+                wait_for_retries_exhausted()
+                return MockEventsStream([self._event('s1', n=2)])
+            return MockEventsStream([])
+
+        self.que_monitor.docker_client.events.side_effect = events
+        self._run_until(lambda: len(self.que_monitor.handled) > 0)
+        self.assertEqual(self.que_monitor.handle_calls, self.backoff.max_attempts + 1)
+        self.assertEqual([e['n'] for e in self.que_monitor.handled], [2])
+
+    def test_watch_service_1_d(self):
+        """
+            Test a service's logs are checked after one of its tasks' containers stops
+        """
+        self.que_monitor.docker_client.services.get.side_effect = lambda service_id: 'service-' + service_id
+        self._set_events_streams(MockEventsStream([self._event('s1', 'die', 'container')]))
+        self._run_until(lambda: len(self.que_monitor.checked_services) > 0)
+        self.assertEqual(self.que_monitor.checked_services, ['service-s1'])
+
+    def test_read_events_1_a(self):
+        """
+            Test the events stream backoff starts over once a reconnected stream delivers an event, even if the stream
+            then fails
+        """
+        stream_results = [docker.errors.APIError('Failed'), docker.errors.APIError('Failed'),
+                          docker.errors.APIError('Failed'), MockEventsStream([{}], docker.errors.APIError('Failed'))]
+
+        def events(**kwargs):
+            result = stream_results.pop(0) if len(stream_results) > 0 else docker.errors.APIError('Failed')
+            if isinstance(result, Exception):
+                raise result
+            return result
+
+        self.que_monitor.docker_client.events.side_effect = events
+        self._run_until(lambda: len(self.backoff.attempts) >= 6)
+        self.assertEqual(self.backoff.attempts[:6], [0, 1, 2, 0, 1, 2])
@@ -0,0 +1,271 @@
+import docker
+import json
+import unittest
+from typing import List
+from unittest.mock import MagicMock, patch
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+from ..monitor.que_monitor import QueMonitor
+
+
+class MockService:
+    """
+    Minimal mock of a Docker service object, strictly for testing the monitor's stored state updates.
+    """
+
+    def __init__(self, name: str, service_id: str, task_state: str = 'running', node: str = 'node-1'):
+        self.name = name
+        self.id = service_id
+        self.attrs = {'ID': service_id, 'Spec': {'Name': name}}
+        self.task_state = task_state
+        self.node = node
+
+    def tasks(self) -> List[dict]:
+        # The older task should be ignored in favor of the most recently updated
+        return [{'ServiceID': self.id, 'DesiredState': 'shutdown',
+                 'Status': {'State': 'shutdown', 'Timestamp': '2021-01-01T00:00:00Z'}},
+                {'ServiceID': self.id, 'DesiredState': 'running',
+                 'Status': {'State': self.task_state, 'Timestamp': '2021-01-02T00:00:00Z',
+                            'ContainerStatus': {'ContainerID': 'container-' + self.id}},
+                 'Spec': {'Placement': {'Constraints': ['node.hostname == {}'.format(self.node)]}}}]
+
+
+@unittest.skipIf(fakeredis is None, "Monitor tests require the optional 'fakeredis' package")
+class TestQueMonitor(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.services = dict()
+        self.docker_client = MagicMock()
+        self.docker_client.services.list.side_effect = lambda: list(self.services.values())
+        self.docker_client.services.get.side_effect = self._get_service
+        self.redis = fakeredis.FakeRedis(decode_responses=True)
+        with patch.object(QueMonitor, '_init_redis_client', return_value=self.redis):
+            self.monitor = QueMonitor('maas', docker_client=self.docker_client)
+
+    def tearDown(self) -> None:
+        self.redis.flushall()
+
+    def _add_service(self, index: int, task_state: str = 'running') -> MockService:
+        service = MockService('nwm_mpi-worker_serv{}'.format(index), 'service-{}'.format(index), task_state)
+        self.services[service.id] = service
+        return service
+
+    def _get_service(self, service_id: str) -> MockService:
+        if service_id not in self.services:
+            raise docker.errors.NotFound('No such service: {}'.format(service_id))
+        return self.services[service_id]
+
+    def _service_event(self, service: MockService, action: str, time_nano: int) -> dict:
+        return {'Type': 'service', 'Action': action, 'timeNano': time_nano,
+                'Actor': {'ID': service.id, 'Attributes': {'name': service.name}}}
+
+    def _container_event(self, service: MockService, action: str, time_nano: int) -> dict:
+        return {'Type': 'container', 'Action': action, 'timeNano': time_nano,
+                'Actor': {'ID': 'container-' + service.id,
+                          'Attributes': {'com.docker.swarm.service.id': service.id,
+                                         'com.docker.swarm.service.name': service.name}}}
+
+    def _task_key(self, service: MockService) -> str:
+        return 'maas:running_services:{}:{}'.format(service.name, service.id)
+
+    def test_handle_docker_event_1_a(self):
+        """
+            Test a service create event stores the service's attributes and latest task state
+        """
+        service = self._add_service(1)
+        self.assertTrue(self.monitor.handle_docker_event(self._service_event(service, 'create', 1600000000000000001)))
+        self.assertEqual(json.loads(self.redis.get('maas:service_attrs:' + service.name)), service.attrs)
+        self.assertEqual(self.redis.smembers('maas:service_set'), {service.name})
+        self.assertEqual(self.redis.smembers('maas:service_tasks'), {service.name + ':' + service.id})
+        task_state = self.redis.hgetall(self._task_key(service))
+        self.assertEqual(task_state['taskState'], 'running')
+        self.assertEqual(task_state['task_host'], 'node-1')
+        self.assertEqual(task_state['task_container_id'], service.name + ':container-' + service.id)
+
+    def test_handle_docker_event_1_b(self):
+        """
+            Test a task container die event updates the stored task state
+        """
+        service = self._add_service(1)
+        self.monitor.handle_docker_event(self._service_event(service, 'create', 1600000000000000000))
+        service.task_state = 'failed'
+        self.assertTrue(self.monitor.handle_docker_event(self._container_event(service, 'die', 1600000001000000000)))
+        self.assertEqual(self.redis.hget(self._task_key(service), 'taskState'), 'failed')
+
+    def test_handle_docker_event_1_c(self):
+        """
+            Test a service remove event removes all stored state of the service, leaving that of other services
+        """
+        service = self._add_service(1)
+        other_service = self._add_service(2)
+        self.monitor.handle_docker_event(self._service_event(service, 'create', 1600000000000000000))
+        self.monitor.handle_docker_event(self._service_event(other_service, 'create', 1600000000000000001))
+        del self.services[service.id]
+        self.assertTrue(self.monitor.handle_docker_event(self._service_event(service, 'remove', 1600000001000000000)))
+        self.assertIsNone(self.redis.get('maas:service_attrs:' + service.name))
+        self.assertFalse(self.redis.exists(self._task_key(service)))
+        self.assertEqual(self.redis.smembers('maas:service_set'), {other_service.name})
+        self.assertEqual(self.redis.smembers('maas:service_tasks'), {other_service.name + ':' + other_service.id})
+
+    def test_handle_docker_event_1_d(self):
+        """
+            Test events for services other than worker services, or for irrelevant container actions, are ignored
+        """
+        service = MockService('nwm_scheduler', 'scheduler-id')
+        self.services[service.id] = service
+        self.assertFalse(self.monitor.handle_docker_event(self._service_event(service, 'update', 1600000000000000000)))
+        worker_service = self._add_service(1)
+        event = self._container_event(worker_service, 'exec_start', 1600000000000000001)
+        self.assertFalse(self.monitor.handle_docker_event(event))
+        self.assertEqual(self.redis.keys('maas:*'), [])
+
+    def test_handle_docker_event_1_e(self):
+        """
+            Test the events cursor is persisted with the handled event's time
+        """
+        service = self._add_service(1)
+        self.monitor.handle_docker_event(self._service_event(service, 'create', 1600000000000000123))
+        self.assertEqual(self.monitor.get_events_cursor(), '1600000000.000000123')
+
+    def test_handle_docker_event_1_f(self):
+        """
+            Test the persisted events cursor only moves forward when events are handled out of order
+        """
+        service = self._add_service(1)
+        self.monitor.handle_docker_event(self._container_event(service, 'start', 1600000002000000000))
+        self.monitor.handle_docker_event(self._container_event(service, 'create', 1600000001000000000))
+        self.assertEqual(self.monitor.get_events_cursor(), '1600000002.000000000')
+
+    def test_reconcile_job_state_1_a(self):
+        """
+            Test reconciling stores the state of all existing worker services, skipping other services
+        """
+        services = [self._add_service(i) for i in range(3)]
+        self.services['scheduler-id'] = MockService('nwm_scheduler', 'scheduler-id')
+        self.assertEqual(self.monitor.reconcile_job_state(), 3)
+        self.assertEqual(self.redis.smembers('maas:service_set'), {s.name for s in services})
+        self.assertEqual(self.redis.smembers('maas:service_tasks'), {s.name + ':' + s.id for s in services})
+
+    def test_reconcile_job_state_1_b(self):
+        """
+            Test reconciling drops stale ``service_set`` and ``service_tasks`` members, and their stored state
+        """
+        service = self._add_service(1)
+        stale_service = self._add_service(2)
+        self.monitor.reconcile_job_state()
+        # Removed without an event being seen
+        del self.services[stale_service.id]
+        self.monitor.reconcile_job_state()
+        self.assertEqual(self.redis.smembers('maas:service_set'), {service.name})
+        self.assertEqual(self.redis.smembers('maas:service_tasks'), {service.name + ':' + service.id})
+        self.assertIsNone(self.redis.get('maas:service_attrs:' + stale_service.name))
+        self.assertFalse(self.redis.exists(self._task_key(stale_service)))
+
+    def test_watch_docker_events_1_a(self):
+        """
+            Test watching resumes from the persisted cursor, handles the window's events, and then persists the cursor
+            at the end of the window
+        """
+        service = self._add_service(1)
+        self.redis.set('maas:docker_events_cursor', '1600000000.000000000')
+        self.docker_client.events.return_value = iter([self._service_event(service, 'create', 1600000001000000000)])
+        self.monitor.watch_docker_events(reconcile_interval=0, max_sweeps=1)
+        self.assertEqual(self.docker_client.events.call_args.kwargs['since'], '1600000000.000000000')
+        self.assertEqual(self.redis.smembers('maas:service_set'), {service.name})
+        window_end = self.docker_client.events.call_args.kwargs['until']
+        self.assertEqual(self.monitor.get_events_cursor(), '{}.000000000'.format(window_end))
+
+    def test_watch_docker_events_1_b(self):
+        """
+            Test a failed events stream falls back to reconciling, without moving the persisted cursor
+        """
+        service = self._add_service(1)
+        self.redis.set('maas:docker_events_cursor', '1600000000.000000000')
+        self.docker_client.events.side_effect = docker.errors.APIError('Events stream failed')
+        self.monitor.watch_docker_events(reconcile_interval=0, max_sweeps=1)
+        self.assertEqual(self.redis.smembers('maas:service_set'), {service.name})
+        self.assertEqual(self.monitor.get_events_cursor(), '1600000000.000000000')
+
+    def test_snapshot_service_attrs_1_a(self):
+        """
+            Test restoring snapshotted service attributes returns them, emptying the set of service names
+        """
+        services_attrs = {s.name: s.attrs for s in [self._add_service(i) for i in range(3)]}
+        self.monitor.snapshot_service_attrs(services_attrs)
+        self.assertEqual(self.monitor.restore_service_attrs(), services_attrs)
+        self.assertFalse(self.redis.exists('maas:service_set'))
+
+    def test_snapshot_service_attrs_1_b(self):
+        """
+            Test restoring snapshotted service attributes for exactly the restore batch size of services
+        """
+        services_attrs = {'nwm_mpi-worker_serv{}'.format(i): {'ID': str(i)}
+                          for i in range(QueMonitor._RESTORE_BATCH_SIZE)}
+        self.monitor.snapshot_service_attrs(services_attrs)
+        self.assertEqual(self.monitor.restore_service_attrs(), services_attrs)
+
+    def test_snapshot_service_attrs_1_c(self):
+        """
+            Test snapshotting no service attributes stores nothing, and restoring with nothing stored returns nothing
+        """
+        self.monitor.snapshot_service_attrs(dict())
+        self.assertEqual(self.redis.keys('maas:*'), [])
+        self.assertEqual(self.monitor.restore_service_attrs(), dict())
+
+    def test_snapshot_task_states_1_a(self):
+        """
+            Test restoring snapshotted task states returns them, emptying the set of their ids
+        """
+        task_states = dict()
+        for service in [self._add_service(i) for i in range(3)]:
+            task_states[service.name + ':' + service.id] = QueMonitor._parse_task_state(service.name,
+                                                                                        service.tasks()[-1])
+        self.monitor.snapshot_task_states(task_states)
+        self.assertEqual(self.monitor.restore_task_states(), task_states)
+        self.assertFalse(self.redis.exists('maas:service_tasks'))
+
+    def test_snapshot_task_states_1_b(self):
+        """
+            Test restoring snapshotted task states for exactly the restore batch size of tasks
+        """
+        task_states = {'nwm_mpi-worker_serv{}:service-{}'.format(i, i): {'taskState': 'running'}
+                       for i in range(QueMonitor._RESTORE_BATCH_SIZE)}
+        self.monitor.snapshot_task_states(task_states)
+        self.assertEqual(self.monitor.restore_task_states(), task_states)
+
+    def test_snapshot_task_states_1_c(self):
+        """
+            Test snapshotting no task states stores nothing, and restoring with nothing stored returns nothing
+        """
+        self.monitor.snapshot_task_states(dict())
+        self.assertEqual(self.redis.keys('maas:*'), [])
+        self.assertEqual(self.monitor.restore_task_states(), dict())
+
+    def test_spop_all_1_a(self):
+        """
+            Test popping all members of a set of exactly the restore batch size
+        """
+        members = {str(i) for i in range(QueMonitor._RESTORE_BATCH_SIZE)}
+        self.redis.sadd('maas:test_set', *members)
+        self.assertEqual(set(self.monitor._spop_all('maas:test_set')), members)
+        self.assertFalse(self.redis.exists('maas:test_set'))
+
+    def test_spop_all_1_b(self):
+        """
+            Test popping all members of a set spanning more than one batch
+        """
+        members = {str(i) for i in range(QueMonitor._RESTORE_BATCH_SIZE * 2 + 1)}
+        self.redis.sadd('maas:test_set', *members)
+        popped = self.monitor._spop_all('maas:test_set')
+        self.assertEqual(len(popped), len(members))
+        self.assertEqual(set(popped), members)
+
+    def test_spop_all_1_c(self):
+        """
+            Test popping all members of an empty set
+        """
+        self.assertEqual(self.monitor._spop_all('maas:test_set'), [])
@@ -1,2 +1,3 @@
 from .keynamehelper import KeyNameHelper
 from .redisbacked import RedisBacked
+from .async_redis_backed import AsyncRedisBacked
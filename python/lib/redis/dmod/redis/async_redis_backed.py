@@ -0,0 +1,137 @@
+from abc import ABC
+from redis.asyncio import BlockingConnectionPool as AsyncConnectionPool, Redis as AsyncRedis
+from redis.commands.core import AsyncScript
+from typing import Dict, Optional
+from .redisbacked import RedisBacked
+
+
+class AsyncRedisBacked(RedisBacked, ABC):
+    """
+    Abstract interface for classes that use a Redis backend store, extending ::class:`RedisBacked` with asyncio clients
+    for use from coroutines.
+
+    The synchronous ::attribute:`redis` client blocks the thread making each call until the Redis response arrives, so
+    using it within a coroutine stalls the entire event loop.  The ::attribute:`async_redis` client (along with the
+    undecoded ::attribute:`async_binary_redis` client) instead yields to the event loop while awaiting responses.  Both
+    draw from bounded pools of connections, so that many concurrent coroutines can each have commands in flight without
+    waiting on each other's round trips, while coroutines beyond the bound simply wait for a connection to be freed.
+
+    The asyncio clients use the same connection settings as ::attribute:`redis`, and are created lazily when first
+    used, since asyncio connections must be created within the event loop that uses them.
+    """
+
+    _ASYNC_CONNECTION_KWARGS = ('host', 'port', 'db', 'username', 'password', 'socket_timeout',
+                                'socket_connect_timeout', 'encoding', 'encoding_errors')
+    """ The connection settings of ::attribute:`redis` that are also applied to the asyncio clients. """
+    _DEFAULT_MAX_ASYNC_CONNECTIONS = 64
+
+    def __init__(self, redis_host: Optional[str] = None, redis_port: Optional[int] = None,
+                 redis_pass: Optional[str] = None, max_async_connections: Optional[int] = None, **kwargs):
+        """
+        Initialize an instance, as for ::class:`RedisBacked`, with the given size limit for asyncio connection pools.
+
+        Parameters
+        ----------
+        redis_host : Optional[str]
+            The value to use, when given, for ``host`` parameter of the Redis connection.
+        redis_port : Optional[int]
+            The value to use, when given, for ``port`` parameter of the Redis connection.
+        redis_pass : Optional[str]
+            The value to use, when given, for ``password`` parameter of the Redis connection.
+        max_async_connections : Optional[int]
+            Optional maximum number of pooled connections for each asyncio client, defaulting to
+            ::attribute:`_DEFAULT_MAX_ASYNC_CONNECTIONS`.
+        kwargs
+            Keyword args, passed through to the ::class:`RedisBacked` init function.
+        """
+        super().__init__(redis_host=redis_host, redis_port=redis_port, redis_pass=redis_pass, **kwargs)
+        self._max_async_connections = self._DEFAULT_MAX_ASYNC_CONNECTIONS if max_async_connections is None \
+            else max_async_connections
+        self._async_redis = None
+        self._async_binary_redis = None
+        self._async_scripts: Dict[str, AsyncScript] = dict()
+
+    def _create_async_connection_pool(self, decode_responses: bool) -> AsyncConnectionPool:
+        """
+        Create a pool of asyncio connections with the same connection settings as ::attribute:`redis`.
+
+        Parameters
+        ----------
+        decode_responses : bool
+            Whether connections of the pool decode responses.
+
+        Returns
+        -------
+        AsyncConnectionPool
+            A new pool of asyncio connections, bounded to ::attribute:`_max_async_connections` connections.
+        """
+        sync_kwargs = self.redis.connection_pool.connection_kwargs
+        connection_kwargs = dict([(k, sync_kwargs[k]) for k in self._ASYNC_CONNECTION_KWARGS if k in sync_kwargs])
+        return AsyncConnectionPool(max_connections=self._max_async_connections, decode_responses=decode_responses,
+                                   **connection_kwargs)
+
+    async def async_close_redis(self):
+        """
+        Close the asyncio clients, if they were created, disconnecting all the connections of their pools.
+        """
+        for client in (self._async_redis, self._async_binary_redis):
+            if client is not None:
+                await client.aclose(close_connection_pool=True)
+        self._async_redis = None
+        self._async_binary_redis = None
+        self._async_scripts = dict()
+
+    def get_async_script(self, script: str) -> AsyncScript:
+        """
+        Get a Lua script registered with ::attribute:`async_redis`, registering it the first time.
+
+        As with scripts registered with ::attribute:`redis`, the returned object executes the script via ``EVALSHA``,
+        loading it when not yet cached by the server, and can be given an asyncio pipeline via its ``client`` param to
+        queue the script within that pipeline (in which case the call must still be awaited).
+
+        Parameters
+        ----------
+        script : str
+            The Lua script source.
+
+        Returns
+        -------
+        AsyncScript
+            The registered script object.
+        """
+        if script not in self._async_scripts:
+            self._async_scripts[script] = self.async_redis.register_script(script)
+        return self._async_scripts[script]
+
+    @property
+    def async_binary_redis(self) -> AsyncRedis:
+        """
+        An asyncio ::class:`redis.asyncio.Redis` object, which does not decode responses, for reading values saved in
+        binary formats.
+
+        The object is created lazily, with its own connection pool.
+
+        Returns
+        -------
+        AsyncRedis
+            An asyncio Redis client for this instance's Redis connection settings that returns responses as ``bytes``.
+        """
+        if self._async_binary_redis is None:
+            self._async_binary_redis = AsyncRedis(connection_pool=self._create_async_connection_pool(False))
+        return self._async_binary_redis
+
+    @property
+    def async_redis(self) -> AsyncRedis:
+        """
+        An asyncio ::class:`redis.asyncio.Redis` object, which decodes responses as ::attribute:`redis` does.
+
+        The object is created lazily, with its own connection pool.
+
+        Returns
+        -------
+        AsyncRedis
+            An asyncio Redis client for this instance's Redis connection settings.
+        """
+        if self._async_redis is None:
+            self._async_redis = AsyncRedis(connection_pool=self._create_async_connection_pool(True))
+        return self._async_redis
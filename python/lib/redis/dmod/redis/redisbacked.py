@@ -1,10 +1,18 @@
+import logging
+import random
 from abc import ABC
 from os import getenv
-from redis import Redis
+from redis import ConnectionPool, Redis
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from threading import Lock
 from time import sleep as time_sleep
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from .keynamehelper import KeyNameHelper
 
+# Process-wide connection pools shared by all instances, keyed by host, port, db, password, and whether decoding
+_connection_pools: Dict[Tuple[str, int, int, str, bool], ConnectionPool] = dict()
+_connection_pools_lock = Lock()
+
 
 class RedisBacked(ABC):
     """
@@ -24,6 +32,31 @@ class RedisBacked(ABC):
     _ENV_NAME_REDIS_HOST = 'REDIS_HOST'
     _ENV_NAME_REDIS_PASS = 'REDIS_PASS'
     _ENV_NAME_REDIS_PORT = 'REDIS_PORT'
+    _INIT_BACKOFF_BASE_SECONDS = 0.25
+    """ Max delay after the first failed connection attempt during initialization, doubled for each further one. """
+    _INIT_BACKOFF_MAX_SECONDS = 8.0
+    """ Overall cap on the delay after a failed connection attempt during initialization. """
+
+    @classmethod
+    def _get_init_retry_delay(cls, attempt: int) -> float:
+        """
+        Get the randomized delay before retrying a failed connection attempt during initialization.
+
+        Delays use exponential backoff with "full jitter": a uniformly random time up to a cap that doubles with each
+        failed attempt (starting at ::attribute:`_INIT_BACKOFF_BASE_SECONDS`), but never exceeds
+        ::attribute:`_INIT_BACKOFF_MAX_SECONDS`.  This keeps several services started at once from retrying in lockstep.
+
+        Parameters
+        ----------
+        attempt : int
+            The zero-based index of the failed attempt.
+
+        Returns
+        -------
+        float
+            The delay in seconds before the next attempt.
+        """
+        return random.uniform(0, min(cls._INIT_BACKOFF_MAX_SECONDS, cls._INIT_BACKOFF_BASE_SECONDS * 2 ** attempt))
 
     @classmethod
     def _init_redis_client(cls, host: str, port: int, passwd: str, max_attempts: int, db_num: int) -> Optional[Redis]:
@@ -34,6 +67,11 @@ class RedisBacked(ABC):
         have something easily separable from the rest of initializer.  The allows for better isolation of logic during
         testing. As such, there is limited sanity checking of parameters.
 
+        The client uses the shared connection pool for its connection settings (see ::method:`get_connection_pool`),
+        and an attempt succeeds when the client can ``PING`` the Redis host, which also health-checks a reused pool.
+        Only connection failures and timeouts are retried, after a delay from ::method:`_get_init_retry_delay`; the
+        first attempt is made immediately.
+
         Parameters
         ----------
         host : str
@@ -56,20 +94,58 @@ class RedisBacked(ABC):
         Optional[Redis]
             An initialize Redis client object, or ``None`` if all attempts failed.
         """
-        n = 0
-        while n <= max_attempts:
-            # Sleep for one second on any retries, but not the first attempt.
-            if n == 0:
-                time_sleep(1)
+        client = Redis(connection_pool=cls.get_connection_pool(host=host, port=port, passwd=passwd, db_num=db_num))
+        attempt = 0
+        while True:
             try:
-                return Redis(host=host, port=port, db=db_num, decode_responses=True, password=passwd)
-            # FIXME except only redis failures here
-            except:
-                # TODO: implement some kind of logging
-                #logging.debug("redis connection error")
-                pass
-            n += 1
-        return None
+                client.ping()
+                return client
+            except (RedisConnectionError, RedisTimeoutError) as e:
+                attempt += 1
+                if attempt >= max_attempts:
+                    logging.error('Failed to connect to Redis at {}:{} after {} attempts: {}'.format(host, port,
+                                                                                                      attempt, e))
+                    return None
+                # Drop any stale idle connections (e.g., from before a Redis restart) so the retry reconnects, but leave
+                # those in use, since the pool is shared by other instances
+                client.connection_pool.disconnect(inuse_connections=False)
+                time_sleep(cls._get_init_retry_delay(attempt - 1))
+
+    @classmethod
+    def get_connection_pool(cls, host: str, port: int, passwd: str, db_num: int,
+                            decode_responses: bool = True) -> ConnectionPool:
+        """
+        Get the process-wide shared connection pool for the given connection settings, creating it if necessary.
+
+        All instances (of any subtype) with the same connection settings share a single pool, rather than each holding
+        its own connections.
+
+        Parameters
+        ----------
+        host : str
+            The Redis host.
+        port : int
+            The listening port of the Redis host.
+        passwd : str
+            The password to authenticate with the Redis host.
+        db_num : int
+            The Redis ``db`` parameter value to use.
+        decode_responses : bool
+            Whether connections of the pool decode responses, which is ``True`` by default.
+
+        Returns
+        -------
+        ConnectionPool
+            The shared connection pool for the given connection settings.
+        """
+        pool_key = (host, int(port), int(db_num), passwd, decode_responses)
+        with _connection_pools_lock:
+            pool = _connection_pools.get(pool_key)
+            if pool is None:
+                pool = ConnectionPool(host=host, port=int(port), db=int(db_num), password=passwd,
+                                      decode_responses=decode_responses)
+                _connection_pools[pool_key] = pool
+            return pool
 
     @classmethod
     def get_docker_secret_name_for_redis_pass(cls) -> str:
@@ -186,12 +262,13 @@ class RedisBacked(ABC):
         replaced with the returned value from ::method:`get_redis_host`, ::method:`get_redis_port`, and/or
         ::method:`get_redis_pass` respectively.
 
-        Once the parameter values are set, the method will attempt to initialize a ::class:`Redis` connection object
-        and store it in the backing attribute for the ::attribute:`redis` property.  It will optionally retry if
-        attempts encounter raised errors, sleeping for 1 second after each attempt, up to the given maximum number of
-        attempts. By default, the maximum number of attempts is ``5`` if not provided.  This value is also used if a
-        non-integer argument is passed (meaning also that the argument cannot be cast to an integer).  Additionally,
-        argument values of less than one will still be tried once, though not re-tried.
+        Once the parameter values are set, the method will attempt to initialize a ::class:`Redis` connection object,
+        using the process-wide shared connection pool for the connection settings, and store it in the backing attribute
+        for the ::attribute:`redis` property.  It will retry if attempts fail to connect, with an exponential, jittered
+        backoff between attempts, up to the given maximum number of attempts. By default, the maximum number of attempts
+        is ``5`` if not provided.  This value is also used if a non-integer argument is passed (meaning also that the
+        argument cannot be cast to an integer).  Additionally, argument values of less than one will still be tried
+        once, though not re-tried.
 
         Objects also have their ::attribute:`keynamehelper` attribute set at initialization to the value returned by
         ::method:``KeyNameHelper.get_default_instance``.
@@ -256,6 +333,7 @@ class RedisBacked(ABC):
             self._db_num = 0
             self._reset_keys = False
 
+        self._binary_redis = None
         self._redis = self._init_redis_client(host=redis_host, port=redis_port, passwd=redis_pass,
                                               max_attempts=max_redis_init_attempts, db_num=self._db_num)
         if self._redis is None:
@@ -307,3 +385,23 @@ class RedisBacked(ABC):
             The ::class:`Redis` object for the created Redis connection.
         """
         return self._redis
+
+    @property
+    def binary_redis(self) -> Redis:
+        """
+        A ::class:`Redis` object with the same connection settings as ::attribute:`redis`, but that does not decode
+        responses, for reading values saved in binary formats.
+
+        The object is created lazily, using the shared non-decoding connection pool for the connection settings.
+
+        Returns
+        -------
+        Redis
+            A ::class:`Redis` object for the same Redis connection settings that returns responses as ``bytes``.
+        """
+        if self._binary_redis is None:
+            kwargs = self.redis.connection_pool.connection_kwargs
+            pool = self.get_connection_pool(host=kwargs['host'], port=kwargs['port'], passwd=kwargs['password'],
+                                            db_num=kwargs['db'], decode_responses=False)
+            self._binary_redis = Redis(connection_pool=pool)
+        return self._binary_redis
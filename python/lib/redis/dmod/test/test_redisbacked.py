@@ -0,0 +1,54 @@
+from unittest import TestCase, mock
+from ..redis.redisbacked import RedisBacked
+
+
+class TestRedisBacked(TestCase):
+
+    def test_get_connection_pool_1_a(self):
+        """
+        Test that the same shared pool is returned for the same connection settings.
+        """
+        pool_1 = RedisBacked.get_connection_pool(host='test-host', port=6379, passwd='pass', db_num=4)
+        pool_2 = RedisBacked.get_connection_pool(host='test-host', port='6379', passwd='pass', db_num=4)
+        self.assertIs(pool_1, pool_2)
+
+    def test_get_connection_pool_1_b(self):
+        """
+        Test that different shared pools are returned for different dbs or decoding settings.
+        """
+        pool = RedisBacked.get_connection_pool(host='test-host', port=6379, passwd='pass', db_num=4)
+        other_db_pool = RedisBacked.get_connection_pool(host='test-host', port=6379, passwd='pass', db_num=5)
+        binary_pool = RedisBacked.get_connection_pool(host='test-host', port=6379, passwd='pass', db_num=4,
+                                                      decode_responses=False)
+        self.assertIsNot(pool, other_db_pool)
+        self.assertIsNot(pool, binary_pool)
+        self.assertFalse(binary_pool.connection_kwargs['decode_responses'])
+
+    def test_get_init_retry_delay_1_a(self):
+        """
+        Test that retry delays are within the doubling cap for each attempt, and never exceed the overall cap.
+        """
+        for attempt in range(10):
+            cap = min(RedisBacked._INIT_BACKOFF_MAX_SECONDS, RedisBacked._INIT_BACKOFF_BASE_SECONDS * 2 ** attempt)
+            for _ in range(20):
+                delay = RedisBacked._get_init_retry_delay(attempt)
+                self.assertGreaterEqual(delay, 0)
+                self.assertLessEqual(delay, cap)
+
+    def test_init_redis_client_1_a(self):
+        """
+        Test that connection failures are retried up to the max attempts, sleeping only between attempts.
+        """
+        with mock.patch('dmod.redis.redisbacked.time_sleep') as mock_sleep:
+            client = RedisBacked._init_redis_client(host='127.0.0.1', port=1, passwd='', max_attempts=3, db_num=0)
+        self.assertIsNone(client)
+        self.assertEqual(mock_sleep.call_count, 2)
+
+    def test_init_redis_client_1_b(self):
+        """
+        Test that retries only disconnect idle connections of the shared pool, leaving those in use by other instances.
+        """
+        pool = RedisBacked.get_connection_pool(host='127.0.0.1', port=1, passwd='', db_num=0)
+        with mock.patch('dmod.redis.redisbacked.time_sleep'), mock.patch.object(pool, 'disconnect') as mock_disconnect:
+            RedisBacked._init_redis_client(host='127.0.0.1', port=1, passwd='', max_attempts=2, db_num=0)
+        mock_disconnect.assert_called_once_with(inuse_connections=False)
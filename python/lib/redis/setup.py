@@ -17,6 +17,6 @@ setup(
     author_email='',
     url='',
     license='',
-    install_requires=['redis'],
+    install_requires=['redis>=4.2.0'],
     packages=find_namespace_packages(exclude=('test'))
 )
\ No newline at end of file
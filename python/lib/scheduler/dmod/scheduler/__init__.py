@@ -1,6 +1,7 @@
 from .rsa_key_pair import RsaKeyPair
 from .ssh_key_util import SshKeyUtil, SshKeyUtilImpl
 from .utils import *
+from .image_and_domain_catalog import ImageAndDomainCatalog
 from .scheduler import Launcher
 from .resources import RedisManager, Resource
 name = 'scheduler'
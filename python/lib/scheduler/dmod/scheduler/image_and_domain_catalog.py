@@ -0,0 +1,222 @@
+import json
+import logging
+import yaml
+from os import stat
+from pathlib import Path
+from threading import RLock
+from typing import List, Optional, Tuple, Union
+
+from redis import Redis, RedisError
+
+
+class ImageAndDomainCatalog:
+    """
+    In-memory catalog of the supported models, with their image versions, domains, and output mounts, as configured in
+    an images and domains YAML file (e.g., ``image_and_domain.yaml``).
+
+    The file is loaded once, rather than for every lookup, with the loaded catalog then kept until the file's
+    modification time changes (checked on each lookup) or ::method:`reload` is called.  Lookups are then just
+    dictionary lookups into the loaded catalog.
+
+    When given a Redis client, the catalog also publishes its contents (as JSON) to a Redis key whenever it is loaded,
+    so other services can share the same catalog via ::method:`get_published` without needing the file.
+    """
+
+    DEFAULT_REDIS_KEY = 'image_and_domain_catalog'
+    """ Default Redis key to which the catalog is published. """
+
+    @classmethod
+    def get_published(cls, redis_client: Redis, redis_key: Optional[str] = None) -> Optional[dict]:
+        """
+        Get the catalog contents last published to Redis by any instance.
+
+        Note that, since it is published as JSON, keys that are numbers in the YAML file (e.g., some model versions)
+        will be strings.
+
+        Parameters
+        ----------
+        redis_client : Redis
+            The Redis client.
+        redis_key : Optional[str]
+            The Redis key to which the catalog is published, defaulting to ::attribute:`DEFAULT_REDIS_KEY`.
+
+        Returns
+        -------
+        Optional[dict]
+            The published catalog contents, or ``None`` if nothing has been published.
+        """
+        published = redis_client.get(cls.DEFAULT_REDIS_KEY if redis_key is None else redis_key)
+        return None if published is None else json.loads(published)
+
+    def __init__(self, yaml_file: Union[str, Path], redis_client: Optional[Redis] = None,
+                 redis_key: Optional[str] = None):
+        """
+        Parameters
+        ----------
+        yaml_file : Union[str, Path]
+            The images and domains YAML file.
+        redis_client : Optional[Redis]
+            An optional Redis client, with which to publish the catalog when loaded.
+        redis_key : Optional[str]
+            The Redis key to which the catalog is published, defaulting to ::attribute:`DEFAULT_REDIS_KEY`.
+        """
+        self._yaml_file = Path(yaml_file)
+        self._redis_client = redis_client
+        self._redis_key = self.DEFAULT_REDIS_KEY if redis_key is None else redis_key
+        self._catalog: Optional[dict] = None
+        self._loaded_mtime: Optional[float] = None
+        self._lock = RLock()
+
+    def _get_catalog(self) -> dict:
+        """
+        Get the loaded catalog, first (re)loading it if not yet loaded or if the file has been modified since.
+
+        If the file cannot be read or parsed (e.g., while it is being replaced), the last loaded catalog continues to be
+        used, with the error only raised if the catalog has never been loaded.
+        """
+        with self._lock:
+            try:
+                mtime = stat(self._yaml_file).st_mtime
+                if self._catalog is None or mtime != self._loaded_mtime:
+                    self._load(mtime)
+            except (OSError, yaml.YAMLError) as e:
+                if self._catalog is None:
+                    raise
+                logging.warning("Using previously loaded image and domain catalog, as {} could not be loaded: {}".format(
+                    self._yaml_file, e))
+            return self._catalog
+
+    def _load(self, mtime: float):
+        with self._lock:
+            with open(self._yaml_file) as fn:
+                catalog = yaml.safe_load(fn)
+            self._catalog = dict() if catalog is None else catalog
+            self._loaded_mtime = mtime
+            logging.info("Loaded image and domain catalog from {}".format(self._yaml_file))
+            # Publishing is best-effort, as lookups do not depend on it
+            if self._redis_client is not None:
+                try:
+                    self._redis_client.set(self._redis_key, json.dumps(self._catalog))
+                except RedisError as e:
+                    logging.error("Failed to publish image and domain catalog to Redis: {}".format(e))
+
+    def get_domains(self, name: str) -> List[str]:
+        """
+        Get the names of the domains supported for the given model.
+
+        Parameters
+        ----------
+        name : str
+            The name of the model.
+
+        Returns
+        -------
+        List[str]
+            The names of the domains supported for the given model, which is empty if the model is not supported.
+        """
+        return list(self._get_catalog().get(name, {}).get('domains', {}).keys())
+
+    def get_image_and_mounts(self, name: str, version: str, domain: str) -> Tuple[str, List[str]]:
+        """
+        Get the image for the given model and version, along with the mounts for the given domain and the model's output.
+
+        Parameters
+        ----------
+        name: str
+            The name of the model, which must match a top level key in the catalog
+        version:
+            The version of the model, which must match a key under name: version: in the catalog
+        domain:
+            The model domain, which must match a key under name: domain: in the catalog
+
+        Returns
+        -------
+        Tuple[str, List[str]]
+            The image, and a list of docker style mount strings in the form ``local_dir:run_dir:rw``, for the domain
+            and then the output
+
+        Raises
+        -------
+        KeyError
+            If the model, version, or domain are not in the catalog, or if the catalog entry is missing required keys.
+        """
+        yml_obj = self._get_catalog()
+        try:
+            model = yml_obj[name]
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no model key {}".format(name)))
+        try:
+            domain = model['domains'][domain]
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no domain key {} for model {}".format(domain, name)))
+        try:
+            run_dir = domain['run']
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no 'run' key for domain {}, model {}".format(domain, name)))
+        try:
+            local_dir = domain['local']
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no 'local' key for domain {}, model {}".format(domain, name)))
+        try:
+            image = model['version'][version]
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no version key {}".format(version)))
+        try:
+            output = model['output']
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no 'output' key for model {}".format(name)))
+        try:
+            output_local = output['local']
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no `local` key for output, model {}".format(name)))
+        try:
+            output_run = output['run']
+        except KeyError:
+            raise(KeyError("image_and_domain.yaml has no `run` key for output, model {}".format(name)))
+
+        input_mount = "{}:{}:rw".format(local_dir, run_dir)
+        output_mount = "{}:{}:rw".format(output_local, output_run)
+
+        return image, [input_mount, output_mount]
+
+    def is_supported(self, name: str, version: str, domain: str) -> bool:
+        """
+        Test whether the given model, version, and domain are supported, i.e., can be launched.
+
+        Parameters
+        ----------
+        name: str
+            The name of the model
+        version:
+            The version of the model
+        domain:
+            The model domain
+
+        Returns
+        -------
+        bool
+            Whether the given model, version, and domain are supported.
+        """
+        try:
+            self.get_image_and_mounts(name, version, domain)
+            return True
+        except (KeyError, TypeError):
+            return False
+
+    def reload(self):
+        """
+        Reload the catalog from the file, regardless of whether the file has been modified.
+        """
+        self._load(stat(self._yaml_file).st_mtime)
+
+    @property
+    def yaml_file(self) -> Path:
+        """
+        The images and domains YAML file.
+
+        Returns
+        -------
+        Path
+            The images and domains YAML file.
+        """
+        return self._yaml_file
@@ -0,0 +1,142 @@
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, Optional, Tuple
+
+from .job import Job, JobAllocationParadigm
+from ..resources.resource_allocation import ResourceAllocation
+
+
+class BackfillReservation:
+    """
+    A reservation of future resource capacity for the highest priority job that could not be allocated during an EASY
+    backfill allocation pass.
+
+    The reservation is estimated from the CPUs currently available on each resource and the expected end times of the
+    jobs currently holding allocations.  Allocations of running jobs are (virtually) released in order of expected end
+    time until the reserved job would fit; that time is the reservation's "shadow time".  Whatever capacity would be
+    available at the shadow time beyond what the reserved job needs is the "extra" capacity.
+
+    A lower priority job may then be backfilled if it is expected to end before the shadow time, or if its allocations
+    are entirely within the extra capacity, since either way it cannot delay the reserved job.
+
+    Reservations only account for CPUs, and (aside from ``SINGLE_NODE``) treat all allocation paradigms as able to spread
+    a job's CPUs over any resources.
+    """
+
+    @classmethod
+    def _plan(cls, job: Job, free_cpus: Dict[str, int]) -> Optional[Dict[str, int]]:
+        """
+        Plan the CPUs per resource the given job would use with the given available CPUs, or ``None`` if it won't fit.
+        """
+        if job.allocation_paradigm == JobAllocationParadigm.SINGLE_NODE:
+            fitting = [r for r in free_cpus if free_cpus[r] >= job.cpu_count]
+            if len(fitting) == 0:
+                return None
+            return {min(fitting, key=lambda r: free_cpus[r]): job.cpu_count}
+        planned = dict()
+        remaining = job.cpu_count
+        for resource_id in sorted(free_cpus, key=lambda r: free_cpus[r], reverse=True):
+            if remaining < 1 or free_cpus[resource_id] < 1:
+                break
+            planned[resource_id] = min(free_cpus[resource_id], remaining)
+            remaining -= planned[resource_id]
+        return planned if remaining < 1 else None
+
+    @classmethod
+    def estimate(cls, job: Job, free_cpus: Dict[str, int],
+                 running: Iterable[Tuple[datetime, Iterable[ResourceAllocation]]],
+                 now: Optional[datetime] = None) -> Optional['BackfillReservation']:
+        """
+        Estimate the reservation for a job, based on the current available CPUs and jobs currently holding allocations.
+
+        Parameters
+        ----------
+        job : Job
+            The job for which to make the reservation.
+        free_cpus : Dict[str, int]
+            The currently available CPUs, keyed by resource id.
+        running : Iterable[Tuple[datetime, Iterable[ResourceAllocation]]]
+            Tuples of expected end time and allocations for each job currently holding allocations.
+        now : Optional[datetime]
+            The current time, which is determined automatically if not provided.
+
+        Returns
+        -------
+        Optional[BackfillReservation]
+            The reservation, or ``None`` if the job would not fit even after all current allocations are released.
+        """
+        now = datetime.now() if now is None else now
+        free = dict(free_cpus)
+        shadow_time = now
+        planned = cls._plan(job, free)
+        for end_time, allocations in sorted(running, key=lambda r: r[0]):
+            if planned is not None:
+                break
+            for allocation in allocations:
+                free[allocation.resource_id] = free.get(allocation.resource_id, 0) + allocation.cpu_count
+            shadow_time = max(end_time, now)
+            planned = cls._plan(job, free)
+        if planned is None:
+            return None
+        extra = dict([(r, free[r] - planned.get(r, 0)) for r in free])
+        return cls(job=job, shadow_time=shadow_time, extra_cpus=extra)
+
+    def __init__(self, job: Job, shadow_time: datetime, extra_cpus: Dict[str, int]):
+        self.job = job
+        self.shadow_time = shadow_time
+        self.extra_cpus = extra_cpus
+
+    def _ends_before_shadow_time(self, walltime: timedelta, now: Optional[datetime] = None) -> bool:
+        return (datetime.now() if now is None else now) + walltime <= self.shadow_time
+
+    def could_backfill(self, job: Job, walltime: timedelta, now: Optional[datetime] = None) -> bool:
+        """
+        Get whether the given job could potentially be backfilled without delaying the reserved job.
+
+        Parameters
+        ----------
+        job : Job
+            The lower priority job under consideration.
+        walltime : timedelta
+            The estimated walltime of the job.
+        now : Optional[datetime]
+            The current time, which is determined automatically if not provided.
+
+        Returns
+        -------
+        bool
+            Whether the job either would end before the shadow time or could fit within the extra capacity.
+        """
+        return self._ends_before_shadow_time(walltime, now) or self._plan(job, self.extra_cpus) is not None
+
+    def claim(self, job: Job, walltime: timedelta, now: Optional[datetime] = None) -> bool:
+        """
+        Account for the allocations received by a backfilled job, if they do not delay the reserved job.
+
+        A job that will end before the shadow time is always accepted.  Otherwise, the job's allocations must fit within
+        the remaining extra capacity, which they are then deducted from.
+
+        Parameters
+        ----------
+        job : Job
+            The lower priority job that has received allocations.
+        walltime : timedelta
+            The estimated walltime of the job.
+        now : Optional[datetime]
+            The current time, which is determined automatically if not provided.
+
+        Returns
+        -------
+        bool
+            Whether the job's allocations are acceptable, in which case they have been accounted for; if ``False``, the
+            allocations should be released.
+        """
+        if self._ends_before_shadow_time(walltime, now):
+            return True
+        needed = dict()
+        for allocation in job.allocations:
+            needed[allocation.resource_id] = needed.get(allocation.resource_id, 0) + allocation.cpu_count
+        if any(self.extra_cpus.get(r, 0) < needed[r] for r in needed):
+            return False
+        for resource_id in needed:
+            self.extra_cpus[resource_id] -= needed[resource_id]
+        return True
@@ -0,0 +1,168 @@
+import math
+from typing import Dict, Iterable, Optional
+
+from redis import Redis
+
+from dmod.redis import KeyNameHelper
+
+from ..resources.resource_allocation import ResourceAllocation
+
+
+class FairShareLedger:
+    """
+    Redis-backed record of the decayed resource usage of each user, for use in fair-share scheduling.
+
+    Usage is measured in CPU-seconds and decays exponentially with a configurable half-life, so that usage from long ago
+    counts for less than recent usage.  Each user's usage is kept as a value and the time at which it was last updated;
+    when read, the value is decayed forward to the current time.  A running total over all users is kept the same way,
+    which is exact because every user's usage decays at the same rate.
+
+    Usage is charged incrementally, once per job, when the job's allocations are released (see ::method:`charge`), using
+    a registered Lua script so that concurrent charges from different job manager instances are atomic.  Reading usage
+    for a set of users is a single pipelined round trip, independent of the number of jobs ever run.  The usage of
+    allocations still being held can be included in reads by the caller via ::method:`decayed_cpu_seconds`.
+    """
+
+    _CHARGE_SCRIPT = """
+        -- KEYS[1]: per-user usage hash key; KEYS[2]: per-user last updated hash key; KEYS[3]: total usage hash key
+        -- ARGV: user, decayed CPU-seconds to add, current timestamp, half-life in seconds
+        -- Returns the user's new usage
+        local now = tonumber(ARGV[3])
+        local half_life = tonumber(ARGV[4])
+        local function charge(usage_key, usage_field, updated_key, updated_field)
+            local usage = tonumber(redis.call('HGET', usage_key, usage_field) or '0')
+            local updated = tonumber(redis.call('HGET', updated_key, updated_field) or ARGV[3])
+            local elapsed = math.max(now - updated, 0)
+            usage = usage * (0.5 ^ (elapsed / half_life)) + tonumber(ARGV[2])
+            redis.call('HSET', usage_key, usage_field, string.format('%.17g', usage))
+            redis.call('HSET', updated_key, updated_field, string.format('%.17g', math.max(now, updated)))
+            return usage
+        end
+        charge(KEYS[3], 'usage', KEYS[3], 'updated')
+        return tostring(charge(KEYS[1], ARGV[1], KEYS[2], ARGV[1]))
+    """
+
+    @classmethod
+    def decay_factor(cls, elapsed_seconds: float, half_life: float) -> float:
+        """
+        Get the factor by which usage decays over the given elapsed time.
+
+        Parameters
+        ----------
+        elapsed_seconds : float
+            The elapsed time in seconds, with negative values treated as ``0``.
+        half_life : float
+            The usage half-life in seconds.
+
+        Returns
+        -------
+        float
+            The decay factor, between ``0`` and ``1``.
+        """
+        return 0.5 ** (max(elapsed_seconds, 0.0) / half_life)
+
+    @classmethod
+    def decayed_cpu_seconds(cls, allocations: Iterable[ResourceAllocation], end_timestamp: float,
+                            half_life: float) -> float:
+        """
+        Get the CPU-seconds used by the given allocations from their creation until the given time, with usage at each
+        instant decayed forward to the end time.
+
+        This is the integral of decayed CPU usage over each allocation's lifetime, so a long job is not charged as if all
+        of its usage happened at the end.
+
+        Parameters
+        ----------
+        allocations : Iterable[ResourceAllocation]
+            The allocations of interest.
+        end_timestamp : float
+            The end of the usage period (e.g., when allocations were released, or the current time), as a timestamp.
+        half_life : float
+            The usage half-life in seconds.
+
+        Returns
+        -------
+        float
+            The decayed CPU-seconds used.
+        """
+        mean_life = half_life / math.log(2)
+        total = 0.0
+        for allocation in allocations:
+            duration = max(end_timestamp - allocation.created.timestamp(), 0.0)
+            total += allocation.cpu_count * mean_life * (1.0 - cls.decay_factor(duration, half_life))
+        return total
+
+    def __init__(self, redis: Redis, base_key: str, half_life: float):
+        """
+
+        Parameters
+        ----------
+        redis : Redis
+            The Redis client to use.
+        base_key : str
+            The base Redis key, from which the keys of this ledger's records are derived.
+        half_life : float
+            The usage half-life in seconds.
+        """
+        self.redis = redis
+        self.half_life = half_life
+        keynamehelper = KeyNameHelper.get_default_instance()
+        self._usage_key = keynamehelper.create_derived_key(base_key, 'usage')
+        self._updated_key = keynamehelper.create_derived_key(base_key, 'updated')
+        self._total_key = keynamehelper.create_derived_key(base_key, 'total')
+        self._charge_script = self.redis.register_script(self._CHARGE_SCRIPT)
+
+    def charge(self, user: str, allocations: Iterable[ResourceAllocation], end_timestamp: float) -> float:
+        """
+        Add the usage of the given allocations, held until the given time, to the recorded usage of the given user.
+
+        Parameters
+        ----------
+        user : str
+            The user to charge.
+        allocations : Iterable[ResourceAllocation]
+            The allocations to charge for, typically as they are released.
+        end_timestamp : float
+            When the allocations stopped being used, as a timestamp.
+
+        Returns
+        -------
+        float
+            The user's updated usage.
+        """
+        cpu_seconds = self.decayed_cpu_seconds(allocations, end_timestamp, self.half_life)
+        return float(self._charge_script(keys=[self._usage_key, self._updated_key, self._total_key],
+                                         args=[user, repr(cpu_seconds), repr(end_timestamp), repr(self.half_life)]))
+
+    def get_usage(self, users: Iterable[str], now_timestamp: float) -> Dict[Optional[str], float]:
+        """
+        Get the recorded usage of the given users and the total recorded usage of all users, decayed to the given time.
+
+        Parameters
+        ----------
+        users : Iterable[str]
+            The users of interest.
+        now_timestamp : float
+            The current time, as a timestamp.
+
+        Returns
+        -------
+        Dict[Optional[str], float]
+            The decayed usage of each user, with the total usage of all users keyed by ``None``.
+        """
+        users = list(users)
+        pipeline = self.redis.pipeline(transaction=False)
+        if len(users) > 0:
+            pipeline.hmget(self._usage_key, users)
+            pipeline.hmget(self._updated_key, users)
+        pipeline.hmget(self._total_key, ['usage', 'updated'])
+        results = pipeline.execute()
+        if len(users) == 0:
+            results = [[], []] + results
+        usage = dict()
+        for user, value, updated in zip(users + [None], results[0] + results[2][:1], results[1] + results[2][1:]):
+            if value is None:
+                usage[user] = 0.0
+            else:
+                usage[user] = float(value) * self.decay_factor(now_timestamp - float(updated), self.half_life)
+        return usage
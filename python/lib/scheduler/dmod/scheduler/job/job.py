@@ -3,7 +3,7 @@ from datetime import datetime
 from dmod.communication import SchedulerRequestMessage
 from dmod.communication.serializeable import Serializable
 from enum import Enum
-from typing import List, Optional, Tuple, TYPE_CHECKING, Union
+from typing import FrozenSet, Iterable, List, Optional, Tuple, TYPE_CHECKING, Union
 from uuid import UUID
 from uuid import uuid4 as uuid_func
 
@@ -25,11 +25,14 @@ class JobAllocationParadigm(Enum):
                       until the sum of assets among all received allocations is sufficient
         ROUND_ROBIN - obtain allocations of assets from available resource nodes in a round-robin manner
         SINGLE_NODE - require all allocation of assets to be from a single resource/host
+        BEST_FIT    - obtain allocations of assets from the resource(s) that would leave the least unused capacity, using
+                      a single resource when possible and otherwise as few as possible
     """
 
     FILL_NODES = 0
     ROUND_ROBIN = 1
     SINGLE_NODE = 2
+    BEST_FIT = 3
 
     @classmethod
     def get_default_selection(cls):
@@ -64,17 +67,19 @@ class JobAllocationParadigm(Enum):
         if name is None or not isinstance(name, str):
             return None if strict else cls.get_default_selection()
 
-        # Adjust literal name string param value to generalize a little better
-        adjusted_name = name.strip().replace('-', '_').upper()
-
-        for enum_val in cls:
-            # Do similar generalizing for enum name values
-            if enum_val.name.replace('-', '_').upper() == adjusted_name:
-                return enum_val
+        # Adjust literal name string param value to generalize a little better, then look up the similarly generalized
+        # enum name values
+        enum_val = _ALLOCATION_PARADIGMS_BY_NAME.get(name.strip().replace('-', '_').upper())
+        if enum_val is not None:
+            return enum_val
 
         return None if strict else cls.get_default_selection()
 
 
+_ALLOCATION_PARADIGMS_BY_NAME = dict([(p.name.replace('-', '_').upper(), p) for p in JobAllocationParadigm])
+""" Lookup table of allocation paradigms by generalized (i.e., upper case, with ``_`` for ``-``) name. """
+
+
 class JobExecStep(Enum):
     """
     A component of a JobStatus, representing the particular step within a "phase" encoded within the current status.
@@ -208,11 +213,7 @@ class JobStatus(Enum):
         List[JobStatus]
             A list of the "active" job status values that indicate a job still needs some action taken or completed.
         """
-        actives = []
-        for value in JobStatus:
-            if value.is_active:
-                actives.append(value)
-        return actives
+        return list(_ACTIVE_JOB_STATUSES)
 
     @staticmethod
     def get_for_name(name: str) -> 'JobStatus':
@@ -235,21 +236,15 @@ class JobStatus(Enum):
         """
         if name is None or not isinstance(name, str) or len(name) == 0:
             return JobStatus.UNKNOWN
-        formatted_name = name.lower().strip()
-        for value in JobStatus:
-            if formatted_name == value.name.lower().strip():
-                return value
-        return JobStatus.UNKNOWN
+        return _JOB_STATUSES_BY_NAME.get(name.lower().strip(), JobStatus.UNKNOWN)
 
     @staticmethod
     def get_for_phase_and_step(phase: JobExecPhase, step: JobExecStep) -> 'JobStatus':
         try:
-            for value in JobStatus:
-                if value.job_exec_phase == phase and value.job_exec_step == step:
-                    return value
-        except:
-            pass
-        return JobStatus.UNKNOWN
+            return _JOB_STATUSES_BY_PHASE_AND_STEP.get((phase, step), JobStatus.UNKNOWN)
+        except TypeError:
+            # Unhashable arguments
+            return JobStatus.UNKNOWN
 
     def __eq__(self, other):
         if isinstance(other, JobStatus):
@@ -309,6 +304,17 @@ class JobStatus(Enum):
         return self._uid
 
 
+_ACTIVE_JOB_STATUSES = tuple([s for s in JobStatus if s.is_active])
+""" The "active" job status values, in definition order. """
+_JOB_STATUSES_BY_NAME = dict([(s.name.lower(), s) for s in JobStatus])
+""" Lookup table of job status values by lower case name. """
+_JOB_STATUSES_BY_PHASE_AND_STEP = dict()
+""" Lookup table of job status values by tuple of phase and step, keeping the first defined value for any tuple. """
+for _status in JobStatus:
+    _JOB_STATUSES_BY_PHASE_AND_STEP.setdefault((_status.job_exec_phase, _status.job_exec_step), _status)
+del _status
+
+
 class Job(Serializable, ABC):
     """
     An abstract interface for a job performed by the MaaS system.
@@ -317,6 +323,9 @@ class Job(Serializable, ABC):
     need different a separate domain of ids must create this by controlling job id values in some structural way.
 
     The hash value of a job is calculated as the hash of it's ::attribute:`job_id`.
+
+    Jobs are ordered by ::attribute:`last_updated`, so that among jobs otherwise tied (e.g., having the same priority in
+    a priority queue), the one that has gone longest without an update comes first.
     """
 
     def __eq__(self, other):
@@ -335,6 +344,11 @@ class Job(Serializable, ABC):
     def __hash__(self):
         return hash(self.job_id)
 
+    def __lt__(self, other):
+        if not isinstance(other, Job):
+            return NotImplemented
+        return (self.last_updated, str(self.job_id)) < (other.last_updated, str(other.job_id))
+
     @property
     @abstractmethod
     def allocation_paradigm(self) -> JobAllocationParadigm:
@@ -515,8 +529,25 @@ class JobImpl(Job):
     Basic implementation of ::class:`Job`
 
     Job ids are simply the string cast of generated UUID values, stored within the ::attribute:`job_uuid` property.
+
+    Instances track which of their serialized fields (i.e., keys in ::method:`to_dict`) have changed via property
+    setters, in ::attribute:`dirty_fields`, so that persisted records can be updated one field at a time (see
+    ::method:`serialize_fields`).  Tracking starts once ::method:`mark_clean` is called, typically by whatever persists
+    the object; before that, all fields are considered changed.
+
+    Instances created by ::method:`factory_init_from_deserialized_json` only parse the comparatively expensive fields in
+    ::attribute:`_LAZY_FIELD_TYPES` the first time they are accessed.  Until then, such fields are kept in serialized
+    form, which is also used as is if the instance is serialized again.  As such, code needing only some properties
+    (e.g., ``status``, ``cpu_count``, ``memory_size``, ``allocation_priority``) does not pay to deserialize the rest.
+    Note that this means errors parsing lazy fields are raised when they are first accessed.
     """
 
+    _SERIALIZED_FIELDS = ('cpu_count', 'memory_size', 'parameters', 'allocation_paradigm', 'allocation_priority',
+                          'job_id', 'rsa_key_pair', 'status', 'last_updated', 'allocations')
+    """ The names of the serialized fields of instances, as keys in ::method:`to_dict`. """
+    _LAZY_FIELD_TYPES = {'allocations': list, 'last_updated': str, 'rsa_key_pair': dict}
+    """ The serialized fields deserialized on first access, mapped to the expected types of their serialized values. """
+
     @classmethod
     def _parse_serialized_allocation_paradigm(cls, json_obj: dict, key: str):
         paradigm = JobAllocationParadigm.get_from_name(name=json_obj[key], strict=True) if key in json_obj else None
@@ -635,6 +666,9 @@ class JobImpl(Job):
         """
         Factory create a new instance of this type based on a JSON object dictionary deserialized from received JSON.
 
+        Fields in ::attribute:`_LAZY_FIELD_TYPES` are only checked to be of the expected serialized type here, and are
+        fully deserialized when first accessed.
+
         Parameters
         ----------
         json_obj
@@ -643,28 +677,13 @@ class JobImpl(Job):
         -------
         A new object of this type instantiated from the deserialize JSON object dictionary
         """
-
+        # Initialize directly from the serialized values, rather than via __init__, which sets values (like a new random
+        # job id) that would only be replaced
+        obj = cls.__new__(cls)
         try:
-            cpus, memory, parameters, paradigm, priority, job_id, rsa_key_pair, status, allocations, updated = \
-                cls.deserialize_core_attributes(json_obj)
-
-            obj = cls(cpu_count=cpus, memory_size=memory, parameters=parameters, allocation_paradigm=paradigm,
-                      alloc_priority=priority)
-
-            if job_id is not None:
-                obj.job_id = job_id
-            if rsa_key_pair is not None:
-                obj.rsa_key_pair = rsa_key_pair
-            if status is not None:
-                obj.status = status
-            if updated is not None:
-                obj._last_updated = updated
-            if allocations is not None:
-                obj.allocations = allocations
-                
+            obj._init_from_deserialized_json(json_obj)
             return obj
-
-        except RuntimeError as e:
+        except (RuntimeError, ValueError) as e:
             logging.error(e)
             return None
 
@@ -741,6 +760,7 @@ class JobImpl(Job):
 
     def __init__(self, cpu_count: int, memory_size: int, parameters: dict,
                  allocation_paradigm: Union[str, JobAllocationParadigm], alloc_priority: int = 0):
+        self._dirty_fields = None
         self._cpu_count = cpu_count
         self._memory_size = memory_size
         self._parameters = parameters
@@ -753,10 +773,130 @@ class JobImpl(Job):
         self._rsa_key_pair = None
         self._status = JobStatus.CREATED
         self._allocations = None
+        self._unparsed_fields = dict()
         self._reset_last_updated()
 
+    def _init_from_deserialized_json(self, json_obj: dict):
+        """
+        Initialize the attributes of a new, uninitialized instance from a serialized dictionary, keeping any present
+        fields in ::attribute:`_LAZY_FIELD_TYPES` in serialized form until first accessed.
+
+        Parameters
+        ----------
+        json_obj : dict
+            The serialized dictionary.
+
+        Raises
+        -------
+        RuntimeError
+            If a required field is missing, or any field is not of the expected type.
+        """
+        int_converter = lambda x: int(x)
+        self._dirty_fields = None
+        self._unparsed_fields = dict()
+        self._cpu_count = self.parse_simple_serialized(json_obj=json_obj, key='cpu_count', expected_type=int,
+                                                       converter=int_converter)
+        self._memory_size = self.parse_simple_serialized(json_obj=json_obj, key='memory_size', expected_type=int,
+                                                         converter=int_converter)
+        self._parameters = self.parse_simple_serialized(json_obj=json_obj, key='parameters', expected_type=dict)
+        self._allocation_paradigm = self._parse_serialized_allocation_paradigm(json_obj=json_obj,
+                                                                               key='allocation_paradigm')
+        self._allocation_priority = self.parse_simple_serialized(json_obj=json_obj, key='allocation_priority',
+                                                                 expected_type=int, converter=int_converter)
+        job_uuid = self.parse_serialized_job_id(serialized_value=None, json_obj=json_obj, key='job_id')
+        self._job_uuid = uuid_func() if job_uuid is None else job_uuid
+        status = self._parse_serialized_job_status(json_obj=json_obj)
+        self._status = JobStatus.CREATED if status is None else status
+        self._rsa_key_pair = None
+        self._allocations = None
+        self._last_updated = None
+        for field, serial_type in self._LAZY_FIELD_TYPES.items():
+            # Absent, null, and empty values all deserialize to the same thing as having no value
+            if not json_obj.get(field):
+                continue
+            if not isinstance(json_obj[field], serial_type):
+                raise RuntimeError(self._get_invalid_type_message().format(field, serial_type.__name__,
+                                                                           json_obj[field].__class__.__name__))
+            self._unparsed_fields[field] = json_obj[field]
+        if 'last_updated' not in self._unparsed_fields:
+            self._last_updated = datetime.now()
+
+    def _parse_unparsed_field(self, field: str):
+        """
+        Deserialize the given lazy field from the serialized value kept for it, if it has not yet been deserialized.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field, as a key in ::method:`to_dict`.
+
+        Raises
+        -------
+        RuntimeError
+            If the serialized value is invalid.
+        """
+        if field not in self._unparsed_fields:
+            return
+        json_obj = {field: self._unparsed_fields[field]}
+        if field == 'allocations':
+            self._allocations = self._parse_serialized_allocations(json_obj=json_obj)
+        elif field == 'last_updated':
+            self._last_updated = self._parse_serialized_last_updated(json_obj=json_obj)
+        elif field == 'rsa_key_pair':
+            self._rsa_key_pair = self._parse_serialized_rsa_key_pair(json_obj=json_obj)
+        else:
+            raise ValueError("Unrecognized lazy field '{}' for {}".format(field, self.__class__.__name__))
+        del self._unparsed_fields[field]
+
+    def _mark_dirty(self, field: str):
+        if self._dirty_fields is not None:
+            self._dirty_fields.add(field)
+
     def _reset_last_updated(self):
+        self._unparsed_fields.pop('last_updated', None)
         self._last_updated = datetime.now()
+        self._mark_dirty('last_updated')
+
+    def _serialize_field(self, field: str):
+        """
+        Get the serialized value of the given field, or ``None`` if the field is omitted from serialized forms.
+
+        Parameters
+        ----------
+        field : str
+            The name of the field, as a key in ::method:`to_dict`.
+
+        Returns
+        -------
+        The serialized value of the given field, or ``None`` if the field is omitted.
+        """
+        # Lazy fields not yet deserialized are still in serialized form
+        if field in self._unparsed_fields:
+            return self._unparsed_fields[field]
+        if field == 'cpu_count':
+            return self.cpu_count
+        elif field == 'memory_size':
+            return self.memory_size
+        elif field == 'parameters':
+            return self.parameters
+        elif field == 'allocation_paradigm':
+            return self.allocation_paradigm.name if self.allocation_paradigm else None
+        elif field == 'allocation_priority':
+            return self.allocation_priority
+        elif field == 'job_id':
+            return None if self.job_id is None else str(self.job_id)
+        elif field == 'rsa_key_pair':
+            return None if self.rsa_key_pair is None else self.rsa_key_pair.to_dict()
+        elif field == 'status':
+            return self.status.name
+        elif field == 'last_updated':
+            return self.last_updated.strftime(self.get_datetime_str_format())
+        elif field == 'allocations':
+            if self.allocations is None or len(self.allocations) == 0:
+                return None
+            return [ResourceAllocation.to_dict(allocation) for allocation in self.allocations]
+        else:
+            raise ValueError("Unrecognized serialized field '{}' for {}".format(field, self.__class__.__name__))
 
     def add_allocation(self, allocation: ResourceAllocation):
         """
@@ -768,9 +908,11 @@ class JobImpl(Job):
         allocation : ResourceAllocation
             A resource allocation object to add.
         """
+        self._parse_unparsed_field('allocations')
         if self._allocations is None:
             self._allocations = list()
         self._allocations.append(allocation)
+        self._mark_dirty('allocations')
         self._reset_last_updated()
 
     @property
@@ -805,24 +947,41 @@ class JobImpl(Job):
     @allocation_priority.setter
     def allocation_priority(self, priority: int):
         self._allocation_priority = priority
+        self._mark_dirty('allocation_priority')
         self._reset_last_updated()
 
     @property
     def allocations(self) -> Optional[Tuple[ResourceAllocation]]:
+        self._parse_unparsed_field('allocations')
         return None if self._allocations is None else tuple(self._allocations)
 
     @allocations.setter
     def allocations(self, allocations: Union[List[ResourceAllocation], Tuple[ResourceAllocation]]):
+        self._unparsed_fields.pop('allocations', None)
         if isinstance(allocations, tuple):
             self._allocations = list(allocations)
         else:
             self._allocations = allocations
+        self._mark_dirty('allocations')
         self._reset_last_updated()
 
     @property
     def cpu_count(self) -> int:
         return self._cpu_count
 
+    @property
+    def dirty_fields(self) -> Optional[FrozenSet[str]]:
+        """
+        The names of the serialized fields that have changed since ::method:`mark_clean` was last called, or ``None``
+        if it has never been called (in which case all fields should be considered changed).
+
+        Returns
+        -------
+        Optional[FrozenSet[str]]
+            The names of the changed serialized fields, or ``None`` if all should be considered changed.
+        """
+        return None if self._dirty_fields is None else frozenset(self._dirty_fields)
+
     @property
     def job_id(self) -> Optional[str]:
         """
@@ -847,14 +1006,23 @@ class JobImpl(Job):
         job_uuid = job_id if isinstance(job_id, UUID) else UUID(str(job_id))
         if job_uuid != self._job_uuid:
             self._job_uuid = job_uuid
+            self._mark_dirty('job_id')
             self._reset_last_updated()
 
+    def mark_clean(self):
+        """
+        Mark all serialized fields as unchanged, such as after the object has been persisted, and start tracking
+        changes in ::attribute:`dirty_fields` if not already doing so.
+        """
+        self._dirty_fields = set()
+
     @property
     def memory_size(self) -> int:
         return self._memory_size
 
     @property
     def last_updated(self) -> datetime:
+        self._parse_unparsed_field('last_updated')
         return self._last_updated
 
     @property
@@ -863,12 +1031,14 @@ class JobImpl(Job):
 
     @property
     def rsa_key_pair(self) -> Optional['RsaKeyPair']:
+        self._parse_unparsed_field('rsa_key_pair')
         return self._rsa_key_pair
 
     @rsa_key_pair.setter
     def rsa_key_pair(self, key_pair: 'RsaKeyPair'):
-        if key_pair != self._rsa_key_pair:
+        if key_pair != self.rsa_key_pair:
             self._rsa_key_pair = key_pair
+            self._mark_dirty('rsa_key_pair')
             self._reset_last_updated()
 
     @property
@@ -879,6 +1049,7 @@ class JobImpl(Job):
     def status(self, new_status: JobStatus):
         if new_status != self._status:
             self._status = new_status
+            self._mark_dirty('status')
             self._reset_last_updated()
 
     @property
@@ -897,6 +1068,30 @@ class JobImpl(Job):
     def status_step(self, step: JobExecStep):
         self.status = JobStatus.get_for_phase_and_step(phase=self.status.job_exec_phase, step=step)
 
+    def serialize_fields(self, fields: Iterable[str]) -> dict:
+        """
+        Get the serialized values of only the given fields, as they would appear in the dictionary from ::method:`to_dict`.
+
+        Fields that are omitted from the serialized form (e.g., ``allocations`` when there are none) are not included in
+        the returned dictionary.
+
+        Parameters
+        ----------
+        fields : Iterable[str]
+            The names of the fields of interest, as keys in ::method:`to_dict`.
+
+        Returns
+        -------
+        dict
+            The serialized values of the given fields that are not omitted, keyed by field name.
+        """
+        serial = dict()
+        for field in fields:
+            value = self._serialize_field(field)
+            if value is not None:
+                serial[field] = value
+        return serial
+
     def to_dict(self) -> dict:
         """
         Get the representation of this instance as a dictionary or dictionary-like object (e.g., a JSON object).
@@ -919,86 +1114,21 @@ class JobImpl(Job):
         dict
             the representation of this instance as a dictionary or dictionary-like object (e.g., a JSON object)
         """
-        serial = dict()
-
-        serial['cpu_count'] = self.cpu_count
-        serial['memory_size'] = self.memory_size
-        serial['parameters'] = self.parameters
-        if self.allocation_paradigm:
-            serial['allocation_paradigm'] = self.allocation_paradigm.name
-        serial['allocation_priority'] = self.allocation_priority
-        if self.job_id is not None:
-            serial['job_id'] = str(self.job_id)
-        if self.rsa_key_pair is not None:
-            serial['rsa_key_pair'] = self.rsa_key_pair.to_dict()
-        serial['status'] = self.status.name
-        serial['last_updated'] = self._last_updated.strftime(self.get_datetime_str_format())
-        if self.allocations is not None and len(self.allocations) > 0:
-            serial['allocations'] = []
-            for allocation in self.allocations:
-                serial['allocations'].append(ResourceAllocation.to_dict(allocation))
-
-        return serial
+        return self.serialize_fields(self._SERIALIZED_FIELDS)
 
 
 class RequestedJob(JobImpl):
     """
     An implementation of ::class:`Job` for jobs that were created due to the received of a client request via a
     ::class:`SchedulerRequestMessage` object.
-    """
 
-    @classmethod
-    def factory_init_from_deserialized_json(cls, json_obj: dict):
-        """
-        Factory create a new instance of this type based on a JSON object dictionary deserialized from received JSON.
-
-        Parameters
-        ----------
-        json_obj
-
-        Returns
-        -------
-        A new object of this type instantiated from the deserialize JSON object dictionary
-        """
-
-        originating_request_key = 'originating_request'
-
-        try:
-            cpus, memory, parameters, paradigm, priority, job_id, rsa_key_pair, status, allocations, updated = \
-                cls.deserialize_core_attributes(json_obj)
-
-            if originating_request_key not in json_obj:
-                msg = 'Key for originating request ({}) not present when deserialize {} object'
-                raise RuntimeError(msg.format(originating_request_key, cls.__name__))
-            request = SchedulerRequestMessage.factory_init_from_deserialized_json(json_obj[originating_request_key])
-            if request is None:
-                msg = 'Invalid serialized scheduler request when deserialize {} object'
-                raise RuntimeError(msg.format(cls.__name__))
-        except Exception as e:
-            logging.error(e)
-            return None
-
-        # Create the object initially from the request
-        new_obj = cls(job_request=request)
-
-        # Then update its properties based on the deserialized values, as those are considered most correct
-
-        # Use property setter for job id to handle string or UUID
-        new_obj.job_id = job_id
-
-        new_obj._cpu_count = cpus
-        new_obj._memory_size = memory
-        new_obj._parameters = parameters
-        new_obj._allocation_paradigm = paradigm
-        new_obj._allocation_priority = priority
-        new_obj._rsa_key_pair = rsa_key_pair
-        new_obj._status = status
-        new_obj._allocations = allocations
-
-        # Do last_updated last, as any usage of setters above might cause the value to be maladjusted
-        new_obj._last_updated = updated
+    The ``originating_request`` serialized field never changes after creation, so it is never in ::attribute:`dirty_fields`.
+    For deserialized instances, it is a lazy field, only deserialized to a ::class:`SchedulerRequestMessage` when first
+    accessed.
+    """
 
-        return new_obj
+    _SERIALIZED_FIELDS = JobImpl._SERIALIZED_FIELDS + ('originating_request',)
+    _LAZY_FIELD_TYPES = dict(JobImpl._LAZY_FIELD_TYPES, originating_request=dict)
 
     def __init__(self, job_request: SchedulerRequestMessage):
         self._originating_request = job_request
@@ -1006,6 +1136,28 @@ class RequestedJob(JobImpl):
                          parameters=job_request.model_request.parameters,
                          allocation_paradigm=job_request.allocation_paradigm)
 
+    def _init_from_deserialized_json(self, json_obj: dict):
+        originating_request_key = 'originating_request'
+        if originating_request_key not in json_obj:
+            msg = 'Key for originating request ({}) not present when deserialize {} object'
+            raise RuntimeError(msg.format(originating_request_key, self.__class__.__name__))
+        self._originating_request = None
+        super()._init_from_deserialized_json(json_obj)
+        if originating_request_key not in self._unparsed_fields:
+            msg = 'Invalid serialized scheduler request when deserialize {} object'
+            raise RuntimeError(msg.format(self.__class__.__name__))
+
+    def _parse_unparsed_field(self, field: str):
+        if field == 'originating_request' and field in self._unparsed_fields:
+            request = SchedulerRequestMessage.factory_init_from_deserialized_json(self._unparsed_fields[field])
+            if request is None:
+                msg = 'Invalid serialized scheduler request when deserialize {} object'
+                raise RuntimeError(msg.format(self.__class__.__name__))
+            self._originating_request = request
+            del self._unparsed_fields[field]
+        else:
+            super()._parse_unparsed_field(field)
+
     @property
     def originating_request(self) -> SchedulerRequestMessage:
         """
@@ -1016,8 +1168,15 @@ class RequestedJob(JobImpl):
         SchedulerRequestMessage
             The original request that resulted in the creation of this job.
         """
+        self._parse_unparsed_field('originating_request')
         return self._originating_request
 
+    def _serialize_field(self, field: str):
+        # An originating request not yet deserialized is still in serialized form
+        if field == 'originating_request' and field not in self._unparsed_fields:
+            return self.originating_request.to_dict()
+        return super()._serialize_field(field)
+
     def to_dict(self) -> dict:
         """
         Get the representation of this instance as a dictionary or dictionary-like object (e.g., a JSON object).
@@ -1041,6 +1200,4 @@ class RequestedJob(JobImpl):
         dict
             the representation of this instance as a dictionary or dictionary-like object (e.g., a JSON object)
         """
-        dictionary = super().to_dict()
-        dictionary['originating_request'] = self.originating_request.to_dict()
-        return dictionary
+        return super().to_dict()
@@ -1,15 +1,24 @@
 from abc import ABC, abstractmethod
-from asyncio import sleep
-from typing import Dict, Iterable, List, Optional, Tuple, Union
+from asyncio import CancelledError, Event, Lock, Queue, Task, TimeoutError as AsyncTimeoutError, ensure_future, get_event_loop, \
+    sleep, wait_for
+from functools import partial
+from typing import AsyncIterator, Dict, Iterable, Iterator, List, Optional, Set, Tuple, Union
 from uuid import UUID, uuid4 as random_uuid
-from .job import Job, JobAllocationParadigm, JobExecStep, JobStatus, RequestedJob
+from .backfill import BackfillReservation
+from .fair_share import FairShareLedger
+from .job import Job, JobAllocationParadigm, JobExecStep, JobImpl, JobStatus, RequestedJob
 from ..resources.resource_allocation import ResourceAllocation
 from ..resources.resource_manager import ResourceManager
 from ..rsa_key_pair import RsaKeyPair
 from ..scheduler import Launcher
 
 from dmod.communication import MaaSRequest, NWMRequest, SchedulerRequestMessage
-from dmod.redis import KeyNameHelper, RedisBacked
+from dmod.communication.serialization import create_tag, get_codec, parse_tag
+from dmod.redis import AsyncRedisBacked, KeyNameHelper
+from redis import ResponseError
+from redis.exceptions import ConnectionError as RedisConnectionError, TimeoutError as RedisTimeoutError
+from redis.asyncio.client import Pipeline as AsyncPipeline, PubSub as AsyncPubSub
+from redis.client import PubSubWorkerThread, Pipeline
 
 import datetime
 import heapq
@@ -45,6 +54,12 @@ class JobManagerFactory:
             The Redis service port.
         redis_pass : str
             The Redis service auth password.
+        backfill : bool
+            Whether the job manager should use EASY backfill scheduling.
+        fair_share : bool
+            Whether the job manager should adjust job priorities based on the decayed past usage of each job's user.
+        serial_codec : str
+            The name of the serialization codec for writing job records, if not JSON.
 
         Returns
         -------
@@ -54,6 +69,9 @@ class JobManagerFactory:
         host = None
         port = None
         pword = None
+        backfill = False
+        fair_share = False
+        serial_codec = None
         for key, value in kwargs.items():
             if key == 'redis_host':
                 host = value
@@ -61,15 +79,170 @@ class JobManagerFactory:
                 port = int(value)
             elif key == 'redis_pass':
                 pword = value
+            elif key == 'backfill':
+                backfill = bool(value)
+            elif key == 'fair_share':
+                fair_share = bool(value)
+            elif key == 'serial_codec':
+                serial_codec = value
         return RedisBackedJobManager(resource_manager=resource_manager, launcher=launcher, redis_host=host, redis_port=port,
-                                     redis_pass=pword)
+                                     redis_pass=pword, backfill=backfill, fair_share=fair_share,
+                                     serial_codec=serial_codec)
 
 
 class JobManager(ABC):
 
+    async def async_create_job(self, **kwargs) -> Job:
+        """
+        Async counterpart of ::method:`create_job`.
+
+        The default implementation runs the synchronous method in the event loop's default executor, so that it does not
+        block the event loop; implementations should override this and the other async methods with native asyncio
+        logic where possible.
+
+        Parameters
+        ----------
+        kwargs
+            Other appropriate, implementation-specific keyed parameters supported for creating the job object.
+
+        Returns
+        -------
+        Job
+            The newly created job object.
+        """
+        return await get_event_loop().run_in_executor(None, partial(self.create_job, **kwargs))
+
+    async def async_delete_job(self, job_id) -> bool:
+        """
+        Async counterpart of ::method:`delete_job`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Parameters
+        ----------
+        job_id
+            The unique id for a job of interest to delete.
+
+        Returns
+        -------
+        bool
+            ``True`` if a record was successfully deleted, otherwise ``False``.
+        """
+        return await get_event_loop().run_in_executor(None, self.delete_job, job_id)
+
+    async def async_does_job_exist(self, job_id) -> bool:
+        """
+        Async counterpart of ::method:`does_job_exist`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Parameters
+        ----------
+        job_id
+            The job id of interest.
+
+        Returns
+        -------
+        bool
+            ``True`` if a job exists with the provided job id, or ``False`` otherwise.
+        """
+        return await get_event_loop().run_in_executor(None, self.does_job_exist, job_id)
+
+    async def async_release_allocations(self, job: Job):
+        """
+        Async counterpart of ::method:`release_allocations`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Parameters
+        ----------
+        job : Job
+            The job for which any held allocations should be released.
+        """
+        await get_event_loop().run_in_executor(None, self.release_allocations, job)
+
+    async def async_retrieve_job(self, job_id) -> Job:
+        """
+        Async counterpart of ::method:`retrieve_job`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Parameters
+        ----------
+        job_id
+            The unique id of the desired job.
+
+        Returns
+        -------
+        Job
+            The particular job with the given unique id.
+
+        Raises
+        -------
+        ValueError
+            If no job exists with given job id.
+        """
+        return await get_event_loop().run_in_executor(None, self.retrieve_job, job_id)
+
+    async def async_save_job(self, job: Job):
+        """
+        Async counterpart of ::method:`save_job`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Parameters
+        ----------
+        job
+            The job to be updated or added.
+        """
+        await get_event_loop().run_in_executor(None, self.save_job, job)
+
+    async def async_watch_job_status(self, job_id, status: Optional[JobStatus] = None) -> AsyncIterator[JobStatus]:
+        """
+        Get the changes to the status of the job with the given id, as they happen, until the job is no longer active.
+
+        The job's current status is yielded first if it differs from the given, last known status.  Each subsequent
+        change of status is then yielded, with iteration ending after a status that is not active.
+
+        The default implementation polls ::method:`async_retrieve_job`, briefly at first to catch initial changes, then
+        at a long interval; implementations should override this with a way to be notified of changes where possible.
+
+        Parameters
+        ----------
+        job_id
+            The unique id of the job of interest.
+        status : Optional[JobStatus]
+            The last known status of the job, if any.
+
+        Returns
+        -------
+        AsyncIterator[JobStatus]
+            An async iterator of the changed statuses of the job.
+
+        Raises
+        -------
+        ValueError
+            If no job exists with given job id.
+        """
+        loop_iterations = 0
+        while status is None or status.is_active:
+            # Sleep after first time through the loop, though more briefly the first few times to catch initial updates
+            if loop_iterations == 1:
+                await sleep(0.25)
+            elif 0 < loop_iterations < 5:
+                await sleep(0.5)
+            elif loop_iterations > 0:
+                await sleep(60)
+            loop_iterations += 1
+            current_status = (await self.async_retrieve_job(job_id)).status
+            if current_status != status:
+                status = current_status
+                yield status
+
     @classmethod
     @abstractmethod
-    def build_prioritized_pending_allocation_queues(cls, jobs_eligible_for_allocate: List[RequestedJob]) -> Union[
+    def build_prioritized_pending_allocation_queues(cls, jobs_eligible_for_allocate: List[RequestedJob],
+                                                    priority_adjustments: Optional[Dict[str, int]] = None) -> Union[
             List[Tuple[int, RequestedJob]], Dict[str, List[Tuple[int, RequestedJob]]]]:
         """
         Construct one or more priority queues for the given jobs eligible to receive allocations, based on the jobs'
@@ -82,8 +255,9 @@ class JobManager(ABC):
 
         Implementations must return Python Lib/heapq.py type priority queues. Note that because this implementation is a
         "min heap" (i.e. return smallest item first), jobs must first be wrapped inside a tuple before being added to
-        a queue.  The first value in one of these tuples should be the additive inverse of the job's
-        ::attribute:`Job.allocation_priority` value, with the job object itself being the second value.
+        a queue.  The first value in one of these tuples should be the additive inverse of the job's effective priority
+        (its ::attribute:`Job.allocation_priority` value, with any aging the implementation applies, plus any adjustment
+        for it), with the job object itself being the second value.  Implementations must not modify the jobs.
 
         In cases multiple queues within a dictionary are returned, implemenations must ensure that each job within the
         parameter list is included in exactly one queue.  I.e., the sum of the length of all returned queues must be
@@ -93,6 +267,9 @@ class JobManager(ABC):
         ----------
         jobs_eligible_for_allocate : List[RequestedJob]
             A list of ::class:`RequestedJob` object, where each is eligible for allocation.
+        priority_adjustments : Optional[Dict[str, int]]
+            Optional adjustments to add to job priorities when queueing (without changing the jobs themselves), keyed
+            by the string form of job id.
 
         Returns
         -------
@@ -276,15 +453,79 @@ class JobManager(ABC):
 
 # TODO: properly account upstream for allocations for finished jobs (or any jobs being deleted) getting cleaned up,
 #   since this type isn't responsible for that.
-class RedisBackedJobManager(JobManager, RedisBacked):
+class RedisBackedJobManager(JobManager, AsyncRedisBacked):
     """
     An implementation of ::class:`JobManager` that uses Redis as a backend, works with ::class:`RequestedJob` job
     objects, and acquires ::class:`ResourceAllocation` objects for processing jobs from some ::class:`ResourceManager`.
+
+    By default, instances run ::method:`manage_job_processing` in a "wake-on-change" mode.  Operations that may make a
+    new allocation possible (e.g., ::method:`create_job`, ::method:`save_job`, and ::method:`release_allocations`)
+    publish a notification to a Redis pub/sub channel, and the processing loop subscribes to this channel and starts a
+    new allocation pass as soon as a notification arrives.  A periodic pass still runs at least every
+    ::attribute:`_DEFAULT_SAFETY_INTERVAL_SECONDS` seconds as a safety net (e.g., for missed notifications).
+
+    Jobs awaiting allocation are also kept in a persistent Redis sorted set, maintained by ::method:`save_job`.  A job's
+    score combines its ::attribute:`Job.allocation_priority` and the time it started waiting, such that ordering by
+    score is the same as ordering by priority aged by ::attribute:`_PENDING_AGING_PER_HOUR` for each hour of waiting
+    (with earlier jobs first for equal aged priorities).  Since every pending job ages at the same rate, aging never
+    has to be written back; it is applied to scores when read.  Allocation passes read pending jobs from the set in
+    order, a chunk at a time, stopping once nothing else could be allocated, and only write the records of jobs that
+    are allocated.
+
+    Each job record is a Redis hash, with a field for each top-level key of the job's ::method:`RequestedJob.to_dict`
+    representation, holding the JSON serialized value.  Jobs retrieved or saved by an instance track their changed
+    fields (see ::attribute:`JobImpl.dirty_fields`), so ::method:`save_job` only writes the fields that changed, rather
+    than re-serializing the entire job (including its originating request) for every status or priority change.
+    Records saved as a single JSON string by older versions are still read, and are rewritten as hashes when next saved.
+
+    The async counterparts of the job management methods (e.g., ::method:`async_save_job`) use the pooled asyncio Redis
+    clients of ::class:`AsyncRedisBacked`, so that they can be used from coroutines without blocking the event loop.
+    Likewise, ::method:`manage_job_processing` runs each allocation pass in the event loop's default executor.
+
+    Saving a job with a changed status also publishes the change to a Redis pub/sub channel for job status changes (in
+    the same pipeline as the write), so ::method:`async_watch_job_status` is notified of changes as they are made by
+    any instance, rather than polling the job's record.  Each instance shares a single subscription to the channel
+    among all its watchers, fanning out each change to the watchers of the changed job.
+    """
+
+    _DEFAULT_SAFETY_INTERVAL_SECONDS = 60
+    """ Max seconds between allocation passes in wake-on-change mode, and the fixed interval otherwise. """
+    _SCHEDULING_EVENT_LISTENER_POLL_SECONDS = 1.0
+    _ACTIVE_JOBS_CHUNK_SIZE = 500
+    """ Default number of active jobs read from Redis per round trip by ::method:`iter_active_jobs`. """
+    _PENDING_JOBS_CHUNK_SIZE = 100
+    """ Number of pending jobs read from the pending jobs sorted set per round trip during allocation passes. """
+    _PENDING_AGING_PER_HOUR = 10
+    """ Effective priority gained by a pending job for each hour it waits for an allocation. """
+    _JOB_STATUS_JOB_ID_KEY = 'job_id'
+    _JOB_STATUS_STATUS_KEY = 'status'
+
+    _ENQUEUE_PENDING_SCRIPT = """
+        -- KEYS[1]: pending jobs sorted set key; KEYS[2]: pending since hash key
+        -- ARGV: job key, job priority, current timestamp, aging per second
+        -- Keeps any existing pending since time, so re-saving a pending job does not reset its aging
+        redis.call('HSETNX', KEYS[2], ARGV[1], ARGV[3])
+        local since = tonumber(redis.call('HGET', KEYS[2], ARGV[1]))
+        local score = since * tonumber(ARGV[4]) - tonumber(ARGV[2])
+        redis.call('ZADD', KEYS[1], string.format('%.17g', score), ARGV[1])
+        return redis.call('HGET', KEYS[2], ARGV[1])
     """
 
+    _DEFAULT_WALLTIME_SECONDS = 86400
+    """ Default walltime estimate for jobs with neither an explicit ``walltime`` parameter nor a model default. """
+
+    _DEFAULT_FAIR_SHARE_HALF_LIFE_SECONDS = 604800
+    """ Default half-life of past usage for fair-share scheduling. """
+    _DEFAULT_FAIR_SHARE_WEIGHT = 50
+    """ Default priority reduction for a user accounting for all recent usage, when using fair-share scheduling. """
+
+    _SERIAL_TAG_FIELD = '__serial__'
+    """ Job record hash field tagging the codec and schema version of the other fields, if not the default codec. """
+
     @classmethod
-    def build_prioritized_pending_allocation_queues(cls, jobs_eligible_for_allocate: List[RequestedJob]) -> Dict[
-            str, List[Tuple[int, RequestedJob]]]:
+    def build_prioritized_pending_allocation_queues(cls, jobs_eligible_for_allocate: List[RequestedJob],
+                                                    priority_adjustments: Optional[Dict[str, int]] = None) -> Dict[
+            str, List[Tuple[float, RequestedJob]]]:
         """
         Construct priority queues for the given jobs eligible to receive allocations, based on the jobs'
         ::attribute:`Job.allocation_priority` values, and return a keyed dictionary of the resulting queues.
@@ -298,40 +539,48 @@ class RedisBackedJobManager(JobManager, RedisBacked):
 
         The ``low`` queue consists of jobs with priorities under 50.
 
+        A job's priority for the above is its effective priority: its ::attribute:`Job.allocation_priority` value, aged
+        by ::attribute:`_PENDING_AGING_PER_HOUR` for each hour since it was last updated (the same aging applied to the
+        pending jobs sorted set, but computed here rather than written to the job), plus any adjustment for it in
+        ``priority_adjustments`` (e.g., from ::method:`get_fair_share_priority_adjustments`).
+
         Note that because the priority queue implementation is a "min heap" (i.e. return smallest item first), jobs are
         first wrapped inside a tuple before being added to the appropriate priority queue, with the first value being
-        the additive inverse of the job's ::attribute:`Job.allocation_priority` value, and the second being the job
-        object itself.
+        the additive inverse of the job's effective priority, and the second being the job object itself.
 
         Parameters
         ----------
         jobs_eligible_for_allocate : List[RequestedJob]
             A list of ::class:`RequestedJob` object, where each is eligible for allocation.
+        priority_adjustments : Optional[Dict[str, int]]
+            Optional adjustments to add to job priorities when queueing (without changing the jobs themselves), keyed
+            by the string form of job id.
 
         Returns
         -------
-        Dict[str, List[Tuple[int, RequestedJob]]]
+        Dict[str, List[Tuple[float, RequestedJob]]]
             A mapping of high, medium, and low priority queues filled with tuples having the additive inverse of a job's
-            priority and the respective job object.
+            effective priority and the respective job object.
         """
         # Build prioritized list/queue of allocation eligible Jobs
         low_priority_queue = []
         med_priority_queue = []
         high_priority_queue = []
+        now = datetime.datetime.now()
         for eligible_job in jobs_eligible_for_allocate:
-            # Bump by 10 if not updated for an hour
-            if datetime.datetime.now() - eligible_job.last_updated >= datetime.timedelta(hours=1):
-                eligible_job.allocation_priority = eligible_job.allocation_priority + 10
             # TODO: formalize this scale better
             # Over 100: high
             # 50 to 100: med
             # otherwise: low
-            priority = eligible_job.allocation_priority
+            waiting_seconds = max(0.0, (now - eligible_job.last_updated).total_seconds())
+            priority = eligible_job.allocation_priority + waiting_seconds * cls._PENDING_AGING_PER_HOUR / 3600
+            if priority_adjustments is not None:
+                priority += priority_adjustments.get(str(eligible_job.job_id), 0)
             # Also keep in mind that higher priority is first, which is reversed from priority queue (so negate)
             inverted_priority = priority * -1
             if priority > 100:
                 heapq.heappush(high_priority_queue, (inverted_priority, eligible_job))
-            elif priority > 49:
+            elif priority >= 50:
                 heapq.heappush(med_priority_queue, (inverted_priority, eligible_job))
             else:
                 heapq.heappush(low_priority_queue, (inverted_priority, eligible_job))
@@ -347,7 +596,11 @@ class RedisBackedJobManager(JobManager, RedisBacked):
             return 'job_mgr'
 
     def __init__(self, resource_manager : ResourceManager, launcher: Launcher, redis_host: Optional[str] = None,
-                 redis_port: Optional[int] = None, redis_pass: Optional[str] = None, **kwargs):
+                 redis_port: Optional[int] = None, redis_pass: Optional[str] = None, wake_on_change: bool = True,
+                 safety_interval: Optional[int] = None, backfill: bool = False,
+                 default_walltime: Optional[int] = None, model_walltimes: Optional[Dict[str, int]] = None,
+                 fair_share: bool = False, fair_share_half_life: Optional[int] = None,
+                 fair_share_weight: Optional[int] = None, serial_codec: Optional[str] = None, **kwargs):
         """
 
         Parameters
@@ -360,8 +613,34 @@ class RedisBackedJobManager(JobManager, RedisBacked):
             Optional explicit string init param for the Redis connection port value.
         redis_pass : Optional[str]
             Optional explicit string init param for the Redis connection password value.
+        wake_on_change : bool
+            Whether ::method:`manage_job_processing` should start an allocation pass as soon as a scheduling event is
+            published, rather than only at a fixed interval (``True`` by default).
+        safety_interval : Optional[int]
+            Optional max number of seconds between allocation passes, defaulting to
+            ::attribute:`_DEFAULT_SAFETY_INTERVAL_SECONDS`.
+        backfill : bool
+            Whether allocation passes should use EASY backfill scheduling, rather than stopping at the first high
+            priority job that cannot be allocated (``False`` by default).
+        default_walltime : Optional[int]
+            Optional default walltime estimate in seconds, for jobs without a ``walltime`` parameter or model default,
+            defaulting to ::attribute:`_DEFAULT_WALLTIME_SECONDS`.
+        model_walltimes : Optional[Dict[str, int]]
+            Optional default walltime estimates in seconds for jobs without a ``walltime`` parameter, keyed by model name.
+        fair_share : bool
+            Whether allocation passes should lower the priority of jobs of users with more recent usage (``False`` by
+            default).
+        fair_share_half_life : Optional[int]
+            Optional half-life in seconds of past usage for fair-share scheduling, defaulting to
+            ::attribute:`_DEFAULT_FAIR_SHARE_HALF_LIFE_SECONDS`.
+        fair_share_weight : Optional[int]
+            Optional priority reduction for a user accounting for all recent usage for fair-share scheduling, defaulting
+            to ::attribute:`_DEFAULT_FAIR_SHARE_WEIGHT`.
+        serial_codec : Optional[str]
+            Optional name of the serialization codec (e.g., ``msgpack``) for writing job record fields, with JSON used by
+            default; records written with any available codec can be read regardless.
         kwargs
-            Keyword args, passed through to the ::class:`RedisBacked` superclass init function.
+            Keyword args, passed through to the ::class:`AsyncRedisBacked` superclass init function.
         """
         super().__init__(redis_host=redis_host, redis_port=redis_port, redis_pass=redis_pass, **kwargs)
         self._resource_manager = resource_manager
@@ -370,7 +649,62 @@ class RedisBackedJobManager(JobManager, RedisBacked):
         else:
             key_prefix = self.get_key_prefix()
         self._active_jobs_set_key = self.keynamehelper.create_key_name(key_prefix, 'active_jobs')
+        self._pending_jobs_key = self.keynamehelper.create_key_name(key_prefix, 'pending_jobs')
+        self._pending_since_key = self.keynamehelper.create_key_name(key_prefix, 'pending_since')
+        self._enqueue_pending_script = self.redis.register_script(self._ENQUEUE_PENDING_SCRIPT)
+        self._scheduling_events_channel = self.keynamehelper.create_key_name(key_prefix, 'scheduling_events')
+        self._job_status_channel = self.keynamehelper.create_key_name(key_prefix, 'job_status')
+        # Queues of watchers of job status changes, by job id, and the shared subscription for their notifications
+        self._job_status_watchers: Dict[str, Set[Queue]] = dict()
+        self._job_status_listener_lock: Optional[Lock] = None
+        self._job_status_listener_task: Optional[Task] = None
         self._launcher = launcher
+        self._wake_on_change = wake_on_change
+        self._safety_interval = self._DEFAULT_SAFETY_INTERVAL_SECONDS if safety_interval is None else safety_interval
+        # Set while this instance is performing its own allocation pass, to keep it from waking itself up again
+        self._is_in_allocation_pass = False
+        self._backfill = backfill
+        self._default_walltime = self._DEFAULT_WALLTIME_SECONDS if default_walltime is None else default_walltime
+        self._model_walltimes = dict() if model_walltimes is None else model_walltimes
+        if fair_share:
+            half_life = self._DEFAULT_FAIR_SHARE_HALF_LIFE_SECONDS if fair_share_half_life is None else fair_share_half_life
+            self._fair_share_ledger = FairShareLedger(self.redis, self.keynamehelper.create_key_name(key_prefix,
+                                                                                                     'fair_share'),
+                                                      half_life)
+        else:
+            self._fair_share_ledger = None
+        self._fair_share_weight = self._DEFAULT_FAIR_SHARE_WEIGHT if fair_share_weight is None else fair_share_weight
+        self._serial_codec = get_codec(serial_codec)
+
+    async def _async_read_job_records(self, job_redis_keys: List[str]) \
+            -> List[Optional[Union[Dict[bytes, bytes], bytes]]]:
+        """
+        Async counterpart of ::method:`_read_job_records`, reading records with ::attribute:`async_binary_redis`.
+
+        Parameters
+        ----------
+        job_redis_keys : List[str]
+            The Redis keys for the jobs' saved records.
+
+        Returns
+        -------
+        List[Optional[Union[Dict[bytes, bytes], bytes]]]
+            The records, in the same order as the keys, as dictionaries of hash fields, JSON strings for older records,
+            or ``None`` for keys without a record.
+        """
+        if len(job_redis_keys) == 0:
+            return []
+        async with self.async_binary_redis.pipeline(transaction=False) as pipeline:
+            for job_redis_key in job_redis_keys:
+                pipeline.hgetall(job_redis_key)
+            records = await pipeline.execute(raise_on_error=False)
+        # Older records are strings, for which HGETALL fails with a WRONGTYPE error
+        legacy_indices = [i for i in range(len(records)) if isinstance(records[i], ResponseError)]
+        if len(legacy_indices) > 0:
+            legacy_records = await self.async_binary_redis.mget([job_redis_keys[i] for i in legacy_indices])
+            for i, legacy_record in zip(legacy_indices, legacy_records):
+                records[i] = legacy_record
+        return [record if record else None for record in records]
 
     def _dev_setup(self):
         self._clean_keys()
@@ -395,6 +729,215 @@ class RedisBackedJobManager(JobManager, RedisBacked):
         """
         return self.redis.exists(redis_key) == 1
 
+    def _dequeue_pending_job(self, job_key: str, pipeline: Pipeline):
+        """
+        Queue commands in the given pipeline to remove the job with the given key from the pending jobs sorted set.
+
+        Parameters
+        ----------
+        job_key : str
+            The Redis key of the job.
+        pipeline : Pipeline
+            The pipeline in which to queue the commands.
+        """
+        pipeline.zrem(self._pending_jobs_key, job_key)
+        pipeline.hdel(self._pending_since_key, job_key)
+
+    def _enqueue_pending_job(self, job: RequestedJob, job_key: str, pipeline: Pipeline,
+                             since: Optional[datetime.datetime] = None):
+        """
+        Queue a command in the given pipeline to add the given job to, or update it within, the pending jobs sorted set.
+
+        Parameters
+        ----------
+        job : RequestedJob
+            The job awaiting allocation.
+        job_key : str
+            The Redis key of the job.
+        pipeline : Pipeline
+            The pipeline in which to queue the command.
+        since : Optional[datetime.datetime]
+            When the job started waiting, if not already recorded, with the current time used by default.
+        """
+        keys, args = self._get_enqueue_pending_script_params(job, job_key, since)
+        self._enqueue_pending_script(keys=keys, args=args, client=pipeline)
+
+    def _get_enqueue_pending_script_params(self, job: RequestedJob, job_key: str,
+                                           since: Optional[datetime.datetime] = None) -> Tuple[List[str], List]:
+        """
+        Get the keys and args for adding the given job to, or updating it within, the pending jobs sorted set with the
+        enqueue script.
+
+        Parameters
+        ----------
+        job : RequestedJob
+            The job awaiting allocation.
+        job_key : str
+            The Redis key of the job.
+        since : Optional[datetime.datetime]
+            When the job started waiting, if not already recorded, with the current time used by default.
+
+        Returns
+        -------
+        Tuple[List[str], List]
+            The keys and the args for the enqueue script.
+        """
+        since = datetime.datetime.now() if since is None else since
+        return [self._pending_jobs_key, self._pending_since_key], \
+               [job_key, job.allocation_priority, repr(since.timestamp()), repr(self._PENDING_AGING_PER_HOUR / 3600)]
+
+    def _get_originating_request(self, job: Job) -> Optional[SchedulerRequestMessage]:
+        """
+        Get the originating request of the given job, if it has one that can be deserialized.
+
+        Since a loaded job's originating request is only deserialized when first accessed, a corrupt saved request is
+        not detected until then.  Such jobs are logged and treated as having no originating request, rather than having
+        the error end the allocation pass.
+
+        Parameters
+        ----------
+        job : Job
+            The job of interest.
+
+        Returns
+        -------
+        Optional[SchedulerRequestMessage]
+            The originating request of the job, or ``None`` if it has none or it cannot be deserialized.
+        """
+        try:
+            return getattr(job, 'originating_request', None)
+        except RuntimeError as e:
+            logging.error("Cannot deserialize originating request of job {}: {}".format(job.job_id, e))
+            return None
+
+    def _get_job_user(self, job: Job) -> Optional[str]:
+        """
+        Get the user to whom the given job's resource usage is attributed for fair-share scheduling.
+
+        Parameters
+        ----------
+        job : Job
+            The job of interest.
+
+        Returns
+        -------
+        Optional[str]
+            The user id of the job's originating request, or ``None`` if the job has no known user.
+        """
+        return getattr(self._get_originating_request(job), 'user_id', None)
+
+    def _is_pending(self, job: Job) -> bool:
+        """
+        Test whether the given job is awaiting an allocation, and thus belongs in the pending jobs sorted set.
+
+        Parameters
+        ----------
+        job : Job
+            The job of interest.
+
+        Returns
+        -------
+        bool
+            Whether the job is active, at the ``AWAITING_ALLOCATION`` step, and does not have allocations.
+        """
+        return job.status.is_active and job.status_step == JobExecStep.AWAITING_ALLOCATION \
+            and (job.allocations is None or len(job.allocations) == 0)
+
+    def _iter_pending_jobs(self, active_jobs_by_key: Dict[str, RequestedJob],
+                           priority_adjustments: Optional[Dict[str, int]] = None) -> Iterator[
+            Tuple[float, RequestedJob]]:
+        """
+        Lazily iterate through the jobs in the pending jobs sorted set, in order of effective priority.
+
+        A job's effective priority is its priority aged to the current time, plus any adjustment for it.  Without
+        adjustments, jobs are read from the sorted set a chunk at a time as iteration proceeds, so stopping early
+        avoids reading the rest.  Chunks are read by score rather than by rank, since jobs may be removed from the set
+        (e.g., when allocated) during iteration.  With adjustments, the order may differ from the sorted set's, so all
+        entries (but only the job records as needed) are read first.
+
+        Job objects are taken from the given mapping when possible, and otherwise read from Redis.  Entries for jobs that
+        no longer exist or are no longer pending are removed from the sorted set and skipped.
+
+        Parameters
+        ----------
+        active_jobs_by_key : Dict[str, RequestedJob]
+            Already-retrieved job objects, keyed by Redis key.
+        priority_adjustments : Optional[Dict[str, int]]
+            Optional adjustments to add to effective priorities, keyed by the string form of job id.
+
+        Returns
+        -------
+        Iterator[Tuple[float, RequestedJob]]
+            An iterator of tuples of effective priority and job object, in descending order of effective priority.
+        """
+        aging = datetime.datetime.now().timestamp() * self._PENDING_AGING_PER_HOUR / 3600
+        chunk_size = self._PENDING_JOBS_CHUNK_SIZE
+        if priority_adjustments:
+            entries = self.redis.zrange(self._pending_jobs_key, 0, -1, withscores=True)
+            adjusted = []
+            for job_key, score in entries:
+                job = active_jobs_by_key.get(job_key)
+                adjustment = 0 if job is None else priority_adjustments.get(str(job.job_id), 0)
+                adjusted.append((job_key, score - adjustment))
+            # Python's sort is stable, so ties stay in sorted set order
+            adjusted.sort(key=lambda entry: entry[1])
+            chunks = (adjusted[i:i + chunk_size] for i in range(0, len(adjusted), chunk_size))
+        else:
+            chunks = self._iter_pending_jobs_chunks_by_score(chunk_size)
+
+        for chunk in chunks:
+            missing = [job_key for job_key, _ in chunk if job_key not in active_jobs_by_key]
+            retrieved = dict()
+            if len(missing) > 0:
+                retrieved = dict([(self._get_job_key_for_id(j.job_id), j)
+                                  for j in self._retrieve_jobs_by_redis_keys(missing)])
+            stale = []
+            for job_key, score in chunk:
+                job = active_jobs_by_key.get(job_key, retrieved.get(job_key))
+                if job is None or not self._is_pending(job):
+                    stale.append(job_key)
+                    continue
+                yield aging - score, job
+            if len(stale) > 0:
+                with self.redis.pipeline() as pipeline:
+                    for job_key in stale:
+                        self._dequeue_pending_job(job_key, pipeline)
+                    pipeline.execute()
+
+    def _iter_pending_jobs_chunks_by_score(self, chunk_size: int) -> Iterator[List[Tuple[str, float]]]:
+        """
+        Lazily iterate through chunks of the entries in the pending jobs sorted set, in score order, paging by score.
+
+        Each chunk starts at the last score of the previous chunk (inclusive), skipping entries at that score that were
+        already returned, so entries removed from the set between chunks do not cause others to be skipped.
+
+        Parameters
+        ----------
+        chunk_size : int
+            The max number of entries per chunk.
+
+        Returns
+        -------
+        Iterator[List[Tuple[str, float]]]
+            An iterator of non-empty lists of tuples of job key and score.
+        """
+        lower = '-inf'
+        at_lower = set()
+        while True:
+            entries = self.redis.zrangebyscore(self._pending_jobs_key, lower, '+inf', start=0,
+                                               num=chunk_size + len(at_lower), withscores=True)
+            chunk = [(job_key, score) for job_key, score in entries if job_key not in at_lower]
+            if len(chunk) == 0:
+                return
+            yield chunk
+            if len(entries) < chunk_size + len(at_lower):
+                return
+            last_score = chunk[-1][1]
+            if lower != repr(last_score):
+                at_lower = set()
+            lower = repr(last_score)
+            at_lower.update([job_key for job_key, score in chunk if score == last_score])
+
     def _get_job_key_for_id(self, job_id) -> str:
         """
         Get the appropriate Redis key for accessing the manager's record of the job with the given id.
@@ -411,6 +954,27 @@ class RedisBackedJobManager(JobManager, RedisBacked):
         """
         return self.create_key_name('job', str(job_id))
 
+    def _notify_scheduling_event(self, reason: str, pipeline: Optional[Pipeline] = None):
+        """
+        Publish a notification that something changed which may allow a new allocation to be made.
+
+        Nothing is published while this instance is in the middle of its own allocation pass, since any such changes
+        have already been considered by the pass that made them.
+
+        Parameters
+        ----------
+        reason : str
+            A brief description of the triggering change, used as the published message.
+        pipeline : Optional[Pipeline]
+            An optional pipeline in which to queue the publish command, instead of sending it immediately.
+        """
+        if self._is_in_allocation_pass:
+            return
+        if pipeline is None:
+            self.redis.publish(self._scheduling_events_channel, reason)
+        else:
+            pipeline.publish(self._scheduling_events_channel, reason)
+
     def _organize_active_jobs(self, active_jobs: List[RequestedJob]) -> List[List[RequestedJob]]:
         """
         Organize the given list of active jobs into collections ready for various next-steps in their processing,
@@ -453,7 +1017,7 @@ class RedisBackedJobManager(JobManager, RedisBacked):
             # For now, assume failure requires manual re-transition
             #if job.status_step == JobExecStep.FAILED
 
-            if job.status_step.AWAITING_ALLOCATION:
+            if job.status_step == JobExecStep.AWAITING_ALLOCATION:
                 # Add to collection, though make sure it doesn't already have an allocation
                 if job.allocations is None or len(job.allocations) == 0:
                     jobs_eligible_for_allocate.append(job)
@@ -472,95 +1036,681 @@ class RedisBackedJobManager(JobManager, RedisBacked):
 
         return [jobs_eligible_for_allocate, jobs_to_release_resources, jobs_completed_phase]
 
-    def _request_allocations_for_queue(self, jobs_priority_queue: List[Tuple[int, RequestedJob]]) -> List[RequestedJob]:
+    def _is_out_of_capacity(self) -> bool:
         """
-        Request allocations for all jobs in a provided priority queue, updating and saving in Redis any jobs that did
-        get the requested allocation, and returning a list of those successfully allocated jobs.
+        Test whether no further job could currently be allocated, because no resource has any CPUs available.
+
+        Returns
+        -------
+        bool
+            Whether no resource has any CPUs available.
+        """
+        return self._resource_manager.get_largest_placeable_cpu_count() < 1
+
+    def _request_allocations_in_order(self, pending_jobs: Iterable[Tuple[float, RequestedJob]]) -> List[RequestedJob]:
+        """
+        Request allocations for the given pending jobs in order, saving in Redis any jobs that did get the requested
+        allocation, and returning a list of those successfully allocated jobs.
+
+        Jobs with effective priorities over 100 are considered high priority.  If any high priority job cannot be
+        allocated, no lower priority jobs are considered.  Iteration also stops as soon as there are no CPUs left to
+        allocate, so the rest of the given pending jobs are never read.
 
         Parameters
         ----------
-        jobs_priority_queue : List[Tuple[int, RequestedJob]]
-            A priority queue (implemented as a list) of jobs for which allocation requests should be made, with items
-            being tuples of priority value additive inverses and requested jobs.
+        pending_jobs : Iterable[Tuple[float, RequestedJob]]
+            Tuples of effective priority and job, in descending order of effective priority.
 
         Returns
         -------
         List[RequestedJob]
             A list of the job objects that received their requested allocations.
-
         """
         allocated_successfully = []
-        not_allocated = []
-        priorities_to_bump = []
-        while len(jobs_priority_queue) > 0:
-            # Remember, the job object itself is the second item in the popped tuple, since this is a min heap
-            job = heapq.heappop(jobs_priority_queue)[1]
-            was_allocated = self.request_allocations(job)
-            # If the allocation was successful
-            if was_allocated:
+        high_priority_failed = False
+        for priority, job in pending_jobs:
+            if high_priority_failed and priority <= 100:
+                break
+            if self.request_allocations(job):
                 allocated_successfully.append(job)
                 self.save_job(job)
-                # Keep track of jobs that got skipped over by at least one lower priority job like this
-                # Simplest thing is to clear an rebuild list with anything "not allocated" that came before this
-                priorities_to_bump = []
-                for j in not_allocated:
-                    priorities_to_bump.append(j)
-            else:
-                not_allocated.append(job)
-        # Then at the end, bump priorities for skipped
-        for j in priorities_to_bump:
-            j.allocation_priority = j.allocation_priority + 1
-            self.save_job(j)
+                continue
+            if priority > 100:
+                high_priority_failed = True
+            if self._is_out_of_capacity():
+                break
         return allocated_successfully
 
-    def create_job(self, **kwargs) -> RequestedJob:
+    def _request_allocations_with_backfill(self, pending_jobs: Iterable[Tuple[float, RequestedJob]],
+                                           active_jobs: List[RequestedJob]) -> List[RequestedJob]:
         """
-        Create and return a new job object that has been saved to the backend store.
+        Request allocations for the given pending jobs using EASY backfill scheduling, saving in Redis any jobs that did
+        get the requested allocation, and returning a list of those successfully allocated jobs.
 
-        Since this class works with ::class:`RequestedJob` objects, a new object must receive a
-        ::class:`SchedulerRequestMessage` as a parameter.  This is in the ``request`` keyword arg.
+        Jobs are processed in order.  Once a job cannot be allocated, a ::class:`BackfillReservation` is estimated
+        for it, after which remaining jobs are only allocated if they cannot delay the reserved job, based on walltime
+        estimates from ::method:`get_walltime_estimate`.  Allocations received by a job that turn out to conflict with
+        the reservation are released again.  Iteration stops as soon as there are no CPUs left to allocate.
 
         Parameters
         ----------
-        kwargs
-            Implementation-specific keyed parameters for creating appropriate job objects (see *Keyword Args* section).
-
-        Keyword Args
-        ------------
-        request : SchedulerRequestMessage
-            The originating request for the job.
-        job_id : str, UUID, None
-            Optional value to try use for the job's id, falling back to random if not present, invalid, or already used.
+        pending_jobs : Iterable[Tuple[float, RequestedJob]]
+            Tuples of effective priority and job, in descending order of effective priority.
+        active_jobs : List[RequestedJob]
+            All active jobs, from which those currently holding allocations are used to estimate any reservation.
 
         Returns
         -------
-        RequestedJob
-            The newly created job object.
+        List[RequestedJob]
+            A list of the job objects that received their requested allocations.
         """
-        job_obj = RequestedJob(job_request=kwargs['request'])
-        try:
-            job_uuid = kwargs['job_id'] if isinstance(kwargs['job_id'], UUID) else UUID(str(kwargs['job_id']))
-            if not self._does_redis_key_exist(self._get_job_key_for_id(job_uuid)):
-                job_obj.job_id = job_uuid
+        allocated_successfully = []
+        reservation = None
+        for _, job in pending_jobs:
+            if reservation is None:
+                if self.request_allocations(job):
+                    allocated_successfully.append(job)
+                    self.save_job(job)
+                    continue
+                if self._is_out_of_capacity():
+                    break
+                free_cpus = dict([(r.resource_id, r.cpu_count) for r in
+                                  self._resource_manager.get_useable_resources()])
+                holding = [j for j in active_jobs if j.allocations and j not in allocated_successfully]
+                running = [(min(a.created for a in j.allocations) + self.get_walltime_estimate(j), j.allocations)
+                           for j in holding + allocated_successfully]
+                reservation = BackfillReservation.estimate(job, free_cpus, running)
+                if reservation is not None:
+                    logging.debug("Reserving resources for job {} at {}".format(job.job_id, reservation.shadow_time))
+                continue
+            walltime = self.get_walltime_estimate(job)
+            if not reservation.could_backfill(job, walltime) or not self.request_allocations(job):
+                if self._is_out_of_capacity():
+                    break
+                continue
+            if reservation.claim(job, walltime):
+                logging.debug("Backfilling job {} ahead of reserved job {}".format(job.job_id,
+                                                                                  reservation.job.job_id))
+                allocated_successfully.append(job)
+                self.save_job(job)
             else:
-                job_obj.job_id = random_uuid()
-        except:
-            job_obj.job_id = random_uuid()
-
-        self.save_job(job_obj)
-        return job_obj
+                self._resource_manager.release_resources(job.allocations)
+                job.allocations = None
+                job.status_step = JobExecStep.AWAITING_ALLOCATION
+        return allocated_successfully
 
-    def delete_job(self, job_id) -> bool:
+    def _deserialize_job_record(self, record: Union[Dict[bytes, bytes], bytes]) -> Optional[RequestedJob]:
         """
-        Delete the job record for the job with the given id value.
+        Deserialize a job from its saved record, either a hash of serialized fields or (for older records) a single JSON
+        string.
 
-        Note that this deletes all the serialized records for the job in Redis, except for the resource allocations,
-        which are handled separately by a resource manager.  This method assumes that gets handled appropriately on its
-        own.
+        Hash fields are JSON, unless the hash has a ::attribute:`_SERIAL_TAG_FIELD` field tagging the codec with which
+        the other fields were encoded.
+
+        Jobs deserialized from hashes encoded with this instance's codec are marked clean, so that only subsequently
+        changed fields are written when they are saved.  Other jobs are not, so they are rewritten in full with this
+        instance's codec when next saved.
 
         Parameters
         ----------
-        job_id
+        record : Union[Dict[bytes, bytes], bytes]
+            The saved record, as a dictionary of hash fields or a JSON string.
+
+        Returns
+        -------
+        Optional[RequestedJob]
+            The deserialized job, or ``None`` if the record is invalid or tagged with an unsupported schema version.
+        """
+        if not isinstance(record, dict):
+            return RequestedJob.factory_init_from_deserialized_json(json_obj=json.loads(record))
+        fields = dict([(field.decode(), value) for field, value in record.items()])
+        tag = parse_tag(fields.pop(self._SERIAL_TAG_FIELD, b''))
+        codec = get_codec() if tag is None else tag[0]
+        if tag is not None and tag[1] > RequestedJob.get_schema_version():
+            return None
+        job = RequestedJob.factory_init_from_deserialized_json(
+            json_obj=dict([(field, codec.loads(value)) for field, value in fields.items()]))
+        if job is not None and codec is self._serial_codec:
+            job.mark_clean()
+        return job
+
+    def _queue_save_job_commands(self, job: RequestedJob, job_key: str,
+                                 pipeline: Union[Pipeline, AsyncPipeline]) -> bool:
+        """
+        Queue the commands for ::method:`save_job` in the given pipeline, except for adding the job to the pending jobs
+        sorted set and publishing a scheduling event.
+
+        This includes publishing a job status change, if the job's status may have changed.
+
+        Parameters
+        ----------
+        job : RequestedJob
+            The job to be updated or added.
+        job_key : str
+            The Redis key of the job.
+        pipeline : Union[Pipeline, AsyncPipeline]
+            The pipeline in which to queue the commands, which may be synchronous or asyncio.
+
+        Returns
+        -------
+        bool
+            Whether the job is awaiting allocation, in which case it should also be added to the pending jobs sorted set
+            (otherwise, commands to remove it have been queued).
+        """
+        dirty_fields = job.dirty_fields if isinstance(job, JobImpl) else None
+        if dirty_fields is None:
+            serial = job.to_dict()
+            pipeline.delete(job_key)
+        else:
+            serial = job.serialize_fields(dirty_fields)
+            # Fields that are now omitted from the serialized form
+            omitted_fields = [f for f in dirty_fields if f not in serial]
+            if len(omitted_fields) > 0:
+                pipeline.hdel(job_key, *omitted_fields)
+        if len(serial) > 0:
+            if self._serial_codec.is_binary():
+                mapping = dict([(f, self._serial_codec.dumps(v)) for f, v in serial.items()])
+                if dirty_fields is None:
+                    mapping[self._SERIAL_TAG_FIELD] = create_tag(self._serial_codec, job.get_schema_version())
+            else:
+                mapping = dict([(f, json.dumps(v)) for f, v in serial.items()])
+            pipeline.hset(job_key, mapping=mapping)
+        if job.status.is_active:
+            # Add to active set
+            pipeline.sadd(self._active_jobs_set_key, job_key)
+        else:
+            # Make sure not in active set
+            pipeline.srem(self._active_jobs_set_key, job_key)
+        if dirty_fields is None or 'status' in dirty_fields:
+            pipeline.publish(self._job_status_channel, json.dumps({self._JOB_STATUS_JOB_ID_KEY: str(job.job_id),
+                                                                   self._JOB_STATUS_STATUS_KEY: job.status.name}))
+        if self._is_pending(job):
+            return True
+        self._dequeue_pending_job(job_key, pipeline)
+        return False
+
+    def _read_job_records(self, job_redis_keys: List[str]) -> List[Optional[Union[Dict[bytes, bytes], bytes]]]:
+        """
+        Read the saved records for the given job keys, in a single pipelined round trip (plus one more if any are older,
+        single string records).
+
+        Records are read undecoded, with ::attribute:`binary_redis`, as they may have been written with a binary codec.
+
+        Parameters
+        ----------
+        job_redis_keys : List[str]
+            The Redis keys for the jobs' saved records.
+
+        Returns
+        -------
+        List[Optional[Union[Dict[bytes, bytes], bytes]]]
+            The records, in the same order as the keys, as dictionaries of hash fields, JSON strings for older records,
+            or ``None`` for keys without a record.
+        """
+        if len(job_redis_keys) == 0:
+            return []
+        with self.binary_redis.pipeline(transaction=False) as pipeline:
+            for job_redis_key in job_redis_keys:
+                pipeline.hgetall(job_redis_key)
+            records = pipeline.execute(raise_on_error=False)
+        # Older records are strings, for which HGETALL fails with a WRONGTYPE error
+        legacy_indices = [i for i in range(len(records)) if isinstance(records[i], ResponseError)]
+        if len(legacy_indices) > 0:
+            legacy_records = self.binary_redis.mget([job_redis_keys[i] for i in legacy_indices])
+            for i, legacy_record in zip(legacy_indices, legacy_records):
+                records[i] = legacy_record
+        return [record if record else None for record in records]
+
+    def _retrieve_jobs_by_redis_keys(self, job_redis_keys: List[str]) -> Iterator[RequestedJob]:
+        """
+        Get the jobs for the given Redis keys, reading all the records as described in ::method:`_read_job_records`.
+
+        Keys that do not correspond to an existing record, or that correspond to records that cannot be deserialized,
+        are skipped.
+
+        Parameters
+        ----------
+        job_redis_keys : List[str]
+            The Redis keys for the jobs' saved records.
+
+        Returns
+        -------
+        Iterator[RequestedJob]
+            An iterator over the jobs for the given keys that could be retrieved.
+        """
+        for job_redis_key, record in zip(job_redis_keys, self._read_job_records(job_redis_keys)):
+            # Record was deleted at some point after its key was read from the active set
+            if record is None:
+                logging.debug('Skipping active job key {} with no existing job record'.format(job_redis_key))
+                continue
+            job = self._deserialize_job_record(record)
+            if job is None:
+                logging.error('Skipping active job key {} with invalid job record'.format(job_redis_key))
+                continue
+            yield job
+
+    def _run_allocation_pass(self):
+        """
+        Perform a single pass of job processing: organize active jobs, release allocations that should be released,
+        request allocations for pending jobs in priority order, and hand off newly allocated jobs to the launcher.
+
+        Pending jobs are read in order from the pending jobs sorted set (see ::method:`_iter_pending_jobs`), and only
+        as many as are considered before allocation stops; the records of jobs that are not allocated are not written.
+
+        While the pass is running, ::method:`_notify_scheduling_event` does not publish anything, so that saves made by
+        the pass itself do not immediately trigger another pass.
+        """
+        self._is_in_allocation_pass = True
+        try:
+            # Get collection of "active" jobs
+            active_jobs: List[RequestedJob] = self.get_all_active_jobs()
+
+            # TODO: something must transition MODEL_EXEC_RUNNING Jobs to MODEL_EXEC_COMPLETED (probably Monitor class)
+            # TODO: something must transition OUTPUT_EXEC_RUNNING Jobs to OUTPUT_EXEC_COMPLETED (probably Monitor class)
+
+            # Process the jobs into various organized collections
+            organized_lists = self._organize_active_jobs(active_jobs)
+            jobs_eligible_for_allocate = organized_lists[0]
+            jobs_to_release_resources = organized_lists[1]
+            jobs_completed_phase = organized_lists[2]
+
+            for job_with_allocations_to_release in jobs_to_release_resources:
+                self.release_allocations(job_with_allocations_to_release)
+                self.save_job(job_with_allocations_to_release)
+
+            for job_transitioning_phases in jobs_completed_phase:
+                # TODO: figure out what to do here; e.g., start output service after model_exec is done
+                pass
+
+            # Read pending jobs in priority order from the persistent pending jobs queue
+            if self._fair_share_ledger is None:
+                priority_adjustments = None
+            else:
+                priority_adjustments = self.get_fair_share_priority_adjustments(jobs_eligible_for_allocate, active_jobs)
+            active_jobs_by_key = dict([(self._get_job_key_for_id(j.job_id), j) for j in active_jobs])
+            pending_jobs = self._iter_pending_jobs(active_jobs_by_key, priority_adjustments)
+
+            if self._backfill:
+                # Allocate in priority order, then backfill around a reservation for the first job that doesn't fit
+                allocated_successfully = self._request_allocations_with_backfill(pending_jobs, active_jobs)
+            else:
+                # Allocate in priority order, only considering others if all high priority jobs get allocated
+                allocated_successfully = self._request_allocations_in_order(pending_jobs)
+
+            if len(allocated_successfully) < len(jobs_eligible_for_allocate):
+                logging.debug("{} of {} eligible jobs not allocated; largest placeable job is {} CPUs ({:.2f} "
+                              "fragmentation)".format(len(jobs_eligible_for_allocate) - len(allocated_successfully),
+                                                      len(jobs_eligible_for_allocate),
+                                                      self._resource_manager.get_largest_placeable_cpu_count(),
+                                                      self._resource_manager.get_fragmentation()))
+
+            # For each Job that received an allocation, save updated state and pass to scheduler
+            for job in allocated_successfully:
+                if self.request_scheduling(job):
+                    job.status_step = JobExecStep.SCHEDULED
+                else:
+                    job.status_step = JobExecStep.FAILED
+                    # TODO: probably log something about this, or raise exception
+                self.save_job(job)
+        finally:
+            self._is_in_allocation_pass = False
+
+    def _start_scheduling_event_listener(self, wake_event: Event) -> PubSubWorkerThread:
+        """
+        Subscribe to this instance's scheduling events channel, setting the given event whenever a message arrives.
+
+        Redis pub/sub messages are received on a separate, daemon worker thread, so the event is set in a thread-safe
+        manner via the event loop that is current when this method is called.
+
+        Parameters
+        ----------
+        wake_event : Event
+            The asyncio event for the processing loop to set when scheduling events are received.
+
+        Returns
+        -------
+        PubSubWorkerThread
+            The started worker thread, which should be stopped via its ``stop()`` method when no longer needed.
+        """
+        loop = get_event_loop()
+        pubsub = self.redis.pubsub(ignore_subscribe_messages=True)
+        pubsub.subscribe(**{self._scheduling_events_channel: lambda msg: loop.call_soon_threadsafe(wake_event.set)})
+        return pubsub.run_in_thread(sleep_time=self._SCHEDULING_EVENT_LISTENER_POLL_SECONDS, daemon=True)
+
+    async def _listen_for_job_status_changes(self, pubsub: AsyncPubSub):
+        """
+        Receive the messages of the given subscription to the job status changes channel, passing each change to the
+        watchers of the changed job, until cancelled or the subscription's connection fails.
+
+        Parameters
+        ----------
+        pubsub : AsyncPubSub
+            The asyncio pub/sub object, already subscribed to the job status changes channel.
+        """
+        try:
+            async for message in pubsub.listen():
+                if message['type'] != 'message':
+                    continue
+                try:
+                    change = json.loads(message['data'])
+                    job_id = change[self._JOB_STATUS_JOB_ID_KEY]
+                    status = JobStatus.get_for_name(change[self._JOB_STATUS_STATUS_KEY])
+                except (ValueError, KeyError, TypeError) as e:
+                    logging.error('Could not parse job status change {}: {}'.format(message['data'], str(e)))
+                    continue
+                for watcher in self._job_status_watchers.get(job_id, ()):
+                    watcher.put_nowait(status)
+        except (RedisConnectionError, RedisTimeoutError) as e:
+            # Watchers fall back to re-reading job records at the safety interval until a new subscription is made
+            logging.error('Job status change subscription failed: {}'.format(str(e)))
+        finally:
+            await pubsub.aclose()
+
+    async def _start_job_status_listener(self):
+        """
+        Subscribe to the job status changes channel and start the task receiving its messages, if not already running.
+
+        The subscription is confirmed before returning, so no change published after this returns will be missed.
+        """
+        if self._job_status_listener_lock is None:
+            self._job_status_listener_lock = Lock()
+        async with self._job_status_listener_lock:
+            if self._job_status_listener_task is not None and not self._job_status_listener_task.done():
+                return
+            pubsub = self.async_redis.pubsub(ignore_subscribe_messages=True)
+            await pubsub.subscribe(self._job_status_channel)
+            self._job_status_listener_task = ensure_future(self._listen_for_job_status_changes(pubsub))
+
+    async def async_close_redis(self):
+        """
+        Stop the shared subscription to job status changes, if running, then close the asyncio clients.
+        """
+        if self._job_status_listener_task is not None:
+            self._job_status_listener_task.cancel()
+            try:
+                await self._job_status_listener_task
+            except CancelledError:
+                pass
+            self._job_status_listener_task = None
+        await super().async_close_redis()
+
+    async def async_create_job(self, **kwargs) -> RequestedJob:
+        """
+        Async counterpart of ::method:`create_job`, using the asyncio Redis clients.
+
+        Parameters
+        ----------
+        kwargs
+            Implementation-specific keyed parameters for creating appropriate job objects (see *Keyword Args* section).
+
+        Keyword Args
+        ------------
+        request : SchedulerRequestMessage
+            The originating request for the job.
+        job_id : str, UUID, None
+            Optional value to try use for the job's id, falling back to random if not present, invalid, or already used.
+
+        Returns
+        -------
+        RequestedJob
+            The newly created job object.
+        """
+        job_obj = RequestedJob(job_request=kwargs['request'])
+        try:
+            job_uuid = kwargs['job_id'] if isinstance(kwargs['job_id'], UUID) else UUID(str(kwargs['job_id']))
+        except (KeyError, TypeError, ValueError):
+            job_uuid = None
+        if job_uuid is not None and not await self.async_redis.exists(self._get_job_key_for_id(job_uuid)):
+            job_obj.job_id = job_uuid
+        else:
+            job_obj.job_id = random_uuid()
+
+        await self.async_save_job(job_obj)
+        return job_obj
+
+    async def async_delete_job(self, job_id) -> bool:
+        """
+        Async counterpart of ::method:`delete_job`, using the asyncio Redis clients.
+
+        Parameters
+        ----------
+        job_id
+            The unique id for a job of interest to delete.
+
+        Returns
+        -------
+        bool
+            ``True`` if a record was successfully deleted.
+
+        Raises
+        -------
+        ValueError
+            If no job exists with given job id.
+        """
+        logging.debug("Deleting job {}".format(job_id))
+        job_key = self._get_job_key_for_id(job_id)
+        job_obj = await self.async_retrieve_job_by_redis_key(job_key)
+
+        # Ensure allocations are released
+        await self.async_release_allocations(job_obj)
+
+        async with self.async_redis.pipeline() as pipeline:
+            if job_obj.status.is_active:
+                # Make sure not in active set
+                pipeline.srem(self._active_jobs_set_key, job_key)
+            self._dequeue_pending_job(job_key, pipeline)
+            pipeline.delete(job_key)
+            await pipeline.execute()
+        # Try to do this, but don't fully fail just for this part
+        try:
+            job_obj.rsa_key_pair.delete_key_files()
+        except Exception:
+            pass
+        return True
+
+    async def async_does_job_exist(self, job_id) -> bool:
+        """
+        Async counterpart of ::method:`does_job_exist`, using the asyncio Redis clients.
+
+        Parameters
+        ----------
+        job_id
+            The job id of interest.
+
+        Returns
+        -------
+        bool
+            ``True`` if a job exists with the provided job id, or ``False`` otherwise.
+        """
+        return await self.async_redis.exists(self._get_job_key_for_id(job_id)) == 1
+
+    async def async_release_allocations(self, job: Job):
+        """
+        Async counterpart of ::method:`release_allocations`, using the asyncio Redis clients and the resource manager's
+        async methods.
+
+        Any fair-share usage charge is made in the event loop's default executor.
+
+        Parameters
+        ----------
+        job : Job
+            The job for which any held allocations should be released.
+        """
+        if job.allocations is not None and len(job.allocations) > 0:
+            await self._resource_manager.async_release_resources(job.allocations)
+            user = self._get_job_user(job)
+            if self._fair_share_ledger is not None and user is not None:
+                await get_event_loop().run_in_executor(None, self._fair_share_ledger.charge, user, job.allocations,
+                                                       datetime.datetime.now().timestamp())
+            await self.async_redis.publish(self._scheduling_events_channel, 'release_allocations')
+        job.allocations = None
+
+    async def async_retrieve_job(self, job_id) -> RequestedJob:
+        """
+        Async counterpart of ::method:`retrieve_job`, using the asyncio Redis clients.
+
+        Parameters
+        ----------
+        job_id
+            The unique id of the desired job.
+
+        Returns
+        -------
+        RequestedJob
+            The particular job with the given unique id.
+
+        Raises
+        -------
+        ValueError
+            If no job exists with given job id.
+        """
+        return await self.async_retrieve_job_by_redis_key(job_redis_key=self._get_job_key_for_id(job_id))
+
+    async def async_retrieve_job_by_redis_key(self, job_redis_key: str) -> RequestedJob:
+        """
+        Async counterpart of ::method:`retrieve_job_by_redis_key`, using the asyncio Redis clients.
+
+        Parameters
+        ----------
+        job_redis_key : str
+            The Redis key for the job's saved record.
+
+        Returns
+        -------
+        RequestedJob
+            The particular job with the given Redis key.
+
+        Raises
+        -------
+        ValueError
+            If no job record exists with given key.
+        """
+        record = (await self._async_read_job_records([job_redis_key]))[0]
+        if record is None:
+            raise ValueError('No job record found for job with key {}'.format(job_redis_key))
+        return self._deserialize_job_record(record)
+
+    async def async_save_job(self, job: RequestedJob):
+        """
+        Async counterpart of ::method:`save_job`, using the asyncio Redis clients.
+
+        Since this is never called by an allocation pass itself, a scheduling event is always published.
+
+        Parameters
+        ----------
+        job : RequestedJob
+            The job to be updated or added.
+        """
+        job_key = self._get_job_key_for_id(job.job_id)
+        async with self.async_redis.pipeline() as pipeline:
+            if self._queue_save_job_commands(job, job_key, pipeline):
+                keys, args = self._get_enqueue_pending_script_params(job, job_key)
+                await self.get_async_script(self._ENQUEUE_PENDING_SCRIPT)(keys=keys, args=args, client=pipeline)
+            pipeline.publish(self._scheduling_events_channel, 'save_job')
+            await pipeline.execute()
+        if isinstance(job, JobImpl):
+            job.mark_clean()
+
+    async def async_watch_job_status(self, job_id, status: Optional[JobStatus] = None) -> AsyncIterator[JobStatus]:
+        """
+        Get the changes to the status of the job with the given id, as they happen, until the job is no longer active.
+
+        The job's current status is yielded first if it differs from the given, last known status.  Each subsequent
+        change of status is then yielded, with iteration ending after a status that is not active.
+
+        Changes are received from the job status changes channel, via the instance's shared subscription, rather than by
+        polling the job's record.  The record is only read again after going ::attribute:`_safety_interval` seconds
+        without a change (e.g., in case a change was missed because the subscription's connection failed).
+
+        Parameters
+        ----------
+        job_id
+            The unique id of the job of interest.
+        status : Optional[JobStatus]
+            The last known status of the job, if any.
+
+        Returns
+        -------
+        AsyncIterator[JobStatus]
+            An async iterator of the changed statuses of the job.
+
+        Raises
+        -------
+        ValueError
+            If no job exists with given job id.
+        """
+        job_id = str(job_id)
+        watcher = Queue()
+        self._job_status_watchers.setdefault(job_id, set()).add(watcher)
+        try:
+            await self._start_job_status_listener()
+            # Read the status once subscribed, so nothing changed before subscribing is missed
+            current_status = (await self.async_retrieve_job(job_id)).status
+            while True:
+                if current_status != status:
+                    status = current_status
+                    yield status
+                if not status.is_active:
+                    return
+                try:
+                    current_status = await wait_for(watcher.get(), timeout=self._safety_interval)
+                except AsyncTimeoutError:
+                    await self._start_job_status_listener()
+                    current_status = (await self.async_retrieve_job(job_id)).status
+        finally:
+            watchers = self._job_status_watchers.get(job_id)
+            watchers.discard(watcher)
+            if len(watchers) == 0:
+                self._job_status_watchers.pop(job_id)
+
+    def create_job(self, **kwargs) -> RequestedJob:
+        """
+        Create and return a new job object that has been saved to the backend store.
+
+        Since this class works with ::class:`RequestedJob` objects, a new object must receive a
+        ::class:`SchedulerRequestMessage` as a parameter.  This is in the ``request`` keyword arg.
+
+        Parameters
+        ----------
+        kwargs
+            Implementation-specific keyed parameters for creating appropriate job objects (see *Keyword Args* section).
+
+        Keyword Args
+        ------------
+        request : SchedulerRequestMessage
+            The originating request for the job.
+        job_id : str, UUID, None
+            Optional value to try use for the job's id, falling back to random if not present, invalid, or already used.
+
+        Returns
+        -------
+        RequestedJob
+            The newly created job object.
+        """
+        job_obj = RequestedJob(job_request=kwargs['request'])
+        try:
+            job_uuid = kwargs['job_id'] if isinstance(kwargs['job_id'], UUID) else UUID(str(kwargs['job_id']))
+            if not self._does_redis_key_exist(self._get_job_key_for_id(job_uuid)):
+                job_obj.job_id = job_uuid
+            else:
+                job_obj.job_id = random_uuid()
+        except:
+            job_obj.job_id = random_uuid()
+
+        self.save_job(job_obj)
+        return job_obj
+
+    def delete_job(self, job_id) -> bool:
+        """
+        Delete the job record for the job with the given id value.
+
+        Note that this deletes all the serialized records for the job in Redis, except for the resource allocations,
+        which are handled separately by a resource manager.  This method assumes that gets handled appropriately on its
+        own.
+
+        Parameters
+        ----------
+        job_id
             The unique id for a job of interest to delete.
 
         Returns
@@ -589,6 +1739,7 @@ class RedisBackedJobManager(JobManager, RedisBacked):
                 if job_obj.status.is_active:
                     # Make sure not in active set
                     pipeline.srem(self._active_jobs_set_key, job_key)
+                self._dequeue_pending_job(job_key, pipeline)
                 pipeline.delete(job_key)
                 pipeline.execute()
                 # Try to do this, but don't fully fail just for this part
@@ -626,10 +1777,145 @@ class RedisBackedJobManager(JobManager, RedisBacked):
         List[RequestedJob]
             A list of every job known to this manager object that is considered active based on each job's status.
         """
-        active_jobs = []
-        for active_job_redis_key in self.redis.smembers(self._active_jobs_set_key):
-            active_jobs.append(self.retrieve_job_by_redis_key(active_job_redis_key))
-        return active_jobs
+        return list(self.iter_active_jobs())
+
+    def get_fair_share_priority_adjustments(self, jobs_eligible_for_allocate: List[RequestedJob],
+                                            active_jobs: List[RequestedJob]) -> Dict[str, int]:
+        """
+        Get the fair-share priority adjustments for the given jobs eligible for allocation.
+
+        Each job's priority is lowered in proportion to its user's share of all recent usage, up to the configured
+        fair-share weight for a user accounting for all of it.  A user's recent usage is the decayed usage recorded as
+        allocations are released, plus the decayed usage so far of allocations currently held by the given active jobs.
+
+        This requires a single read from Redis for the users of the eligible jobs, regardless of the number of jobs.
+
+        Parameters
+        ----------
+        jobs_eligible_for_allocate : List[RequestedJob]
+            The jobs eligible for allocation.
+        active_jobs : List[RequestedJob]
+            All active jobs, used to account for the usage of currently held allocations.
+
+        Returns
+        -------
+        Dict[str, int]
+            The (non-positive) priority adjustments, keyed by the string form of job id, or an empty dictionary if
+            fair-share scheduling is not enabled.
+        """
+        if self._fair_share_ledger is None:
+            return dict()
+        now = datetime.datetime.now().timestamp()
+        half_life = self._fair_share_ledger.half_life
+        users = set(self._get_job_user(j) for j in jobs_eligible_for_allocate)
+        users.discard(None)
+        usage = self._fair_share_ledger.get_usage(users, now)
+        for job in active_jobs:
+            if job.allocations is None or len(job.allocations) == 0:
+                continue
+            in_progress = FairShareLedger.decayed_cpu_seconds(job.allocations, now, half_life)
+            usage[None] += in_progress
+            user = self._get_job_user(job)
+            if user in users:
+                usage[user] += in_progress
+        if usage[None] <= 0:
+            return dict()
+        adjustments = dict()
+        for job in jobs_eligible_for_allocate:
+            user = self._get_job_user(job)
+            if user is not None:
+                adjustments[str(job.job_id)] = -round(self._fair_share_weight * usage[user] / usage[None])
+        return adjustments
+
+    def get_walltime_estimate(self, job: Job) -> datetime.timedelta:
+        """
+        Get the estimated walltime for a job, as used for backfill scheduling.
+
+        The estimate is the job's ``walltime`` parameter in seconds, if present and valid.  Otherwise, it is the default
+        for the job's model, if one was configured, or else the overall default walltime for this instance.
+
+        Parameters
+        ----------
+        job : Job
+            The job in question.
+
+        Returns
+        -------
+        datetime.timedelta
+            The estimated walltime for the job.
+        """
+        walltime = job.parameters.get('walltime') if isinstance(job.parameters, dict) else None
+        try:
+            if walltime is not None and float(walltime) > 0:
+                return datetime.timedelta(seconds=float(walltime))
+        except (TypeError, ValueError):
+            logging.warning("Ignoring invalid walltime parameter {} for job {}".format(walltime, job.job_id))
+        model_request = getattr(self._get_originating_request(job), 'model_request', None)
+        if model_request is not None and model_request.get_model_name() in self._model_walltimes:
+            return datetime.timedelta(seconds=self._model_walltimes[model_request.get_model_name()])
+        return datetime.timedelta(seconds=self._default_walltime)
+
+    def iter_active_jobs(self, chunk_size: Optional[int] = None) -> Iterator[RequestedJob]:
+        """
+        Lazily iterate through every job known to this manager object that is considered active.
+
+        The set of active job keys is incrementally scanned with ``SSCAN``, and the job hash records for each chunk of
+        keys are then read with ``HGETALL`` commands sent in a single pipeline, followed by one ``MGET`` for any older,
+        single string records in the chunk.  The number of Redis round trips is thus proportional to the number of
+        chunks rather than the number of jobs.  Only one chunk of jobs is held in memory by this method at a time.
+
+        Keys for job records that no longer exist when read (e.g., because the job was deleted after the scan started)
+        are skipped, as are any records that cannot be deserialized.
+
+        Parameters
+        ----------
+        chunk_size : Optional[int]
+            Optional number of jobs to read from Redis per round trip, with ::attribute:`_ACTIVE_JOBS_CHUNK_SIZE` used
+            by default.
+
+        Returns
+        -------
+        Iterator[RequestedJob]
+            An iterator over the active jobs.
+        """
+        if chunk_size is None:
+            chunk_size = self._ACTIVE_JOBS_CHUNK_SIZE
+        chunk = []
+        for active_job_redis_key in self.redis.sscan_iter(self._active_jobs_set_key, count=chunk_size):
+            chunk.append(active_job_redis_key)
+            if len(chunk) >= chunk_size:
+                yield from self._retrieve_jobs_by_redis_keys(chunk)
+                chunk = []
+        if len(chunk) > 0:
+            yield from self._retrieve_jobs_by_redis_keys(chunk)
+
+    def rebuild_pending_jobs_queue(self) -> int:
+        """
+        Rebuild the pending jobs sorted set from the active job records, e.g., for records saved by older versions.
+
+        Pending jobs missing from the set are added, using their last update time as when they started waiting, and
+        entries for jobs that are not pending are removed.  Jobs already in the set keep their recorded wait start.
+
+        This reads every active job record, so it is not done on init, but is instead intended as a startup step of the
+        scheduler service, before jobs are processed.
+
+        Returns
+        -------
+        int
+            The number of pending jobs.
+        """
+        pending_keys = set()
+        with self.redis.pipeline() as pipeline:
+            for job in self.iter_active_jobs():
+                if self._is_pending(job):
+                    job_key = self._get_job_key_for_id(job.job_id)
+                    pending_keys.add(job_key)
+                    self._enqueue_pending_job(job, job_key, pipeline, since=job.last_updated)
+            for job_key in self.redis.zrange(self._pending_jobs_key, 0, -1):
+                if job_key not in pending_keys:
+                    self._dequeue_pending_job(job_key, pipeline)
+            pipeline.execute()
+        return len(pending_keys)
 
     def request_scheduling(self, job: RequestedJob):
         """
@@ -648,59 +1934,42 @@ class RedisBackedJobManager(JobManager, RedisBacked):
     async def manage_job_processing(self):
         """
         Monitor for created jobs and perform steps for job queueing, allocation of resources, and hand-off to scheduler.
-        """
-        while True:
-            # Get collection of "active" jobs
-            active_jobs: List[RequestedJob] = self.get_all_active_jobs()
-
-            # TODO: something must transition MODEL_EXEC_RUNNING Jobs to MODEL_EXEC_COMPLETED (probably Monitor class)
-            # TODO: something must transition OUTPUT_EXEC_RUNNING Jobs to OUTPUT_EXEC_COMPLETED (probably Monitor class)
 
-            # Process the jobs into various organized collections
-            organized_lists = self._organize_active_jobs(active_jobs)
-            jobs_eligible_for_allocate = organized_lists[0]
-            jobs_to_release_resources = organized_lists[1]
-            jobs_completed_phase = organized_lists[2]
-
-            for job_with_allocations_to_release in jobs_to_release_resources:
-                self.release_allocations(job_with_allocations_to_release)
-                self.save_job(job_with_allocations_to_release)
+        In wake-on-change mode, a new allocation pass is started as soon as a scheduling event is received, with a pass
+        also run after ::attribute:`_safety_interval` seconds without any events.  Otherwise, a pass is simply run every
+        ::attribute:`_safety_interval` seconds.
 
-            for job_transitioning_phases in jobs_completed_phase:
-                # TODO: figure out what to do here; e.g., start output service after model_exec is done
-                pass
-
-            # Build prioritized list/queue of allocation eligible Jobs
-            priority_queues = self.build_prioritized_pending_allocation_queues(jobs_eligible_for_allocate)
-            high_priority_queue = priority_queues['high']
-            # Do this here to get size in case queue is altered below
-            initial_high_priority_queue_size = len(high_priority_queue)
-            low_priority_queue = priority_queues['low']
-            med_priority_queue = priority_queues['medium']
-
-            # Request allocations and get collection of jobs that were allocated, starting first with high priorities
-            allocated_successfully = self._request_allocations_for_queue(high_priority_queue)
-            # Only even process others if any and all high priority jobs get allocated
-            if len(allocated_successfully) == initial_high_priority_queue_size:
-                allocated_successfully.extend(self._request_allocations_for_queue(med_priority_queue))
-                allocated_successfully.extend(self._request_allocations_for_queue(low_priority_queue))
-
-            # For each Job that received an allocation, save updated state and pass to scheduler
-            for job in allocated_successfully:
-                if self.request_scheduling(job):
-                    job.status_step = JobExecStep.SCHEDULED
-                else:
-                    job.status_step = JobExecStep.FAILED
-                    # TODO: probably log something about this, or raise exception
-                self.save_job(job)
-
-            await sleep(60)
+        Allocation passes, which make many synchronous Redis calls, are run in the event loop's default executor, so
+        that other coroutines (e.g., service handlers using the async job management methods) are not blocked by them.
+        """
+        loop = get_event_loop()
+        if not self._wake_on_change:
+            while True:
+                await loop.run_in_executor(None, self._run_allocation_pass)
+                await sleep(self._safety_interval)
+
+        wake_event = Event()
+        listener_thread = self._start_scheduling_event_listener(wake_event)
+        try:
+            while True:
+                await loop.run_in_executor(None, self._run_allocation_pass)
+                try:
+                    await wait_for(wake_event.wait(), timeout=self._safety_interval)
+                except AsyncTimeoutError:
+                    logging.debug("No scheduling events in {} seconds; running allocation pass".format(
+                        self._safety_interval))
+                # Clear after waking, so any burst of events received before this point is coalesced into one pass
+                wake_event.clear()
+        finally:
+            listener_thread.stop()
 
     def release_allocations(self, job: Job):
         """
         Release any resource allocations held by the given job back to the resource manager and unset the allocation
         assignment for the object.
 
+        If fair-share scheduling is enabled, the usage of the allocations is also charged to the job's user.
+
         Parameters
         ----------
         job : Job
@@ -708,6 +1977,10 @@ class RedisBackedJobManager(JobManager, RedisBacked):
         """
         if job.allocations is not None and len(job.allocations) > 0:
             self._resource_manager.release_resources(job.allocations)
+            user = self._get_job_user(job)
+            if self._fair_share_ledger is not None and user is not None:
+                self._fair_share_ledger.charge(user, job.allocations, datetime.datetime.now().timestamp())
+            self._notify_scheduling_event('release_allocations')
         job.allocations = None
 
     def request_allocations(self, job: Job, require_awaiting_status: bool = True) -> bool:
@@ -742,6 +2015,8 @@ class RedisBackedJobManager(JobManager, RedisBacked):
             alloc = self._resource_manager.allocate_fill_nodes(job.cpu_count, job.memory_size)
         elif job.allocation_paradigm == JobAllocationParadigm.ROUND_ROBIN:
             alloc = self._resource_manager.allocate_round_robin(job.cpu_count, job.memory_size)
+        elif job.allocation_paradigm == JobAllocationParadigm.BEST_FIT:
+            alloc = self._resource_manager.allocate_best_fit(job.cpu_count, job.memory_size)
         else:
             alloc = [None]
         if isinstance(alloc, list) and len(alloc) > 0 and isinstance(alloc[0], ResourceAllocation):
@@ -795,16 +2070,21 @@ class RedisBackedJobManager(JobManager, RedisBacked):
         ValueError
             If no job record exists with given key.
         """
-        if self._does_redis_key_exist(job_redis_key):
-            serialized_job = json.loads(self.redis.get(job_redis_key))
-            return RequestedJob.factory_init_from_deserialized_json(json_obj=serialized_job)
-        else:
+        record = self._read_job_records([job_redis_key])[0]
+        if record is None:
             raise ValueError('No job record found for job with key {}'.format(job_redis_key))
+        return self._deserialize_job_record(record)
 
     def save_job(self, job: RequestedJob):
         """
         Add or update the given job object in this manager's backend data store of job record data, also maintaining a
-        Redis set of the ids of 'active' jobs.
+        Redis set of the ids of 'active' jobs and the sorted set of jobs awaiting allocation.
+
+        If the job is tracking changed fields (see ::attribute:`JobImpl.dirty_fields`), only those fields of its record
+        are written; otherwise, the whole record is replaced.  Either way, the job is then marked clean.
+
+        Fields are encoded with this instance's serialization codec, with records written with a codec other than JSON
+        also getting a ::attribute:`_SERIAL_TAG_FIELD` field identifying the codec.
 
         Parameters
         ----------
@@ -812,17 +2092,13 @@ class RedisBackedJobManager(JobManager, RedisBacked):
             The job to be updated or added.
         """
         job_key = self._get_job_key_for_id(job.job_id)
-        serialized_job_str = job.to_json()
-
         pipeline = self.redis.pipeline()
         try:
-            pipeline.set(job_key, serialized_job_str)
-            if job.status.is_active:
-                # Add to active set
-                pipeline.sadd(self._active_jobs_set_key, job_key)
-            else:
-                # Make sure not in active set
-                pipeline.srem(self._active_jobs_set_key, job_key)
+            if self._queue_save_job_commands(job, job_key, pipeline):
+                self._enqueue_pending_job(job, job_key, pipeline)
+            self._notify_scheduling_event('save_job', pipeline=pipeline)
             pipeline.execute()
+            if isinstance(job, JobImpl):
+                job.mark_clean()
         finally:
             pipeline.reset()
@@ -1,4 +1,4 @@
 from .resource import Resource, ResourceAvailability, ResourceState
 from .resource_allocation import ResourceAllocation
 from .redis_manager import RedisManager
-from .resource_manager import ResourceManager
+from .resource_manager import ResourceFit, ResourceManager
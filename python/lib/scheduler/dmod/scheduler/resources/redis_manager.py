@@ -1,11 +1,12 @@
 #!/usr/bin/env python3
-from typing import Iterable, List, Union, Optional
+from datetime import datetime
+from typing import Iterable, List, Sequence, Tuple, Union, Optional
 from redis import WatchError
 import logging
 
-from dmod.redis import RedisBacked
+from dmod.redis import AsyncRedisBacked
 ## local imports
-from .resource_manager import ResourceManager
+from .resource_manager import ResourceFit, ResourceManager
 from .resource import Resource, ResourceAvailability, ResourceState
 from .resource_allocation import ResourceAllocation
 
@@ -18,18 +19,217 @@ logging.basicConfig(
     datefmt="%H:%M:%S")
 
 
-class RedisManager(ResourceManager, RedisBacked):
+class RedisManager(ResourceManager, AsyncRedisBacked):
     """
     Implementation of a Redis-backed ::class:`ResourceManager` that works internally with modeled objects representing
     the involved data entities (e.g., ::class:`Resource` objects), as opposed to some other raw serial data structures
     like dictionaries.
+
+    Allocating from and releasing to resources is performed server-side by registered Lua scripts, so that checking and
+    updating a resource's available CPUs and memory, along with writing or deleting the allocation record, happens in a
+    single atomic step without optimistic locking retries.  Likewise, ::method:`allocate_resources` claims from several
+    resources in one atomic script call that either reserves everything requested or changes nothing.
+
+    The manager also maintains a secondary index of free capacity for its pool: a pair of sorted sets scoring each
+    allocatable resource by its available CPUs and its available memory, along with a third keeping the allocatable
+    resources in the pool's natural order.  The index is updated by the same scripts that allocate and release, so it
+    is always consistent with the resource records, and lets ::method:`get_candidate_resource_ids` find resources with
+    enough capacity without reading the whole pool.  Scripts are sent using ``EVALSHA`` and are only loaded into the
+    Redis script cache when not already present.
+    """
+
+    _ALLOCATE_SCRIPT = """
+        -- KEYS[1]: resource hash key; KEYS[2]: allocation hash key; KEYS[3], KEYS[4]: free cpu and memory index keys
+        -- ARGV: requested cpus, requested memory, partial flag ('1' or '0'), created timestamp, id separator
+        -- Returns {-1} for an unrecognized resource, {0} for no allocation, or {1, cpus, memory, hostname}
+        if redis.call('EXISTS', KEYS[1]) == 0 then
+            return {-1}
+        end
+        local resource = redis.call('HMGET', KEYS[1], 'CPUs', 'MemoryBytes', 'node_id', 'Hostname')
+        local requested_cpus = tonumber(ARGV[1])
+        local requested_mem = tonumber(ARGV[2])
+        local cpus = math.min(tonumber(resource[1]), requested_cpus)
+        local mem = math.min(tonumber(resource[2]), requested_mem)
+        local is_fully = cpus == requested_cpus and mem == requested_mem
+        if not (is_fully or (ARGV[3] == '1' and cpus > 0 and (mem > 0 or requested_mem == 0))) then
+            return {0}
+        end
+        local free_cpus = redis.call('HINCRBY', KEYS[1], 'CPUs', string.format('%d', -cpus))
+        local free_mem = redis.call('HINCRBY', KEYS[1], 'MemoryBytes', string.format('%d', -mem))
+        redis.call('ZADD', KEYS[3], 'XX', free_cpus, KEYS[1])
+        redis.call('ZADD', KEYS[4], 'XX', free_mem, KEYS[1])
+        redis.call('HSET', KEYS[2], 'node_id', resource[3], 'Hostname', resource[4],
+                   'cpus_allocated', string.format('%d', cpus), 'mem', string.format('%d', mem), 'Created', ARGV[4],
+                   'separator', ARGV[5])
+        return {1, cpus, mem, resource[4]}
+    """
+
+    _ALLOCATE_MULTIPLE_SCRIPT = """
+        -- KEYS[1..n]: resource hash keys; KEYS[n+1..2n]: the corresponding allocation hash keys;
+        -- KEYS[2n+1], KEYS[2n+2]: free cpu and memory index keys
+        -- ARGV[1..2n]: requested cpus and memory for each resource, in pairs; then created timestamp, id separator
+        -- Returns {-1, i} if resource i is unrecognized, {0, i} if resource i cannot satisfy its request, or
+        -- {1, hostname_1, ..., hostname_n} after allocating from every resource
+        local n = (#KEYS - 2) / 2
+        for i = 1, n do
+            if redis.call('EXISTS', KEYS[i]) == 0 then
+                return {-1, i}
+            end
+            local available = redis.call('HMGET', KEYS[i], 'CPUs', 'MemoryBytes')
+            if tonumber(available[1]) < tonumber(ARGV[2 * i - 1]) or tonumber(available[2]) < tonumber(ARGV[2 * i]) then
+                return {0, i}
+            end
+        end
+        local result = {1}
+        for i = 1, n do
+            local resource = redis.call('HMGET', KEYS[i], 'node_id', 'Hostname')
+            local cpus = tonumber(ARGV[2 * i - 1])
+            local mem = tonumber(ARGV[2 * i])
+            local free_cpus = redis.call('HINCRBY', KEYS[i], 'CPUs', string.format('%d', -cpus))
+            local free_mem = redis.call('HINCRBY', KEYS[i], 'MemoryBytes', string.format('%d', -mem))
+            redis.call('ZADD', KEYS[2 * n + 1], 'XX', free_cpus, KEYS[i])
+            redis.call('ZADD', KEYS[2 * n + 2], 'XX', free_mem, KEYS[i])
+            redis.call('HSET', KEYS[n + i], 'node_id', resource[1], 'Hostname', resource[2],
+                       'cpus_allocated', string.format('%d', cpus), 'mem', string.format('%d', mem),
+                       'Created', ARGV[2 * n + 1], 'separator', ARGV[2 * n + 2])
+            result[i + 1] = resource[2]
+        end
+        return result
+    """
+
+    _RELEASE_SCRIPT = """
+        -- KEYS[1]: resource hash key; KEYS[2]: allocation hash key; KEYS[3], KEYS[4]: free cpu and memory index keys
+        -- ARGV: allocated cpus, allocated memory
+        -- Returns -1 for an unrecognized resource, or 1 after releasing
+        if redis.call('EXISTS', KEYS[1]) == 0 then
+            return -1
+        end
+        local free_cpus = redis.call('HINCRBY', KEYS[1], 'CPUs', ARGV[1])
+        local free_mem = redis.call('HINCRBY', KEYS[1], 'MemoryBytes', ARGV[2])
+        redis.call('ZADD', KEYS[3], 'XX', free_cpus, KEYS[1])
+        redis.call('ZADD', KEYS[4], 'XX', free_mem, KEYS[1])
+        redis.call('DEL', KEYS[2])
+        return 1
     """
 
+    _FIND_CANDIDATES_SCRIPT = """
+        -- KEYS[1], KEYS[2], KEYS[3]: free cpu, free memory, and pool order index keys
+        -- ARGV: required cpus, required memory, fit ('first', 'best', or 'worst'), limit (0 for no limit), page size
+        -- Returns the keys of resources with enough free capacity, ordered by preference for the given fit
+        local required_cpus = tonumber(ARGV[1])
+        local required_mem = tonumber(ARGV[2])
+        local limit = tonumber(ARGV[4])
+        local page_size = tonumber(ARGV[5])
+        local result = {}
+        local offset = 0
+        -- Read a page of index members at a time, so the lookup stops as soon as the limit is filled
+        while true do
+            local members
+            if ARGV[3] == 'first' then
+                members = redis.call('ZRANGE', KEYS[3], offset, offset + page_size - 1)
+            elseif ARGV[3] == 'worst' then
+                members = redis.call('ZREVRANGEBYSCORE', KEYS[1], '+inf', ARGV[1], 'LIMIT', offset, page_size)
+            else
+                members = redis.call('ZRANGEBYSCORE', KEYS[1], ARGV[1], '+inf', 'LIMIT', offset, page_size)
+            end
+            for _, member in ipairs(members) do
+                -- Pages of the cpu index only hold members with enough cpus, but the pool order index holds them all
+                local has_cpus = true
+                if ARGV[3] == 'first' then
+                    local free_cpus = tonumber(redis.call('ZSCORE', KEYS[1], member))
+                    has_cpus = free_cpus ~= nil and free_cpus >= required_cpus
+                end
+                local free_mem = tonumber(redis.call('ZSCORE', KEYS[2], member))
+                if has_cpus and free_mem ~= nil and free_mem >= required_mem then
+                    result[#result + 1] = member
+                    if limit > 0 and #result >= limit then
+                        return result
+                    end
+                end
+            end
+            if #members < page_size then
+                return result
+            end
+            offset = offset + page_size
+        end
+    """
+
+    _REBUILD_INDEX_SCRIPT = """
+        -- KEYS[1]: resource pool set key; KEYS[2], KEYS[3], KEYS[4]: free cpu, free memory, and pool order index keys;
+        -- KEYS[5..n]: resource hash keys of the pool
+        -- Returns the number of resources indexed
+        redis.call('DEL', KEYS[2], KEYS[3], KEYS[4])
+        local count = 0
+        for i = 5, #KEYS do
+            local resource = redis.call('HMGET', KEYS[i], 'Availability', 'State', 'CPUs', 'MemoryBytes')
+            if redis.call('SISMEMBER', KEYS[1], KEYS[i]) == 1 and resource[1]
+                    and string.lower(resource[1]) == 'active' and resource[2]
+                    and string.lower(resource[2]) == 'ready' then
+                redis.call('ZADD', KEYS[2], resource[3], KEYS[i])
+                redis.call('ZADD', KEYS[3], resource[4], KEYS[i])
+                redis.call('ZADD', KEYS[4], 0, KEYS[i])
+                count = count + 1
+            end
+        end
+        return count
+    """
+
+    _CANDIDATE_PAGE_SIZE = 32
+    """ The number of index members read at a time when finding candidate resources. """
+
     def __init__(self, resource_pool: str, redis_host: Optional[str] = None, redis_port: Optional[int] = None,
                  redis_pass: Optional[str] = None, **kwargs):
         super().__init__(redis_host=redis_host, redis_port=redis_port, redis_pass=redis_pass, **kwargs)
         self.resource_pool = resource_pool
         self.resource_pool_key = self.keynamehelper.create_key_name("resource_pool", self.resource_pool)
+        self._free_cpus_index_key = self.keynamehelper.create_key_name("resource_pool", self.resource_pool, "free_cpus")
+        self._free_memory_index_key = self.keynamehelper.create_key_name("resource_pool", self.resource_pool,
+                                                                         "free_memory")
+        # Allocatable resources, all with the same score so they are kept in the order of their keys
+        self._pool_order_index_key = self.keynamehelper.create_key_name("resource_pool", self.resource_pool, "order")
+        self._candidate_index_keys = [self._free_cpus_index_key, self._free_memory_index_key,
+                                      self._pool_order_index_key]
+        # Registered scripts are executed via EVALSHA, falling back to loading the script if not yet cached
+        self._allocate_script = self.redis.register_script(self._ALLOCATE_SCRIPT)
+        self._allocate_multiple_script = self.redis.register_script(self._ALLOCATE_MULTIPLE_SCRIPT)
+        self._release_script = self.redis.register_script(self._RELEASE_SCRIPT)
+        self._find_candidates_script = self.redis.register_script(self._FIND_CANDIDATES_SCRIPT)
+        self._rebuild_index_script = self.redis.register_script(self._REBUILD_INDEX_SCRIPT)
+        # Make sure the index reflects any resource records that were written without it
+        self.rebuild_capacity_index()
+
+    def _get_release_script_params(self, allocation: ResourceAllocation) -> Tuple[List[str], List[int]]:
+        """
+        Get the keys and args for releasing the given allocation with the release script.
+
+        Parameters
+        ----------
+        allocation : ResourceAllocation
+            A resource allocation object, which will have its unique id separator set to that of this instance.
+
+        Returns
+        -------
+        Tuple[List[str], List[int]]
+            The keys and the args for the release script.
+        """
+        allocation.unique_id_separator = self.keynamehelper.separator
+        source_resource_key = Resource.generate_unique_id(allocation.resource_id, self.keynamehelper.separator)
+        return [source_resource_key, allocation.unique_id, self._free_cpus_index_key, self._free_memory_index_key], \
+               [allocation.cpu_count, allocation.memory]
+
+    def rebuild_capacity_index(self) -> int:
+        """
+        Atomically rebuild the free capacity index from the current records of the resources in the pool.
+
+        Returns
+        -------
+        int
+            The number of resources indexed, which are those having an ``ACTIVE`` availability and ``READY`` state.
+        """
+        index_keys = [self._free_cpus_index_key, self._free_memory_index_key, self._pool_order_index_key]
+        # The script must be passed every key it accesses, so the pool's resource keys are read first
+        resource_keys = sorted(self.get_resource_unique_ids())
+        return self._rebuild_index_script(keys=[self.resource_pool_key] + index_keys + resource_keys)
 
     def add_resource(self, resource: Resource, resource_pool_key: Optional[str] = None):
         """
@@ -48,10 +248,19 @@ class RedisManager(ResourceManager, RedisBacked):
             resource_pool_key = self.resource_pool_key
         resource.unique_id_separator = self.keynamehelper.separator
         if self.redis.exists(resource.unique_id) == 0:
-            # Add main record
-            self.redis.hmset(resource.unique_id, resource.to_dict())
-            # And add reference to record in pool
-            self.redis.sadd(resource_pool_key, resource.unique_id)
+            with self.redis.pipeline() as pipeline:
+                # Add main record
+                pipeline.hmset(resource.unique_id, resource.to_dict())
+                # And add reference to record in pool
+                pipeline.sadd(resource_pool_key, resource.unique_id)
+                # Resources in this manager's pool that can be allocated from are also indexed by free capacity
+                if resource_pool_key == self.resource_pool_key \
+                        and resource.availability == ResourceAvailability.ACTIVE \
+                        and resource.state == ResourceState.READY:
+                    pipeline.zadd(self._free_cpus_index_key, {resource.unique_id: resource.cpu_count})
+                    pipeline.zadd(self._free_memory_index_key, {resource.unique_id: resource.memory})
+                    pipeline.zadd(self._pool_order_index_key, {resource.unique_id: 0})
+                pipeline.execute()
 
     def set_resources(self, resources: Iterable[Resource]):
         """
@@ -74,9 +283,13 @@ class RedisManager(ResourceManager, RedisBacked):
         List[Resource]
             A list of all managed resource objects.
         """
-        for resource_id in self.get_resource_ids():
-            yield Resource.factory_init_from_dict(
-                self.redis.hgetall(Resource.generate_unique_id(resource_id, self.keynamehelper.separator)))
+        resource_keys = [Resource.generate_unique_id(resource_id, self.keynamehelper.separator) for resource_id in
+                         self.get_resource_ids()]
+        # Read all the resource records in a single round trip
+        with self.redis.pipeline(transaction=False) as pipeline:
+            for resource_key in resource_keys:
+                pipeline.hgetall(resource_key)
+            return [Resource.factory_init_from_dict(resource_hash) for resource_hash in pipeline.execute()]
 
     def get_resource_ids(self) -> List[Union[str, int]]:
         """
@@ -89,12 +302,69 @@ class RedisManager(ResourceManager, RedisBacked):
         """
         resource_ids = list()
         for uid in self.get_resource_unique_ids():
-            resource_ids.append(uid.split(':')[1])
+            resource_ids.append(self._get_resource_id_for_key(uid))
         return resource_ids
 
+    def _get_resource_id_for_key(self, resource_key: str) -> str:
+        return resource_key.split(':')[1]
+
+    def get_candidate_resource_ids(self, cpus: int, memory: int, fit: ResourceFit = ResourceFit.FIRST,
+                                   limit: Optional[int] = None) -> List[str]:
+        """
+        Get the ids of useable resources currently having at least the given amounts of CPUs and memory available.
+
+        Candidates are found using the free capacity index in a single script call, rather than by reading every
+        resource in the pool.  The script reads pages of the index only until it has found ``limit`` candidates.  For
+        the ``BEST`` and ``WORST`` fits, pages come from the free CPU index, which holds them already in order.  For the
+        ``FIRST`` fit, pages come from the pool order index, so candidates are ordered by their resource keys.
+
+        Parameters
+        ----------
+        cpus : int
+            The number of CPUs that must be available.
+        memory : int
+            The amount of memory that must be available.
+        fit : ResourceFit
+            The strategy determining the order of the candidates, which by default is ``FIRST``.
+        limit : Optional[int]
+            An optional maximum number of candidates to return.
+
+        Returns
+        -------
+        List[str]
+            The ids of the candidate resources, ordered from most to least preferred by the given fit strategy.
+        """
+        resource_keys = self._find_candidates_script(keys=self._candidate_index_keys,
+                                                     args=[cpus, memory, fit.name.lower(),
+                                                           0 if limit is None else limit, self._CANDIDATE_PAGE_SIZE])
+        return [self._get_resource_id_for_key(key) for key in resource_keys]
+
     def get_resource_unique_ids(self):
         return self.redis.smembers(self.resource_pool_key)
 
+    def get_largest_placeable_cpu_count(self, memory: int = 0) -> int:
+        """
+        Get the largest number of CPUs that a single-node job could currently be allocated.
+
+        The value is found from the free capacity index rather than by reading every resource in the pool.
+
+        Parameters
+        ----------
+        memory : int
+            The amount of memory the job would also require, which by default is ``0``.
+
+        Returns
+        -------
+        int
+            The largest number of CPUs that a single-node job could currently be allocated, or ``0`` if none.
+        """
+        resource_keys = self._find_candidates_script(keys=self._candidate_index_keys,
+                                                     args=[1, memory, ResourceFit.WORST.name.lower(), 1,
+                                                           self._CANDIDATE_PAGE_SIZE])
+        if len(resource_keys) == 0:
+            return 0
+        return int(self.redis.zscore(self._free_cpus_index_key, resource_keys[0]))
+
     def allocate_resource(self, resource_id: str, requested_cpus: int,
                           requested_memory: int = 0, partial: bool = False) -> Optional[ResourceAllocation]:
         """
@@ -131,38 +401,80 @@ class RedisManager(ResourceManager, RedisBacked):
         if requested_cpus <= 0:
             raise ValueError("Invalid < 1 CPU allocation requested")
 
-        resource_key = Resource.generate_unique_id(resource_id, separator=self.keynamehelper.separator)
-        if not self.redis.exists(resource_key):
+        separator = self.keynamehelper.separator
+        resource_key = Resource.generate_unique_id(resource_id, separator=separator)
+        created = datetime.now()
+        allocation_key = ResourceAllocation.generate_unique_id(resource_id, created, separator)
+
+        result = self._allocate_script(keys=[resource_key, allocation_key, self._free_cpus_index_key,
+                                             self._free_memory_index_key],
+                                       args=[requested_cpus, requested_memory, 1 if partial else 0,
+                                             created.timestamp(), separator])
+        if result[0] < 0:
             raise ValueError("Invalid allocation request to unrecognized resource {}".format(resource_key))
+        elif result[0] == 0:
+            return None
+
+        allocation = ResourceAllocation(resource_id, result[3], int(result[1]), int(result[2]), created)
+        allocation.unique_id_separator = separator
+        return allocation
 
-        allocation = None
+    def allocate_resources(self, requested_allocations: Sequence[Tuple[str, int, int]]) \
+            -> Optional[List[ResourceAllocation]]:
+        """
+        Attempt to allocate the requested amounts from each of several resources, as a single atomic operation.
 
-        # By using the context manager, we get connection cleanup for free (e.g., pipeline.reset(), etc.)
+        Either every requested allocation is made, or no resource is changed at all.
 
-        while True:
-            with self.redis.pipeline() as pipeline:
-                try:
-                    # Will get WatchError if the value changes between now and pipe.execute()
-                    pipeline.watch(resource_key)
-                    resource = Resource.factory_init_from_dict(pipeline.hgetall(resource_key))
-                    pipeline.multi()
-                    cpus_allocated, mem_allocated, is_fully = resource.allocate(requested_cpus, requested_memory)
-
-                    if is_fully or (partial and cpus_allocated > 0 and (mem_allocated > 0 or requested_memory == 0)):
-                        pipeline.hmset(resource_key, resource.to_dict())
-                        allocation = ResourceAllocation(resource_id, resource.hostname, cpus_allocated, mem_allocated)
-                        allocation.unique_id_separator = self.keynamehelper.separator
-                        pipeline.hmset(allocation.unique_id, allocation.to_dict())
-                    else:
-                        resource.release(cpus_allocated, mem_allocated)
-                except WatchError:
-                    logging.debug("Write Conflict allocate_resource: {}. Retrying...".format(resource_key))
-                    # Clear and try the transaction again
-                    pipeline.reset()
-                    continue
-                pipeline.execute()
-                break
-        return allocation
+        Parameters
+        ----------
+        requested_allocations : Sequence[Tuple[str, int, int]]
+            A sequence of tuples of resource id, requested cpus, and requested memory, with one tuple per resource.
+
+        Returns
+        -------
+        Optional[List[ResourceAllocation]]
+            A list of resource allocation objects, in the same order as the requests, or ``None`` if any of the
+            requested allocations could not be fully satisfied.
+
+        Raises
+        ------
+        ValueError
+            If the allocation request is invalid due to an unrecognized or repeated source resource, or a requested CPU
+            count of less than 1 or memory amount less than 0.
+        """
+        separator = self.keynamehelper.separator
+        created = datetime.now()
+        resource_keys = []
+        allocation_keys = []
+        args = []
+        for resource_id, cpus, memory in requested_allocations:
+            if cpus <= 0 or memory < 0:
+                raise ValueError("Invalid multi-resource allocation request of {} CPUs and {} memory from {}".format(
+                    cpus, memory, resource_id))
+            resource_keys.append(Resource.generate_unique_id(resource_id, separator=separator))
+            allocation_keys.append(ResourceAllocation.generate_unique_id(resource_id, created, separator))
+            args.extend([int(cpus), int(memory)])
+        if len(set(resource_keys)) != len(resource_keys):
+            raise ValueError("Invalid multi-resource allocation request with repeated resource")
+        if len(resource_keys) == 0:
+            return []
+
+        index_keys = [self._free_cpus_index_key, self._free_memory_index_key]
+        result = self._allocate_multiple_script(keys=resource_keys + allocation_keys + index_keys,
+                                                args=args + [created.timestamp(), separator])
+        if result[0] < 0:
+            raise ValueError("Invalid allocation request to unrecognized resource {}".format(
+                resource_keys[result[1] - 1]))
+        elif result[0] == 0:
+            return None
+
+        allocations = []
+        for i, (resource_id, cpus, memory) in enumerate(requested_allocations):
+            allocation = ResourceAllocation(resource_id, result[i + 1], int(cpus), int(memory), created)
+            allocation.unique_id_separator = separator
+            allocations.append(allocation)
+        return allocations
 
     def release_resource(self, allocation: ResourceAllocation):
         """
@@ -173,41 +485,11 @@ class RedisManager(ResourceManager, RedisBacked):
         allocation : ResourceAllocation
             A resource allocation object.
         """
-        allocation.unique_id_separator = self.keynamehelper.separator
-        while True:
-            with self.redis.pipeline() as pipeline:
-                try:
-                    # Obtain the source Resource object for the allocation
-                    source_resource_key = Resource.generate_unique_id(allocation.resource_id,
-                                                                      self.keynamehelper.separator)
-                    pipeline.watch(source_resource_key)
-                    if not pipeline.exists(source_resource_key):
-                        raise RuntimeError(
-                            "RedisManager::release_resources -- No key {} exists to release resources to".format(
-                                allocation.unique_id))
-
-                    # Should return directly after watch takes us of of buffered mode
-                    serial_source_resource_hash = pipeline.hgetall(source_resource_key)
-                    source_resource = Resource.factory_init_from_dict(serial_source_resource_hash)
-
-                    # Once we have looked up the resource record and deserialized, return to buffered transaction mode
-                    pipeline.multi()
-                    source_resource.unique_id_separator = self.keynamehelper.separator
-
-                    # Release the allocated properties and updated the Resource record
-                    source_resource.release(allocation.cpu_count, allocation.memory)
-                    pipeline.hmset(source_resource_key, source_resource.to_dict())
-
-                    # Delete the allocation redis record
-                    # TODO: need to address implications of this in job manager
-                    pipeline.delete(allocation.unique_id)
-
-                    # Finally, execute the transaction
-                    pipeline.execute()
-                    return
-
-                except WatchError:
-                    logging.debug("Write Conflict allocate_resource: {}. Retrying...".format(source_resource_key))
+        keys, args = self._get_release_script_params(allocation)
+        result = self._release_script(keys=keys, args=args)
+        if result < 0:
+            raise RuntimeError("RedisManager::release_resources -- No key {} exists to release resources to".format(
+                allocation.unique_id))
 
     def release_resources(self, allocated_resources: Iterable[ResourceAllocation]):
         """
@@ -248,3 +530,79 @@ class RedisManager(ResourceManager, RedisBacked):
                     continue
                 break
         return total_available
+
+    async def async_get_available_cpu_count(self) -> int:
+        """
+        Async counterpart of ::method:`get_available_cpu_count`, using the asyncio Redis client.
+
+        The available CPUs of every resource are read within a single transaction, so that the total reflects the state
+        of all resources at one point in time.
+
+        Returns
+        -------
+        int
+            Total available CPUs.
+        """
+        separator = self.keynamehelper.separator
+        resource_keys = [Resource.generate_unique_id(resource_id, separator) for resource_id in
+                         await self.async_get_resource_ids()]
+        async with self.async_redis.pipeline() as pipeline:
+            for key in resource_keys:
+                pipeline.hget(key, Resource.get_cpu_hash_key())
+            return sum([int(cpus) for cpus in await pipeline.execute()])
+
+    async def async_get_resource_ids(self) -> List[Union[str, int]]:
+        """
+        Async counterpart of ::method:`get_resource_ids`, using the asyncio Redis client.
+
+        Returns
+        -------
+        List[Union[str, int]]
+            The identifiers for all managed resources.
+        """
+        return [self._get_resource_id_for_key(uid) for uid in await self.async_redis.smembers(self.resource_pool_key)]
+
+    async def async_get_resources(self) -> List[Resource]:
+        """
+        Async counterpart of ::method:`get_resources`, using the asyncio Redis client.
+
+        Returns
+        -------
+        List[Resource]
+            A list of all managed resource objects.
+        """
+        resource_keys = [Resource.generate_unique_id(resource_id, self.keynamehelper.separator) for resource_id in
+                         await self.async_get_resource_ids()]
+        async with self.async_redis.pipeline(transaction=False) as pipeline:
+            for resource_key in resource_keys:
+                pipeline.hgetall(resource_key)
+            return [Resource.factory_init_from_dict(resource_hash) for resource_hash in await pipeline.execute()]
+
+    async def async_release_resources(self, allocated_resources: Iterable[ResourceAllocation]):
+        """
+        Async counterpart of ::method:`release_resources`, using the asyncio Redis client.
+
+        Each allocation is released by the release script, as for ::method:`release_resource`, but with all the
+        executions of the script sent in a single pipelined round trip.
+
+        Parameters
+        ----------
+        allocated_resources : Iterable[ResourceAllocation]
+            An iterable of resource allocation objects.
+
+        Raises
+        -------
+        RuntimeError
+            If any allocation's source resource does not exist, after all the other allocations are released.
+        """
+        allocations = list(allocated_resources)
+        release_script = self.get_async_script(self._RELEASE_SCRIPT)
+        async with self.async_redis.pipeline(transaction=False) as pipeline:
+            for allocation in allocations:
+                keys, args = self._get_release_script_params(allocation)
+                await release_script(keys=keys, args=args, client=pipeline)
+            results = await pipeline.execute()
+        for allocation, result in zip(allocations, results):
+            if result < 0:
+                raise RuntimeError("RedisManager::release_resources -- No key {} exists to release resources to".format(
+                    allocation.unique_id))
@@ -55,6 +55,28 @@ class ResourceAllocation(SingleHostProcessingAssetPool):
 
         return deserialized
 
+    @classmethod
+    def generate_unique_id(cls, resource_id: str, created: datetime, separator: str) -> str:
+        """
+        For an arbitrary resource id and creation time, generate the appropriate derived value for
+        ::attribute:`unique_id`, which can be used for things such as Redis keys.
+
+        Parameters
+        ----------
+        resource_id : str
+            The resource id of the ::class:`Resource` from which the allocation is sourced.
+        created : datetime
+            The creation time of the allocation.
+        separator : str
+            The separator to use between components of the id.
+
+        Returns
+        -------
+        str
+            The derived unique id.
+        """
+        return cls.__name__ + separator + resource_id + separator + str(created.timestamp())
+
     def __eq__(self, other):
         if not isinstance(other, ResourceAllocation):
             return False
@@ -96,7 +118,7 @@ class ResourceAllocation(SingleHostProcessingAssetPool):
         return self._created
 
     def get_unique_id(self, separator: str) -> str:
-        return self.__class__.__name__ + separator + self.resource_id + separator + str(self.created.timestamp())
+        return self.generate_unique_id(resource_id=self.resource_id, created=self.created, separator=separator)
 
     @property
     def resource_id(self) -> str:
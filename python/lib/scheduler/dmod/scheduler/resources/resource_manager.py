@@ -1,7 +1,9 @@
 #!/usr/bin/env python3
 import logging
-from typing import Iterable, Optional, Union, List
+from asyncio import get_event_loop
+from typing import Iterable, Optional, Sequence, Tuple, Union, List
 from abc import ABC, abstractmethod
+from enum import Enum
 from .resource import Resource
 from .resource_allocation import ResourceAllocation
 
@@ -13,11 +15,82 @@ logging.basicConfig(
     datefmt="%H:%M:%S")
 
 
+class ResourceFit(Enum):
+    """
+    Strategies for choosing among the resources on which a single-node allocation would fit.
+    """
+    FIRST = 0
+    """ Prefer resources in the manager's natural ordering of resources. """
+    BEST = 1
+    """ Prefer resources that would have the fewest CPUs left over. """
+    WORST = 2
+    """ Prefer resources that would have the most CPUs left over. """
+
+
 class ResourceManager(ABC):
     """
         Abstract class for defining the API for Resource Managing
     """
 
+    _MAX_ALLOCATION_PLAN_ATTEMPTS = 3
+    """ Number of times multi-resource paradigms will re-plan when resources change between planning and allocating. """
+
+    _SINGLE_NODE_CANDIDATE_LIMIT = 8
+    """ Number of candidate resources looked up at a time when making single-node allocations. """
+
+    async def async_get_available_cpu_count(self) -> int:
+        """
+        Async counterpart of ::method:`get_available_cpu_count`.
+
+        The default implementation runs the synchronous method in the event loop's default executor, so that it does not
+        block the event loop; implementations should override this with native asyncio logic where possible.
+
+        Returns
+        -------
+        int
+            Total available CPUs.
+        """
+        return await get_event_loop().run_in_executor(None, self.get_available_cpu_count)
+
+    async def async_get_resource_ids(self) -> Iterable[Union[str, int]]:
+        """
+        Async counterpart of ::method:`get_resource_ids`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Returns
+        -------
+        Iterable[Union[str, int]]
+            The identifiers for all managed resources.
+        """
+        return await get_event_loop().run_in_executor(None, self.get_resource_ids)
+
+    async def async_get_resources(self) -> Iterable[Resource]:
+        """
+        Async counterpart of ::method:`get_resources`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Returns
+        -------
+        Iterable[Resource]
+            An iterable collection of the ::class:`Resource` objects for known resources.
+        """
+        return await get_event_loop().run_in_executor(None, self.get_resources)
+
+    async def async_release_resources(self, allocated_resources: Iterable[ResourceAllocation]):
+        """
+        Async counterpart of ::method:`release_resources`.
+
+        The default implementation runs the synchronous method in the event loop's default executor.
+
+        Parameters
+        ----------
+        allocated_resources : Iterable[ResourceAllocation]
+            An iterable of resource allocation objects.
+        """
+        await get_event_loop().run_in_executor(None, self.release_resources, allocated_resources)
+
     @abstractmethod
     def set_resources(self, resources: Iterable[Resource]):
         """
@@ -97,6 +170,43 @@ class ResourceManager(ABC):
         """
         pass
 
+    def allocate_resources(self, requested_allocations: Sequence[Tuple[str, int, int]]) \
+            -> Optional[List[ResourceAllocation]]:
+        """
+        Attempt to allocate the requested amounts from each of several resources, as an all-or-nothing operation.
+
+        The default implementation allocates from each resource in turn via ::method:`allocate_resource`, releasing
+        anything already acquired if a later allocation fails.  Implementations able to do so should override this to
+        perform the allocations as a single atomic operation, which either fully succeeds or changes nothing.
+
+        Parameters
+        ----------
+        requested_allocations : Sequence[Tuple[str, int, int]]
+            A sequence of tuples of resource id, requested cpus, and requested memory, with one tuple per resource.
+
+        Returns
+        -------
+        Optional[List[ResourceAllocation]]
+            A list of resource allocation objects, in the same order as the requests, or ``None`` if any of the
+            requested allocations could not be fully satisfied.
+
+        Raises
+        ------
+        ValueError
+            If a resource is requested more than once, or an individual request is otherwise invalid.
+        """
+        resource_ids = [resource_id for resource_id, _, _ in requested_allocations]
+        if len(set(resource_ids)) != len(resource_ids):
+            raise ValueError("Invalid multi-resource allocation request with repeated resource")
+        allocations = []
+        for resource_id, cpus, memory in requested_allocations:
+            alloc = self.allocate_resource(resource_id=resource_id, requested_cpus=cpus, requested_memory=memory)
+            if alloc is None:
+                self.release_resources(allocations)
+                return None
+            allocations.append(alloc)
+        return allocations
+
     @abstractmethod
     def release_resources(self, allocated_resources: Iterable[ResourceAllocation]):
         """
@@ -121,6 +231,46 @@ class ResourceManager(ABC):
         """
         pass
 
+    def get_largest_placeable_cpu_count(self, memory: int = 0) -> int:
+        """
+        Get the largest number of CPUs that a single-node job could currently be allocated.
+
+        Parameters
+        ----------
+        memory : int
+            The amount of memory the job would also require, which by default is ``0``.
+
+        Returns
+        -------
+        int
+            The largest number of CPUs that a single-node job could currently be allocated, or ``0`` if none.
+        """
+        return max([r.cpu_count for r in self.get_useable_resources() if r.memory >= memory], default=0)
+
+    def get_fragmentation(self, memory: int = 0) -> float:
+        """
+        Get a measure of how fragmented the currently available CPUs are across resources.
+
+        The measure is the proportion of available CPUs that a single-node job could not make use of, i.e., one minus
+        the ratio of ::method:`get_largest_placeable_cpu_count` to the total CPUs available on useable resources.  A
+        value of ``0.0`` means all available CPUs are on one resource (or that none are available), while values
+        approaching ``1.0`` mean the available CPUs are spread thinly across many resources.
+
+        Parameters
+        ----------
+        memory : int
+            The amount of memory a single-node job would also require, which by default is ``0``.
+
+        Returns
+        -------
+        float
+            The fragmentation measure, between ``0.0`` and ``1.0``.
+        """
+        available = sum(r.cpu_count for r in self.get_useable_resources())
+        if available == 0:
+            return 0.0
+        return 1.0 - self.get_largest_placeable_cpu_count(memory) / available
+
     def get_useable_resources(self) -> Iterable[Resource]:
         """
             Generator yielding allocatable resources
@@ -153,15 +303,50 @@ class ResourceManager(ABC):
         if not (isinstance(memory, int) and memory > 0):
             raise(ValueError("memory must be an integer > 0"))
 
-    def allocate_single_node(self, cpus: int, memory: int) -> List[Optional[ResourceAllocation]]:
+    def get_candidate_resource_ids(self, cpus: int, memory: int, fit: ResourceFit = ResourceFit.FIRST,
+                                   limit: Optional[int] = None) -> List[str]:
+        """
+        Get the ids of useable resources currently having at least the given amounts of CPUs and memory available.
+
+        The default implementation filters and sorts the collection from ::method:`get_useable_resources`.
+        Implementations that maintain an index of free capacity should override this to avoid examining every resource.
+
+        Parameters
+        ----------
+        cpus : int
+            The number of CPUs that must be available.
+        memory : int
+            The amount of memory that must be available.
+        fit : ResourceFit
+            The strategy determining the order of the candidates, which by default is ``FIRST``.
+        limit : Optional[int]
+            An optional maximum number of candidates to return.
+
+        Returns
+        -------
+        List[str]
+            The ids of the candidate resources, ordered from most to least preferred by the given fit strategy.
+        """
+        candidates = [r for r in self.get_useable_resources() if r.cpu_count >= cpus and r.memory >= memory]
+        if fit == ResourceFit.BEST:
+            candidates.sort(key=lambda r: r.cpu_count)
+        elif fit == ResourceFit.WORST:
+            candidates.sort(key=lambda r: r.cpu_count, reverse=True)
+        return [r.resource_id for r in (candidates if limit is None else candidates[:limit])]
+
+    def allocate_single_node(self, cpus: int, memory: int,
+                             fit: ResourceFit = ResourceFit.FIRST) -> List[Optional[ResourceAllocation]]:
         """
         Check available resources to allocate job request to a single node to optimize
         computation efficiency
 
+        Candidate nodes are looked up with ::method:`get_candidate_resource_ids` and tried in order of preference.
+
         Parameters
         ----------
             cpus: Total number of CPUs requested
             memory: Amount of memory required in bytes
+            fit: Strategy for choosing among the nodes on which the allocation would fit
 
         Returns
         -------
@@ -171,12 +356,66 @@ class ResourceManager(ABC):
         #Fit the entire allocation on a single resource
         self.validate_allocation_parameters(cpus, memory)
 
-        for res in self.get_useable_resources():
-            #if res.cpu_count >= cpus and res.memory >= memory:
-            allocation = self.allocate_resource(resource_id=res.resource_id, requested_cpus=cpus,
-                                                requested_memory=memory)
-            if allocation:
-                return [allocation]
+        for _ in range(self._MAX_ALLOCATION_PLAN_ATTEMPTS):
+            candidates = self.get_candidate_resource_ids(cpus, memory, fit, limit=self._SINGLE_NODE_CANDIDATE_LIMIT)
+            if len(candidates) == 0:
+                return [None]
+            for resource_id in candidates:
+                allocation = self.allocate_resource(resource_id=resource_id, requested_cpus=cpus,
+                                                    requested_memory=memory)
+                if allocation:
+                    return [allocation]
+            #Candidates were all claimed elsewhere after the lookup, so look again
+        return [None]
+
+    def allocate_best_fit(self, cpus: int, memory: int) -> List[Optional[ResourceAllocation]]:
+        """
+        Check available resources to allocate job request so as to pack jobs as tightly as possible.
+
+        If the request fits on a single node, the node that would be left with the fewest free CPUs is used.  Otherwise,
+        as few nodes as possible are used: nodes are claimed entirely in order of most free CPUs, except for the last,
+        for which the node with the fewest free CPUs that still covers the remainder of the request is chosen.  The
+        multi-node amounts are claimed together through ::method:`allocate_resources`, re-planning (up to
+        ::attribute:`_MAX_ALLOCATION_PLAN_ATTEMPTS` times) if the resources change between planning and allocating.
+
+        Parameters
+        ----------
+            cpus: Total number of CPUs requested
+            memory: Amount of memory required in bytes, on each node
+
+        Returns
+        -------
+        [ResourceAlloction]
+            List of one or more ResourceAllocation if allocation successful, otherwise, [None]
+        """
+        self.validate_allocation_parameters(cpus, memory)
+        allocation = self.allocate_single_node(cpus, memory, fit=ResourceFit.BEST)
+        if allocation[0] is not None:
+            return allocation
+
+        for _ in range(self._MAX_ALLOCATION_PLAN_ATTEMPTS):
+            resources = sorted((r for r in self.get_useable_resources() if r.memory >= memory),
+                               key=lambda r: r.cpu_count, reverse=True)
+            planned = []
+            remaining_cpus = cpus
+            for i in range(len(resources)):
+                if resources[i].cpu_count >= remaining_cpus:
+                    #Finish on whichever of the remaining nodes covers what is left with the least left over
+                    last = min((r for r in resources[i:] if r.cpu_count >= remaining_cpus), key=lambda r: r.cpu_count)
+                    planned.append((last.resource_id, remaining_cpus, memory))
+                    remaining_cpus = 0
+                    break
+                planned.append((resources[i].resource_id, resources[i].cpu_count, memory))
+                remaining_cpus -= resources[i].cpu_count
+
+            #If not enough resources are available, there is nothing to claim
+            if remaining_cpus > 0:
+                return [None]
+
+            allocation = self.allocate_resources(planned)
+            if allocation is not None:
+                return allocation
+            #Resources changed after planning, so plan again from their current state
         return [None]
 
     def allocate_fill_nodes(self, cpus: int, memory: int) -> List[Optional[ResourceAllocation]]:
@@ -184,6 +423,10 @@ class ResourceManager(ABC):
         Check available resources to allocate job request to one or more nodes, claiming all required
         resources from each node until the request is satisfied.
 
+        The per-node amounts are planned from the current view of the useable resources and then claimed together
+        through ::method:`allocate_resources`.  If the resources change between planning and allocating, such that the
+        plan can no longer be satisfied, planning is repeated (up to ::attribute:`_MAX_ALLOCATION_PLAN_ATTEMPTS` times).
+
         Parameters
         ----------
             cpus: Total number of CPUs requested
@@ -196,32 +439,31 @@ class ResourceManager(ABC):
         """
         self.validate_allocation_parameters(cpus, memory)
         #TODO fill_nodes really should allocate on a MEM per CPU basis???
-        allocation = []
-
-        for res in self.get_useable_resources(): #i in range(len(resources)):
-            #Greedily allocate a (potentially) partial allocation on this resource
-            alloc = self.allocate_resource(resource_id=res.resource_id, requested_cpus=cpus,
-                                                requested_memory=memory, partial=True)
-            if alloc:
-                #The allocation was (partially) successful
-                allocation.append(alloc)
-                cpus -= alloc.cpu_count
-                #TODO what about memory?  If mem_per_node, don't change it
-            else:
-                #TODO think about mem per process type allocation
-                #For now, this resource cannot provide anything to the allocation
-                #So we skip to the next one
-                continue
-            if cpus < 1:
-                break
 
-        #If enough resources found, return the allocations
-        #otherwise we have to roll back the greedily aquired resources
-        if cpus > 0:
-            self.release_resources(allocation)
-            allocation = [None]
+        for _ in range(self._MAX_ALLOCATION_PLAN_ATTEMPTS):
+            planned = []
+            remaining_cpus = cpus
+            for res in self.get_useable_resources():
+                #Greedily plan a (potentially) partial allocation on this resource
+                #TODO what about memory?  If mem_per_node, don't change it
+                planned_cpus = min(res.cpu_count, remaining_cpus)
+                planned_memory = min(res.memory, memory)
+                if planned_cpus > 0 and planned_memory > 0:
+                    planned.append((res.resource_id, planned_cpus, planned_memory))
+                    remaining_cpus -= planned_cpus
+                #Otherwise, this resource cannot provide anything to the allocation, so skip to the next one
+                if remaining_cpus < 1:
+                    break
+
+            #If not enough resources are available, there is nothing to claim
+            if remaining_cpus > 0:
+                return [None]
 
-        return allocation
+            allocation = self.allocate_resources(planned)
+            if allocation is not None:
+                return allocation
+            #Resources changed after planning, so plan again from their current state
+        return [None]
 
     def allocate_round_robin(self, cpus: int, memory: int) -> List[Optional[ResourceAllocation]]:
         """
@@ -234,6 +476,9 @@ class ResourceManager(ABC):
             i.e. a request for 10 cpus with an available resource view of [4, 2, 4] would fail to allocate with this
             algorithm, because it assumes an availablity of [4, 3, 3]
 
+            The per-node amounts are claimed together through ::method:`allocate_resources`, re-planning (up to
+            ::attribute:`_MAX_ALLOCATION_PLAN_ATTEMPTS` times) if the resources change between planning and allocating.
+
             Parameters
             ----------
                 cpus: Total number of CPUs requested
@@ -245,35 +490,35 @@ class ResourceManager(ABC):
                 List of one or more ResourceAllocation if allocation successful, otherwise, [None]
         """
         #TODO consider scaling memory per cpu
-        #Find the number of cpus to allocate to each node
         self.validate_allocation_parameters(cpus, memory)
-        resources = list(self.get_useable_resources())
-
-        num_node = len(resources)
-        if num_node == 0:
-            return [None]
-
-        int_cpus = int(cpus / num_node)
-        remaining_cpus = cpus % num_node
-        cpu_per_resource = [int_cpus]*num_node #The minimun number of cpus on each resource
-        for i in range(remaining_cpus):
-            cpu_per_resource[i] += 1    #Add remainder if needed
-
-        allocation = []
-
-        for i in range(num_node):
-            #Greedily allocate a full allocation on this resource
-            alloc = self.allocate_resource(resource_id=resources[i].resource_id, requested_cpus=cpu_per_resource[i],
-                                                requested_memory=memory)
-            if alloc:
-                #This resource can satisfy the allocation so far
-                allocation.append(alloc)
-                cpus -= alloc.cpu_count
-            else:
-                #TODO think about mem per process type allocation
-                #For now, this resource cannot provide anything to the allocation
-                #If alloc wasn't successful, don't need to try any more, release any we are holding and return
-                self.release_resources(allocation)
+
+        for _ in range(self._MAX_ALLOCATION_PLAN_ATTEMPTS):
+            resources = list(self.get_useable_resources())
+
+            num_node = len(resources)
+            if num_node == 0:
                 return [None]
 
-        return allocation
+            #Find the number of cpus to allocate to each node
+            int_cpus = int(cpus / num_node)
+            remaining_cpus = cpus % num_node
+            cpu_per_resource = [int_cpus]*num_node #The minimun number of cpus on each resource
+            for i in range(remaining_cpus):
+                cpu_per_resource[i] += 1    #Add remainder if needed
+
+            planned = []
+            for i in range(num_node):
+                #Nodes beyond the requested cpu count get nothing
+                if cpu_per_resource[i] == 0:
+                    break
+                #TODO think about mem per process type allocation
+                #If any resource can't satisfy its full share, the allocation can't succeed
+                if resources[i].cpu_count < cpu_per_resource[i] or resources[i].memory < memory:
+                    return [None]
+                planned.append((resources[i].resource_id, cpu_per_resource[i], memory))
+
+            allocation = self.allocate_resources(planned)
+            if allocation is not None:
+                return allocation
+            #Resources changed after planning, so plan again from their current state
+        return [None]
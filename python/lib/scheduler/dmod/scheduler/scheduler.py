@@ -1,12 +1,15 @@
 #!/usr/bin/env python3
 
 import logging
+from collections import OrderedDict
+from concurrent.futures import FIRST_EXCEPTION, ThreadPoolExecutor, wait
 from requests.exceptions import ReadTimeout
+from time import perf_counter
 import docker
-import yaml
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Dict, List, Optional
 
 ## local imports
+from .image_and_domain_catalog import ImageAndDomainCatalog
 from .utils import parsing_nested as pn
 
 # Imports strictly for type hinting
@@ -41,9 +44,48 @@ class DockerServiceParameters():
         self.mounts = mounts
 
 
+class JobLaunchMetrics():
+    """
+    Timing metrics for the launch of the Docker services of a job by a ::class:`Launcher`.
+    """
+
+    def __init__(self, job_id, service_count: int, concurrent: bool):
+        """
+        Parameters
+        ----------
+        job_id
+            The id of the launched job
+        service_count
+            The number of services to create for the job
+        concurrent
+            Whether the services were created concurrently
+        """
+        self.job_id = job_id
+        self.service_count = service_count
+        self.concurrent = concurrent
+        self.service_create_seconds: Dict[str, float] = dict()
+        """ Seconds taken to create (and log) each successfully created service, by service name. """
+        self.total_seconds: Optional[float] = None
+        """ Seconds taken to create all the services, including any cleanup after a failure. """
+        self.succeeded = False
+
+    def __str__(self):
+        slowest = max(self.service_create_seconds.values()) if len(self.service_create_seconds) > 0 else 0.0
+        return "Launch of job {} {} {} of {} services ({}) in {:.3f}s (slowest service {:.3f}s)".format(
+            self.job_id, 'succeeded with' if self.succeeded else 'failed after', len(self.service_create_seconds),
+            self.service_count, 'concurrent' if self.concurrent else 'sequential',
+            0.0 if self.total_seconds is None else self.total_seconds, slowest)
+
+
 class Launcher:
 
-    def __init__(self, images_and_domains_yaml, docker_client=None, api_client=None, **kwargs):
+    _DEFAULT_MAX_LAUNCH_WORKERS = 8
+    """ Default max number of services created at once when launching a job concurrently. """
+    _MAX_LAUNCH_METRICS = 100
+    """ Max number of jobs for which launch metrics are kept, beyond which those of the oldest launches are dropped. """
+
+    def __init__(self, images_and_domains_yaml, docker_client=None, api_client=None, concurrent_launch: bool = True,
+                 max_launch_workers: Optional[int] = None, catalog: Optional[ImageAndDomainCatalog] = None, **kwargs):
         """ FIXME
         Parameters
         ----------
@@ -51,8 +93,16 @@ class Launcher:
             Docker API client
         api_client
             Docker Low-level API client
+        concurrent_launch
+            Whether the services of a job are created concurrently, rather than one at a time (``True`` by default)
+        max_launch_workers
+            Max number of services created at once when launching a job concurrently, defaulting to
+            ::attribute:`_DEFAULT_MAX_LAUNCH_WORKERS`
+        catalog
+            Optional catalog of supported images and domains, defaulting to a new one for ``images_and_domains_yaml``
         """
         self._images_and_domains_yaml = images_and_domains_yaml
+        self.catalog = ImageAndDomainCatalog(images_and_domains_yaml) if catalog is None else catalog
         if docker_client:
             self.docker_client = docker_client
             self.api_client = api_client
@@ -69,8 +119,16 @@ class Launcher:
         #FIXME parameterize network
         self.networks = ["mpi-net"]
 
+        self._concurrent_launch = concurrent_launch
+        self._max_launch_workers = self._DEFAULT_MAX_LAUNCH_WORKERS if max_launch_workers is None \
+            else max_launch_workers
+        # Created lazily, when first launching a job concurrently
+        self._launch_executor: Optional[ThreadPoolExecutor] = None
+        self.launch_metrics: Dict[str, JobLaunchMetrics] = OrderedDict()
+        """ Metrics for the most recent job launches, by job id, oldest first. """
+
     def create_service(self, serviceParams: DockerServiceParameters, idx: int, args: list) \
-        -> docker.from_env().services.create:
+        -> docker.models.services.Service:
         """
         Create new service with Healthcheck, host, and other info
 
@@ -110,7 +168,8 @@ class Launcher:
         restart = docker.types.RestartPolicy(condition='none')
 
         if (idx == 0): #FIXME just always pass idx???
-            args.append(str(idx))
+            # Copy rather than append, since the same args are used for the job's other services
+            args = args + [str(idx)]
 
         try:
             service = client.services.create(image = image,
@@ -132,11 +191,12 @@ class Launcher:
 
         return service
 
-    @staticmethod
-    def log_service(base_name: str, id: str):
+    def log_service(self, base_name: str, id: str):
         """
         Log information about service identified by base_name and id
 
+        The launcher's own clients are used, rather than building new clients (and connections) for every service.
+
         Parameters
         ----------
         base_name
@@ -144,9 +204,8 @@ class Launcher:
         id
             identifier for the specific service, contatenated to base_name
         """
-        #TODO how important is it to inspect/log from the same api/client as launcher is using?
-        api_client = docker.APIClient()
-        client = docker.from_env()
+        api_client = self.api_client
+        client = self.docker_client
         from inspect import stack
         inspect = api_client.inspect_service(id, insert_defaults=True)
         logging.info("Output from log_service in {}:".format(stack()[1].function))
@@ -167,8 +226,108 @@ class Launcher:
         service_attrs = serv_list.attrs
         # pp(service_attrs)
         logging.info("\n")
-        api_client.close()
-        client.close()
+
+    def _create_services(self, service_params: List[DockerServiceParameters], args: list,
+                         metrics: JobLaunchMetrics) -> List[docker.models.services.Service]:
+        """
+        Create the given services one at a time, removing any already created if one fails.
+
+        Parameters
+        ----------
+        service_params
+            The parameters of the services to create, in index order
+        args
+            list of args to pass to each service
+        metrics
+            The launch metrics to which the time taken creating each service is added
+
+        Returns
+        -------
+        List[docker.models.services.Service]
+            The created services, in index order
+        """
+        services = []
+        try:
+            for idx, params in enumerate(service_params):
+                services.append(self._create_timed_service(params, idx, args, metrics))
+        except Exception:
+            self._remove_services(services)
+            raise
+        return services
+
+    def _create_services_concurrently(self, service_params: List[DockerServiceParameters], args: list,
+                                      metrics: JobLaunchMetrics) -> List[docker.models.services.Service]:
+        """
+        Create the given services concurrently, in a pool of at most ::attribute:`_max_launch_workers` threads,
+        removing any created if one fails.
+
+        Once any creation fails, creations not yet started are cancelled, and those in progress are waited for, so
+        that every created service is known and removed before the failure is raised.
+
+        Parameters
+        ----------
+        service_params
+            The parameters of the services to create, in index order
+        args
+            list of args to pass to each service
+        metrics
+            The launch metrics to which the time taken creating each service is added
+
+        Returns
+        -------
+        List[docker.models.services.Service]
+            The created services, in index order
+        """
+        if self._launch_executor is None:
+            self._launch_executor = ThreadPoolExecutor(max_workers=self._max_launch_workers,
+                                                       thread_name_prefix='launcher')
+        futures = [self._launch_executor.submit(self._create_timed_service, params, idx, args, metrics)
+                   for idx, params in enumerate(service_params)]
+        done, not_done = wait(futures, return_when=FIRST_EXCEPTION)
+        if len(not_done) > 0:
+            for future in not_done:
+                future.cancel()
+            wait(not_done)
+        # Futures are only cancelled after a failure
+        errors = [f.exception() for f in futures if not f.cancelled() and f.exception() is not None]
+        if len(errors) > 0:
+            self._remove_services([f.result() for f in futures if not f.cancelled() and f.exception() is None])
+            raise errors[0]
+        return [f.result() for f in futures]
+
+    def _create_timed_service(self, serviceParams: DockerServiceParameters, idx: int, args: list,
+                              metrics: JobLaunchMetrics) -> docker.models.services.Service:
+        """
+        Create a service via ::method:`create_service`, adding the time taken to the given launch metrics.
+        """
+        start = perf_counter()
+        service = self.create_service(serviceParams, idx, args)
+        metrics.service_create_seconds[serviceParams.serv_name] = perf_counter() - start
+        return service
+
+    def _record_launch_metrics(self, metrics: JobLaunchMetrics):
+        """
+        Log and keep the given job launch metrics, dropping those of the oldest launch if over the limit.
+        """
+        logging.info(str(metrics))
+        job_id = str(metrics.job_id)
+        self.launch_metrics.pop(job_id, None)
+        self.launch_metrics[job_id] = metrics
+        while len(self.launch_metrics) > self._MAX_LAUNCH_METRICS:
+            self.launch_metrics.popitem(last=False)
+
+    @staticmethod
+    def _remove_services(services: List[docker.models.services.Service]):
+        """
+        Remove the given services, i.e., those created for a job before the launch of another of its services failed.
+
+        Failures to remove a service are logged, but otherwise ignored, so that the rest are still removed.
+        """
+        for service in services:
+            try:
+                service.remove()
+            except docker.errors.APIError as e:
+                logging.error("Failed to remove service {} after failed job launch: {}".format(service.name, str(e)))
 
     def checkDocker(self):
         """Test that docker is up running"""
@@ -211,10 +370,11 @@ class Launcher:
         return host_str
 
     def load_image_and_mounts(self, name: str, version: str, domain: str) -> tuple:
-        """ TODO make this a static method, pass in image_and_domain_list file path
-        Read a list of image_name and domain_name from the yaml file: image_and_domain.yaml
-        Derive domain directory to be used for computing
-        The image_name needed and user requested domain_name must be in the list for a valid job request,
+        """
+        Get the image for the given model name and version, and the mounts for the given domain, from the launcher's
+        ::attribute:`catalog` of images and domains (see ::method:`ImageAndDomainCatalog.get_image_and_mounts`).
+
+        The image_name needed and user requested domain_name must be in the catalog for a valid job request,
         otherwise, it is not supported
 
         Parameters
@@ -233,62 +393,32 @@ class Launcher:
         mounts: list[str]
             A list of docker style mount strings in the form `selected_domain`:`run_domain`:rw
             The selected domain directory out of the valid domain name : domain directory dicts in the yaml file
-        run_domain_dir
-            The run domain directory in the docker container, based on the domain name to directory mapping in the yaml file
         """
-
-        # Load the yaml file into dictionary
-        with open(self._images_and_domains_yaml) as fn:
-            yml_obj = yaml.safe_load(fn)
-
-        try:
-            model = yml_obj[name]
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no model key {}".format(name)))
-        try:
-            domain = model['domains'][domain]
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no domain key {} for model {}".format(domain, name)))
-        try:
-            run_dir = domain['run']
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no 'run' key for domain {}, model {}".format(domain, name)))
-        try:
-            local_dir = domain['local']
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no 'local' key for domain {}, model {}".format(domain, name)))
-        try:
-            image = model['version'][version]
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no version key {}".format(version)))
-        try:
-            output = model['output']
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no 'output' key for model {}".format(name)))
-        try:
-            output_local = output['local']
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no `local` key for output, model {}".format(name)))
-        try:
-            output_run = output['run']
-        except KeyError:
-            raise(KeyError("image_and_domain.yaml has no `run` key for output, model {}".format(name)))
-
-        #Configure local volume mounts based on domain and model lookup
-
-        input_mount = "{}:{}:rw".format(local_dir, run_dir)
-        output_mount = "{}:{}:rw".format(output_local, output_run)
-
-        return image, [input_mount, output_mount]
+        return self.catalog.get_image_and_mounts(name, version, domain)
 
     def start_job(self, job: 'Job'):
         """
+        Create the Docker services for the allocations of the given job, returning whether this succeeded, along with
+        the last of the created services.
+
+        If the launcher was initialized for concurrent launches, the services of a job with multiple allocations are
+        created concurrently, rather than paying the latency of each Docker API round trip in turn.  Either way, if the
+        creation of any service fails, any others already created for the job are removed, and the error is raised.
+        Timing metrics for the launch are logged and kept in ::attribute:`launch_metrics`.
 
+        Parameters
+        ----------
+        job
+            The job to launch
+
+        Returns
+        -------
+        tuple
+            Whether the services were created, and the last created service (or ``None`` if there are no allocations)
         """
         #TODO read these from request metadata
         model = job.originating_request.model_request.get_model_name()
         name = "{}-worker".format(model)
-        #FIXME read all image/domain at init and select from internal cache (i.e. dict) or even push to redis for long term cache
         (image_tag, mounts) = self.load_image_and_mounts(model,
                                                          job.originating_request.model_request.version,
                                                          job.originating_request.model_request.domain)
@@ -306,6 +436,7 @@ class Launcher:
         args.append(job.job_id)
 
         idx = 0
+        service_params = []
 
         for alloc in job.allocations:
             constraints = "node.hostname == "
@@ -315,15 +446,29 @@ class Launcher:
             logging.info("Hostname: {}".format(hostname))
             #FIXME important that all label values are strings, otherwise docker service create hangs
             labels_tmp = {"Hostname": hostname, "cpus_alloc": str(cpus_alloc)}
-            labels.update(labels_tmp)
+            # Each service needs its own copy, since services may be created concurrently
+            service_labels = dict(labels)
+            service_labels.update(labels_tmp)
             constraints += hostname
             constraints = list(constraints.split("/"))
             #TODO review all self attributes
             serv_name = "{}{}_{}".format(name, idx, job.job_id)
-            #Create the docker service
-            serviceParams = DockerServiceParameters(image_tag, constraints, hostname, labels, serv_name, mounts)
-            #TODO check for proper service creation, return False if doesn't work
-            service = self.create_service(serviceParams, idx, args)
+            service_params.append(DockerServiceParameters(image_tag, constraints, hostname, service_labels, serv_name,
+                                                          mounts))
             idx += 1
+
+        #Create the docker services
+        concurrent = self._concurrent_launch and len(service_params) > 1
+        metrics = JobLaunchMetrics(job.job_id, len(service_params), concurrent)
+        start = perf_counter()
+        try:
+            if concurrent:
+                services = self._create_services_concurrently(service_params, args, metrics)
+            else:
+                services = self._create_services(service_params, args, metrics)
+            metrics.succeeded = True
+        finally:
+            metrics.total_seconds = perf_counter() - start
+            self._record_launch_metrics(metrics)
         logging.info("\n")
-        return (True, service)
+        return (len(services) > 0, services[-1] if len(services) > 0 else None)
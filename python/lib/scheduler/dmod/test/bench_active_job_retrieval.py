@@ -0,0 +1,117 @@
+"""
+Benchmark for reading all active jobs from a ::class:`RedisBackedJobManager`.
+
+Compares the per-job retrieval path (``SMEMBERS`` followed by one ::method:`retrieve_job_by_redis_key` call per job)
+against the chunked ::method:`RedisBackedJobManager.iter_active_jobs` path, reporting the number of Redis round trips
+and the wall time for each.  This requires a running Redis instance, e.g. the one started for integration tests:
+
+    python -m dmod.test.bench_active_job_retrieval --redis-port 19639 --redis-pass <pass> --sizes 1000 10000 100000
+"""
+import argparse
+import json
+from time import perf_counter
+from typing import Callable, Tuple
+from uuid import uuid4
+
+from redis.client import Pipeline
+
+from ..scheduler.job.job_manager import RedisBackedJobManager
+from . import MockResourceManager, mock_job
+
+
+class RoundTripCounter:
+    """
+    Simple wrapper to count the Redis round trips made through a job manager's client, including pipeline executions.
+    """
+
+    def __init__(self, job_manager: RedisBackedJobManager):
+        self.count = 0
+        self._redis = job_manager.redis
+        self._orig_execute_command = self._redis.execute_command
+        self._orig_pipeline_execute = Pipeline.execute
+
+    def __enter__(self):
+        counter = self
+
+        def counting_execute_command(*args, **kwargs):
+            counter.count += 1
+            return counter._orig_execute_command(*args, **kwargs)
+
+        def counting_pipeline_execute(pipeline, *args, **kwargs):
+            counter.count += 1
+            return counter._orig_pipeline_execute(pipeline, *args, **kwargs)
+
+        self._redis.execute_command = counting_execute_command
+        Pipeline.execute = counting_pipeline_execute
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self._redis.execute_command = self._orig_execute_command
+        Pipeline.execute = self._orig_pipeline_execute
+
+
+def _handle_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--redis-host', help='Set the Redis host', dest='redis_host', default='127.0.0.1')
+    parser.add_argument('--redis-port', help='Set the Redis port', dest='redis_port', type=int, default=6379)
+    parser.add_argument('--redis-pass', help='Set the Redis password', dest='redis_pass', default='')
+    parser.add_argument('--sizes', help='Numbers of active jobs to benchmark', dest='sizes', type=int, nargs='+',
+                        default=[1000, 10000, 100000])
+    parser.add_argument('--skip-per-job', help='Skip the (slow) per-job retrieval path', dest='skip_per_job',
+                        action='store_true')
+    return parser.parse_args()
+
+
+def populate_active_jobs(job_manager: RedisBackedJobManager, count: int):
+    """
+    Directly write the given number of active job records, bypassing ::method:`save_job` to keep setup fast.
+    """
+    serial_template = mock_job().to_dict()
+    with job_manager.redis.pipeline(transaction=False) as pipeline:
+        for i in range(count):
+            serial_template['job_id'] = str(uuid4())
+            job_key = job_manager._get_job_key_for_id(serial_template['job_id'])
+            pipeline.hset(job_key, mapping=dict([(f, json.dumps(v)) for f, v in serial_template.items()]))
+            pipeline.sadd(job_manager._active_jobs_set_key, job_key)
+            if i % 1000 == 999:
+                pipeline.execute()
+        pipeline.execute()
+
+
+def time_retrieval(job_manager: RedisBackedJobManager, retrieval_func: Callable[[], int]) -> Tuple[int, int, float]:
+    with RoundTripCounter(job_manager) as counter:
+        start = perf_counter()
+        retrieved = retrieval_func()
+        elapsed = perf_counter() - start
+    return retrieved, counter.count, elapsed
+
+
+def main():
+    args = _handle_args()
+    job_manager = RedisBackedJobManager(resource_manager=MockResourceManager(), launcher=None,
+                                        redis_host=args.redis_host, redis_port=args.redis_port,
+                                        redis_pass=args.redis_pass, type='test')
+
+    def per_job() -> int:
+        keys = job_manager.redis.smembers(job_manager._active_jobs_set_key)
+        return len([job_manager.retrieve_job_by_redis_key(k) for k in keys])
+
+    def chunked() -> int:
+        return sum(1 for _ in job_manager.iter_active_jobs())
+
+    print('{:>8} {:>10} {:>12} {:>10}'.format('jobs', 'path', 'round trips', 'seconds'))
+    try:
+        for size in args.sizes:
+            job_manager._clean_keys(prefix='test')
+            populate_active_jobs(job_manager, size)
+            paths = [('chunked', chunked)] if args.skip_per_job else [('per-job', per_job), ('chunked', chunked)]
+            for name, func in paths:
+                retrieved, round_trips, elapsed = time_retrieval(job_manager, func)
+                assert retrieved == size
+                print('{:>8} {:>10} {:>12} {:>10.3f}'.format(size, name, round_trips, elapsed))
+    finally:
+        job_manager._clean_keys(prefix='test')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""
+Microbenchmark for the per-job cost of loading a ::class:`RequestedJob` from its serialized form.
+
+Reports the average microseconds per job for deserializing only (with lazy fields left in serialized form), for
+deserializing and reading the properties used by listing and scheduling code, and for deserializing and reading every
+property (equivalent to fully parsing each job), as well as for a full load from a JSON string and for a serialization
+round trip.  No Redis instance is needed:
+
+    python -m dmod.test.bench_job_deserialization --iterations 20000
+"""
+import argparse
+import json
+from time import perf_counter
+from typing import Callable
+
+from ..scheduler.job.job import JobStatus, RequestedJob
+from . import mock_job
+
+
+def _handle_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--iterations', help='Number of jobs loaded per case', dest='iterations', type=int,
+                        default=20000)
+    parser.add_argument('--allocations', help='Number of allocations of each job', dest='allocations', type=int,
+                        default=2)
+    return parser.parse_args()
+
+
+def _microseconds_per_call(func: Callable, iterations: int) -> float:
+    start = perf_counter()
+    for _ in range(iterations):
+        func()
+    return (perf_counter() - start) * 1000000 / iterations
+
+
+def _read_scheduling_fields(job: RequestedJob):
+    return job.status, job.cpu_count, job.memory_size, job.allocation_priority, job.allocations, job.last_updated
+
+
+def _load_projected(serial: dict):
+    return _read_scheduling_fields(RequestedJob.factory_init_from_deserialized_json(serial))
+
+
+def _load_fully(serial: dict):
+    job = RequestedJob.factory_init_from_deserialized_json(serial)
+    return _read_scheduling_fields(job) + (job.parameters, job.rsa_key_pair, job.originating_request.model_request)
+
+
+def main():
+    args = _handle_args()
+    job = mock_job(cpus=8, allocations=args.allocations)
+    job.status = JobStatus.MODEL_EXEC_RUNNING
+    serial = job.to_dict()
+    json_str = job.to_json()
+    cases = [('deserialize only', lambda: RequestedJob.factory_init_from_deserialized_json(serial)),
+             ('scheduling fields', lambda: _load_projected(serial)),
+             ('all fields', lambda: _load_fully(serial)),
+             ('all fields from JSON', lambda: _load_fully(json.loads(json_str))),
+             ('round trip to dict', lambda: RequestedJob.factory_init_from_deserialized_json(serial).to_dict()),
+             ('status name lookup', lambda: JobStatus.get_for_name('model_exec_running'))]
+    print('{:>22} {:>14}'.format('case', 'us per job'))
+    for name, func in cases:
+        print('{:>22} {:>14.2f}'.format(name, _microseconds_per_call(func, args.iterations)))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,200 @@
+"""
+Contention benchmark for ::class:`RedisManager` resource allocation.
+
+Several worker threads, each with its own ::class:`RedisManager` (as separate scheduler replicas would have), repeatedly
+allocate from and release to the same small resource pool.  The scripted implementation used by
+::method:`RedisManager.allocate_resource` is compared with the optimistic ``WATCH``/``MULTI`` implementation of
+::class:`WatchRedisManager`, reporting throughput and, for the latter, the number of transaction retries caused by write
+conflicts.  This requires a running Redis instance, e.g. the one started for integration tests:
+
+    python -m dmod.test.bench_redis_manager_contention --redis-port 19639 --redis-pass <pass> --threads 1 4 16
+"""
+import argparse
+import logging
+from threading import Thread
+from time import perf_counter
+from typing import Optional
+
+from redis import WatchError
+from redis.client import Pipeline
+
+from ..scheduler.resources.redis_manager import RedisManager
+from ..scheduler.resources.resource import Resource
+from ..scheduler.resources.resource_allocation import ResourceAllocation
+from . import mock_resources
+
+
+class WatchRedisManager(RedisManager):
+    """
+    Extension of ::class:`RedisManager`, strictly for benchmarking, which allocates and releases using optimistic
+    ``WATCH``/``MULTI`` transactions instead of the server-side scripts, for comparison with the scripted
+    implementation.
+    """
+
+    def allocate_resource(self, resource_id: str, requested_cpus: int, requested_memory: int = 0,
+                          partial: bool = False) -> Optional[ResourceAllocation]:
+        """
+        Allocate from the resource using an optimistic ``WATCH``/``MULTI`` transaction, retrying on write conflicts.
+        """
+        if requested_cpus <= 0:
+            raise ValueError("Invalid < 1 CPU allocation requested")
+
+        resource_key = Resource.generate_unique_id(resource_id, separator=self.keynamehelper.separator)
+        if not self.redis.exists(resource_key):
+            raise ValueError("Invalid allocation request to unrecognized resource {}".format(resource_key))
+
+        allocation = None
+
+        # By using the context manager, we get connection cleanup for free (e.g., pipeline.reset(), etc.)
+
+        while True:
+            with self.redis.pipeline() as pipeline:
+                try:
+                    # Will get WatchError if the value changes between now and pipe.execute()
+                    pipeline.watch(resource_key)
+                    resource = Resource.factory_init_from_dict(pipeline.hgetall(resource_key))
+                    pipeline.multi()
+                    cpus_allocated, mem_allocated, is_fully = resource.allocate(requested_cpus, requested_memory)
+
+                    if is_fully or (partial and cpus_allocated > 0 and (mem_allocated > 0 or requested_memory == 0)):
+                        pipeline.hmset(resource_key, resource.to_dict())
+                        self._update_capacity_index(pipeline, resource_key, resource)
+                        allocation = ResourceAllocation(resource_id, resource.hostname, cpus_allocated, mem_allocated)
+                        allocation.unique_id_separator = self.keynamehelper.separator
+                        pipeline.hmset(allocation.unique_id, allocation.to_dict())
+                    else:
+                        resource.release(cpus_allocated, mem_allocated)
+                    pipeline.execute()
+                except WatchError:
+                    logging.debug("Write Conflict allocate_resource: {}. Retrying...".format(resource_key))
+                    # Clear and try the transaction again
+                    allocation = None
+                    pipeline.reset()
+                    continue
+                break
+        return allocation
+
+    def release_resource(self, allocation: ResourceAllocation):
+        """
+        Release the allocation using an optimistic ``WATCH``/``MULTI`` transaction, retrying on write conflicts.
+        """
+        allocation.unique_id_separator = self.keynamehelper.separator
+        while True:
+            with self.redis.pipeline() as pipeline:
+                try:
+                    # Obtain the source Resource object for the allocation
+                    source_resource_key = Resource.generate_unique_id(allocation.resource_id,
+                                                                      self.keynamehelper.separator)
+                    pipeline.watch(source_resource_key)
+                    if not pipeline.exists(source_resource_key):
+                        raise RuntimeError(
+                            "RedisManager::release_resources -- No key {} exists to release resources to".format(
+                                allocation.unique_id))
+
+                    # Should return directly after watch takes us of of buffered mode
+                    serial_source_resource_hash = pipeline.hgetall(source_resource_key)
+                    source_resource = Resource.factory_init_from_dict(serial_source_resource_hash)
+
+                    # Once we have looked up the resource record and deserialized, return to buffered transaction mode
+                    pipeline.multi()
+                    source_resource.unique_id_separator = self.keynamehelper.separator
+
+                    # Release the allocated properties and updated the Resource record
+                    source_resource.release(allocation.cpu_count, allocation.memory)
+                    pipeline.hmset(source_resource_key, source_resource.to_dict())
+                    self._update_capacity_index(pipeline, source_resource_key, source_resource)
+
+                    # Delete the allocation redis record
+                    # TODO: need to address implications of this in job manager
+                    pipeline.delete(allocation.unique_id)
+
+                    # Finally, execute the transaction
+                    pipeline.execute()
+                    return
+
+                except WatchError:
+                    logging.debug("Write Conflict allocate_resource: {}. Retrying...".format(source_resource_key))
+
+    def _update_capacity_index(self, pipeline: Pipeline, resource_key: str, resource: Resource):
+        """
+        Queue commands on the given pipeline to update the free capacity index scores for an already-indexed resource.
+        """
+        pipeline.zadd(self._free_cpus_index_key, {resource_key: resource.cpu_count}, xx=True)
+        pipeline.zadd(self._free_memory_index_key, {resource_key: resource.memory}, xx=True)
+
+
+class ConflictCounter(logging.Handler):
+    """
+    Logging handler that counts the write conflict retries logged by the ``WATCH`` based implementation.
+    """
+
+    def __init__(self):
+        super().__init__(level=logging.DEBUG)
+        self.count = 0
+
+    def emit(self, record: logging.LogRecord):
+        if record.getMessage().startswith('Write Conflict'):
+            self.count += 1
+
+
+def _handle_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--redis-host', help='Set the Redis host', dest='redis_host', default='127.0.0.1')
+    parser.add_argument('--redis-port', help='Set the Redis port', dest='redis_port', type=int, default=6379)
+    parser.add_argument('--redis-pass', help='Set the Redis password', dest='redis_pass', default='')
+    parser.add_argument('--threads', help='Numbers of concurrent workers to benchmark', dest='threads', type=int,
+                        nargs='+', default=[1, 4, 16])
+    parser.add_argument('--iterations', help='Allocate/release cycles per worker', dest='iterations', type=int,
+                        default=500)
+    return parser.parse_args()
+
+
+def _create_manager(args, manager_type: type = RedisManager) -> RedisManager:
+    return manager_type(resource_pool='bench_pool', redis_host=args.redis_host, redis_port=args.redis_port,
+                        redis_pass=args.redis_pass, type='test')
+
+
+def run_workers(managers, iterations: int) -> float:
+    # All workers contend for the first (smallest) mock resource
+    resource_id = mock_resources()[0].resource_id
+
+    def work(manager: RedisManager):
+        for _ in range(iterations):
+            allocation = manager.allocate_resource(resource_id, 1, 1000)
+            if allocation is not None:
+                manager.release_resource(allocation)
+
+    threads = [Thread(target=work, args=(m,)) for m in managers]
+    start = perf_counter()
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    return perf_counter() - start
+
+
+def main():
+    args = _handle_args()
+    setup_manager = _create_manager(args)
+    conflict_counter = ConflictCounter()
+    logging.getLogger().addHandler(conflict_counter)
+    logging.getLogger().setLevel(logging.DEBUG)
+
+    print('{:>8} {:>8} {:>12} {:>12} {:>10}'.format('threads', 'path', 'ops/sec', 'conflicts', 'seconds'))
+    try:
+        for thread_count in args.threads:
+            for name, manager_type in [('watch', WatchRedisManager), ('script', RedisManager)]:
+                managers = [_create_manager(args, manager_type) for _ in range(thread_count)]
+                setup_manager._clean_keys(prefix='test')
+                setup_manager.set_resources(mock_resources())
+                conflict_counter.count = 0
+                elapsed = run_workers(managers, args.iterations)
+                ops = 2 * thread_count * args.iterations
+                print('{:>8} {:>8} {:>12.1f} {:>12} {:>10.3f}'.format(thread_count, name, ops / elapsed,
+                                                                      conflict_counter.count, elapsed))
+    finally:
+        setup_manager._clean_keys(prefix='test')
+
+
+if __name__ == '__main__':
+    main()
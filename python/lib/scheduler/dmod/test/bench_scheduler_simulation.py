@@ -0,0 +1,356 @@
+"""
+Offline discrete-event simulation benchmark for job scheduling.
+
+Drives a ::class:`RedisBackedJobManager` and ::class:`RedisManager` with a workload of jobs, where each job has an
+arrival time, CPU and memory requirements, a runtime, and a priority.  No external services are needed: both managers
+are backed by an in-process Redis stand-in (requiring the optional ``fakeredis`` package, with Lua support via
+``lupa``), jobs are "launched" by a no-op launcher, and the time seen by the scheduling code is a simulated clock.
+
+At each event time, arriving jobs are created, completed jobs release their allocations and are closed, and then a
+single allocation pass is run, timing how long the pass takes.  Jobs started by the pass complete after their runtime.
+Reported results are throughput, CPU utilization, queue wait percentiles, and allocation pass latency.
+
+Workloads are either generated randomly (reproducibly, for a given seed) or read from a CSV trace file with columns
+``arrival``, ``cpus``, ``memory``, ``runtime``, and optionally ``priority``, ``paradigm``, ``walltime``, and ``user``
+(times in seconds from the start of the simulation):
+
+    python -m dmod.test.bench_scheduler_simulation --jobs 1000 --nodes 16 --cpus-per-node 32 --seed 1
+    python -m dmod.test.bench_scheduler_simulation --trace workload.csv --backfill
+    python -m dmod.test.bench_scheduler_simulation --users 4 --fair-share
+"""
+import argparse
+import csv
+import heapq
+import random
+from datetime import datetime, timedelta
+from time import perf_counter
+from types import SimpleNamespace
+from typing import Dict, List, NamedTuple, Optional
+from unittest import mock
+
+from dmod.communication import NWMRequest, SchedulerRequestMessage
+from ..scheduler.job.job import Job, JobStatus
+from ..scheduler.job.job_manager import RedisBackedJobManager
+from ..scheduler.resources.redis_manager import RedisManager
+from ..scheduler.resources.resource import Resource
+
+_SESSION_SECRET = 'f21f27ac3d443c0948aab924bddefc64891c455a756ca77a4d86ec2f697cd13c'
+
+
+class WorkloadJob(NamedTuple):
+    """
+    A job within a simulated workload.
+    """
+    arrival: float
+    """ Arrival time, in seconds from the start of the simulation. """
+    cpus: int
+    memory: int
+    runtime: float
+    """ Actual runtime in seconds. """
+    priority: int = 0
+    paradigm: str = 'SINGLE_NODE'
+    walltime: Optional[float] = None
+    """ Walltime estimate in seconds, used for backfilling, or ``None`` to use the actual runtime. """
+    user: str = 'sim'
+
+
+class SimulationClock:
+    """
+    Simulated clock for the scheduling code, installed by patching the ``datetime`` names of the scheduler modules.
+
+    Each read of the current time returns a value one microsecond later than the last, so that records keyed by
+    creation time (e.g., resource allocations) stay unique when created at the same simulated instant.
+    """
+
+    _PATCHED_DATETIME_CLASS_MODULES = ['dmod.scheduler.job.job', 'dmod.scheduler.job.backfill',
+                                       'dmod.scheduler.resources.resource_allocation',
+                                       'dmod.scheduler.resources.redis_manager']
+    _PATCHED_DATETIME_MODULE_MODULES = ['dmod.scheduler.job.job_manager']
+
+    def __init__(self, start: datetime):
+        self.start = start
+        self._current = start
+        self._ticks = 0
+        clock = self
+
+        class SimulatedDatetime(datetime):
+            @classmethod
+            def now(cls, tz=None):
+                clock._ticks += 1
+                current = clock._current + timedelta(microseconds=clock._ticks)
+                # Always return this type, as the patched modules may check with isinstance()
+                return cls.combine(current.date(), current.time())
+
+        self._datetime_class = SimulatedDatetime
+        self._patches = []
+
+    def advance_to(self, seconds: float):
+        """
+        Set the simulated time to the given number of seconds after the simulation start.
+        """
+        self._current = self.start + timedelta(seconds=seconds)
+        self._ticks = 0
+
+    def __enter__(self):
+        module_namespace = SimpleNamespace(datetime=self._datetime_class, timedelta=timedelta)
+        self._patches = [mock.patch(m + '.datetime', self._datetime_class) for m in
+                         self._PATCHED_DATETIME_CLASS_MODULES]
+        self._patches.extend([mock.patch(m + '.datetime', module_namespace) for m in
+                              self._PATCHED_DATETIME_MODULE_MODULES])
+        for p in self._patches:
+            p.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        for p in self._patches:
+            p.stop()
+
+
+class NoOpLauncher:
+    """
+    Launcher stand-in that accepts every job, recording which jobs have been started.
+    """
+
+    def __init__(self):
+        self.started: List[Job] = []
+
+    def start_job(self, job: Job) -> bool:
+        self.started.append(job)
+        return True
+
+
+def _in_process_redis_type(cls, server):
+    """
+    Create a subclass of the given ::class:`RedisBacked` type whose instances connect to the given in-process server.
+    """
+    import fakeredis
+
+    def get_connection_pool(c, host, port, passwd, db_num, decode_responses=True):
+        return fakeredis.FakeRedis(server=server, db=db_num, decode_responses=decode_responses).connection_pool
+
+    return type('InProcess' + cls.__name__, (cls,), {'get_connection_pool': classmethod(get_connection_pool)})
+
+
+class SimulationResults(NamedTuple):
+    completed: int
+    unscheduled: int
+    makespan: float
+    throughput: float
+    """ Completed jobs per hour. """
+    utilization: float
+    wait_times: List[float]
+    pass_latencies: List[float]
+    wait_times_by_user: Dict[str, List[float]]
+
+
+class SchedulerSimulation:
+    """
+    Discrete-event simulation of a workload run through a ::class:`RedisBackedJobManager`.
+    """
+
+    def __init__(self, workload: List[WorkloadJob], nodes: int, cpus_per_node: int, memory_per_node: int,
+                 backfill: bool = False, fair_share: bool = False):
+        try:
+            import fakeredis
+        except ImportError:
+            raise RuntimeError("Scheduler simulation requires the optional 'fakeredis' package (with 'lupa')")
+        self.workload = sorted(workload, key=lambda j: j.arrival)
+        self.total_cpus = nodes * cpus_per_node
+        self.clock = SimulationClock(start=datetime(2020, 1, 1))
+        self.launcher = NoOpLauncher()
+        server = fakeredis.FakeServer()
+        self.resource_manager = _in_process_redis_type(RedisManager, server)(resource_pool='sim')
+        self.resource_manager.set_resources([Resource.factory_init_from_dict(
+            {'node_id': 'Node-{:04d}'.format(i), 'Hostname': 'host{}'.format(i), 'Availability': 'active',
+             'State': 'ready', 'CPUs': cpus_per_node, 'MemoryBytes': memory_per_node}) for i in range(nodes)])
+        self.workload_by_job_id: Dict[str, WorkloadJob] = dict()
+        workload_by_job_id = self.workload_by_job_id
+
+        def get_walltime_estimate(manager, job):
+            spec = workload_by_job_id.get(job.job_id)
+            if spec is None:
+                return RedisBackedJobManager.get_walltime_estimate(manager, job)
+            return timedelta(seconds=spec.runtime if spec.walltime is None else spec.walltime)
+
+        job_manager_type = _in_process_redis_type(RedisBackedJobManager, server)
+        job_manager_type.get_walltime_estimate = get_walltime_estimate
+        self.job_manager = job_manager_type(resource_manager=self.resource_manager, launcher=self.launcher,
+                                            backfill=backfill, fair_share=fair_share)
+
+    def _create_job(self, spec: WorkloadJob):
+        model_request = NWMRequest(version=2.0, output='streamflow', domain='sim', parameters={},
+                                   session_secret=_SESSION_SECRET)
+        request = SchedulerRequestMessage(model_request=model_request, user_id=spec.user, cpus=spec.cpus, mem=spec.memory,
+                                          allocation_paradigm=spec.paradigm)
+        job = self.job_manager.create_job(request=request)
+        self.workload_by_job_id[job.job_id] = spec
+        if spec.priority != 0:
+            job.allocation_priority = spec.priority
+            self.job_manager.save_job(job)
+        return job
+
+    def _complete_job(self, job_id: str):
+        job = self.job_manager.retrieve_job(job_id)
+        self.job_manager.release_allocations(job)
+        job.status = JobStatus.CLOSED
+        self.job_manager.save_job(job)
+
+    def run(self) -> SimulationResults:
+        # Events are tuples of time, sequence number (to keep ordering stable), and either a workload job to create or
+        # a job id to complete
+        events = [(spec.arrival, i, spec) for i, spec in enumerate(self.workload)]
+        heapq.heapify(events)
+        sequence = len(events)
+        arrivals = dict()
+        wait_times = []
+        wait_times_by_user = dict()
+        pass_latencies = []
+        busy_cpus = 0
+        busy_cpu_seconds = 0.0
+        last_time = 0.0
+        completed = 0
+
+        with self.clock:
+            while len(events) > 0:
+                now = events[0][0]
+                busy_cpu_seconds += busy_cpus * (now - last_time)
+                last_time = now
+                self.clock.advance_to(now)
+                while len(events) > 0 and events[0][0] == now:
+                    _, _, event = heapq.heappop(events)
+                    if isinstance(event, WorkloadJob):
+                        arrivals[self._create_job(event).job_id] = now
+                    else:
+                        job_id, cpus = event
+                        self._complete_job(job_id)
+                        busy_cpus -= cpus
+                        completed += 1
+
+                self.launcher.started = []
+                start = perf_counter()
+                self.job_manager._run_allocation_pass()
+                pass_latencies.append(perf_counter() - start)
+
+                for job in self.launcher.started:
+                    cpus = sum(a.cpu_count for a in job.allocations)
+                    busy_cpus += cpus
+                    wait_times.append(now - arrivals[job.job_id])
+                    spec = self.workload_by_job_id[job.job_id]
+                    wait_times_by_user.setdefault(spec.user, []).append(wait_times[-1])
+                    runtime = spec.runtime
+                    heapq.heappush(events, (now + runtime, sequence, (job.job_id, cpus)))
+                    sequence += 1
+
+        makespan = last_time - (self.workload[0].arrival if len(self.workload) > 0 else 0.0)
+        return SimulationResults(completed=completed, unscheduled=len(self.workload) - completed, makespan=makespan,
+                                 throughput=completed * 3600 / makespan if makespan > 0 else 0.0,
+                                 utilization=busy_cpu_seconds / (self.total_cpus * makespan) if makespan > 0 else 0.0,
+                                 wait_times=wait_times, pass_latencies=pass_latencies,
+                                 wait_times_by_user=wait_times_by_user)
+
+
+def generate_workload(count: int, seed: int, max_cpus: int, max_single_node_cpus: int, memory_per_cpu: int,
+                      mean_interarrival: float, mean_runtime: float, paradigms: List[str],
+                      users: int = 1) -> List[WorkloadJob]:
+    """
+    Generate a random workload, with exponentially distributed inter-arrival times and runtimes, job sizes skewed
+    towards small jobs, and walltime estimates that overestimate the actual runtime by up to a factor of three.
+
+    With multiple users, the first submits half of all jobs (e.g., a large ensemble) and the rest share the other half.
+    """
+    rng = random.Random(seed)
+    workload = []
+    arrival = 0.0
+    for _ in range(count):
+        arrival += rng.expovariate(1.0 / mean_interarrival)
+        paradigm = rng.choice(paradigms)
+        limit = max_single_node_cpus if paradigm.upper() == 'SINGLE_NODE' else max_cpus
+        cpus = max(1, min(limit, int(2 ** rng.uniform(0, limit.bit_length()))))
+        runtime = rng.expovariate(1.0 / mean_runtime)
+        user = 'user0' if users < 2 or rng.random() < 0.5 else 'user{}'.format(rng.randrange(1, users))
+        workload.append(WorkloadJob(arrival=arrival, cpus=cpus, memory=cpus * memory_per_cpu, runtime=runtime,
+                                    priority=rng.choice([0, 0, 0, 60, 110]), paradigm=paradigm,
+                                    walltime=runtime * rng.uniform(1.0, 3.0), user=user))
+    return workload
+
+
+def load_workload_trace(path: str) -> List[WorkloadJob]:
+    """
+    Load a workload from a CSV trace file.
+    """
+    workload = []
+    with open(path, newline='') as trace_file:
+        for row in csv.DictReader(trace_file):
+            workload.append(WorkloadJob(arrival=float(row['arrival']), cpus=int(row['cpus']),
+                                        memory=int(row['memory']), runtime=float(row['runtime']),
+                                        priority=int(row.get('priority') or 0),
+                                        paradigm=row.get('paradigm') or 'SINGLE_NODE',
+                                        walltime=float(row['walltime']) if row.get('walltime') else None,
+                                        user=row.get('user') or 'sim'))
+    return workload
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if len(values) == 0:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(pct / 100.0 * (len(ordered) - 1))))]
+
+
+def _handle_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--trace', help='CSV workload trace file to use instead of a generated workload', dest='trace')
+    parser.add_argument('--jobs', help='Number of jobs to generate', dest='jobs', type=int, default=500)
+    parser.add_argument('--seed', help='Random seed for workload generation', dest='seed', type=int, default=0)
+    parser.add_argument('--nodes', help='Number of simulated nodes', dest='nodes', type=int, default=8)
+    parser.add_argument('--cpus-per-node', help='CPUs per simulated node', dest='cpus_per_node', type=int, default=32)
+    parser.add_argument('--memory-per-node', help='Memory bytes per simulated node', dest='memory_per_node', type=int,
+                        default=128 * 2 ** 30)
+    parser.add_argument('--mean-interarrival', help='Mean seconds between generated job arrivals',
+                        dest='mean_interarrival', type=float, default=60.0)
+    parser.add_argument('--mean-runtime', help='Mean generated job runtime in seconds', dest='mean_runtime',
+                        type=float, default=1800.0)
+    parser.add_argument('--paradigms', help='Allocation paradigms to choose from for generated jobs', dest='paradigms',
+                        nargs='+', default=['SINGLE_NODE', 'FILL_NODES'])
+    parser.add_argument('--users', help='Number of users submitting generated jobs', dest='users', type=int,
+                        default=1)
+    parser.add_argument('--backfill', help='Use EASY backfill scheduling', dest='backfill', action='store_true')
+    parser.add_argument('--fair-share', help='Use fair-share scheduling', dest='fair_share', action='store_true')
+    return parser.parse_args()
+
+
+def main():
+    args = _handle_args()
+    if args.trace:
+        workload = load_workload_trace(args.trace)
+    else:
+        workload = generate_workload(count=args.jobs, seed=args.seed, max_cpus=args.cpus_per_node * 2,
+                                     max_single_node_cpus=args.cpus_per_node,
+                                     memory_per_cpu=args.memory_per_node // args.cpus_per_node // 2,
+                                     mean_interarrival=args.mean_interarrival, mean_runtime=args.mean_runtime,
+                                     paradigms=args.paradigms, users=args.users)
+    simulation = SchedulerSimulation(workload, nodes=args.nodes, cpus_per_node=args.cpus_per_node,
+                                     memory_per_node=args.memory_per_node, backfill=args.backfill,
+                                     fair_share=args.fair_share)
+    start = perf_counter()
+    results = simulation.run()
+    elapsed = perf_counter() - start
+
+    print('jobs completed:      {} ({} never scheduled)'.format(results.completed, results.unscheduled))
+    print('simulated makespan:  {:.1f} hours'.format(results.makespan / 3600))
+    print('throughput:          {:.2f} jobs/hour'.format(results.throughput))
+    print('cpu utilization:     {:.1%}'.format(results.utilization))
+    print('queue wait (s):      p50 {:.1f}  p90 {:.1f}  p99 {:.1f}  max {:.1f}'.format(
+        *[percentile(results.wait_times, p) for p in (50, 90, 99, 100)]))
+    print('pass latency (ms):   p50 {:.2f}  p90 {:.2f}  p99 {:.2f}  max {:.2f}  ({} passes)'.format(
+        *[1000 * percentile(results.pass_latencies, p) for p in (50, 90, 99, 100)], len(results.pass_latencies)))
+    if len(results.wait_times_by_user) > 1:
+        for user in sorted(results.wait_times_by_user):
+            waits = results.wait_times_by_user[user]
+            print('  {:<17} {:>5} jobs, queue wait p50 {:.1f}  p90 {:.1f}'.format(
+                user + ':', len(waits), percentile(waits, 50), percentile(waits, 90)))
+    print('wall time:           {:.1f} seconds'.format(elapsed))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Benchmark for encoding and decoding persisted and transmitted ::class:`Serializable` objects.
+
+Compares the existing JSON path (``json.dumps`` and ``json.loads``) against tagged encoding and decoding with each
+available codec (as used by ::method:`Serializable.to_bytes` and ::method:`Serializable.factory_init_from_bytes`),
+reporting the encoded size and the encode and decode throughput for each object type.  Note that the figures include the
+conversions to and from serialized dictionaries common to all codecs.  No Redis instance is needed:
+
+    python -m dmod.test.bench_serialization --iterations 10000
+"""
+import argparse
+import json
+from time import perf_counter
+from typing import Callable, List, Tuple
+
+from dmod.communication import SchedulerRequestMessage, Session
+from dmod.communication.serialization import decode, encode, get_available_codecs
+
+from ..scheduler.job.job import RequestedJob
+
+from ..scheduler.resources.resource_allocation import ResourceAllocation
+from . import mock_job
+
+
+def _handle_args():
+    parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--iterations', help='Number of encodes and decodes per object and path', dest='iterations',
+                        type=int, default=10000)
+    return parser.parse_args()
+
+
+def _rate(func: Callable, iterations: int) -> float:
+    """
+    Get the number of calls per second of the given function, over the given number of calls.
+    """
+    start = perf_counter()
+    for _ in range(iterations):
+        func()
+    return iterations / (perf_counter() - start)
+
+
+def sample_objects() -> List[Tuple[str, Callable[[], dict], Callable[[dict], object]]]:
+    """
+    Get a sample object of each benchmarked type, as tuples of type name, serialization function, and deserialization
+    function.
+    """
+    job = mock_job(cpus=8, allocations=2)
+    allocation = ResourceAllocation('resource1', 'hostname1', 4, 500000)
+    session = Session(session_id=1)
+    return [(RequestedJob.__name__, job.to_dict, RequestedJob.factory_init_from_deserialized_json),
+            (SchedulerRequestMessage.__name__, job.originating_request.to_dict,
+             SchedulerRequestMessage.factory_init_from_deserialized_json),
+            (ResourceAllocation.__name__, allocation.to_dict, ResourceAllocation.factory_init_from_dict),
+            (Session.__name__, session.to_dict, Session.factory_init_from_deserialized_json)]
+
+
+def main():
+    args = _handle_args()
+    print('{:>24} {:>14} {:>8} {:>12} {:>12}'.format('type', 'path', 'bytes', 'encodes/s', 'decodes/s'))
+    for type_name, to_dict, from_dict in sample_objects():
+        json_str = json.dumps(to_dict())
+        results = [('json (existing)', len(json_str.encode()),
+                    _rate(lambda: json.dumps(to_dict()), args.iterations),
+                    _rate(lambda: from_dict(json.loads(json_str)), args.iterations))]
+        for codec in get_available_codecs():
+            data = encode(to_dict(), codec)
+            results.append((codec.get_name(), len(data),
+                            _rate(lambda: encode(to_dict(), codec), args.iterations),
+                            _rate(lambda: from_dict(decode(data)[0]), args.iterations)))
+        for path, size, encode_rate, decode_rate in results:
+            print('{:>24} {:>14} {:>8} {:>12.0f} {:>12.0f}'.format(type_name, path, size, encode_rate, decode_rate))
+
+
+if __name__ == '__main__':
+    main()
@@ -1,10 +1,14 @@
+import asyncio
+import datetime
 import os
 import unittest
-from ..scheduler.job.job import Job, JobStatus, RequestedJob, SchedulerRequestMessage
+from ..scheduler.job.job import Job, JobImpl, JobStatus, RequestedJob, SchedulerRequestMessage
 from ..scheduler.job.job_manager import RedisBackedJobManager
+from ..scheduler.resources.resource_allocation import ResourceAllocation
 from ..scheduler.rsa_key_pair import RsaKeyPair
-from . import MockResourceManager, mock_resources
+from . import MockResourceManager, mock_job, mock_resources
 from dmod.communication import NWMRequest
+from dmod.communication.serialization import MsgpackCodec
 from dotenv import load_dotenv
 from pathlib import Path
 from typing import List, Optional, Tuple
@@ -314,6 +318,26 @@ class IntegrationTestRedisBackedJobManager(unittest.TestCase):
 
         self.assertEqual(job_ids, active_job_ids)
 
+    # Test getting all active jobs skips active set entries for job records that no longer exist
+    def test_get_all_active_jobs_3_a(self):
+        job = mock_job()
+        self._job_manager.save_job(job)
+        missing_job_key = self._job_manager._get_job_key_for_id(mock_job().job_id)
+        self._job_manager.redis.sadd(self._job_manager._active_jobs_set_key, missing_job_key)
+        active_jobs = self._job_manager.get_all_active_jobs()
+        self.assertEqual([job.job_id], [aj.job_id for aj in active_jobs])
+
+    # Test iterating through active jobs with a small chunk size still gets all the active jobs
+    def test_iter_active_jobs_1_a(self):
+        job_ids = []
+        for i in range(5):
+            job = mock_job()
+            job_ids.append(job.job_id)
+            self._job_manager.save_job(job)
+        job_ids.sort()
+        active_job_ids = sorted([aj.job_id for aj in self._job_manager.iter_active_jobs(chunk_size=2)])
+        self.assertEqual(job_ids, active_job_ids)
+
     # Test save_job saves a record (i.e., it later exists)
     def test_save_job_1_a(self):
         example_index = 0
@@ -561,4 +585,376 @@ class IntegrationTestRedisBackedJobManager(unittest.TestCase):
         self._job_manager.release_allocations(retrieved_job_1)
         self.assertIsNone(retrieved_job_1.allocations)
 
-    # TODO: tests for manage_job_processing (maybe ... async so this might be too difficult)
+    # Test save_job publishes a scheduling event
+    def test_save_job_3_a(self):
+        pubsub = self._job_manager.redis.pubsub()
+        pubsub.subscribe(self._job_manager._scheduling_events_channel)
+        # Read the subscribe confirmation first
+        pubsub.get_message(timeout=1.0)
+        self._job_manager.save_job(mock_job())
+        message = pubsub.get_message(timeout=1.0)
+        pubsub.close()
+        self.assertIsNotNone(message)
+
+    # Test save_job does not publish a scheduling event when saving from within the manager's own allocation pass
+    def test_save_job_3_b(self):
+        pubsub = self._job_manager.redis.pubsub()
+        pubsub.subscribe(self._job_manager._scheduling_events_channel)
+        # Read the subscribe confirmation first
+        pubsub.get_message(timeout=1.0)
+        self._job_manager._is_in_allocation_pass = True
+        self._job_manager.save_job(mock_job())
+        message = pubsub.get_message(timeout=1.0)
+        pubsub.close()
+        self.assertIsNone(message)
+
+    # Test manage_job_processing runs a new allocation pass right away when a job is created, without waiting
+    def test_manage_job_processing_1_a(self):
+        job_manager = RedisBackedJobManager(resource_manager=self._resource_manager, launcher=self._launcher,
+                                            redis_host=self.redis_test_host, redis_port=self.redis_test_port,
+                                            redis_pass=self.redis_test_pass, type=self._env_type, safety_interval=600)
+        pass_count = [0]
+
+        def count_pass():
+            pass_count[0] += 1
+
+        job_manager._run_allocation_pass = count_pass
+
+        async def exec_test():
+            task = asyncio.ensure_future(job_manager.manage_job_processing())
+            # Give the listener a moment to subscribe before publishing
+            await asyncio.sleep(0.5)
+            job_manager.create_job(request=mock_job().originating_request)
+            await asyncio.sleep(2)
+            task.cancel()
+
+        asyncio.get_event_loop().run_until_complete(exec_test())
+        self.assertEqual(pass_count[0], 2)
+
+    # Test that a job's walltime parameter is used as its walltime estimate
+    def test_get_walltime_estimate_1_a(self):
+        job = JobImpl(4, 1000, parameters={'walltime': 600}, allocation_paradigm='single-node')
+        self.assertEqual(self._job_manager.get_walltime_estimate(job), datetime.timedelta(seconds=600))
+
+    # Test that a configured model default, and otherwise the overall default, is used without a walltime parameter
+    def test_get_walltime_estimate_1_b(self):
+        job = mock_job()
+        job_manager = RedisBackedJobManager(resource_manager=self._resource_manager, launcher=self._launcher,
+                                            redis_host=self.redis_test_host, redis_port=self.redis_test_port,
+                                            redis_pass=self.redis_test_pass, type=self._env_type,
+                                            default_walltime=1200,
+                                            model_walltimes={job.originating_request.model_request.get_model_name(): 300})
+        self.assertEqual(job_manager.get_walltime_estimate(job), datetime.timedelta(seconds=300))
+        self.assertEqual(job_manager.get_walltime_estimate(mock_job(model='ngen')), datetime.timedelta(seconds=1200))
+
+    # Test that a loaded job with a corrupt originating request gets the default walltime estimate, rather than an error
+    def test_get_walltime_estimate_1_c(self):
+        serial = mock_job().to_dict()
+        serial['originating_request'] = {'not': 'a request'}
+        job = RequestedJob.factory_init_from_deserialized_json(serial)
+        self.assertIsNotNone(job)
+        self.assertEqual(self._job_manager.get_walltime_estimate(job),
+                         datetime.timedelta(seconds=self._job_manager._default_walltime))
+
+    def _create_fair_share_job_manager(self) -> RedisBackedJobManager:
+        return RedisBackedJobManager(resource_manager=self._resource_manager, launcher=self._launcher,
+                                     redis_host=self.redis_test_host, redis_port=self.redis_test_port,
+                                     redis_pass=self.redis_test_pass, type=self._env_type, fair_share=True,
+                                     fair_share_weight=40)
+
+    # Test that releasing allocations charges their CPU-seconds to the job's user
+    def test_release_allocations_2_a(self):
+        job_manager = self._create_fair_share_job_manager()
+        job = mock_job()
+        created = datetime.datetime.now() - datetime.timedelta(hours=1)
+        job.allocations = [ResourceAllocation('resource1', 'hostname1', 4, 1000, created=created)]
+        job_manager.release_allocations(job)
+        usage = job_manager._fair_share_ledger.get_usage([job.originating_request.user_id],
+                                                         datetime.datetime.now().timestamp())
+        # Usage over an hour decays only very slightly with the default one week half-life
+        self.assertAlmostEqual(usage[job.originating_request.user_id], 4 * 3600, delta=4 * 3600 * 0.01)
+        self.assertEqual(usage[job.originating_request.user_id], usage[None])
+
+    # Test that jobs of users with more recent usage, including running jobs, get lower priority adjustments
+    def test_get_fair_share_priority_adjustments_1_a(self):
+        job_manager = self._create_fair_share_job_manager()
+        now = datetime.datetime.now()
+        heavy_user_job = mock_job()
+        light_user_job = mock_job()
+        light_user_job.originating_request.user_id = 'light_user'
+        running_job = mock_job()
+        running_job.allocations = [ResourceAllocation('resource1', 'hostname1', 1, 1000,
+                                                      created=now - datetime.timedelta(hours=1))]
+        running_job.originating_request.user_id = 'light_user'
+        past_allocation = ResourceAllocation('resource2', 'hostname2', 3, 1000, created=now - datetime.timedelta(hours=2))
+        job_manager._fair_share_ledger.charge(heavy_user_job.originating_request.user_id, [past_allocation],
+                                              (now - datetime.timedelta(hours=1)).timestamp())
+
+        adjustments = job_manager.get_fair_share_priority_adjustments([heavy_user_job, light_user_job],
+                                                                      [heavy_user_job, light_user_job, running_job])
+        self.assertEqual(adjustments[str(heavy_user_job.job_id)], -30)
+        self.assertEqual(adjustments[str(light_user_job.job_id)], -10)
+
+    # Test that priority adjustments are applied when queueing, without changing the jobs themselves
+    def test_build_prioritized_pending_allocation_queues_1_a(self):
+        job = mock_job()
+        job.allocation_priority = 60
+        queues = RedisBackedJobManager.build_prioritized_pending_allocation_queues([job], {str(job.job_id): -20})
+        self.assertEqual(len(queues['low']), 1)
+        self.assertAlmostEqual(queues['low'][0][0], -40, places=2)
+        self.assertIs(queues['low'][0][1], job)
+        self.assertEqual(job.allocation_priority, 60)
+
+    # Test that jobs are queued by priority aged by how long since they were updated, without changing the jobs
+    def test_build_prioritized_pending_allocation_queues_1_b(self):
+        job = mock_job()
+        job.allocation_priority = 45
+        job._last_updated = datetime.datetime.now() - datetime.timedelta(hours=1)
+        for _ in range(2):
+            queues = RedisBackedJobManager.build_prioritized_pending_allocation_queues([job])
+            self.assertEqual(len(queues['medium']), 1)
+            self.assertAlmostEqual(queues['medium'][0][0], -55, places=2)
+        self.assertEqual(job.allocation_priority, 45)
+
+    # Test that saving a job awaiting allocation adds it to the pending jobs queue, and allocating it removes it
+    def test_save_job_4_a(self):
+        job = mock_job()
+        job_key = self._job_manager._get_job_key_for_id(job.job_id)
+        job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        self._job_manager.save_job(job)
+        self.assertIsNotNone(self._job_manager.redis.zscore(self._job_manager._pending_jobs_key, job_key))
+        self.assertTrue(self._job_manager.request_allocations(job))
+        self._job_manager.save_job(job)
+        self.assertIsNone(self._job_manager.redis.zscore(self._job_manager._pending_jobs_key, job_key))
+
+    # Test that pending jobs are iterated by priority aged by how long they have been waiting
+    def test_iter_pending_jobs_1_a(self):
+        waiting_job = mock_job()
+        newer_job = mock_job()
+        waiting_job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        newer_job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        newer_job.allocation_priority = waiting_job.allocation_priority + 5
+        # Record the first job as having been waiting for two hours
+        since = datetime.datetime.now() - datetime.timedelta(hours=2)
+        self._job_manager.redis.hset(self._job_manager._pending_since_key,
+                                     self._job_manager._get_job_key_for_id(waiting_job.job_id), since.timestamp())
+        self._job_manager.save_job(waiting_job)
+        self._job_manager.save_job(newer_job)
+
+        pending = list(self._job_manager._iter_pending_jobs(dict()))
+        self.assertEqual([j.job_id for _, j in pending], [waiting_job.job_id, newer_job.job_id])
+        self.assertAlmostEqual(pending[0][0] - pending[1][0], 2 * RedisBackedJobManager._PENDING_AGING_PER_HOUR - 5,
+                               places=2)
+
+    # Test that rebuilding the pending jobs queue adds missing pending jobs and removes stale entries
+    def test_rebuild_pending_jobs_queue_1_a(self):
+        job = mock_job()
+        job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        self._job_manager.save_job(job)
+        job_key = self._job_manager._get_job_key_for_id(job.job_id)
+        self._job_manager.redis.delete(self._job_manager._pending_jobs_key)
+        self._job_manager.redis.zadd(self._job_manager._pending_jobs_key, {'stale_job_key': 0})
+
+        self.assertEqual(self._job_manager.rebuild_pending_jobs_queue(), 1)
+        self.assertEqual(self._job_manager.redis.zrange(self._job_manager._pending_jobs_key, 0, -1), [job_key])
+
+    # Test that saving a retrieved job only writes the fields that changed
+    def test_save_job_5_a(self):
+        job = mock_job()
+        self._job_manager.save_job(job)
+        job_key = self._job_manager._get_job_key_for_id(job.job_id)
+        retrieved_job = self._job_manager.retrieve_job(job.job_id)
+        self.assertEqual(retrieved_job.dirty_fields, frozenset())
+        # Change another field directly in Redis, which should not be overwritten
+        self._job_manager.redis.hset(job_key, 'memory_size', '1')
+        retrieved_job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        self._job_manager.save_job(retrieved_job)
+        self.assertEqual(retrieved_job.dirty_fields, frozenset())
+        self.assertEqual(self._job_manager.redis.hget(job_key, 'status'), '"MODEL_EXEC_AWAITING_ALLOCATION"')
+        self.assertEqual(self._job_manager.redis.hget(job_key, 'memory_size'), '1')
+
+    # Test that fields omitted from the serialized form are removed from the saved record
+    def test_save_job_5_b(self):
+        job = mock_job()
+        job.allocations = [ResourceAllocation('resource1', 'hostname1', 4, 1000)]
+        self._job_manager.save_job(job)
+        job_key = self._job_manager._get_job_key_for_id(job.job_id)
+        self.assertTrue(self._job_manager.redis.hexists(job_key, 'allocations'))
+        job.allocations = None
+        self._job_manager.save_job(job)
+        self.assertFalse(self._job_manager.redis.hexists(job_key, 'allocations'))
+        self.assertIsNone(self._job_manager.retrieve_job(job.job_id).allocations)
+
+    # Test that a job saved as a single JSON string by older versions can be retrieved, and is rewritten as a hash
+    def test_retrieve_job_3_a(self):
+        job = mock_job()
+        job_key = self._job_manager._get_job_key_for_id(job.job_id)
+        self._job_manager.redis.set(job_key, job.to_json())
+        retrieved_job = self._job_manager.retrieve_job(job.job_id)
+        self.assertEqual(retrieved_job.to_dict(), job.to_dict())
+        self.assertIsNone(retrieved_job.dirty_fields)
+        retrieved_job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        self._job_manager.save_job(retrieved_job)
+        self.assertEqual(self._job_manager.redis.type(job_key), 'hash')
+        self.assertEqual(self._job_manager.retrieve_job(job.job_id).status, JobStatus.MODEL_EXEC_AWAITING_ALLOCATION)
+
+    # Test that a job saved with the msgpack codec is tagged, and can be retrieved by a manager using either codec
+    @unittest.skipIf(not MsgpackCodec.is_available(), 'msgpack package is not installed')
+    def test_save_job_6_a(self):
+        job_manager = RedisBackedJobManager(resource_manager=self._resource_manager, launcher=self._launcher,
+                                            redis_host=self.redis_test_host, redis_port=self.redis_test_port,
+                                            redis_pass=self.redis_test_pass, type=self._env_type,
+                                            serial_codec='msgpack')
+        job = mock_job()
+        job_manager.save_job(job)
+        job_key = job_manager._get_job_key_for_id(job.job_id)
+        self.assertTrue(job_manager.redis.hexists(job_key, job_manager._SERIAL_TAG_FIELD))
+        retrieved_job = job_manager.retrieve_job(job.job_id)
+        self.assertEqual(retrieved_job.to_dict(), job.to_dict())
+        self.assertEqual(retrieved_job.dirty_fields, frozenset())
+        # A JSON manager can read the record, but rewrites it in full as JSON
+        retrieved_job = self._job_manager.retrieve_job(job.job_id)
+        self.assertEqual(retrieved_job.to_dict(), job.to_dict())
+        self.assertIsNone(retrieved_job.dirty_fields)
+        self._job_manager.save_job(retrieved_job)
+        self.assertFalse(job_manager.redis.hexists(job_key, job_manager._SERIAL_TAG_FIELD))
+        self.assertEqual(job_manager.retrieve_job(job.job_id).to_dict(), job.to_dict())
+
+    # Test that a job saved with the async client is added to the pending jobs queue and can be retrieved either way
+    def test_async_save_job_1_a(self):
+        job = mock_job()
+        job_key = self._job_manager._get_job_key_for_id(job.job_id)
+        job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+
+        async def exec_test():
+            await self._job_manager.async_save_job(job)
+            retrieved = await self._job_manager.async_retrieve_job(job.job_id)
+            await self._job_manager.async_close_redis()
+            return retrieved
+
+        async_retrieved_job = asyncio.get_event_loop().run_until_complete(exec_test())
+        self.assertEqual(job.dirty_fields, frozenset())
+        self.assertIsNotNone(self._job_manager.redis.zscore(self._job_manager._pending_jobs_key, job_key))
+        self.assertEqual(async_retrieved_job.to_dict(), job.to_dict())
+        self.assertEqual(self._job_manager.retrieve_job(job.job_id).to_dict(), job.to_dict())
+
+    # Test that the async retrieve reads a job saved as a single JSON string by older versions
+    def test_async_retrieve_job_1_a(self):
+        job = mock_job()
+        self._job_manager.redis.set(self._job_manager._get_job_key_for_id(job.job_id), job.to_json())
+
+        async def exec_test():
+            retrieved = await self._job_manager.async_retrieve_job(job.job_id)
+            await self._job_manager.async_close_redis()
+            return retrieved
+
+        self.assertEqual(asyncio.get_event_loop().run_until_complete(exec_test()).to_dict(), job.to_dict())
+
+    # Test that the async retrieve raises a ValueError for an unknown job id
+    def test_async_retrieve_job_1_b(self):
+        async def exec_test():
+            try:
+                await self._job_manager.async_retrieve_job(mock_job().job_id)
+            finally:
+                await self._job_manager.async_close_redis()
+
+        self.assertRaises(ValueError, asyncio.get_event_loop().run_until_complete, exec_test())
+
+    # Test that a job created with the async client uses the given id and exists until deleted with the async client
+    def test_async_delete_job_1_a(self):
+        expected_job = mock_job()
+
+        async def exec_test():
+            created = await self._job_manager.async_create_job(request=expected_job.originating_request,
+                                                               job_id=expected_job.job_id)
+            existed = await self._job_manager.async_does_job_exist(created.job_id)
+            await self._job_manager.async_delete_job(created.job_id)
+            exists = await self._job_manager.async_does_job_exist(created.job_id)
+            await self._job_manager.async_close_redis()
+            return created, existed, exists
+
+        created_job, existed, exists = asyncio.get_event_loop().run_until_complete(exec_test())
+        self.assertEqual(created_job.job_id, expected_job.job_id)
+        self.assertTrue(existed)
+        self.assertFalse(exists)
+        self.assertFalse(self._job_manager.does_job_exist(created_job.job_id))
+
+    # Test that watching a job yields its current status, then each status change saved either way, but not other saves
+    def test_async_watch_job_status_1_a(self):
+        job = mock_job()
+        job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        self._job_manager.save_job(job)
+
+        async def watch():
+            statuses = []
+            async for status in self._job_manager.async_watch_job_status(job.job_id):
+                statuses.append(status)
+                if len(statuses) == 1:
+                    job.allocation_priority = job.allocation_priority + 1
+                    await self._job_manager.async_save_job(job)
+                    job.status = JobStatus.MODEL_EXEC_RUNNING
+                    await self._job_manager.async_save_job(job)
+                elif len(statuses) == 2:
+                    job.status = JobStatus.CLOSED
+                    self._job_manager.save_job(job)
+            return statuses
+
+        async def exec_test():
+            try:
+                return await asyncio.wait_for(watch(), timeout=10)
+            finally:
+                await self._job_manager.async_close_redis()
+
+        self.assertEqual(asyncio.get_event_loop().run_until_complete(exec_test()),
+                         [JobStatus.MODEL_EXEC_AWAITING_ALLOCATION, JobStatus.MODEL_EXEC_RUNNING, JobStatus.CLOSED])
+        self.assertEqual(self._job_manager._job_status_watchers, dict())
+
+    # Test that watching a job no longer active yields only its changed status, if changed from the given status
+    def test_async_watch_job_status_1_b(self):
+        job = mock_job()
+        job.status = JobStatus.CLOSED
+        self._job_manager.save_job(job)
+
+        async def exec_test():
+            try:
+                changed = [s async for s in self._job_manager.async_watch_job_status(job.job_id,
+                                                                                       JobStatus.MODEL_EXEC_RUNNING)]
+                unchanged = [s async for s in self._job_manager.async_watch_job_status(job.job_id, JobStatus.CLOSED)]
+                return changed, unchanged
+            finally:
+                await self._job_manager.async_close_redis()
+
+        self.assertEqual(asyncio.get_event_loop().run_until_complete(exec_test()), ([JobStatus.CLOSED], []))
+
+    # Test that multiple watchers of multiple jobs each get the status changes of their own job
+    def test_async_watch_job_status_1_c(self):
+        jobs = [mock_job() for _ in range(3)]
+        for job in jobs:
+            job.status = JobStatus.MODEL_EXEC_RUNNING
+            self._job_manager.save_job(job)
+
+        async def watch(job, ready: asyncio.Event):
+            statuses = []
+            async for status in self._job_manager.async_watch_job_status(job.job_id):
+                statuses.append(status)
+                ready.set()
+            return statuses
+
+        async def exec_test():
+            ready_events = [asyncio.Event() for _ in jobs]
+            watchers = [asyncio.ensure_future(watch(j, e)) for j, e in zip(jobs, ready_events)]
+            try:
+                await asyncio.wait_for(asyncio.gather(*[e.wait() for e in ready_events]), timeout=10)
+                for job, status in zip(jobs, [JobStatus.CLOSED, JobStatus.CLOSED_FAILURE, JobStatus.CLOSED]):
+                    job.status = status
+                    await self._job_manager.async_save_job(job)
+                return await asyncio.wait_for(asyncio.gather(*watchers), timeout=10)
+            finally:
+                await self._job_manager.async_close_redis()
+
+        self.assertEqual(asyncio.get_event_loop().run_until_complete(exec_test()),
+                         [[JobStatus.MODEL_EXEC_RUNNING, JobStatus.CLOSED],
+                          [JobStatus.MODEL_EXEC_RUNNING, JobStatus.CLOSED_FAILURE],
+                          [JobStatus.MODEL_EXEC_RUNNING, JobStatus.CLOSED]])
+
+    # TODO: more tests for manage_job_processing (maybe ... async so this might be too difficult)
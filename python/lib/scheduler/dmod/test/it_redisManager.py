@@ -1,3 +1,4 @@
+import asyncio
 import unittest
 import os
 from dotenv import load_dotenv
@@ -6,6 +7,7 @@ from typing import Optional
 from ..scheduler.resources.redis_manager import RedisManager
 from ..scheduler.resources.resource import Resource
 from ..scheduler.resources.resource_allocation import ResourceAllocation
+from ..scheduler.resources.resource_manager import ResourceFit
 from . import mock_resources
 
 
@@ -411,6 +413,154 @@ class IntegrationTestRedisManager(unittest.TestCase):
         # Verify there was no allocation
         self.assertIsNone(allocation)
 
+    def test_get_candidate_resource_ids_1(self):
+        """
+            Test candidate lookup ordering for each fit strategy
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        ids = [r.resource_id for r in self.mock_resources]
+        by_cpus = [r.resource_id for r in sorted(self.mock_resources, key=lambda r: r.cpu_count)]
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(1, 1, ResourceFit.FIRST), sorted(ids))
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(1, 1, ResourceFit.BEST), by_cpus)
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(1, 1, ResourceFit.WORST),
+                         list(reversed(by_cpus)))
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(1, 1, ResourceFit.BEST, limit=1),
+                         by_cpus[0:1])
+
+    def test_get_candidate_resource_ids_1_a(self):
+        """
+            Test candidate lookup excludes resources without enough free capacity, tracking allocations and releases
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        resource = max(self.mock_resources, key=lambda r: r.cpu_count)
+        cpus = resource.total_cpu_count
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(cpus, 1), [resource.resource_id])
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(1, resource.total_memory + 1), [])
+
+        allocation = self.resource_manager.allocate_resource(resource.resource_id, 1, 100)
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(cpus, 1), [])
+
+        self.resource_manager.release_resources([allocation])
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(cpus, 1), [resource.resource_id])
+
+    def test_get_candidate_resource_ids_1_b(self):
+        """
+            Test candidate lookup reading the index one member at a time gives the same candidates for each fit strategy
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        cpus = sorted(r.cpu_count for r in self.mock_resources)[1]
+        expected = {fit: self.resource_manager.get_candidate_resource_ids(cpus, 1, fit) for fit in ResourceFit}
+        self.resource_manager._CANDIDATE_PAGE_SIZE = 1
+        for fit in ResourceFit:
+            self.assertEqual(self.resource_manager.get_candidate_resource_ids(cpus, 1, fit), expected[fit])
+            self.assertEqual(self.resource_manager.get_candidate_resource_ids(cpus, 1, fit, limit=1), expected[fit][:1])
+        self.assertEqual(len(expected[ResourceFit.FIRST]), 2)
+
+    def test_get_largest_placeable_cpu_count_1(self):
+        """
+            Test the largest placeable job size follows the capacity index
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        largest = max(self.mock_resources, key=lambda r: r.cpu_count)
+        self.assertEqual(self.resource_manager.get_largest_placeable_cpu_count(), largest.total_cpu_count)
+        self.assertEqual(self.resource_manager.get_largest_placeable_cpu_count(largest.total_memory + 1), 0)
+
+        self.resource_manager.allocate_resource(largest.resource_id, 10, 100)
+        self.assertEqual(self.resource_manager.get_largest_placeable_cpu_count(), largest.total_cpu_count - 10)
+
+    def test_rebuild_capacity_index_1(self):
+        """
+            Test rebuilding the capacity index from resource records
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        self.redis.delete(*self.resource_manager._candidate_index_keys)
+        self.assertEqual(self.resource_manager.get_candidate_resource_ids(1, 1), [])
+
+        self.assertEqual(self.resource_manager.rebuild_capacity_index(), len(self.mock_resources))
+        self.assertEqual(len(self.resource_manager.get_candidate_resource_ids(1, 1)), len(self.mock_resources))
+
+    def test_allocate_resources_1(self):
+        """
+            Test allocating from multiple resources at once
+        """
+        self.resource_manager.set_resources(self.mock_resources[0:2])
+        requested = [(self.mock_resources[0].resource_id, 5, 100), (self.mock_resources[1].resource_id, 10, 200)]
+        allocations = self.resource_manager.allocate_resources(requested)
+
+        self.assertEqual(len(allocations), 2)
+        for (resource_id, cpus, memory), allocation, resource in zip(requested, allocations, self.mock_resources):
+            self.assertEqual(allocation.resource_id, resource_id)
+            self.assertEqual(allocation.cpu_count, cpus)
+            self.assertEqual(allocation.memory, memory)
+            self.assertEqual(allocation.hostname, resource.hostname)
+            looked_up_resource = Resource.factory_init_from_dict(self.redis.hgetall(resource.unique_id))
+            self.assertEqual(looked_up_resource.cpu_count, resource.total_cpu_count - cpus)
+            self.assertEqual(looked_up_resource.memory, resource.total_memory - memory)
+            looked_up_allocation = ResourceAllocation.factory_init_from_dict(self.redis.hgetall(allocation.unique_id))
+            self.assertEqual(allocation, looked_up_allocation)
+
+    def test_allocate_resources_1_a(self):
+        """
+            Test allocating from multiple resources changes nothing when any one cannot be satisfied
+        """
+        self.resource_manager.set_resources(self.mock_resources[0:2])
+        requested = [(self.mock_resources[0].resource_id, 5, 100),
+                     (self.mock_resources[1].resource_id, self.mock_resources[1].total_cpu_count + 1, 200)]
+        allocations = self.resource_manager.allocate_resources(requested)
+
+        self.assertIsNone(allocations)
+        for resource in self.mock_resources[0:2]:
+            looked_up_resource = Resource.factory_init_from_dict(self.redis.hgetall(resource.unique_id))
+            self.assertEqual(looked_up_resource.cpu_count, resource.total_cpu_count)
+            self.assertEqual(looked_up_resource.memory, resource.total_memory)
+        self.assertEqual(len(list(self.redis.scan_iter(ResourceAllocation.__name__ + '*'))), 0)
+
+    def test_allocate_resources_1_b(self):
+        """
+            Test allocating from multiple resources when one is unrecognized or repeated
+        """
+        self.resource_manager.set_resources(self.mock_resources[0:1])
+        resource_id = self.mock_resources[0].resource_id
+        self.assertRaises(ValueError, self.resource_manager.allocate_resources,
+                          [(resource_id, 1, 100), ('Node-9999', 1, 100)])
+        self.assertRaises(ValueError, self.resource_manager.allocate_resources,
+                          [(resource_id, 1, 100), (resource_id, 1, 100)])
+
+    def test_allocate_fill_nodes_1(self):
+        """
+            Test fill nodes allocation across multiple resources
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        total_cpus = sum(r.total_cpu_count for r in self.mock_resources)
+        allocations = self.resource_manager.allocate_fill_nodes(total_cpus, 1000)
+
+        self.assertEqual(len(allocations), len(self.mock_resources))
+        self.assertEqual(sum(a.cpu_count for a in allocations), total_cpus)
+        self.assertEqual(self.resource_manager.get_available_cpu_count(), 0)
+
+    def test_allocate_fill_nodes_1_a(self):
+        """
+            Test fill nodes allocation that cannot be satisfied leaves resources unchanged
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        total_cpus = sum(r.total_cpu_count for r in self.mock_resources)
+        allocations = self.resource_manager.allocate_fill_nodes(total_cpus + 1, 1000)
+
+        self.assertEqual(allocations, [None])
+        self.assertEqual(self.resource_manager.get_available_cpu_count(), total_cpus)
+
+    def test_allocate_round_robin_1(self):
+        """
+            Test round robin allocation across multiple resources
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        allocations = self.resource_manager.allocate_round_robin(4, 1000)
+        total_cpus = sum(r.total_cpu_count for r in self.mock_resources)
+
+        self.assertEqual(len(allocations), len(self.mock_resources))
+        self.assertEqual(sorted(a.cpu_count for a in allocations), [1, 1, 2])
+        self.assertEqual(self.resource_manager.get_available_cpu_count(), total_cpus - 4)
+
     def test_release_resources_1(self):
         """
             Test releasing "allocated" resource
@@ -432,6 +582,27 @@ class IntegrationTestRedisManager(unittest.TestCase):
         self.assertEqual(looked_up_resource_2nd.cpu_count, looked_up_resource_2nd.total_cpu_count)
         self.assertEqual(looked_up_resource_2nd.memory, looked_up_resource_2nd.total_memory)
 
+    def test_release_resources_1_a(self):
+        """
+            Test allocating writes the allocation record and releasing removes it
+        """
+        resource = self.mock_resources[0]
+        self.resource_manager.add_resource(resource)
+        allocation = self.resource_manager.allocate_resource(resource.resource_id, 2, 100)
+
+        looked_up_allocation = ResourceAllocation.factory_init_from_dict(self.redis.hgetall(allocation.unique_id))
+        self.assertEqual(allocation, looked_up_allocation)
+
+        self.resource_manager.release_resources([allocation])
+        self.assertFalse(self.redis.exists(allocation.unique_id))
+
+    def test_release_resources_1_b(self):
+        """
+            Test releasing an allocation for an unrecognized resource
+        """
+        allocation = ResourceAllocation('Node-9999', 'hostname9999', 2, 100)
+        self.assertRaises(RuntimeError, self.resource_manager.release_resources, [allocation])
+
     def test_get_available_cpu_count_1(self):
         """
             Test that all available CPUS are reported with 1 resource
@@ -448,6 +619,46 @@ class IntegrationTestRedisManager(unittest.TestCase):
         total_cpus = self.resource_manager.get_available_cpu_count()
         self.assertEqual(total_cpus, self.mock_resources[0].cpu_count + self.mock_resources[1].cpu_count)
 
+    def _run_async(self, coroutine):
+        async def run_and_close():
+            try:
+                return await coroutine
+            finally:
+                await self.resource_manager.async_close_redis()
+        return asyncio.get_event_loop().run_until_complete(run_and_close())
+
+    def test_async_get_resources_1(self):
+        """
+            Test the async counterparts give back the same resources, ids, and available CPUs as the sync methods
+        """
+        self.resource_manager.set_resources(self.mock_resources[0:2])
+        resources = self._run_async(self.resource_manager.async_get_resources())
+        self.assertEqual(sorted([r.unique_id for r in resources]),
+                         sorted([r.unique_id for r in self.resource_manager.get_resources()]))
+        ids = self._run_async(self.resource_manager.async_get_resource_ids())
+        self.assertEqual(sorted(ids), sorted(self.resource_manager.get_resource_ids()))
+        total_cpus = self._run_async(self.resource_manager.async_get_available_cpu_count())
+        self.assertEqual(total_cpus, self.resource_manager.get_available_cpu_count())
+
+    def test_async_release_resources_1(self):
+        """
+            Test releasing several allocations with the async client restores the resources and removes the records
+        """
+        self.resource_manager.set_resources(self.mock_resources[0:2])
+        allocations = [self.resource_manager.allocate_resource(r.resource_id, 2, 100) for r in self.mock_resources[0:2]]
+        self._run_async(self.resource_manager.async_release_resources(allocations))
+        for resource, allocation in zip(self.mock_resources[0:2], allocations):
+            looked_up_resource = Resource.factory_init_from_dict(self.redis.hgetall(resource.unique_id))
+            self.assertEqual(looked_up_resource.cpu_count, looked_up_resource.total_cpu_count)
+            self.assertFalse(self.redis.exists(allocation.unique_id))
+
+    def test_async_release_resources_1_a(self):
+        """
+            Test releasing an allocation for an unrecognized resource with the async client
+        """
+        allocation = ResourceAllocation('Node-9999', 'hostname9999', 2, 100)
+        self.assertRaises(RuntimeError, self._run_async, self.resource_manager.async_release_resources([allocation]))
+
     @unittest.skip("Functionality moved to JobManager class")
     def test_create_job_entry_1(self):
         """
@@ -0,0 +1,63 @@
+import unittest
+from datetime import datetime, timedelta
+from ..scheduler.job.backfill import BackfillReservation
+from ..scheduler.job.job import JobImpl
+from ..scheduler.resources.resource_allocation import ResourceAllocation
+
+
+class TestBackfillReservation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.now = datetime(2020, 7, 10, 12, 0, 0)
+        # Two 8-CPU nodes, with 2 CPUs free on each
+        self.free_cpus = {'node001': 2, 'node002': 2}
+        # One job holding 6 CPUs on each node, ending in one and three hours respectively
+        self.running = [(self.now + timedelta(hours=3), [ResourceAllocation('node002', 'node002', 6, 1000)]),
+                        (self.now + timedelta(hours=1), [ResourceAllocation('node001', 'node001', 6, 1000)])]
+
+    def tearDown(self) -> None:
+        pass
+
+    # Test that the shadow time is the earliest time the reserved job fits, with extra capacity beyond its needs
+    def test_estimate_1_a(self):
+        job = JobImpl(8, 1000, parameters={}, allocation_paradigm='single-node')
+        reservation = BackfillReservation.estimate(job, self.free_cpus, self.running, now=self.now)
+        self.assertEqual(reservation.shadow_time, self.now + timedelta(hours=1))
+        self.assertEqual(reservation.extra_cpus, {'node001': 0, 'node002': 2})
+
+    # Test that a multi-node job is reserved once enough total CPUs are released
+    def test_estimate_1_b(self):
+        job = JobImpl(12, 1000, parameters={}, allocation_paradigm='fill-nodes')
+        reservation = BackfillReservation.estimate(job, self.free_cpus, self.running, now=self.now)
+        self.assertEqual(reservation.shadow_time, self.now + timedelta(hours=3))
+        self.assertEqual(sum(reservation.extra_cpus.values()), 4)
+
+    # Test that no reservation is made for a job that can never fit
+    def test_estimate_1_c(self):
+        job = JobImpl(20, 1000, parameters={}, allocation_paradigm='fill-nodes')
+        self.assertIsNone(BackfillReservation.estimate(job, self.free_cpus, self.running, now=self.now))
+
+    # Test that short jobs may be backfilled anywhere, but long jobs only within the extra capacity
+    def test_could_backfill_1_a(self):
+        job = JobImpl(8, 1000, parameters={}, allocation_paradigm='single-node')
+        reservation = BackfillReservation.estimate(job, self.free_cpus, self.running, now=self.now)
+        small_job = JobImpl(2, 1000, parameters={}, allocation_paradigm='single-node')
+        big_job = JobImpl(3, 1000, parameters={}, allocation_paradigm='single-node')
+        self.assertTrue(reservation.could_backfill(big_job, timedelta(minutes=30), now=self.now))
+        self.assertTrue(reservation.could_backfill(small_job, timedelta(hours=2), now=self.now))
+        self.assertFalse(reservation.could_backfill(big_job, timedelta(hours=2), now=self.now))
+
+    # Test that a long job's allocations must be within the extra capacity, which they then use up
+    def test_claim_1_a(self):
+        job = JobImpl(8, 1000, parameters={}, allocation_paradigm='single-node')
+        reservation = BackfillReservation.estimate(job, self.free_cpus, self.running, now=self.now)
+
+        conflicting_job = JobImpl(2, 1000, parameters={}, allocation_paradigm='single-node')
+        conflicting_job.allocations = [ResourceAllocation('node001', 'node001', 2, 1000)]
+        self.assertFalse(reservation.claim(conflicting_job, timedelta(hours=2), now=self.now))
+
+        backfill_job = JobImpl(2, 1000, parameters={}, allocation_paradigm='single-node')
+        backfill_job.allocations = [ResourceAllocation('node002', 'node002', 2, 1000)]
+        self.assertTrue(reservation.claim(backfill_job, timedelta(hours=2), now=self.now))
+        self.assertEqual(reservation.extra_cpus['node002'], 0)
+        self.assertFalse(reservation.could_backfill(backfill_job, timedelta(hours=2), now=self.now))
@@ -1,6 +1,9 @@
 import unittest
-from ..scheduler.job.job import JobImpl
+from ..scheduler.job.job import JobImpl, JobStatus, RequestedJob, SchedulerRequestMessage
 from ..scheduler.resources.resource_allocation import ResourceAllocation
+from . import mock_job
+from datetime import timedelta
+from unittest.mock import patch
 from uuid import UUID
 
 
@@ -186,3 +189,83 @@ class TestJobImpl(unittest.TestCase):
     # TODO: add tests for rest of setters that should update last_updated property
 
     # TODO: add tests for status_phase and status_step
+
+    # Test that jobs are ordered by when they were last updated
+    def test_lt_1_a(self):
+        older_job = self._example_jobs[0]
+        newer_job = JobImpl(4, 1000, parameters={}, allocation_paradigm='single-node')
+        newer_job._last_updated = older_job.last_updated + timedelta(seconds=1)
+
+        self.assertLess(older_job, newer_job)
+        self.assertFalse(newer_job < older_job)
+
+    # Test that all fields are considered changed until a job is marked clean
+    def test_dirty_fields_1_a(self):
+        job = self._example_jobs[0]
+        self.assertIsNone(job.dirty_fields)
+        job.mark_clean()
+        self.assertEqual(job.dirty_fields, frozenset())
+
+    # Test that setters track the fields they change, along with last_updated
+    def test_dirty_fields_1_b(self):
+        job = self._example_jobs[0]
+        job.mark_clean()
+        job.status = JobStatus.MODEL_EXEC_AWAITING_ALLOCATION
+        self.assertEqual(job.dirty_fields, frozenset(['status', 'last_updated']))
+        job.allocations = self._resource_allocations
+        job.allocation_priority = 10
+        self.assertEqual(job.dirty_fields, frozenset(['status', 'last_updated', 'allocations', 'allocation_priority']))
+
+    # Test that serializing only some fields gives the same values as the full serialized form
+    def test_serialize_fields_1_a(self):
+        job = self._example_jobs[0]
+        job.allocations = self._resource_allocations
+        serial = job.to_dict()
+        fields = ['status', 'allocations', 'allocation_priority']
+        self.assertEqual(job.serialize_fields(fields), dict([(f, serial[f]) for f in fields]))
+
+    # Test that fields omitted from the serialized form are also omitted when serializing only some fields
+    def test_serialize_fields_1_b(self):
+        job = self._example_jobs[0]
+        self.assertEqual(job.serialize_fields(['allocations', 'rsa_key_pair']), dict())
+
+    # Test that a deserialized job is equal to the original, with lazy fields deserialized only once accessed
+    def test_factory_init_from_deserialized_json_1_a(self):
+        job = self._example_jobs[0]
+        job.allocations = self._resource_allocations
+        deserialized = JobImpl.factory_init_from_deserialized_json(job.to_dict())
+        self.assertEqual(deserialized.to_dict(), job.to_dict())
+        self.assertIn('allocations', deserialized._unparsed_fields)
+        self.assertEqual(deserialized.allocations[0].to_dict(), self._resource_allocations[0].to_dict())
+        self.assertEqual(deserialized.last_updated, job.last_updated.replace(microsecond=0))
+        self.assertEqual(deserialized._unparsed_fields, dict())
+
+    # Test that a deserialized requested job parses its originating request when first accessed
+    def test_factory_init_from_deserialized_json_1_b(self):
+        job = mock_job()
+        deserialized = RequestedJob.factory_init_from_deserialized_json(job.to_dict())
+        self.assertEqual(deserialized.status, job.status)
+        self.assertEqual(deserialized.cpu_count, job.cpu_count)
+        self.assertIn('originating_request', deserialized._unparsed_fields)
+        self.assertEqual(deserialized.originating_request, job.originating_request)
+        self.assertEqual(deserialized.to_dict(), job.to_dict())
+
+    # Test that re-serializing a deserialized requested job reuses its serialized originating request, without parsing it
+    def test_factory_init_from_deserialized_json_1_d(self):
+        job = mock_job()
+        deserialized = RequestedJob.factory_init_from_deserialized_json(job.to_dict())
+        with patch.object(SchedulerRequestMessage, 'factory_init_from_deserialized_json') as factory:
+            self.assertEqual(deserialized.to_dict(), job.to_dict())
+            factory.assert_not_called()
+        self.assertIn('originating_request', deserialized._unparsed_fields)
+
+    # Test that lazy fields of the wrong serialized type are still rejected when deserializing
+    def test_factory_init_from_deserialized_json_1_c(self):
+        serial = mock_job().to_dict()
+        serial['allocations'] = 'not a list'
+        self.assertIsNone(RequestedJob.factory_init_from_deserialized_json(serial))
+
+    # Test that status names are looked up ignoring case and surrounding whitespace, with unknown names as UNKNOWN
+    def test_get_for_name_1_a(self):
+        self.assertEqual(JobStatus.get_for_name(' model_exec_running '), JobStatus.MODEL_EXEC_RUNNING)
+        self.assertEqual(JobStatus.get_for_name('not_a_status'), JobStatus.UNKNOWN)
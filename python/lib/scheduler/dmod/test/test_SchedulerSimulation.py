@@ -0,0 +1,40 @@
+import unittest
+
+try:
+    import fakeredis
+except ImportError:
+    fakeredis = None
+
+from .bench_scheduler_simulation import SchedulerSimulation, WorkloadJob, generate_workload
+
+
+@unittest.skipIf(fakeredis is None, "Scheduler simulation requires the optional 'fakeredis' package")
+class TestSchedulerSimulation(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.workload = generate_workload(count=20, seed=1, max_cpus=8, max_single_node_cpus=4,
+                                          memory_per_cpu=1000, mean_interarrival=60.0, mean_runtime=600.0,
+                                          paradigms=['SINGLE_NODE', 'FILL_NODES'])
+
+    def tearDown(self) -> None:
+        pass
+
+    # Test that a generated workload is run to completion, with sane results
+    def test_run_1_a(self):
+        results = SchedulerSimulation(self.workload, nodes=2, cpus_per_node=4, memory_per_node=100000).run()
+        self.assertEqual(results.completed, len(self.workload))
+        self.assertEqual(results.unscheduled, 0)
+        self.assertEqual(len(results.wait_times), len(self.workload))
+        self.assertTrue(all(w >= 0 for w in results.wait_times))
+        self.assertTrue(0.0 < results.utilization <= 1.0)
+        self.assertGreater(len(results.pass_latencies), 0)
+
+    # Test that a job has to wait until the one ahead of it, which fills the only node, completes
+    def test_run_1_b(self):
+        workload = [WorkloadJob(arrival=0.0, cpus=4, memory=1000, runtime=100.0),
+                    WorkloadJob(arrival=10.0, cpus=4, memory=1000, runtime=100.0)]
+        results = SchedulerSimulation(workload, nodes=1, cpus_per_node=4, memory_per_node=100000).run()
+        self.assertEqual(results.completed, 2)
+        self.assertEqual(sorted(results.wait_times), [0.0, 90.0])
+        self.assertEqual(results.makespan, 200.0)
+        self.assertAlmostEqual(results.utilization, 1.0)
@@ -0,0 +1,145 @@
+import os
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from redis.exceptions import ConnectionError
+from ..scheduler.image_and_domain_catalog import ImageAndDomainCatalog
+
+
+class MockRedis:
+    """
+    Minimal mock of a Redis client, strictly for unit testing publishing of catalogs.
+    """
+
+    def __init__(self):
+        self.values = dict()
+
+    def get(self, key: str):
+        return self.values.get(key)
+
+    def set(self, key: str, value: str):
+        self.values[key] = value
+
+
+class FailingMockRedis(MockRedis):
+    """
+    Mock of a Redis client that is unavailable, for which every command fails.
+    """
+
+    def get(self, key: str):
+        raise ConnectionError("Redis unavailable")
+
+    def set(self, key: str, value: str):
+        raise ConnectionError("Redis unavailable")
+
+
+class TestImageAndDomainCatalog(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.temp_dir = Path(tempfile.mkdtemp())
+        self.yaml_file = self.temp_dir.joinpath('image_and_domain.yaml')
+        shutil.copy(Path(__file__).parent/"image_and_domain.yaml", self.yaml_file)
+        self.catalog = ImageAndDomainCatalog(self.yaml_file)
+
+    def tearDown(self) -> None:
+        shutil.rmtree(self.temp_dir)
+
+    def _rewrite_yaml(self, old: str, new: str, mtime_offset: int = 10):
+        """
+        Replace text in the test YAML file, also ensuring its modification time changes.
+        """
+        stat = os.stat(self.yaml_file)
+        self.yaml_file.write_text(self.yaml_file.read_text().replace(old, new))
+        os.utime(self.yaml_file, (stat.st_atime, stat.st_mtime + mtime_offset))
+
+    def test_get_image_and_mounts_1_a(self):
+        """
+            Test get_image_and_mounts with valid name, version, and domain
+        """
+        image_tag, mounts = self.catalog.get_image_and_mounts('nwm', 2, 'croton_NY')
+        self.assertEqual(image_tag, '127.0.0.1:5000/nwm-2.0:latest')
+        self.assertEqual(mounts, ['./domains:./example_case/NWM:rw', './local_out:/run_out:rw'])
+
+    def test_get_image_and_mounts_1_b(self):
+        """
+            Test get_image_and_mounts raises a KeyError for an unknown domain
+        """
+        with self.assertRaises(KeyError):
+            self.catalog.get_image_and_mounts('nwm', 2, 'not_a_domain')
+
+    def test_get_image_and_mounts_1_c(self):
+        """
+            Test get_image_and_mounts reloads the catalog once the file is modified
+        """
+        self.catalog.get_image_and_mounts('nwm', 2, 'croton_NY')
+        self._rewrite_yaml('nwm-2.0:latest', 'nwm-2.1:latest')
+        self.assertEqual(self.catalog.get_image_and_mounts('nwm', 2, 'croton_NY')[0], '127.0.0.1:5000/nwm-2.1:latest')
+
+    def test_reload_1_a(self):
+        """
+            Test reload loads changes to the file, even when its modification time is unchanged
+        """
+        self.catalog.get_image_and_mounts('nwm', 2, 'croton_NY')
+        self._rewrite_yaml('croton_NY', 'croton_NJ', mtime_offset=0)
+        self.assertTrue(self.catalog.is_supported('nwm', 2, 'croton_NY'))
+        self.catalog.reload()
+        self.assertFalse(self.catalog.is_supported('nwm', 2, 'croton_NY'))
+        self.assertTrue(self.catalog.is_supported('nwm', 2, 'croton_NJ'))
+
+    def test_is_supported_1_a(self):
+        """
+            Test is_supported for supported and unsupported models, versions, and domains
+        """
+        self.assertTrue(self.catalog.is_supported('nwm', 2, 'test-domain'))
+        self.assertFalse(self.catalog.is_supported('nwm', 3, 'test-domain'))
+        self.assertFalse(self.catalog.is_supported('not_a_model', 2, 'test-domain'))
+        # The ngen entry has no output mount, so it cannot be launched
+        self.assertFalse(self.catalog.is_supported('ngen', 1, 'test-domain'))
+
+    def test_get_domains_1_a(self):
+        """
+            Test get_domains for supported and unsupported models
+        """
+        self.assertEqual(self.catalog.get_domains('nwm'), ['croton_NY', 'SixMileXCreek', 'test-domain'])
+        self.assertEqual(self.catalog.get_domains('not_a_model'), [])
+
+    def test_get_published_1_a(self):
+        """
+            Test the catalog is published to Redis when loaded, and republished when reloaded
+        """
+        redis_client = MockRedis()
+        catalog = ImageAndDomainCatalog(self.yaml_file, redis_client=redis_client)
+        self.assertIsNone(ImageAndDomainCatalog.get_published(redis_client))
+        catalog.is_supported('nwm', 2, 'croton_NY')
+        published = ImageAndDomainCatalog.get_published(redis_client)
+        self.assertEqual(published['nwm']['version']['2'], '127.0.0.1:5000/nwm-2.0:latest')
+        self._rewrite_yaml('nwm-2.0:latest', 'nwm-2.1:latest')
+        catalog.is_supported('nwm', 2, 'croton_NY')
+        published = ImageAndDomainCatalog.get_published(redis_client)
+        self.assertEqual(published['nwm']['version']['2'], '127.0.0.1:5000/nwm-2.1:latest')
+
+    def test_get_published_1_b(self):
+        """
+            Test a failure to publish the catalog to Redis does not fail lookups
+        """
+        catalog = ImageAndDomainCatalog(self.yaml_file, redis_client=FailingMockRedis())
+        self.assertTrue(catalog.is_supported('nwm', 2, 'croton_NY'))
+
+    def test_get_image_and_mounts_1_d(self):
+        """
+            Test the previously loaded catalog is still used when the file is missing or invalid
+        """
+        self.catalog.get_image_and_mounts('nwm', 2, 'croton_NY')
+        self._rewrite_yaml('nwm:', 'nwm: [')
+        self.assertTrue(self.catalog.is_supported('nwm', 2, 'croton_NY'))
+        self.yaml_file.unlink()
+        self.assertTrue(self.catalog.is_supported('nwm', 2, 'croton_NY'))
+
+    def test_get_image_and_mounts_1_e(self):
+        """
+            Test an error is raised for a missing file when there is no previously loaded catalog to fall back to
+        """
+        self.yaml_file.unlink()
+        with self.assertRaises(OSError):
+            self.catalog.get_image_and_mounts('nwm', 2, 'croton_NY')
@@ -1,5 +1,6 @@
 import unittest
 
+from ..scheduler.resources.resource_manager import ResourceFit
 from . import EmptyResourceManager, MockResourceManager, mock_resources
 
 class TestResourceManagerBase(unittest.TestCase):
@@ -180,6 +181,77 @@ class TestValidResources(TestResourceManagerBase):
         self.assertEqual(len(test), 1)
         self.assertIsNone(test[0])
 
+    def test_allocate_single_node_best_fit(self):
+        """
+            Test single node scheduling with best fit picks the resource leaving the fewest CPUs free
+        """
+        request_cpus = 10
+        mem = 1000000
+        self.resource_manager.set_resources(self.mock_resources)
+        allocation = self.resource_manager.allocate_single_node(request_cpus, mem, fit=ResourceFit.BEST)
+        self.assertEqual(len(allocation), 1)
+        self.assertEqual(allocation[0].cpu_count, request_cpus)
+        self.assertEqual(allocation[0].pool_id, 'Node-0003')
+
+    def test_allocate_single_node_worst_fit(self):
+        """
+            Test single node scheduling with worst fit picks the resource leaving the most CPUs free
+        """
+        request_cpus = 10
+        mem = 1000000
+        self.resource_manager.set_resources(self.mock_resources)
+        allocation = self.resource_manager.allocate_single_node(request_cpus, mem, fit=ResourceFit.WORST)
+        self.assertEqual(len(allocation), 1)
+        self.assertEqual(allocation[0].cpu_count, request_cpus)
+        self.assertEqual(allocation[0].pool_id, 'Node-0002')
+
+    def test_allocate_best_fit_valid(self):
+        """
+            Test best fit scheduling of a request that fits on one node picks the tightest fitting node
+        """
+        cpus = 40
+        mem = 1000000
+        self.resource_manager.set_resources(self.mock_resources)
+        allocation = self.resource_manager.allocate_best_fit(cpus, mem)
+        self.assertEqual(len(allocation), 1)
+        self.assertEqual(allocation[0].cpu_count, cpus)
+        self.assertEqual(allocation[0].pool_id, 'Node-0003')
+
+    def test_allocate_best_fit_valid_a(self):
+        """
+            Test best fit scheduling of a request that needs multiple nodes finishes on the tightest fitting node
+        """
+        cpus = 100
+        mem = 1000000
+        self.resource_manager.set_resources(self.mock_resources)
+        allocation = self.resource_manager.allocate_best_fit(cpus, mem)
+        self.assertEqual(len(allocation), 2)
+        self.assertEqual(allocation[0].cpu_count, 96)
+        self.assertEqual(allocation[0].pool_id, 'Node-0002')
+        self.assertEqual(allocation[1].cpu_count, 4)
+        self.assertEqual(allocation[1].pool_id, 'Node-0001')
+
+    def test_allocate_best_fit_unsatisfied(self):
+        """
+            Test best fit scheduling with valid resources which cannot satisfy request
+        """
+        cpus = 500
+        mem = 1000000
+        self.resource_manager.set_resources(self.mock_resources)
+        allocation = self.resource_manager.allocate_best_fit(cpus, mem)
+        self.assertEqual(len(allocation), 1)
+        self.assertIsNone(allocation[0])
+
+    def test_get_fragmentation(self):
+        """
+            Test the largest placeable job size and fragmentation measures
+        """
+        self.resource_manager.set_resources(self.mock_resources)
+        self.assertEqual(self.resource_manager.get_largest_placeable_cpu_count(), 96)
+        self.assertAlmostEqual(self.resource_manager.get_fragmentation(), 1.0 - 96 / 143)
+        self.assertEqual(self.resource_manager.get_largest_placeable_cpu_count(memory=300000000000), 96)
+        self.assertEqual(self.resource_manager.get_largest_placeable_cpu_count(memory=600000000000), 0)
+
     def test_allocate_fill_nodes_valid(self):
         """
             Test fill nodes scheduling with valid resources for first node
@@ -1,5 +1,8 @@
+import docker
 import unittest
 from pathlib import Path
+from threading import Lock
+from time import sleep
 from ..scheduler.scheduler import Launcher
 from . import mock_job
 
@@ -23,6 +26,69 @@ class NoCheckDockerLauncher(Launcher):
         pass
 
 
+class MockService:
+    """
+    Mock of a Docker service object, strictly for unit testing.
+    """
+
+    def __init__(self, services: 'MockServiceCollection', name: str):
+        self.id = name
+        self.name = name
+        self.attrs = {}
+        self._services = services
+
+    def remove(self):
+        self._services.removed.append(self.name)
+
+
+class MockServiceCollection:
+    """
+    Mock of the services collection of a Docker client, strictly for unit testing, which takes a bit of time to create
+    each service, tracks the max number of creations in progress at once, and fails to create any named services.
+    """
+
+    def __init__(self, create_seconds: float = 0.05, failing_names: tuple = ()):
+        self.create_seconds = create_seconds
+        self.failing_names = failing_names
+        self.created_kwargs = dict()
+        self.removed = []
+        self.in_progress = 0
+        self.max_in_progress = 0
+        self._lock = Lock()
+
+    def create(self, **kwargs):
+        with self._lock:
+            self.in_progress += 1
+            self.max_in_progress = max(self.max_in_progress, self.in_progress)
+        sleep(self.create_seconds)
+        with self._lock:
+            self.in_progress -= 1
+        if kwargs['name'] in self.failing_names:
+            raise docker.errors.APIError('Mock failure creating {}'.format(kwargs['name']))
+        self.created_kwargs[kwargs['name']] = kwargs
+        return MockService(self, kwargs['name'])
+
+    def list(self, filters: dict):
+        return [MockService(self, n) for n in self.created_kwargs if n.startswith(filters['name'])]
+
+
+class MockDockerClient:
+    """
+    Mock of the Docker high- and low-level API clients, strictly for unit testing of service creation.
+    """
+
+    def __init__(self, services: MockServiceCollection):
+        self.services = services
+
+    def close(self):
+        pass
+
+    def inspect_service(self, id: str, insert_defaults: bool = False):
+        kwargs = self.services.created_kwargs[id]
+        return {'CreatedAt': 'now', 'Spec': {'Labels': kwargs['labels'],
+                                             'TaskTemplate': {'Placement': {'Constraints': kwargs['constraints']}}}}
+
+
 class TestLauncher(unittest.TestCase):
 
     def setUp(self) -> None:
@@ -116,3 +182,74 @@ class TestLauncher(unittest.TestCase):
         self.assertEqual(image_tag, '127.0.0.1:5000/nwm-2.0:latest')
         self.assertEqual( mounts[0], './domains:./example_case/NWM:rw')
         self.assertEqual( mounts[1], './local_out:/run_out:rw')
+
+
+class TestLauncherStartJob(unittest.TestCase):
+    """
+    Tests of launching job services, using a mock Docker client so that no Docker daemon is needed.
+    """
+
+    def _mock_docker_launcher(self, services: MockServiceCollection, **kwargs) -> Launcher:
+        client = MockDockerClient(services)
+        return NoCheckDockerLauncher(images_and_domains_yaml=Path(__file__).parent/"image_and_domain.yaml",
+                                     docker_client=client, api_client=client, **kwargs)
+
+    def test_start_job_1_a(self):
+        """
+            Test start_job creates the services of a job concurrently, each with its own labels, and records metrics
+        """
+        services = MockServiceCollection()
+        launcher = self._mock_docker_launcher(services, max_launch_workers=4)
+        job = mock_job(allocations=8)
+        success, service = launcher.start_job(job)
+
+        self.assertTrue(success)
+        self.assertEqual(service.name, 'nwm-worker7_{}'.format(job.job_id))
+        self.assertEqual(len(services.created_kwargs), 8)
+        self.assertEqual(services.max_in_progress, 4)
+        self.assertEqual(services.created_kwargs['nwm-worker2_{}'.format(job.job_id)]['labels']['Hostname'],
+                         'hostname3')
+        metrics = launcher.launch_metrics[str(job.job_id)]
+        self.assertTrue(metrics.succeeded)
+        self.assertTrue(metrics.concurrent)
+        self.assertEqual(len(metrics.service_create_seconds), 8)
+
+    def test_start_job_1_b(self):
+        """
+            Test start_job creates the services of a job one at a time when not launching concurrently
+        """
+        services = MockServiceCollection()
+        launcher = self._mock_docker_launcher(services, concurrent_launch=False)
+        job = mock_job(allocations=3)
+        success, service = launcher.start_job(job)
+
+        self.assertTrue(success)
+        self.assertEqual(service.name, 'nwm-worker2_{}'.format(job.job_id))
+        self.assertEqual(services.max_in_progress, 1)
+        self.assertFalse(launcher.launch_metrics[str(job.job_id)].concurrent)
+
+    def test_start_job_1_c(self):
+        """
+            Test start_job removes the created services of a job and raises the error when creating one fails
+        """
+        job = mock_job(allocations=4)
+        services = MockServiceCollection(failing_names=('nwm-worker1_{}'.format(job.job_id),))
+        launcher = self._mock_docker_launcher(services)
+
+        self.assertRaises(docker.errors.APIError, launcher.start_job, job)
+        self.assertEqual(sorted(services.removed), sorted(services.created_kwargs.keys()))
+        self.assertEqual(len(services.removed), 3)
+        self.assertFalse(launcher.launch_metrics[str(job.job_id)].succeeded)
+
+    def test_start_job_1_d(self):
+        """
+            Test start_job passes the index arg only to the first service of a job
+        """
+        services = MockServiceCollection()
+        launcher = self._mock_docker_launcher(services)
+        job = mock_job(allocations=2)
+        launcher.start_job(job)
+
+        args_0 = services.created_kwargs['nwm-worker0_{}'.format(job.job_id)]['args']
+        args_1 = services.created_kwargs['nwm-worker1_{}'.format(job.job_id)]['args']
+        self.assertEqual(args_0, args_1 + ['0'])
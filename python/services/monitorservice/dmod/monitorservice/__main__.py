@@ -1,12 +1,52 @@
 import argparse
+from os import getenv
 from . import name as package_name
 from . import MonitorService
+from dmod.monitor import AsyncQueMonitor, Backoff, QueMonitor
+from dmod.monitor.que_monitor import RECONCILE_INTERVAL
 from pathlib import Path
 from socket import gethostname
 
 
 def _handle_args():
     parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
+    parser.add_argument('--redis-host',
+                        help='Set the host value for making Redis connections',
+                        dest='redis_host',
+                        default=None)
+    parser.add_argument('--redis-pass',
+                        help='Set the password value for making Redis connections',
+                        dest='redis_pass',
+                        default=None)
+    parser.add_argument('--redis-port',
+                        help='Set the port value for making Redis connections',
+                        dest='redis_port',
+                        default=None)
+    parser.add_argument('--reconcile-interval',
+                        help='Set the seconds between sweeps of all worker services, correcting any missed events',
+                        dest='reconcile_interval',
+                        type=int,
+                        default=RECONCILE_INTERVAL)
+    parser.add_argument('--max-docker-calls',
+                        help='Set the max number of concurrent calls to the Docker API',
+                        dest='max_docker_calls',
+                        type=int,
+                        default=None)
+    parser.add_argument('--backoff-initial',
+                        help='Set the seconds to wait before retrying a failed Docker or Redis operation',
+                        dest='backoff_initial',
+                        type=float,
+                        default=1.0)
+    parser.add_argument('--backoff-max',
+                        help='Set the max seconds to wait before retrying a repeatedly failing operation',
+                        dest='backoff_max',
+                        type=float,
+                        default=60.0)
+    parser.add_argument('--backoff-attempts',
+                        help='Set the number of attempts of a failing operation before giving up',
+                        dest='backoff_attempts',
+                        type=int,
+                        default=5)
 
     parser.prog = package_name
     return parser.parse_args()
@@ -23,13 +63,36 @@ def _sanity_check_path_arg(path_as_str, is_directory=False):
     return True
 
 
+def _get_parsed_or_env_val(parsed_val, env_var_suffix, fallback):
+    """
+    Return either a passed parsed value, if it is not ``None``, the value from one of several environmental variables
+    with a standard beginning to their name, if one is found with a non-``None`` value, or a given fallback value.
+    """
+    if parsed_val is not None:
+        return parsed_val
+    env_prefixes = ['REDIS_', 'DOCKER_SECRET_REDIS_', 'DOCKER_REDIS_']
+    for prefix in env_prefixes:
+        env_var = prefix + env_var_suffix
+        if getenv(env_var, None) is not None:
+            return getenv(env_var)
+    return fallback
+
+
 def main():
     args = _handle_args()
 
     # Sanity check any provided path arguments
 
+    redis_host = _get_parsed_or_env_val(args.redis_host, 'HOST', 'localhost')
+    redis_port = _get_parsed_or_env_val(args.redis_port, 'PORT', 6379)
+    redis_pass = _get_parsed_or_env_val(args.redis_pass, 'PASS', '')
+
     # Init monitor service
-    handler = MonitorService()
+    que_monitor = QueMonitor("maas", redis_host=redis_host, redis_port=redis_port, redis_pass=redis_pass)
+    backoff = Backoff(initial=args.backoff_initial, maximum=args.backoff_max, max_attempts=args.backoff_attempts)
+    monitor = AsyncQueMonitor(que_monitor, max_docker_calls=args.max_docker_calls,
+                              reconcile_interval=args.reconcile_interval, backoff=backoff)
+    handler = MonitorService(monitor)
     handler.run()
 
 
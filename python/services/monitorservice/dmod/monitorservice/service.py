@@ -1,14 +1,127 @@
 #!/usr/bin/env python3
+import asyncio
+import logging
+import signal
 
-#TODO implement monitor service
-class MonitorService():
-    __init__(self):
-        pass
+from dmod.monitor import AsyncQueMonitor
+
+
+class MonitorService:
+    """
+    Service running an ::class:`AsyncQueMonitor` as a task in its event loop, along with any other added async tasks.
+    """
+
+    def __init__(self, monitor: AsyncQueMonitor):
+        """
+        Parameters
+        ----------
+        monitor : AsyncQueMonitor
+            The monitor run by the service.
+        """
+        self._monitor = monitor
+        self._loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(self._loop)
+
+        # register signals for tasks to respond to
+        self.signals = (signal.SIGHUP, signal.SIGTERM, signal.SIGINT)
+        for s in self.signals:
+            self._loop.add_signal_handler(s, lambda s=s: self._loop.create_task(self.shutdown(shutdown_signal=s)))
+
+        self._requested_tasks = []
+        self._scheduled_tasks = []
+
+    def add_async_task(self, coro) -> int:
+        """
+        Add a coroutine that will be run as a task in the service event loop, alongside the monitor.
+
+        Parameters
+        ----------
+        coro
+            A coroutine
+
+        Returns
+        ----------
+        int
+            The index of the ::class:`Task` object for the provided coro.
+        """
+        next_index = len(self._requested_tasks)
+        self._requested_tasks.append(coro)
+        # If the event loop is already running, the make sure the task gets scheduled
+        if len(self._scheduled_tasks) > 0:
+            self._scheduled_tasks.append(self.loop.create_task(coro))
+        return next_index
+
+    @property
+    def loop(self) -> asyncio.AbstractEventLoop:
+        """
+        Get the event loop for the service.
+
+        Returns
+        -------
+        AbstractEventLoop
+            The event loop for the service.
+        """
+        return self._loop
+
+    @property
+    def monitor(self) -> AsyncQueMonitor:
+        """
+        Get the monitor run by the service.
+
+        Returns
+        -------
+        AsyncQueMonitor
+            The monitor run by the service.
+        """
+        return self._monitor
+
+    def run(self):
+        """
+        Run the event loop until shutdown, with the monitor scheduled as the first task, followed by any tasks added via
+        ::method:`add_async_task`.
+
+        The service shuts down if the monitor fails, with the monitor's error then raised.
+        """
+        try:
+            monitor_task = self.loop.create_task(self._monitor.run())
+            monitor_task.add_done_callback(self._handle_monitor_done)
+            self._scheduled_tasks.append(monitor_task)
+            for requested_coro in self._requested_tasks:
+                self._scheduled_tasks.append(self.loop.create_task(requested_coro))
+            self.loop.run_forever()
+        finally:
+            self.loop.close()
+            logging.info("Monitor service finished")
+        # Exit with an error if the monitor failed, so that the service's container is restarted
+        if not monitor_task.cancelled() and monitor_task.exception() is not None:
+            raise RuntimeError("Monitor failed") from monitor_task.exception()
+
+    def _handle_monitor_done(self, task: asyncio.Task):
+        """
+        Shut down the service if the monitor task finishes other than by being cancelled, since the service would
+        otherwise keep running without monitoring anything.
+        """
+        if task.cancelled():
+            return
+        if task.exception() is not None:
+            logging.error("Monitor failed; shutting down", exc_info=task.exception())
+        else:
+            logging.error("Monitor stopped unexpectedly; shutting down")
+        self.loop.create_task(self.shutdown())
+
+    async def shutdown(self, shutdown_signal=None):
+        """
+        Cancel all tasks, wait for them to finish, and stop the event loop.
+        """
+        if shutdown_signal:
+            logging.info(f"Exiting on signal {shutdown_signal.name}")
+        tasks = [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+        for task in tasks:
+            task.cancel()
+        logging.info(f"Cancelling {len(tasks)} pending tasks")
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self.loop.stop()
 
-    def run():
-        while True:
-            print("Not Implemented")
-            break
 
 if __name__ == '__main__':
     raise RuntimeError('Module {} called directly; use main package entrypoint instead')
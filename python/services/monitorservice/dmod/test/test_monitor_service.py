@@ -0,0 +1,89 @@
+import asyncio
+import sys
+import unittest
+from unittest.mock import patch
+
+from ..monitorservice import MonitorService
+from ..monitorservice import __main__ as service_main
+
+
+class MockMonitor:
+    """
+    Mock of the service's ::class:`AsyncQueMonitor`, running until cancelled, or failing with a given error.
+    """
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.started = False
+        self.cancelled = False
+
+    async def run(self):
+        self.started = True
+        try:
+            if self.error is not None:
+                await asyncio.sleep(0.01)
+                raise self.error
+            await asyncio.Event().wait()
+        except asyncio.CancelledError:
+            self.cancelled = True
+            raise
+
+
+class TestMonitorService(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.monitor = MockMonitor()
+        self.service = MonitorService(self.monitor)
+
+    def tearDown(self) -> None:
+        if not self.service.loop.is_closed():
+            self.service.loop.close()
+
+    def test_run_1_a(self):
+        """
+            Test the monitor runs as a task of the service, and is cancelled on shutdown
+        """
+        async def shutdown_after_start():
+            while not self.monitor.started:
+                await asyncio.sleep(0.01)
+            await self.service.shutdown()
+
+        self.service.add_async_task(shutdown_after_start())
+        self.service.run()
+        self.assertTrue(self.monitor.cancelled)
+        self.assertTrue(self.service.loop.is_closed())
+
+    def test_run_1_b(self):
+        """
+            Test the service shuts down, cancelling its other tasks, and raises the error, when the monitor fails
+        """
+        other_task_cancelled = []
+
+        async def other_task():
+            try:
+                await asyncio.Event().wait()
+            except asyncio.CancelledError:
+                other_task_cancelled.append(True)
+                raise
+
+        self.monitor.error = KeyError('Actor')
+        self.service.add_async_task(other_task())
+        with self.assertRaises(RuntimeError) as context:
+            self.service.run()
+        self.assertIs(context.exception.__cause__, self.monitor.error)
+        self.assertEqual(other_task_cancelled, [True])
+        self.assertTrue(self.service.loop.is_closed())
+
+    def test_main_1_a(self):
+        """
+            Test the entry point builds the monitor from its args, and runs it in the service
+        """
+        with patch.object(sys, 'argv', ['monitorservice', '--max-docker-calls', '3', '--backoff-attempts', '2']), \
+                patch.object(service_main, 'QueMonitor') as mock_que_monitor, \
+                patch.object(service_main, 'MonitorService') as mock_service:
+            service_main.main()
+        monitor = mock_service.call_args[0][0]
+        self.assertIs(monitor._monitor, mock_que_monitor.return_value)
+        self.assertEqual(monitor.max_docker_calls, 3)
+        self.assertEqual(monitor.backoff.max_attempts, 2)
+        mock_service.return_value.run.assert_called_once()
@@ -39,6 +39,15 @@ def _handle_args():
                         help='Set the ssl directory for scheduler certs, if not the same as for the request handler',
                         dest='scheduler_ssl_dir',
                         default='3013')
+    parser.add_argument('--scheduler-codec',
+                        help='Request a serialization codec (e.g., msgpack) for messages with the scheduler',
+                        dest='scheduler_codec',
+                        default=None)
+    parser.add_argument('--max-concurrent-requests',
+                        help='Set the max number of correlated requests handled concurrently for each client connection',
+                        dest='max_concurrent_requests',
+                        type=int,
+                        default=None)
     parser.prog = package_name
     return parser.parse_args()
 
@@ -76,7 +85,9 @@ def main():
                              priv_key_pem=args.key_path,
                              scheduler_host=args.scheduler_host,
                              scheduler_port=args.scheduler_port,
-                             scheduler_ssl_dir=Path(args.scheduler_ssl_dir))
+                             scheduler_ssl_dir=Path(args.scheduler_ssl_dir),
+                             scheduler_codec=args.scheduler_codec,
+                             max_concurrent_requests=args.max_concurrent_requests)
     handler.run()
 
 
@@ -3,14 +3,15 @@
 import asyncio
 import json
 import logging
-from typing import Type, Union
+from typing import Optional, Set, Type, Union
 
 import websockets
 from websockets import WebSocketServerProtocol
 
 from dmod.access import DummyAuthUtil, RedisBackendSessionManager
-from dmod.communication import Response, InvalidMessageResponse, MessageEventType, \
-    WebSocketInterface, WebSocketSessionsInterface, SchedulerClient
+from dmod.communication import Response, InitRequestResponseReason, InvalidMessageResponse, MessageEventType, \
+    NWMRequestResponse, WebSocketInterface, WebSocketSessionsInterface, SchedulerClient, get_correlation_id, \
+    wrap_in_envelope
 from dmod.externalrequests import AuthHandler, NWMRequestHandler
 
 logging.basicConfig(
@@ -48,13 +49,22 @@ class RequestService(WebSocketSessionsInterface):
 
     server:
         websocket server
+
+    max_concurrent_requests:
+        max number of correlated requests handled concurrently for each client connection
     """
 
+    _DEFAULT_MAX_CONCURRENT_REQUESTS = 8
+    """ Default max number of correlated requests handled concurrently for each client connection. """
+
     def __init__(self, listen_host='', port='3012', scheduler_host: str = 'localhost',
                  scheduler_port: Union[str, int] = 3013, ssl_dir=None, cert_pem=None, priv_key_pem=None,
-                 scheduler_ssl_dir=None):
+                 scheduler_ssl_dir=None, scheduler_codec: Optional[str] = None,
+                 max_concurrent_requests: Optional[int] = None):
         super().__init__(listen_host=listen_host, port=port, ssl_dir=ssl_dir, cert_pem=cert_pem,
                          priv_key_pem=priv_key_pem)
+        self.max_concurrent_requests = self._DEFAULT_MAX_CONCURRENT_REQUESTS if max_concurrent_requests is None \
+            else int(max_concurrent_requests)
         self._session_manager: RedisBackendSessionManager = RedisBackendSessionManager()
         self.scheduler_host = scheduler_host
         self.scheduler_port = int(scheduler_port)
@@ -67,7 +77,8 @@ class RequestService(WebSocketSessionsInterface):
 
         scheduler_url = "wss://{}:{}".format(self.scheduler_host, self.scheduler_port)
 
-        self._scheduler_client = SchedulerClient(scheduler_url, self.scheduler_client_ssl_dir)
+        self._scheduler_client = SchedulerClient(scheduler_url, self.scheduler_client_ssl_dir,
+                                                 serial_codec=scheduler_codec)
         """SchedulerClient: Client for interacting with scheduler, which also is a context manager for connections."""
 
         self._auth_handler: AuthHandler = AuthHandler(session_manager=self._session_manager,
@@ -78,29 +89,94 @@ class RequestService(WebSocketSessionsInterface):
                                                          authorizer=self.authorizer,
                                                          scheduler_host=scheduler_host,
                                                          scheduler_port=scheduler_port,
-                                                         scheduler_ssl_dir=self.scheduler_client_ssl_dir)
+                                                         scheduler_ssl_dir=self.scheduler_client_ssl_dir,
+                                                         scheduler_codec=scheduler_codec)
 
     @property
     def session_manager(self):
         return self._session_manager
 
+    async def _handle_correlated_request(self, websocket: WebSocketServerProtocol, req_message, correlation_id: str,
+                                         request_slots: asyncio.Semaphore):
+        """
+        Handle a job request sent with a correlation id, concurrently with other requests over the same connection,
+        sending back the response (with the same correlation id) as soon as it is ready, then freeing the request's slot.
+
+        If handling the request fails, a failed response is sent instead, so the client is not left waiting.
+
+        Parameters
+        ----------
+        websocket : WebSocketServerProtocol
+            The client connection over which the request was received.
+        req_message
+            The received request message.
+        correlation_id : str
+            The correlation id the request was sent with.
+        request_slots : asyncio.Semaphore
+            The connection's semaphore limiting concurrently handled requests, already acquired for this request.
+        """
+        try:
+            response = await self._dmod_request_handler.handle_request(request=req_message)
+            logging.debug('************************* Handled request {} response: {}'.format(correlation_id,
+                                                                                          str(response)))
+            await self._send_response(websocket, response, correlation_id)
+        except websockets.exceptions.ConnectionClosed:
+            logging.info("Connection Closed before response to {} was sent".format(correlation_id))
+        except Exception as e:
+            # Make sure the client still gets a response for the correlation id, rather than waiting indefinitely
+            logging.exception("Failed to handle request {}".format(correlation_id))
+            response = NWMRequestResponse(success=False, reason=InitRequestResponseReason.UNKNOWN.name,
+                                          message='Error handling request: {}'.format(e))
+            try:
+                await self._send_response(websocket, response, correlation_id)
+            except websockets.exceptions.ConnectionClosed:
+                logging.info("Connection Closed before error response to {} was sent".format(correlation_id))
+        finally:
+            request_slots.release()
+
+    async def _send_response(self, websocket: WebSocketServerProtocol, response: Response,
+                             correlation_id: Optional[str] = None):
+        """
+        Send the given response, wrapped in an envelope with the correlation id of the request when there is one.
+        """
+        if correlation_id is None:
+            await websocket.send(str(response))
+        else:
+            await websocket.send(json.dumps(wrap_in_envelope(response, correlation_id)))
+
     async def listener(self, websocket: WebSocketServerProtocol, path):
         """
         Async function listening for incoming information on websocket.
+
+        Job requests sent in an envelope with a correlation id (see ::mod:`message_registry`) are handled concurrently,
+        each in its own task, with their responses sent (in envelopes with the same correlation id) as they complete,
+        rather than in the order the requests arrived.  At most ::attribute:`max_concurrent_requests` are handled at
+        once for a connection, with further frames not read until one finishes.  Other messages, including all those
+        without a correlation id, are handled in order, one at a time, as before.
         """
         session = None
         client_ip = websocket.remote_address[0]
+        request_slots = asyncio.Semaphore(self.max_concurrent_requests)
+        request_tasks: Set[asyncio.Task] = set()
         try:
             async for message in websocket:
                 data = json.loads(message)
                 logging.info(f"Got payload: {data}")
+                correlation_id = get_correlation_id(data)
                 should_check_for_auth = session is None
                 event_type, errors_map = await self.parse_request_type(data=data, check_for_auth=should_check_for_auth)
                 req_message = await self.deserialized_message(message_data=data, event_type=event_type)
 
                 if event_type == MessageEventType.INVALID:
                     response = InvalidMessageResponse(data=req_message)
-                    await websocket.send(str(response))
+                    await self._send_response(websocket, response, correlation_id)
+                elif event_type == MessageEventType.MAAS_REQUEST and correlation_id is not None:
+                    # Wait for a free slot, which also stops reading frames while the connection is at its limit
+                    await request_slots.acquire()
+                    task = asyncio.create_task(self._handle_correlated_request(websocket, req_message, correlation_id,
+                                                                               request_slots))
+                    request_tasks.add(task)
+                    task.add_done_callback(request_tasks.discard)
                 elif event_type == MessageEventType.SESSION_INIT:
                     response = await self._auth_handler.handle_request(request=req_message, client_ip=client_ip)
                     #
@@ -109,7 +185,7 @@ class RequestService(WebSocketSessionsInterface):
                         result = await self.register_websocket_session(websocket, session)
                         logging.debug('************************* Attempt to register session-websocket: {}'.format(
                             str(result)))
-                    await websocket.send(str(response))
+                    await self._send_response(websocket, response, correlation_id)
                 elif event_type == MessageEventType.MAAS_REQUEST:
                     response = await self._dmod_request_handler.handle_request(request=req_message)
                     logging.debug('************************* Handled request response: {}'.format(str(response)))
@@ -135,6 +211,9 @@ class RequestService(WebSocketSessionsInterface):
         except asyncio.CancelledError:
             logging.info("Cancelling listerner task")
         finally:
+            # Responses to requests still in progress can no longer be sent
+            for task in list(request_tasks):
+                task.cancel()
             if session is not None:
                 await self.unregister_websocket_session(session=session)
 
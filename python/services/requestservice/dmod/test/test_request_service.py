@@ -0,0 +1,176 @@
+import asyncio
+import json
+import unittest
+from pathlib import Path
+from typing import List
+from unittest.mock import patch
+
+from dmod.communication import InitRequestResponseReason, NWMRequest, NWMRequestResponse, WebSocketSessionsInterface
+from dmod.communication.message_registry import ENVELOPE_CORRELATION_ID_KEY, ENVELOPE_EVENT_TYPE_KEY, \
+    ENVELOPE_MESSAGE_KEY
+from ..requestservice.service import RequestService
+
+
+class MockWebSocket:
+    """
+    Minimal mock of a server-side websocket connection, strictly for unit testing the request service listener.
+
+    Received frames are given via ::method:`put_received`, with ``None`` closing the connection.
+    """
+
+    def __init__(self):
+        self.remote_address = ('127.0.0.1', 12345)
+        self.sent: List[dict] = []
+        self._received = asyncio.Queue()
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        message = await self._received.get()
+        if message is None:
+            raise StopAsyncIteration
+        return message
+
+    def put_received(self, message):
+        self._received.put_nowait(message)
+
+    async def send(self, message: str):
+        self.sent.append(json.loads(message))
+
+
+class MockRequestHandler:
+    """
+    Mock of the service's job request handler, completing each handled request only when released by the test.
+    """
+
+    def __init__(self, error: Exception = None):
+        self.error = error
+        self.active = 0
+        self.max_active = 0
+        self.cancelled = 0
+        self.releases: List[asyncio.Event] = []
+
+    async def handle_request(self, request, **kwargs):
+        release = asyncio.Event()
+        self.releases.append(release)
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        try:
+            await release.wait()
+            if self.error is not None:
+                raise self.error
+            return NWMRequestResponse(success=True, reason=InitRequestResponseReason.ACCEPTED.name,
+                                      message='request {}'.format(len(self.releases)))
+        except asyncio.CancelledError:
+            self.cancelled += 1
+            raise
+        finally:
+            self.active -= 1
+
+
+class TestRequestService(unittest.TestCase):
+
+    def setUp(self) -> None:
+        self.loop = asyncio.new_event_loop()
+        self.request = NWMRequest(session_secret='f21f27ac3d443c0948aab924bddefc64891c455a756ca77a4d86ec2f697cd13c',
+                                  version=2.0, domain='test-domain').to_dict()
+        # Skip setting up the websocket server and SSL, and connecting to Redis for sessions
+        with patch.object(WebSocketSessionsInterface, '__init__', return_value=None), \
+                patch('dmod.requestservice.service.RedisBackendSessionManager'):
+            self.service = RequestService(scheduler_ssl_dir=Path('.'), max_concurrent_requests=2)
+        self.handler = MockRequestHandler()
+        self.service._dmod_request_handler = self.handler
+        self.websocket = MockWebSocket()
+
+    def tearDown(self) -> None:
+        self.loop.close()
+
+    def _put_request(self, correlation_id: str):
+        self.websocket.put_received(json.dumps({ENVELOPE_EVENT_TYPE_KEY: 'MAAS_REQUEST',
+                                                ENVELOPE_MESSAGE_KEY: self.request,
+                                                ENVELOPE_CORRELATION_ID_KEY: correlation_id}))
+
+    async def _wait_for(self, condition, timeout: float = 5.0):
+        async def wait():
+            while not condition():
+                await asyncio.sleep(0.01)
+        await asyncio.wait_for(wait(), timeout)
+
+    def test_listener_1_a(self):
+        """
+            Test no more than the max concurrent requests are handled at once for a connection
+        """
+        async def exec_test():
+            listener = asyncio.create_task(self.service.listener(self.websocket, '/'))
+            for i in range(4):
+                self._put_request('c{}'.format(i))
+            await self._wait_for(lambda: len(self.handler.releases) == 2)
+            await asyncio.sleep(0.1)
+            self.assertEqual(len(self.handler.releases), 2)
+            for i in range(4):
+                await self._wait_for(lambda: len(self.handler.releases) > i)
+                self.handler.releases[i].set()
+            await self._wait_for(lambda: len(self.websocket.sent) == 4)
+            self.websocket.put_received(None)
+            await listener
+
+        self.loop.run_until_complete(exec_test())
+        self.assertEqual(self.handler.max_active, 2)
+
+    def test_listener_1_b(self):
+        """
+            Test responses are sent as requests complete, with the correlation ids of their requests
+        """
+        async def exec_test():
+            listener = asyncio.create_task(self.service.listener(self.websocket, '/'))
+            self._put_request('first')
+            self._put_request('second')
+            await self._wait_for(lambda: len(self.handler.releases) == 2)
+            self.handler.releases[1].set()
+            await self._wait_for(lambda: len(self.websocket.sent) == 1)
+            self.handler.releases[0].set()
+            await self._wait_for(lambda: len(self.websocket.sent) == 2)
+            self.websocket.put_received(None)
+            await listener
+
+        self.loop.run_until_complete(exec_test())
+        self.assertEqual([r[ENVELOPE_CORRELATION_ID_KEY] for r in self.websocket.sent], ['second', 'first'])
+        self.assertEqual(self.websocket.sent[0][ENVELOPE_MESSAGE_KEY]['message'], 'request 2')
+
+    def test_listener_1_c(self):
+        """
+            Test requests still being handled are cancelled when the connection closes
+        """
+        async def exec_test():
+            listener = asyncio.create_task(self.service.listener(self.websocket, '/'))
+            self._put_request('c0')
+            self._put_request('c1')
+            await self._wait_for(lambda: len(self.handler.releases) == 2)
+            self.websocket.put_received(None)
+            await listener
+            await self._wait_for(lambda: self.handler.cancelled == 2)
+
+        self.loop.run_until_complete(exec_test())
+        self.assertEqual(self.websocket.sent, [])
+
+    def test_listener_1_d(self):
+        """
+            Test a failed response is sent, with the request's correlation id, when handling the request fails
+        """
+        self.handler.error = ConnectionError('Scheduler unavailable')
+
+        async def exec_test():
+            listener = asyncio.create_task(self.service.listener(self.websocket, '/'))
+            self._put_request('c0')
+            await self._wait_for(lambda: len(self.handler.releases) == 1)
+            self.handler.releases[0].set()
+            await self._wait_for(lambda: len(self.websocket.sent) == 1)
+            self.websocket.put_received(None)
+            await listener
+
+        self.loop.run_until_complete(exec_test())
+        response = self.websocket.sent[0]
+        self.assertEqual(response[ENVELOPE_CORRELATION_ID_KEY], 'c0')
+        self.assertFalse(response[ENVELOPE_MESSAGE_KEY]['success'])
+        self.assertIn('Scheduler unavailable', response[ENVELOPE_MESSAGE_KEY]['message'])
@@ -4,8 +4,9 @@ from os import getenv
 from pathlib import Path
 from . import name as package_name
 from .service import SchedulerHandler
-from dmod.scheduler import Launcher, RedisManager, Resource
+from dmod.scheduler import ImageAndDomainCatalog, Launcher, RedisManager, Resource
 from dmod.scheduler.job import JobManagerFactory, JobManager
+from dmod.scheduler.job.job_manager import RedisBackedJobManager
 
 def _handle_args():
     parser = argparse.ArgumentParser(formatter_class=argparse.ArgumentDefaultsHelpFormatter)
@@ -40,6 +41,27 @@ def _handle_args():
                         help='yaml file with a list of resources to use',
                         dest='resource_list_file',
                         default='./resources.yaml')
+    parser.add_argument('--backfill',
+                        help='Use EASY backfill scheduling for jobs that cannot be allocated in priority order',
+                        dest='backfill',
+                        action='store_true')
+    parser.add_argument('--fair-share',
+                        help='Lower the priority of jobs of users with more recent resource usage',
+                        dest='fair_share',
+                        action='store_true')
+    parser.add_argument('--redis-codec',
+                        help='Serialization codec (e.g., msgpack) for writing job records to Redis',
+                        dest='redis_codec',
+                        default=None)
+    parser.add_argument('--sequential-launch',
+                        help='Create the Docker services of a job one at a time, rather than concurrently',
+                        dest='sequential_launch',
+                        action='store_true')
+    parser.add_argument('--max-launch-workers',
+                        help='Set the max number of Docker services created at once when launching a job',
+                        dest='max_launch_workers',
+                        type=int,
+                        default=None)
 
     parser.prog = package_name
     return parser.parse_args()
@@ -126,12 +148,21 @@ def main():
 
     # instantiate the scheduler
     # TODO: look at handling if the value in args.images_and_domains_yaml doesn't correspond to an actual file
-    launcher = Launcher(images_and_domains_yaml=args.images_and_domains_yaml, type="dev")
+    # Share the catalog of supported images and domains with other services via Redis
+    catalog = ImageAndDomainCatalog(args.images_and_domains_yaml, redis_client=resource_manager.redis)
+    launcher = Launcher(images_and_domains_yaml=args.images_and_domains_yaml, type="dev",
+                        concurrent_launch=not args.sequential_launch, max_launch_workers=args.max_launch_workers,
+                        catalog=catalog)
     # instantiate the job manager
-    job_manager: JobManager = JobManagerFactory.factory_create(resource_manager, launcher, host=redis_host, port=redis_port, redis_pass=redis_pass)
+    job_manager: JobManager = JobManagerFactory.factory_create(resource_manager, launcher, host=redis_host, port=redis_port, redis_pass=redis_pass,
+                                                               backfill=args.backfill, fair_share=args.fair_share,
+                                                               serial_codec=args.redis_codec)
+    # Make sure the pending jobs queue is consistent with the active job records (e.g., saved by older versions)
+    if isinstance(job_manager, RedisBackedJobManager):
+        job_manager.rebuild_pending_jobs_queue()
 
     #Instansite the handle_job_request
-    handler = SchedulerHandler(job_manager, ssl_dir=Path(args.ssl_dir), port=args.port)
+    handler = SchedulerHandler(job_manager, ssl_dir=Path(args.ssl_dir), port=args.port, catalog=catalog)
     # Create the async task for processing Jobs within queue and scheduling
     handler.add_async_task(job_manager.manage_job_processing())
     #keynamehelper.set_prefix("stack0")
@@ -6,12 +6,14 @@ logging.basicConfig(
     datefmt="%H:%M:%S"
 )
 
+from functools import partial
+from typing import Dict, Optional
 from websockets import WebSocketServerProtocol
-from typing import List, Type
-from dmod.communication import InvalidMessageResponse, Message, SchedulerRequestMessage, SchedulerRequestResponse, \
-    UpdateMessage, UpdateMessageResponse, WebSocketInterface
+from dmod.communication import CorrelatedMessageChannel, InvalidMessageResponse, MessageChannel, MessageTypeRegistry, \
+    SchedulerRequestMessage, SchedulerRequestResponse, UpdateMessage, UpdateMessageResponse, WebSocketInterface, \
+    WebSocketMessageChannel, get_correlation_id, is_stream_end
+from dmod.scheduler import ImageAndDomainCatalog
 from dmod.scheduler.job import Job, JobManager, JobStatus
-import json
 
 import asyncio
 import websockets
@@ -31,41 +33,39 @@ class SchedulerHandler(WebSocketInterface):
         scheduler instance to schedule requested jobs
     """
 
-    @staticmethod
-    async def _update_client_on_requested_job(previous_job_state: Job, updated_job_state: Job,
-                                              websocket: WebSocketServerProtocol):
+    _message_registry = MessageTypeRegistry()
+    """ Registry of the supported initial message types, in order of precedence for messages not in an envelope. """
+    _message_registry.register(SchedulerRequestMessage)
+    _message_registry.register(UpdateMessage)
+
+    @classmethod
+    async def _update_client_on_requested_job(cls, job: Job, updated_status: JobStatus, channel: MessageChannel):
         """
-        Send an update message back to the client that initiated a scheduler request when the associated job updates it
-        state, and await a valid response to the update message.
+        Send an update message back to the client that initiated a scheduler request when the associated job changes
+        its status, and await a valid response to the update message.
 
         Note that if an invalid response comes back, either because it isn't a response at all or the digest is wrong,
         an error is logged, but processing otherwise continues.
 
         Parameters
         ----------
-        previous_job_state : Job
-            An object representing the updated job in its prior state.
-        updated_job_state : Job
-            An object representing the updated job in its updated state.
-        websocket : WebSocketServerProtocol
-            The websocket for client communication.
+        job : Job
+            An object representing the updated job.
+        updated_status : JobStatus
+            The changed status of the job.
+        channel : MessageChannel
+            The channel for the client conversation started by the scheduler request.
         """
-        updates = dict()
         # For now, the only relevant change should be a change in status
-        if updated_job_state.status != previous_job_state.status:
-            updates['status'] = str(updated_job_state.status)
-
-        # Exit without doing anything if no relevant updates were made
-        if len(updates) == 0:
-            return
+        updates = {'status': str(updated_status)}
 
-        # Otherwise, send update message over socket and await response
+        # Send update message over socket and await response
         # TODO: should any retries be considered?
-        update_message = UpdateMessage(previous_job_state.job_id, previous_job_state.__class__, updates)
-        await websocket.send(str(update_message))
+        update_message = UpdateMessage(job.job_id, job.__class__, updates)
+        await channel.send_serialized(update_message)
         # Then wait for the next message
-        response_raw = await websocket.recv()
-        response = UpdateMessageResponse.factory_init_from_deserialized_json(json.loads(response_raw))
+        response_raw = await channel.recv()
+        response = UpdateMessageResponse.factory_init_from_deserialized_json(response_raw)
 
         if response is None or not isinstance(response, UpdateMessageResponse):
             logging.error('Expected response to update message {}, but got something else: {}'.format(
@@ -74,14 +74,16 @@ class SchedulerHandler(WebSocketInterface):
             logging.error('Expected response to update message {}, but response digest {}'.format(
                 update_message.digest, response.digest))
 
-    def __init__(self, job_mgr: JobManager, *args, **kwargs):
+    def __init__(self, job_mgr: JobManager, *args, catalog: Optional[ImageAndDomainCatalog] = None, **kwargs):
         """
-            Initialize the WebSocketInterface with any user defined custom server config
+            Initialize the WebSocketInterface with any user defined custom server config, and optionally the catalog of
+            supported images and domains, against which job requests are checked before jobs are created
         """
         super().__init__(*args, **kwargs)
         self._job_manager = job_mgr
+        self._catalog = catalog
 
-    async def _handle_scheduler_request(self, message: SchedulerRequestMessage, websocket: WebSocketServerProtocol):
+    async def _handle_scheduler_request(self, message: SchedulerRequestMessage, channel: MessageChannel):
         """
         Async logic for processing after receiving an incoming websocket connection with an opening message that is an
         ::class:`SchedulerRequestMessage` object.
@@ -90,53 +92,54 @@ class SchedulerHandler(WebSocketInterface):
         ----------
         message : SchedulerRequestMessage
             The initial message over the websocket, requesting a job be scheduled.
-        websocket : WebSocketServerProtocol
-            The websocket connection.
+        channel : MessageChannel
+            The channel for the client conversation started by the message.
         """
 
+        # Reject requests for unsupported models, versions, or domains now, rather than failing once allocated
+        if self._catalog is not None:
+            model_request = message.model_request
+            model_name = model_request.get_model_name()
+            try:
+                is_supported = self._catalog.is_supported(model_name, model_request.version, model_request.domain)
+            except Exception as e:
+                msg = 'Could not check support for model {} by {}: {}'.format(model_name, self.__class__.__name__, e)
+                logging.error(msg)
+                response = SchedulerRequestResponse(success=False, reason='Model Catalog Unavailable', message=msg)
+                await channel.send_serialized(response)
+                return
+            if not is_supported:
+                msg = 'Version {} and/or domain {} of model {} not supported by {}'.format(
+                    model_request.version, model_request.domain, model_name, self.__class__.__name__)
+                logging.error(msg)
+                response = SchedulerRequestResponse(success=False, reason='Unsupported Model Request', message=msg)
+                await channel.send_serialized(response)
+                return
+
         # Create job object for this request
-        job = self._job_manager.create_job(request=message)
+        job = await self._job_manager.async_create_job(request=message)
 
         # Send request processed message back through
         response = SchedulerRequestResponse(success=True, reason='Job Request Processed', data={'job_id': job.job_id})
-        await websocket.send(str(response))
-
-        loop_iterations = 0
-        # Check for job state changes that trigger info (or data) messages back through websocket
-        # Loop for as long as the job is in some active state
-        while job.status.is_active:
-            # Sleep after first time through the loop, though more briefly the first few times to catch initial updates
-            # Have sleep logic at top of loop so loop condition is checked immediately after any chance for it to change
-            if loop_iterations == 1:
-                await asyncio.sleep(0.25)
-            elif 0 < loop_iterations < 5:
-                await asyncio.sleep(0.5)
-            else:
-                await asyncio.sleep(60)
-            loop_iterations += 1
-
-            # Refresh data for job
-            job_refreshed_copy = self._job_manager.retrieve_job(job.job_id)
-            # If the job was updated ...
-            if job_refreshed_copy.last_updated != job.last_updated:
-                # Send an update message as needed
-                await self._update_client_on_requested_job(previous_job_state=job, updated_job_state=job_refreshed_copy,
-                                                           websocket=websocket)
-                # Update to use the fresh copy of the job
-                job = job_refreshed_copy
-
-    async def _handle_update_message(self, message: UpdateMessage, websocket: WebSocketServerProtocol):
+        await channel.send_serialized(response)
+
+        # Push info messages back through the channel as the job's status changes, for as long as it is active, with the
+        # job manager notifying of changes as they are made rather than this polling the job's record
+        async for status in self._job_manager.async_watch_job_status(job.job_id, job.status):
+            await self._update_client_on_requested_job(job=job, updated_status=status, channel=channel)
+
+    async def _handle_update_message(self, message: UpdateMessage, channel: MessageChannel):
         # Only accept updates to Job objects, so verify the type
         if message.object_type != Job and not issubclass(message.object_type, Job):
             msg = 'The update message type `{}` is not a Job subtype, which is required for {}'.format(
                 message.object_type_string, self.__class__.__name__)
             response = UpdateMessageResponse(digest=message.digest, object_found=False, success=False,
                                              reason='Unrecognized Type', response_text=msg)
-            await websocket.send(str(response))
+            await channel.send_serialized(response)
             raise TypeError(msg)
 
         # Get current persisted copy of Job object
-        job = self._job_manager.retrieve_job(message.object_id)
+        job = await self._job_manager.async_retrieve_job(message.object_id)
 
         # Only accept updates to active Jobs, so verify the Job is active
         if not job.status.is_active:
@@ -144,7 +147,7 @@ class SchedulerHandler(WebSocketInterface):
                 message.object_type_string)
             response = UpdateMessageResponse(digest=message.digest, object_found=True, success=False,
                                              reason='Job Not Active', response_text=msg)
-            await websocket.send(str(response))
+            await channel.send_serialized(response)
             return
 
         # TODO: Refactor this in a way that is more extensible and also lends itself better to unit testing
@@ -160,13 +163,13 @@ class SchedulerHandler(WebSocketInterface):
                 msg = 'Cannot update `{}` property for `{}` objects.'.format(property_key, message.object_type_string)
                 response = UpdateMessageResponse(digest=message.digest, object_found=True, success=False,
                                                  reason='Immutable Property Update', response_text=msg)
-                await websocket.send(str(response))
+                await channel.send_serialized(response)
                 return
             elif property_key in real_but_unsupported_for_now_properties:
                 msg = 'Cannot update `{}` property for `{}` objects.'.format(property_key, message.object_type_string)
                 response = UpdateMessageResponse(digest=message.digest, object_found=True, success=False,
                                                  reason='Immutable Property Update', response_text=msg)
-                await websocket.send(str(response))
+                await channel.send_serialized(response)
                 return
             elif property_key == 'status':
                 new_status = JobStatus.get_for_name(message.updated_data[property_key])
@@ -177,49 +180,37 @@ class SchedulerHandler(WebSocketInterface):
                 msg = 'Unrecognized `{}` property for `{}` objects.'.format(property_key, message.object_type_string)
                 response = UpdateMessageResponse(digest=message.digest, object_found=True, success=False,
                                                  reason='Unrecognized Property Update', response_text=msg)
-                await websocket.send(str(response))
+                await channel.send_serialized(response)
                 return
 
         # Save updates if something was actually modified
         if was_modified:
-            self._job_manager.save_job(job)
+            await self._job_manager.async_save_job(job)
         response = UpdateMessageResponse(digest=message.digest, object_found=True, success=True,
                                          reason='Successful Update')
-        await websocket.send(str(response))
+        await channel.send_serialized(response)
 
-    async def listener(self, websocket: WebSocketServerProtocol, path):
+    async def _handle_message(self, data: dict, channel: MessageChannel):
         """
-        Process incoming messages, for things like ::class:`Job` requests or updates, via a listened-for websocket,
-        kicking off the appropriate actions and sending the appropriate response or responses back via the websocket.
+        Process the received opening message of a client conversation, kicking off the appropriate actions and sending
+        the appropriate response or responses back through the conversation's channel, then closing the channel.
 
-        Note that this particular implementation does not perform any access-like checking on the incoming messages.
-        Any message received is assumed to be something that should be process so long as the message is valid
-        syntactically and semantically.
+        Parameters
+        ----------
+        data : dict
+            The received opening message, deserialized to its serialized dictionary form.
+        channel : MessageChannel
+            The channel for the client conversation started by the message.
         """
-        print("Scheduler Listener")
-
         try:
-            message = await websocket.recv()
-            logging.info(f"Got message: {message}")
-            data = json.loads(message)
-            logging.info(f"Got payload: {data}")
-
-            # TODO: perhaps add this functionality below to the actual abstract interface
-            # Define the types of initial messages we can receive, and the specific function that handles the rest of
-            # processing when such a message comes in
-            supported_init_message_types: List[Type[Message]] = [SchedulerRequestMessage, UpdateMessage]
-
-            # Deserialize the message to the appropriate type if possible
-            for init_message_class_type in supported_init_message_types:
-                message = init_message_class_type.factory_init_from_deserialized_json(data)
-                # If successfully deserialized to something non-None, break here and process the message
-                if message is not None:
-                    break
+            # Deserialize the message to the appropriate supported type if possible, dispatching directly on the event
+            # type of enveloped messages, and otherwise trying each supported type in turn
+            message = self._message_registry.deserialize(data)
             # Once message is deserialized (or potential supported types are exhausted), handle appropriately
             if isinstance(message, SchedulerRequestMessage):
-                await self._handle_scheduler_request(message=message, websocket=websocket)
+                await self._handle_scheduler_request(message=message, channel=channel)
             elif isinstance(message, UpdateMessage):
-                await self._handle_update_message(message=message, websocket=websocket)
+                await self._handle_update_message(message=message, channel=channel)
             # TODO: add something for reconnecting to monitor progress of job after being disconnected
             # TODO: potentially add something for restarting a stopped job (if the workflow requires)
             # If not some supported message type ...
@@ -228,16 +219,61 @@ class SchedulerHandler(WebSocketInterface):
                 msg = "Unrecognized message format received over {} websocket (message: `{}`)".format(
                     self.__class__.__name__, content)
                 response = InvalidMessageResponse(data={'message_content': content})
-                await websocket.send(str(response))
+                await channel.send_serialized(response)
                 raise TypeError(msg)
-
         except TypeError as te:
-            logging.error("Problem with object types when processing received message", te)
+            logging.error("Problem with object types when processing received message: {}".format(str(te)))
+        except websockets.exceptions.ConnectionClosed:
+            logging.info("Connection Closed at Consumer")
+        await channel.close()
+
+    async def listener(self, websocket: WebSocketServerProtocol, path):
+        """
+        Process incoming messages, for things like ::class:`Job` requests or updates, via a listened-for websocket,
+        kicking off the appropriate actions and sending the appropriate response or responses back via the websocket.
+
+        Clients may multiplex several concurrent conversations over one connection, by wrapping messages in envelopes
+        with a correlation id (see ::mod:`message_registry`).  A message with a new correlation id starts a conversation,
+        handled in its own task through a ::class:`CorrelatedMessageChannel`, while further messages with the same
+        correlation id (e.g., responses to job update messages) are routed to that conversation.  Messages without a
+        correlation id are handled one at a time directly over the connection, as before conversations could be
+        multiplexed.
+
+        Note that this particular implementation does not perform any access-like checking on the incoming messages.
+        Any message received is assumed to be something that should be process so long as the message is valid
+        syntactically and semantically.
+        """
+        print("Scheduler Listener")
+        channels: Dict[str, CorrelatedMessageChannel] = dict()
+        tasks = set()
+
+        def release_conversation(task: asyncio.Task, correlation_id: str):
+            tasks.discard(task)
+            channels.pop(correlation_id, None)
+
+        try:
+            async for raw_message in websocket:
+                logging.info(f"Got message: {raw_message}")
+                data = self.deserialize_received(raw_message)
+                logging.info(f"Got payload: {data}")
+                correlation_id = get_correlation_id(data)
+                if correlation_id is None:
+                    await self._handle_message(data, WebSocketMessageChannel(websocket))
+                elif correlation_id in channels:
+                    channels[correlation_id].put_received(data)
+                elif not is_stream_end(data):
+                    channels[correlation_id] = CorrelatedMessageChannel(websocket, correlation_id)
+                    task = asyncio.create_task(self._handle_message(data, channels[correlation_id]))
+                    tasks.add(task)
+                    task.add_done_callback(partial(release_conversation, correlation_id=correlation_id))
         except websockets.exceptions.ConnectionClosed:
             logging.info("Connection Closed at Consumer")
         except asyncio.CancelledError:
             logging.info("Cancelling listener task")
-
+        finally:
+            # Conversations cannot continue without the connection
+            for task in list(tasks):
+                task.cancel()
 
 if __name__ == "__main__":
     raise RuntimeError('Module {} called directly; use main package entrypoint instead')